@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+benchmarks.get_score_overhead
+******************************************
+
+Measures the time the WalkScore library itself spends on each request, by
+sending requests through an HTTP client which answers them immediately with a
+canned response (so that no time is spent on the network).
+
+Run from the root of the repository::
+
+  $ python benchmarks/get_score_overhead.py --number 20000
+
+"""
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from walkscore import WalkScoreAPI                                              # pylint: disable=C0413
+from walkscore.http_client import HTTPClient, PreparedRequest                  # pylint: disable=C0413
+
+
+CONTENT = json.dumps({
+    'status': 1,
+    'walkscore': 98,
+    'description': "Walker's Paradise",
+    'updated': '2019-03-28 21:43:37.670012',
+    'logo_url': 'https://cdn.walk.sc/images/api-logo.png',
+    'more_info_icon': 'https://cdn.walk.sc/images/api-more-info.gif',
+    'more_info_link': 'https://www.redfin.com/how-walk-score-works',
+    'ws_link': 'https://www.walkscore.com/score/loc/lat=47.6085/lng=-122.3295',
+    'help_link': 'https://www.redfin.com/how-walk-score-works',
+    'snapped_lat': 47.6085,
+    'snapped_lon': -122.3295,
+    'transit': {'score': 100, 'description': "Rider's Paradise", 'summary': ''},
+    'bike': {'score': 71, 'description': 'Very Bikeable'},
+}).encode('utf-8')
+
+
+class CannedHTTPClient(HTTPClient):
+    """HTTP client which answers every request with :data:`CONTENT`."""
+
+    name = 'canned'
+
+    def _request(self,
+                 method,
+                 url,
+                 parameters = None,
+                 headers = None,
+                 request_body = None,
+                 timeout = None):
+        return CONTENT, 200, {'content-type': 'application/json'}
+
+    def close(self):
+        pass
+
+
+def get_scenarios():
+    """Return the name of each scenario, and the callable it times."""
+    http_client = CannedHTTPClient()
+    api = WalkScoreAPI(api_key = 'KEY', http_client = http_client)
+    url = api._API_URL                                                          # pylint: disable=W0212
+    parameters = {'format': 'json', 'transit': 1, 'bike': 1, 'wsapikey': 'KEY'}
+    location = {'lat': '47.6085', 'lon': '-122.3295', 'address': None}
+    prepared = PreparedRequest('GET', url, parameters = parameters)
+
+    return [
+        ('HTTPClient.request() (validated per call)',
+         lambda: http_client.request('GET', url, parameters = dict(parameters, **location))),
+        ('HTTPClient.send() (prepared request)',
+         lambda: http_client.send(prepared, location)),
+        ('WalkScoreAPI.get_score()',
+         lambda: api.get_score(47.6085, -122.3295, max_retries = 0)),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().split('\n\n')[1])
+    parser.add_argument('--number',
+                        type = int,
+                        default = 10000,
+                        help = 'the number of calls to time per scenario')
+    parser.add_argument('--repeat',
+                        type = int,
+                        default = 5,
+                        help = 'the number of times to repeat each timing')
+    args = parser.parse_args()
+
+    scenarios = get_scenarios()
+    width = max(len(name) for name, _ in scenarios)
+    print('%s  %s' % ('scenario'.ljust(width), 'per call (us)'))
+    for name, function in scenarios:
+        best = min(timeit.repeat(function, number = args.number, repeat = args.repeat))
+        print('%s  %13.1f' % (name.ljust(width), best / args.number * 1e6))
+
+
+if __name__ == '__main__':
+    main()
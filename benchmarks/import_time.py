@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+benchmarks.import_time
+******************************************
+
+Measures how long a fresh interpreter takes to import the WalkScore library (as
+a serverless function does on every cold start), compared with importing every
+HTTP library it supports up front.
+
+Run from the root of the repository::
+
+  $ python benchmarks/import_time.py --runs 20
+
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+#: Each scenario is a script executed in a fresh interpreter.
+SCENARIOS = [
+    ('import walkscore',
+     'import walkscore'),
+    ('from walkscore import WalkScoreAPI',
+     'from walkscore import WalkScoreAPI'),
+    ('WalkScoreAPI().http_client (lazy)',
+     'from walkscore import WalkScoreAPI\n'
+     'WalkScoreAPI(api_key = "KEY").http_client'),
+    ('WalkScoreAPI().http_client (all backends eagerly)',
+     'from walkscore import WalkScoreAPI\n'
+     'from walkscore import http_client\n'
+     'for name in sorted(http_client._BACKEND_MODULES):\n'
+     '    http_client._import_backend(name)\n'
+     'WalkScoreAPI(api_key = "KEY").http_client'),
+]
+
+
+def time_script(script, runs):
+    """Return the median number of milliseconds a fresh interpreter takes to
+    execute ``script``, less the time it takes to start up."""
+    def measure(source):
+        timings = []
+        for _ in range(runs):
+            output = subprocess.check_output(
+                [sys.executable, '-c',
+                 'import time\n'
+                 'started = time.perf_counter()\n'
+                 '%s\n'
+                 'print(time.perf_counter() - started)' % source],
+                cwd = ROOT
+            )
+            timings.append(float(output.decode('utf-8').strip().splitlines()[-1]))
+
+        return statistics.median(timings) * 1000
+
+    return measure(script)
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().split('\n\n')[1])
+    parser.add_argument('--runs',
+                        type = int,
+                        default = 10,
+                        help = 'the number of fresh interpreters to time per scenario')
+    args = parser.parse_args()
+
+    width = max(len(name) for name, _ in SCENARIOS)
+    print('%s  %s' % ('scenario'.ljust(width), 'median (ms)'))
+    for name, script in SCENARIOS:
+        print('%s  %11.1f' % (name.ljust(width), time_script(script, args.runs)))
+
+
+if __name__ == '__main__':
+    main()
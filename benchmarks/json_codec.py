@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+benchmarks.json_codec
+******************************************
+
+Measures how long each JSON library installed takes to serialize a location
+score (as the :class:`SQLiteCache <walkscore.SQLiteCache>` does) and to parse it
+back (as responses and :meth:`LocationScore.from_json()
+<walkscore.LocationScore.from_json>` are).
+
+Run from the root of the repository::
+
+  $ python benchmarks/json_codec.py --number 20000
+
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from walkscore.jsoncodec import JSON_LIBRARIES, set_json_codec                  # pylint: disable=C0413
+
+
+CONTENT = {
+    'status': 1,
+    'walkscore': 98,
+    'description': "Walker's Paradise",
+    'updated': '2019-03-28 21:43:37.670012',
+    'logo_url': 'https://cdn.walk.sc/images/api-logo.png',
+    'more_info_icon': 'https://cdn.walk.sc/images/api-more-info.gif',
+    'more_info_link': 'https://www.redfin.com/how-walk-score-works',
+    'ws_link': 'https://www.walkscore.com/score/loc/lat=47.6085/lng=-122.3295',
+    'help_link': 'https://www.redfin.com/how-walk-score-works',
+    'snapped_lat': 47.6085,
+    'snapped_lon': -122.3295,
+    'transit': {'score': 100, 'description': "Rider's Paradise", 'summary': ''},
+    'bike': {'score': 71, 'description': 'Very Bikeable'},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.strip().split('\n\n')[1])
+    parser.add_argument('--number',
+                        type = int,
+                        default = 10000,
+                        help = 'the number of calls to time per scenario')
+    parser.add_argument('--repeat',
+                        type = int,
+                        default = 5,
+                        help = 'the number of times to repeat each timing')
+    args = parser.parse_args()
+
+    print('%-10s  %13s  %13s' % ('library', 'dumps (us)', 'loads (us)'))
+    for name in JSON_LIBRARIES:
+        try:
+            codec = set_json_codec(name)
+        except ImportError:
+            continue
+
+        payload = codec.dumps(CONTENT)
+        timings = []
+        for function in (lambda: codec.dumps(CONTENT),
+                         lambda: codec.loads(payload)):
+            best = min(timeit.repeat(function, number = args.number, repeat = args.repeat))
+            timings.append(best / args.number * 1e6)
+
+        print('%-10s  %13.1f  %13.1f' % (name, timings[0], timings[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -144,7 +144,6 @@ setup(
     # https://packaging.python.org/en/latest/requirements.html
     install_requires=[
         'validator-collection>=1.3.0',
-        'backoff-utils>=1.0.0',
     ],
 
     # List additional groups of dependencies here (e.g. development
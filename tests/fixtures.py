@@ -9,13 +9,26 @@ Fixtures used by the WalkScore test suite.
 
 """
 import os
+import gzip
+import zlib
+import asyncio
 import sqlite3
 import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn, ThreadingTCPServer, BaseRequestHandler
+
+from six.moves.urllib.parse import urlparse, parse_qsl
 
 import pytest
 
 from validator_collection import validators, checkers
 
+from walkscore.errors import HTTPTimeoutError
+from walkscore.http_client import HTTPClient, AsyncHTTPClient
+
 class State(object):
     """Class to hold incremental test state."""
     # pylint: disable=too-few-public-methods
@@ -53,3 +66,312 @@ def check_input_file(input_directory, input_value):
         input_value = input_file
 
     return input_value
+
+
+def stub_response(parameters = None, status = 1):
+    """Return the content of a canned WalkScore API response for ``parameters``.
+
+    :rtype: :class:`bytes <python:bytes>`
+    """
+    parameters = parameters or {}
+    content = {
+        'status': status,
+        'walkscore': 98,
+        'description': "Walker's Paradise",
+        'updated': '2019-03-28 21:43:37.670012',
+        'logo_url': 'https://cdn.walk.sc/images/api-logo.png',
+        'more_info_icon': 'https://cdn.walk.sc/images/api-more-info.gif',
+        'more_info_link': 'https://www.redfin.com/how-walk-score-works',
+        'ws_link': 'https://www.walkscore.com/score/loc/lat=47.6085/lng=-122.3295',
+        'help_link': 'https://www.redfin.com/how-walk-score-works',
+        'snapped_lat': float(parameters.get('lat') or 0),
+        'snapped_lon': float(parameters.get('lon') or 0),
+    }
+    if parameters.get('transit'):
+        content['transit'] = {
+            'score': 100,
+            'description': "Rider's Paradise",
+            'summary': '115 nearby routes: 103 bus, 6 rail, 6 other'
+        }
+    if parameters.get('bike'):
+        content['bike'] = {
+            'score': 70,
+            'description': 'Very Bikeable'
+        }
+
+    return json.dumps(content).encode('utf-8')
+
+
+class StubHTTPClient(HTTPClient):
+    """:class:`HTTPClient <walkscore.http_client.HTTPClient>` which returns canned
+    WalkScore API responses without making any network requests."""
+
+    name = 'stub'
+
+    def __init__(self, delay = 0, status = 1, **kwargs):
+        super(StubHTTPClient, self).__init__(**kwargs)
+        self.delay = delay
+        self.status = status
+        self.calls = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def _request(self,
+                 method,
+                 url,
+                 parameters = None,
+                 headers = None,
+                 request_body = None,
+                 timeout = None):
+        with self._lock:
+            self.calls += 1
+
+        if timeout is not None and timeout.read is not None and self.delay > timeout.read:
+            time.sleep(timeout.read)
+            raise HTTPTimeoutError('Simulated read timeout.')
+
+        if self.delay:
+            time.sleep(self.delay)
+
+        return stub_response(parameters, self.status), 200, {}
+
+    def close(self):
+        self.closed = True
+
+
+class StubAsyncHTTPClient(AsyncHTTPClient):
+    """:class:`AsyncHTTPClient <walkscore.http_client.AsyncHTTPClient>` which
+    returns canned WalkScore API responses without making any network requests."""
+
+    name = 'stub-async'
+
+    def __init__(self, delay = 0, status = 1, **kwargs):
+        super(StubAsyncHTTPClient, self).__init__(**kwargs)
+        self.delay = delay
+        self.status = status
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    async def _request(self,
+                       method,
+                       url,
+                       parameters = None,
+                       headers = None,
+                       request_body = None,
+                       timeout = None):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if timeout is not None and timeout.read is not None and self.delay > timeout.read:
+                await asyncio.sleep(timeout.read)
+                raise HTTPTimeoutError('Simulated read timeout.')
+
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        return stub_response(parameters, self.status), 200, {}
+
+    async def close(self):
+        self.closed = True
+
+
+class _LocalAPIServer(ThreadingMixIn, HTTPServer):
+    """Local HTTP server which mimics the WalkScore API's ``/score`` endpoint."""
+
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self):
+        HTTPServer.__init__(self, ('127.0.0.1', 0), _LocalAPIHandler)
+        self.requests = []
+        self.connections = set()
+        self.lock = threading.Lock()
+        self.delay = 0
+        self.content_encoding = None
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%s' % self.server_address[1]
+
+
+def compress(content, content_encoding):
+    """Compress ``content`` with ``content_encoding``, returning the compressed
+    content and the ``Content-Encoding`` header to send with it.
+
+    ``raw-deflate`` is sent as ``deflate``, but without a zlib header, and
+    ``corrupt`` is sent as ``gzip`` without being compressed.
+    """
+    if content_encoding == 'gzip':
+        return gzip.compress(content), 'gzip'
+    if content_encoding == 'deflate':
+        return zlib.compress(content), 'deflate'
+    if content_encoding == 'raw-deflate':
+        compressor = zlib.compressobj(wbits = -zlib.MAX_WBITS)
+        return compressor.compress(content) + compressor.flush(), 'deflate'
+    if content_encoding == 'corrupt':
+        return content, 'gzip'
+
+    return content, None
+
+
+class _LocalAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):                                                             # pylint: disable=C0103
+        parameters = dict(parse_qsl(urlparse(self.path).query))
+        with self.server.lock:
+            self.server.requests.append((parameters, dict(self.headers)))
+            self.server.connections.add(self.client_address)
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        content = stub_response(parameters)
+        content_encoding = None
+        if self.server.content_encoding and \
+           'gzip' in self.headers.get('Accept-Encoding', ''):
+            content, content_encoding = compress(content, self.server.content_encoding)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        if content_encoding:
+            self.send_header('Content-Encoding', content_encoding)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):                                         # pylint: disable=W0622
+        pass
+
+
+@pytest.fixture
+def local_api():
+    """Return a local HTTP server which mimics the WalkScore API.
+
+    The server records the parameters and headers of each request it receives
+    (``requests``), and the client address of each connection it accepts
+    (``connections``). Each response is delayed by ``delay`` seconds, and (if the
+    request accepts it) compressed with ``content_encoding``.
+    """
+    server = _LocalAPIServer()
+    thread = threading.Thread(target = server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+class _LocalHTTP2Server(ThreadingTCPServer):
+    """Local HTTP/2 ("with prior knowledge") server which mimics the WalkScore
+    API's ``/score`` endpoint."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        ThreadingTCPServer.__init__(self, ('127.0.0.1', 0), _LocalHTTP2Handler)
+        self.requests = []
+        self.connections = set()
+        self.lock = threading.Lock()
+        self.delay = 0
+        self.open_streams = 0
+        self.max_open_streams = 0
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%s' % self.server_address[1]
+
+
+class _LocalHTTP2Handler(BaseRequestHandler):
+    def handle(self):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        connection = h2.connection.H2Connection(
+            config = h2.config.H2Configuration(client_side = False)
+        )
+        lock = threading.RLock()
+
+        def flush():
+            try:
+                self.request.sendall(connection.data_to_send())
+            except OSError:
+                pass
+
+        def respond(stream_id, content):
+            with lock:
+                connection.send_headers(stream_id, [(':status', '200'),
+                                                    ('content-type', 'application/json'),
+                                                    ('content-length', str(len(content)))])
+                connection.send_data(stream_id, content, end_stream = True)
+                flush()
+
+            with self.server.lock:
+                self.server.open_streams -= 1
+
+        with lock:
+            connection.initiate_connection()
+            flush()
+
+        with self.server.lock:
+            self.server.connections.add(self.client_address)
+
+        while True:
+            try:
+                data = self.request.recv(65535)
+            except OSError:
+                return
+            if not data:
+                return
+
+            with lock:
+                for event in connection.receive_data(data):
+                    if isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                    if not isinstance(event, h2.events.RequestReceived):
+                        continue
+
+                    headers = dict((k.decode() if isinstance(k, bytes) else k,
+                                    v.decode() if isinstance(v, bytes) else v)
+                                   for k, v in event.headers)
+                    parameters = dict(parse_qsl(urlparse(headers[':path']).query))
+                    with self.server.lock:
+                        self.server.requests.append((parameters, headers))
+                        self.server.open_streams += 1
+                        self.server.max_open_streams = max(self.server.max_open_streams,
+                                                           self.server.open_streams)
+
+                    timer = threading.Timer(self.server.delay,
+                                            respond,
+                                            (event.stream_id, stub_response(parameters)))
+                    timer.daemon = True
+                    timer.start()
+
+                flush()
+
+
+@pytest.fixture
+def local_http2_api():
+    """Return a local HTTP/2 server which mimics the WalkScore API.
+
+    Like :func:`local_api`, but also records the number of streams open at once
+    (``max_open_streams``).
+    """
+    pytest.importorskip('h2')
+    server = _LocalHTTP2Server()
+    thread = threading.Thread(target = server.serve_forever)
+    thread.daemon = True
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_AsyncWalkScoreAPI
+******************************************
+
+Tests for the :class:`AsyncWalkScoreAPI` class.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient, stub_response
+from walkscore.api import AsyncWalkScoreAPI
+from walkscore.locationscore import LocationScore
+from walkscore import errors
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize('http_client, max_concurrency, error', [
+    (StubAsyncHTTPClient(), 10, None),
+    (None, 10, None),
+    (StubHTTPClient(), 10, ValueError),
+    (StubAsyncHTTPClient(), 0, ValueError),
+])
+def test__init__(http_client, max_concurrency, error):
+    if not error:
+        result = AsyncWalkScoreAPI(api_key = 'custom-api-key',
+                                   http_client = http_client,
+                                   max_concurrency = max_concurrency)
+        assert isinstance(result, AsyncWalkScoreAPI) is True
+        assert result.max_concurrency == max_concurrency
+    else:
+        with pytest.raises(error):
+            result = AsyncWalkScoreAPI(api_key = 'custom-api-key',
+                                       http_client = http_client,
+                                       max_concurrency = max_concurrency)
+
+
+@pytest.mark.parametrize('api_key, latitude, longitude, return_transit_score, return_bike_score, error', [
+    ('custom-api-key', 47.6085, -122.3295, True, True, None),
+    ('custom-api-key', 47.6085, -122.3295, False, False, None),
+    ('custom-api-key', None, -122.3295, True, True, errors.InvalidCoordinatesError),
+    (None, 47.6085, -122.3295, True, True, errors.AuthenticationError),
+])
+def test_get_score(monkeypatch, api_key, latitude, longitude, return_transit_score, return_bike_score, error):
+    monkeypatch.delenv('WALKSCORE_API_KEY', raising = False)
+    api = AsyncWalkScoreAPI(api_key = api_key, http_client = StubAsyncHTTPClient())
+
+    async def get_score():
+        return await api.get_score(latitude = latitude,
+                                   longitude = longitude,
+                                   return_transit_score = return_transit_score,
+                                   return_bike_score = return_bike_score)
+
+    if not error:
+        result = run(get_score())
+        assert isinstance(result, LocationScore) is True
+        assert result.status == 1
+        assert result.original_latitude == latitude
+        assert (result.transit_score is not None) is return_transit_score
+        assert (result.bike_score is not None) is return_bike_score
+    else:
+        with pytest.raises(error):
+            run(get_score())
+
+
+@pytest.mark.parametrize('ordered, max_concurrency', [
+    (True, 5),
+    (False, 5),
+    (True, 100),
+])
+def test_get_scores(ordered, max_concurrency):
+    http_client = StubAsyncHTTPClient(delay = 0.001)
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key',
+                            http_client = http_client,
+                            max_concurrency = max_concurrency)
+    locations = [(47.6085 + (x / 1000), -122.3295) for x in range(50)]
+
+    async def get_scores():
+        return [x async for x in api.get_scores(locations,
+                                                ordered = ordered,
+                                                max_retries = 0)]
+
+    results = run(get_scores())
+
+    assert len(results) == len(locations)
+    assert http_client.calls == len(locations)
+    assert http_client.max_in_flight <= max_concurrency
+    latitudes = [x[0] for x in locations]
+    if ordered:
+        assert [x.original_latitude for x in results] == latitudes
+    else:
+        assert sorted(x.original_latitude for x in results) == latitudes
+
+
+def test_get_scores_return_exceptions():
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key',
+                            http_client = StubAsyncHTTPClient())
+    locations = [(47.6085, -122.3295), (None, -122.3295)]
+
+    async def get_scores():
+        return [x async for x in api.get_scores(locations,
+                                                max_retries = 0,
+                                                return_exceptions = True)]
+
+    results = run(get_scores())
+
+    assert isinstance(results[0], LocationScore) is True
+    assert isinstance(results[1], errors.InvalidCoordinatesError) is True
+
+
+def test_aiohttp_client():
+    web = pytest.importorskip('aiohttp.web')
+
+    async def handler(request):
+        return web.Response(body = stub_response(dict(request.query)),
+                            content_type = 'application/json')
+
+    async def get_score():
+        app = web.Application()
+        app.router.add_get('/score', handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]                              # pylint: disable=W0212
+        try:
+            async with AsyncWalkScoreAPI(api_key = 'custom-api-key') as api:
+                api._BASE_URL = 'http://127.0.0.1:%s' % port                         # pylint: disable=W0212
+                result = await api.get_score(47.6085, -122.3295, max_retries = 0)
+        finally:
+            await runner.cleanup()
+
+        return result
+
+    result = run(get_score())
+
+    assert isinstance(result, LocationScore) is True
+    assert result.walk_score == 98
+    assert result.snapped_latitude == 47.6085
@@ -782,3 +782,90 @@ def test_LocationScore__bool__(arguments, expected_result):
     result = bool(obj)
 
     assert result == expected_result
+
+
+TRUSTED_OBJ = {
+    'status': 1,
+    'walkscore': 98,
+    'description': "Walker's Paradise",
+    'updated': '2019-03-28 21:43:37.670012',
+    'logo_url': 'https://cdn.walk.sc/images/api-logo.png',
+    'more_info_icon': 'https://cdn.walk.sc/images/api-more-info.gif',
+    'more_info_link': 'https://www.redfin.com/how-walk-score-works',
+    'ws_link': 'https://www.walkscore.com/score/loc/lat=47.6085/lng=-122.3295',
+    'help_link': 'https://www.redfin.com/how-walk-score-works',
+    'snapped_lat': 47.6085,
+    'snapped_lon': -122,
+    'transit': {'score': 100, 'description': "Rider's Paradise", 'summary': ''},
+    'bike': {'score': 71, 'description': 'Very Bikeable'},
+}
+
+
+@pytest.mark.parametrize('obj, latitude, longitude, address, error', [
+    (TRUSTED_OBJ, '47.6085', '-122.3295', None, None),
+    (TRUSTED_OBJ, 47.6085, -122.3295, '1119 8th Avenue Seattle, WA 98101', None),
+    (dict(TRUSTED_OBJ, updated = '2019-03-28T21:43:37+00:00', transit = {}, bike = {}), None, None, '', None),
+    (dict(TRUSTED_OBJ, walkscore = '98', snapped_lat = '47.6085'), '47.6085', '-122.3295', None, None),
+    (dict(TRUSTED_OBJ, walkscore = 101), '47.6085', '-122.3295', None, (ValueError, TypeError)),
+    (dict(TRUSTED_OBJ, ws_link = 123), '47.6085', '-122.3295', None, (ValueError, TypeError)),
+    (TRUSTED_OBJ, 'not a number', '-122.3295', None, (ValueError, TypeError)),
+    (dict(TRUSTED_OBJ, updated = 'not a date'), '47.6085', '-122.3295', None, (ValueError, TypeError)),
+])
+def test_LocationScore__from_trusted(obj, latitude, longitude, address, error):
+    if not error:
+        result = LocationScore._from_trusted(obj,                            # pylint: disable=W0212
+                                             latitude = latitude,
+                                             longitude = longitude,
+                                             address = address)
+
+        expected_result = LocationScore.from_dict(obj, api_compatible = True)
+        expected_result.address = address
+        expected_result.original_latitude = latitude
+        expected_result.original_longitude = longitude
+
+        for attribute in LocationScore.__slots__:
+            assert getattr(result, attribute) == getattr(expected_result, attribute)
+            assert type(getattr(result, attribute)) is type(getattr(expected_result, attribute))
+    else:
+        with pytest.raises(error):
+            LocationScore._from_trusted(obj,                                 # pylint: disable=W0212
+                                        latitude = latitude,
+                                        longitude = longitude,
+                                        address = address)
+
+
+def test_LocationScore__slots__():
+    import copy
+    import pickle
+
+    obj = LocationScore._from_trusted(TRUSTED_OBJ, 47.6085, -122.3295)        # pylint: disable=W0212
+
+    assert not hasattr(obj, '__dict__')
+    with pytest.raises(AttributeError):
+        obj.not_an_attribute = 123
+
+    with pytest.raises(ValueError):
+        obj.walk_score = 101
+
+    assert copy.copy(obj).to_dict() == obj.to_dict()
+    assert pickle.loads(pickle.dumps(obj)).to_dict() == obj.to_dict()
+
+
+@pytest.mark.parametrize('value', [
+    '2019-03-28 21:43:37.670012',
+    '2019-03-28 21:43:37.67',
+    '2019-03-28T21:43:37Z',
+    '2019-03-28T21:43:37+00:00',
+    '2019-03-28',
+])
+@pytest.mark.parametrize('has_fromisoformat', [True, False])
+def test_LocationScore__from_trusted_updated(monkeypatch, value, has_fromisoformat):
+    from walkscore import locationscore
+
+    if not has_fromisoformat:
+        # As on Python 3.6.
+        monkeypatch.setattr(locationscore, '_fromisoformat', None)
+
+    result = LocationScore._from_trusted(dict(TRUSTED_OBJ, updated = value))      # pylint: disable=W0212
+
+    assert result.walk_updated == LocationScore(walk_updated = value).walk_updated
@@ -21,8 +21,9 @@ except ImportError:
 
 from validator_collection import checkers
 
-from tests.fixtures import input_files, check_input_file
+from tests.fixtures import input_files, check_input_file, StubHTTPClient, local_api
 from walkscore.api import WalkScoreAPI
+from walkscore.http_client import RequestsClient
 from walkscore.locationscore import LocationScore
 from walkscore import errors
 
@@ -118,3 +119,90 @@ def test_get_score(use_key_from_env, api_key_override, address, longitude_latitu
             assert checkers.is_numeric(result.bike_score) is True
         else:
             assert result.bike_score is None
+
+
+@pytest.mark.parametrize('locations, ordered, max_workers, error', [
+    ([(47.6085, -122.3295), (47.6101, -122.3421, '1 Main St')], True, None, None),
+    ([{'latitude': 47.6085, 'longitude': -122.3295, 'address': '1 Main St'}], True, 2, None),
+    ([(47.6085 + (x / 1000), -122.3295) for x in range(25)], True, 4, None),
+    ([(47.6085 + (x / 1000), -122.3295) for x in range(25)], False, 4, None),
+    ([(47.6085, -122.3295)], True, 0, ValueError),
+])
+def test_get_scores(locations, ordered, max_workers, error):
+    http_client = StubHTTPClient(delay = 0.001)
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    if not error:
+        results = list(api.get_scores(locations,
+                                      max_workers = max_workers,
+                                      ordered = ordered,
+                                      max_retries = 0))
+        assert len(results) == len(locations)
+        assert http_client.calls == len(locations)
+        for result in results:
+            assert isinstance(result, LocationScore) is True
+            assert result.status == 1
+
+        latitudes = [x[0] if not isinstance(x, dict) else x['latitude']
+                     for x in locations]
+        if ordered:
+            assert [x.original_latitude for x in results] == latitudes
+        else:
+            assert sorted(x.original_latitude for x in results) == sorted(latitudes)
+    else:
+        with pytest.raises(error):
+            api.get_scores(locations, max_workers = max_workers)
+
+
+@pytest.mark.parametrize('return_exceptions', [True, False])
+def test_get_scores_errors(return_exceptions):
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = StubHTTPClient())
+    locations = [(47.6085, -122.3295), (None, -122.3295), (47.6101, -122.3421)]
+
+    if return_exceptions:
+        results = list(api.get_scores(locations,
+                                      max_retries = 0,
+                                      return_exceptions = True))
+        assert isinstance(results[0], LocationScore) is True
+        assert isinstance(results[1], errors.InvalidCoordinatesError) is True
+        assert isinstance(results[2], LocationScore) is True
+    else:
+        with pytest.raises(errors.InvalidCoordinatesError):
+            list(api.get_scores(locations, max_retries = 0))
+
+
+def test_http_client_lifecycle():
+    with WalkScoreAPI(api_key = 'custom-api-key') as api:
+        http_client = api.http_client
+        assert http_client is api.http_client
+
+        api.proxy = 'http://www.some-proxy-url.com'
+        assert api.http_client is not http_client
+
+    assert api._default_http_client is None                                   # pylint: disable=W0212
+
+    supplied_client = StubHTTPClient()
+    with WalkScoreAPI(api_key = 'custom-api-key', http_client = supplied_client) as api:
+        assert api.http_client is supplied_client
+
+    assert supplied_client.closed is False
+
+
+@pytest.mark.parametrize('keep_alive, expected_connections', [
+    (True, 1),
+    (False, 5),
+])
+def test_connection_reuse(local_api, keep_alive, expected_connections):
+    pytest.importorskip('requests')
+    api = WalkScoreAPI(api_key = 'custom-api-key',
+                       http_client = RequestsClient(keep_alive = keep_alive))
+    api._BASE_URL = local_api.url                                            # pylint: disable=W0212
+
+    for _ in range(5):
+        result = api.get_score(47.6085, -122.3295, max_retries = 0)
+        assert result.walk_score == 98
+
+    api.http_client.close()
+
+    assert len(local_api.requests) == 5
+    assert len(local_api.connections) == expected_connections
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_batch
+******************************************
+
+Tests for the :mod:`walkscore.batch` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.batch import BatchPlan
+from walkscore.locationscore import LocationScore
+from walkscore import errors
+
+LOCATIONS = [
+    (47.6085, -122.3295, '1 Main St'),
+    (47.6101, -122.3421),
+    (47.60851, -122.32949, '2 Main St'),
+    {'latitude': 47.6085, 'longitude': -122.3295, 'address': '3 Main St'},
+    (None, -122.3295),
+    (47.61011, -122.34211, '4 Main St'),
+]
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_BatchPlan():
+    plan = BatchPlan(LOCATIONS)
+
+    assert len(plan) == 6
+    assert plan.requests == [LOCATIONS[0], LOCATIONS[1], LOCATIONS[4]]
+    assert plan.saved_calls == 3
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_BatchPlan_resolve(ordered):
+    plan = BatchPlan(LOCATIONS)
+    first = LocationScore(status = 1, walk_score = 50, original_latitude = 47.6085)
+    second = LocationScore(status = 1, walk_score = 60, original_latitude = 47.6101)
+    error = errors.InvalidCoordinatesError('no latitude')
+
+    results = plan.resolve(1, second, ordered = ordered)
+    if ordered:
+        assert results == []
+    else:
+        assert [x.original_latitude for x in results] == [47.6101, 47.61011]
+
+    results = plan.resolve(0, first, ordered = ordered)
+    if ordered:
+        assert [x.walk_score for x in results] == [50, 60, 50, 50]
+        assert plan.resolve(2, error, ordered = ordered)[0] is error
+    else:
+        assert [x.address for x in results] == [None, '2 Main St', '3 Main St']
+        assert results[0] is first
+        assert results[1] is not first
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_get_scores_deduplicate(ordered):
+    http_client = StubHTTPClient()
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    results = list(api.get_scores(LOCATIONS,
+                                  ordered = ordered,
+                                  max_retries = 0,
+                                  return_exceptions = True,
+                                  deduplicate = True))
+
+    assert http_client.calls == 2
+    assert api.deduplicated_calls == 3
+    assert len(results) == len(LOCATIONS)
+    assert sum(isinstance(x, errors.InvalidCoordinatesError) for x in results) == 1
+    scores = [x for x in results if isinstance(x, LocationScore)]
+    assert sorted(x.original_latitude for x in scores) == sorted([47.6085, 47.6101, 47.60851, 47.6085, 47.61011])
+    if ordered:
+        assert [getattr(x, 'address', None) for x in results] == ['1 Main St', None, '2 Main St', '3 Main St', None, '4 Main St']
+        assert results[2].snapped_latitude == results[0].snapped_latitude
+
+
+def test_get_scores_deduplicate_raises():
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = StubHTTPClient())
+
+    results = api.get_scores(LOCATIONS, max_retries = 0, deduplicate = True)
+    assert len([next(results) for x in range(4)]) == 4
+    with pytest.raises(errors.InvalidCoordinatesError):
+        next(results)
+
+
+def test_AsyncWalkScoreAPI_get_scores_deduplicate():
+    http_client = StubAsyncHTTPClient()
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    async def get_scores():
+        return [x async for x in api.get_scores(LOCATIONS,
+                                                max_retries = 0,
+                                                return_exceptions = True,
+                                                deduplicate = True)]
+
+    results = run(get_scores())
+
+    assert http_client.calls == 2
+    assert api.deduplicated_calls == 3
+    assert [getattr(x, 'original_latitude', None) for x in results] == [47.6085, 47.6101, 47.60851, 47.6085, None, 47.61011]
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_cache
+******************************************
+
+Tests for the :mod:`walkscore.cache` module.
+
+"""
+# pylint: disable=line-too-long
+
+import os
+import sys
+import time
+import datetime
+import subprocess
+
+import pytest
+
+from tests.fixtures import StubHTTPClient
+from walkscore.api import WalkScoreAPI
+from walkscore.cache import MemoryCache, SQLiteCache
+from walkscore.locationscore import LocationScore
+
+
+def make_score(walk_score = 50):
+    return LocationScore(status = 1,
+                         walk_score = walk_score,
+                         walk_updated = datetime.datetime(2019, 3, 28, 21, 43, 37),
+                         transit_score = 12,
+                         snapped_latitude = 47.6085,
+                         snapped_longitude = -122.3295)
+
+
+@pytest.mark.parametrize('first, second, expected_match', [
+    ((47.6085, -122.3295, True, True), (47.6085, -122.3295, True, True), True),
+    ((47.6085, -122.3295, True, True), (47.60851, -122.32949, True, True), True),
+    ((47.6085, -122.3295, True, True), (47.6085, -122.3295, False, True), False),
+    ((47.6085, -122.3295, True, True), (47.6185, -122.3295, True, True), False),
+    ((47.6085, -122.3295, True, True), ('47.6085', '-122.3295', True, True), True),
+])
+def test_make_key(first, second, expected_match):
+    cache = MemoryCache()
+    assert (cache.make_key(*first) == cache.make_key(*second)) is expected_match
+
+
+def test_MemoryCache_lru():
+    cache = MemoryCache(max_entries = 2)
+    cache.set('a', make_score(1))
+    cache.set('b', make_score(2))
+
+    assert cache.get('a').walk_score == 1
+    cache.set('c', make_score(3))
+
+    assert cache.get('b') is None
+    assert cache.get('a').walk_score == 1
+    assert cache.get('c').walk_score == 3
+    assert cache.stats == {'hits': 3, 'misses': 1, 'evictions': 1, 'size': 2}
+
+
+def test_MemoryCache_ttl():
+    cache = MemoryCache(ttl = 0.01)
+    cache.set('a', make_score())
+    assert cache.get('a') is not None
+
+    time.sleep(0.02)
+
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_MemoryCache_returns_copies():
+    cache = MemoryCache()
+    cache.set('a', make_score())
+
+    first = cache.get('a')
+    first.address = '1 Main St'
+
+    assert cache.get('a').address is None
+
+
+@pytest.mark.parametrize('cache, error', [
+    (MemoryCache(), None),
+    (None, None),
+    ('not a cache', ValueError),
+])
+def test_WalkScoreAPI_cache(cache, error):
+    http_client = StubHTTPClient()
+    if error:
+        with pytest.raises(error):
+            WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client, cache = cache)
+        return
+
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client, cache = cache)
+
+    first = api.get_score(47.6085, -122.3295, address = '1 Main St', max_retries = 0)
+    second = api.get_score(47.60851, -122.32949, address = '2 Main St', max_retries = 0)
+    third = api.get_score(47.60851, -122.32949, return_bike_score = False, max_retries = 0)
+
+    assert first.address == '1 Main St'
+    assert second.address == '2 Main St'
+    assert second.original_latitude == 47.60851
+    assert third.bike_score is None
+    if cache is not None:
+        assert http_client.calls == 2
+        assert cache.stats['hits'] == 1
+        assert cache.stats['misses'] == 2
+    else:
+        assert http_client.calls == 3
+
+
+def test_SQLiteCache_shared(tmp_path):
+    path = str(tmp_path / 'scores.db')
+    writer = SQLiteCache(path, batch_size = 2, flush_interval = 60)
+    reader = SQLiteCache(path)
+
+    key = writer.make_key(47.6085, -122.3295)
+    writer.set(key, make_score(77))
+
+    assert writer.get(key).walk_score == 77
+    assert reader.get(key) is None
+
+    writer.flush()
+
+    result = reader.get(key)
+    assert isinstance(result, LocationScore) is True
+    assert result == make_score(77)
+    assert reader.stats['hits'] == 1
+    assert reader.stats['misses'] == 1
+
+    writer.close()
+    reader.close()
+
+    assert SQLiteCache(path).get(key).walk_score == 77
+
+
+def test_SQLiteCache_batched_writes(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'scores.db'), batch_size = 3, flush_interval = 60)
+    for walk_score in range(3):
+        cache.set(('key', walk_score, True, True), make_score(walk_score))
+        assert len(cache._pending) == (walk_score + 1) % 3                     # pylint: disable=W0212
+
+    assert len(cache) == 3
+
+
+def test_SQLiteCache_ttl_and_vacuum(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'scores.db'), ttl = 0.01)
+    cache.set((1, 1, True, True), make_score())
+    cache.set((2, 2, True, True), make_score())
+    cache.flush()
+
+    time.sleep(0.02)
+
+    assert cache.get((1, 1, True, True)) is None
+    assert len(cache) == 1
+    assert cache.vacuum() == 1
+    assert cache.stats['evictions'] == 2
+    assert len(cache) == 0
+
+
+def test_SQLiteCache_purges_expired_on_flush(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'scores.db'), ttl = 0.01, flush_interval = 60, purge_interval = 0)
+    cache.set((1, 1, True, True), make_score())
+    cache.set((2, 2, True, True), make_score())
+    cache.flush()
+
+    time.sleep(0.02)
+
+    cache._ttl = None                                                           # pylint: disable=W0212
+    cache.set((3, 3, True, True), make_score())
+    cache.flush()
+
+    assert len(cache) == 1
+    assert cache.stats['evictions'] == 2
+    assert cache.get((3, 3, True, True)) is not None
+
+
+def test_SQLiteCache_flushes_at_exit(tmp_path):
+    path = str(tmp_path / 'scores.db')
+    script = '\n'.join([
+        'import datetime',
+        'from walkscore.cache import SQLiteCache',
+        'from walkscore.locationscore import LocationScore',
+        'cache = SQLiteCache(%r, flush_interval = 60)' % path,
+        'cache.set((1, 1, True, True), LocationScore(status = 1, walk_score = 77, walk_updated = datetime.datetime(2019, 3, 28)))',
+        'assert len(cache._pending) == 1',
+    ])
+    subprocess.check_call([sys.executable, '-c', script],
+                          cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    assert SQLiteCache(path).get((1, 1, True, True)).walk_score == 77
+
+
+def test_SQLiteCache_with_api(tmp_path):
+    cache = SQLiteCache(str(tmp_path / 'scores.db'))
+    http_client = StubHTTPClient()
+    with WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client, cache = cache) as api:
+        first = api.get_score(47.6085, -122.3295, max_retries = 0)
+        second = api.get_score(47.6085, -122.3295, address = '1 Main St', max_retries = 0)
+
+    assert http_client.calls == 1
+    assert second.address == '1 Main St'
+    assert second.walk_score == first.walk_score
+    assert second.transit_summary == first.transit_summary
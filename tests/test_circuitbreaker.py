@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_circuitbreaker
+******************************************
+
+Tests for the :mod:`walkscore.circuitbreaker` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import time
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.circuitbreaker import CircuitBreaker
+from walkscore import errors
+
+
+class FailingHTTPClient(StubHTTPClient):
+    """Stub client which fails with ``error`` while ``failing`` is ``True``."""
+
+    def __init__(self, error = errors.HTTPConnectionError, **kwargs):
+        super(FailingHTTPClient, self).__init__(**kwargs)
+        self.error = error
+        self.failing = True
+
+    def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        if self.failing:
+            self.calls += 1
+            raise self.error('failed')
+
+        return super(FailingHTTPClient, self)._request(method, url, parameters, headers, request_body, timeout)
+
+
+@pytest.mark.parametrize('error, status_code, expected_result', [
+    (errors.HTTPConnectionError('failed'), None, True),
+    (errors.HTTPTimeoutError('failed'), None, True),
+    (errors.InternalAPIError('failed'), None, True),
+    (errors.WalkScoreError('failed'), 500, True),
+    (errors.InvalidCoordinatesError('failed'), 404, False),
+    (None, 200, False),
+])
+def test_is_failure(error, status_code, expected_result):
+    assert CircuitBreaker.is_failure(error, status_code) is expected_result
+
+
+def test_state_transitions():
+    breaker = CircuitBreaker(failure_threshold = 0.5,
+                             window_size = 4,
+                             minimum_requests = 4,
+                             reset_timeout = 0.05)
+
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    assert breaker.stats['opened'] == 1
+    with pytest.raises(errors.CircuitOpenError):
+        breaker.before_request()
+    assert breaker.stats['rejected'] == 1
+
+    time.sleep(0.06)
+
+    assert breaker.state == 'half-open'
+    breaker.before_request()
+    with pytest.raises(errors.CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    time.sleep(0.06)
+
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+    assert breaker.failure_rate == 0
+
+
+def test_replaces_success():
+    breaker = CircuitBreaker(window_size = 4, minimum_requests = 4)
+    for _ in range(4):
+        breaker.record_success()
+
+    breaker.record_failure(replaces_success = True)
+
+    assert breaker.failure_rate == 0.25
+    assert breaker.state == 'closed'
+
+
+def test_HTTPClient_circuit_breaker():
+    breaker = CircuitBreaker(window_size = 5, minimum_requests = 5, reset_timeout = 0.05)
+    http_client = FailingHTTPClient(circuit_breaker = breaker)
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    for latitude in range(5):
+        with pytest.raises(errors.HTTPConnectionError):
+            api.get_score(47 + latitude / 10, -122.3295, max_retries = 0)
+
+    with pytest.raises(errors.CircuitOpenError):
+        api.get_score(47.6085, -122.3295, max_retries = 0)
+    assert http_client.calls == 5
+
+    http_client.failing = False
+    time.sleep(0.06)
+
+    assert api.get_score(47.6085, -122.3295, max_retries = 0).walk_score == 98
+    assert breaker.state == 'closed'
+
+    with pytest.raises(ValueError):
+        http_client.circuit_breaker = 'not a breaker'
+
+
+def test_WalkScoreAPI_internal_error():
+    breaker = CircuitBreaker(window_size = 2, minimum_requests = 2)
+    api = WalkScoreAPI(api_key = 'custom-api-key',
+                       http_client = StubHTTPClient(status = 31, circuit_breaker = breaker))
+
+    for latitude in range(2):
+        with pytest.raises(errors.InternalAPIError):
+            api.get_score(47 + latitude / 10, -122.3295, max_retries = 0)
+
+    assert breaker.state == 'open'
+
+
+def test_WalkScoreAPI_default_client():
+    breaker = CircuitBreaker()
+    api = WalkScoreAPI(api_key = 'custom-api-key', circuit_breaker = breaker)
+
+    assert api.http_client.circuit_breaker is breaker
+
+    with pytest.raises(ValueError):
+        WalkScoreAPI(api_key = 'custom-api-key', circuit_breaker = 'not a breaker')
+
+
+def test_AsyncHTTPClient_circuit_breaker():
+    breaker = CircuitBreaker(window_size = 2, minimum_requests = 2)
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key',
+                            http_client = StubAsyncHTTPClient(status = 31, circuit_breaker = breaker))
+
+    async def get_scores():
+        return [x async for x in api.get_scores([(47.6, -122.3), (47.7, -122.3), (47.8, -122.3)],
+                                                max_workers = 1,
+                                                max_retries = 0,
+                                                return_exceptions = True)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(get_scores())
+    finally:
+        loop.close()
+
+    assert [type(x) for x in results] == [errors.InternalAPIError, errors.InternalAPIError, errors.CircuitOpenError]
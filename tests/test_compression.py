@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_compression
+******************************************
+
+Tests for the :mod:`walkscore.compression` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import zlib
+
+import pytest
+
+from tests.fixtures import local_api, compress, stub_response
+from walkscore.compression import ResponseDecoder, TransferCounter, get_accept_encoding
+from walkscore.http_client import default_http_client, default_async_http_client
+from walkscore.errors import HTTPConnectionError
+
+
+CONTENT = stub_response({'lat': 47.6, 'lon': -122.3})
+
+
+def split(content, size = 7):
+    return [content[x:x + size] for x in range(0, len(content), size)]
+
+
+@pytest.mark.parametrize('content_encoding', [
+    None,
+    'gzip',
+    'deflate',
+    'raw-deflate',
+])
+def test_ResponseDecoder(content_encoding):
+    compressed, header = compress(CONTENT, content_encoding)
+    decoder = ResponseDecoder(header)
+    for chunk in split(compressed):
+        decoder.write(chunk)
+
+    assert decoder.getvalue() == CONTENT
+    assert decoder.compressed_bytes == len(compressed)
+    assert decoder.decompressed_bytes == len(CONTENT)
+
+
+@pytest.mark.parametrize('content_encoding, expected_result', [
+    ('identity', CONTENT),
+    ('GZIP', CONTENT),
+    ('not-a-coding', zlib.compress(CONTENT)),
+], ids = ['identity', 'upper case', 'unknown'])
+def test_ResponseDecoder_content_encoding(content_encoding, expected_result):
+    content = CONTENT if content_encoding == 'identity' else zlib.compress(CONTENT)
+    if content_encoding == 'GZIP':
+        content, _ = compress(CONTENT, 'gzip')
+
+    decoder = ResponseDecoder()
+    decoder.content_encoding = content_encoding
+    decoder.write(content)
+
+    assert decoder.getvalue() == expected_result
+
+
+def test_ResponseDecoder_multiple_codings():
+    content = zlib.compress(compress(CONTENT, 'gzip')[0])
+    decoder = ResponseDecoder('gzip, deflate')
+    for chunk in split(content):
+        decoder.write(chunk)
+
+    assert decoder.getvalue() == CONTENT
+
+
+@pytest.mark.parametrize('content', [
+    CONTENT,
+    compress(CONTENT, 'gzip')[0][:-10],
+], ids = ['not compressed', 'truncated'])
+def test_ResponseDecoder_error(content):
+    decoder = ResponseDecoder('gzip')
+    decoder.write(content)
+
+    with pytest.raises(HTTPConnectionError):
+        decoder.getvalue()
+
+
+def test_TransferCounter():
+    counter = TransferCounter()
+    for content_encoding in ('gzip', None):
+        compressed, header = compress(CONTENT, content_encoding)
+        decoder = ResponseDecoder(header)
+        decoder.write(compressed)
+        decoder.getvalue()
+        counter.record(decoder)
+
+    assert counter.stats == {
+        'compressed_bytes': len(compress(CONTENT, 'gzip')[0]) + len(CONTENT),
+        'decompressed_bytes': 2 * len(CONTENT)
+    }
+
+
+def get_http_client(backend, **kwargs):
+    try:
+        return default_http_client(backend = backend, **kwargs)
+    except ImportError:
+        pytest.skip('%s is not installed' % backend)
+
+
+BACKENDS = ['requests', 'pycurl', 'pycurl-multi', 'urllib', 'httpx']
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+@pytest.mark.parametrize('content_encoding', ['gzip', 'deflate', 'raw-deflate'])
+def test_compressed_response(local_api, backend, content_encoding):
+    local_api.content_encoding = content_encoding
+    http_client = get_http_client(backend)
+
+    content, status_code, headers = http_client.request('GET', local_api.url + '/score')
+    http_client.close()
+
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    compressed, _ = compress(stub_response(), content_encoding)
+
+    assert status_code == 200
+    assert content == stub_response()
+    assert headers['content-encoding'] == ('deflate' if 'deflate' in content_encoding else 'gzip')
+    assert local_api.requests[0][1]['Accept-Encoding'] == get_accept_encoding()
+    assert http_client.transfer.stats == {
+        'compressed_bytes': len(compressed),
+        'decompressed_bytes': len(stub_response())
+    }
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_compression_disabled(local_api, backend):
+    local_api.content_encoding = 'gzip'
+    http_client = get_http_client(backend, compression = False)
+
+    http_client.request('GET', local_api.url + '/score')
+    http_client.close()
+
+    assert local_api.requests[0][1]['Accept-Encoding'] == 'identity'
+    assert http_client.transfer.stats == {
+        'compressed_bytes': len(stub_response()),
+        'decompressed_bytes': len(stub_response())
+    }
+
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_corrupt_response(local_api, backend):
+    local_api.content_encoding = 'corrupt'
+    http_client = get_http_client(backend)
+
+    with pytest.raises(HTTPConnectionError):
+        http_client.request('GET', local_api.url + '/score')
+
+    http_client.close()
+
+
+@pytest.mark.parametrize('backend', ['aiohttp', 'httpx'])
+def test_compressed_response_async(local_api, backend):
+    local_api.content_encoding = 'gzip'
+    try:
+        http_client = default_async_http_client(backend = backend)
+    except ImportError:
+        pytest.skip('%s is not installed' % backend)
+
+    async def run():
+        try:
+            return await http_client.request('GET', local_api.url + '/score')
+        finally:
+            await http_client.close()
+
+    content, status_code, _ = asyncio.run(run())
+
+    assert status_code == 200
+    assert content == stub_response()
+    assert http_client.transfer.stats == {
+        'compressed_bytes': len(compress(stub_response(), 'gzip')[0]),
+        'decompressed_bytes': len(stub_response())
+    }
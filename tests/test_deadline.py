@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_deadline
+******************************************
+
+Tests for the :mod:`walkscore.deadline` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import time
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient
+from tests.test_retry import ScriptedHTTPClient
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.deadline import Deadline, Timeout, normalize_timeout
+from walkscore.quota import QuotaLedger
+from walkscore.ratelimit import RateLimiter
+from walkscore.retry import RetryBudget, RetryPolicy
+from walkscore import errors
+
+
+@pytest.mark.parametrize('value, expected_result, error', [
+    (None, (None, None), None),
+    (5, (5, 5), None),
+    (0.3, (0.3, 0.3), None),
+    ((1, 2), (1, 2), None),
+    ([1, None], (1, None), None),
+    (Timeout(3, 4, 10), (3, 4), None),
+    (-1, None, ValueError),
+    ((1, 2, 3), None, ValueError),
+    ('not a timeout', None, ValueError),
+])
+def test_normalize_timeout(value, expected_result, error):
+    if not error:
+        assert normalize_timeout(value) == expected_result
+    else:
+        with pytest.raises(error):
+            normalize_timeout(value)
+
+
+def test_Deadline():
+    deadline = Deadline(10)
+    assert 9 < deadline.remaining() <= 10
+    assert not deadline.expired
+    deadline.check()
+
+    assert Deadline.coerce(deadline) is deadline
+    assert Deadline.coerce(None) is None
+    assert isinstance(Deadline.coerce(5), Deadline)
+
+    with pytest.raises(ValueError):
+        Deadline(-1)
+
+
+def test_Deadline_expired():
+    deadline = Deadline(0)
+
+    assert deadline.expired
+    assert deadline.remaining() == 0
+    with pytest.raises(errors.HTTPTimeoutError):
+        deadline.check()
+
+
+@pytest.mark.parametrize('timeout, seconds, expected_total', [
+    (Timeout(30, 80, None), 1, 1),
+    (Timeout(30, 80, 0.5), 1, 0.5),
+    (Timeout(0.2, 0.4, None), 1, 1),
+])
+def test_Deadline_clamp(timeout, seconds, expected_total):
+    result = Deadline(seconds).clamp(timeout)
+
+    assert result.connect <= min(timeout.connect, seconds)
+    assert result.read <= min(timeout.read, seconds)
+    assert result.total == pytest.approx(expected_total, abs = 0.05)
+
+
+def test_HTTPClient_get_timeout():
+    http_client = StubHTTPClient(connect_timeout = 2, read_timeout = 5)
+
+    assert http_client._get_timeout() == Timeout(2, 5, None)
+    assert http_client._get_timeout((1, None)) == Timeout(1, 5, None)
+    assert http_client._get_timeout(3) == Timeout(3, 3, None)
+    assert http_client._get_timeout(deadline = Deadline(1)).read <= 1
+
+    with pytest.raises(ValueError):
+        StubHTTPClient(connect_timeout = -1)
+
+
+def test_request_expired_deadline():
+    http_client = StubHTTPClient()
+
+    with pytest.raises(errors.HTTPTimeoutError):
+        http_client.request('GET', 'http://api.walkscore.com/score', deadline = Deadline(0))
+
+    assert http_client.calls == 0
+
+
+def test_retries_stop_at_deadline():
+    http_client = ScriptedHTTPClient([(500, {})] * 5,
+                                     retry_policy = RetryPolicy(base_delay = 0.5,
+                                                                budget = RetryBudget(minimum_retries = 10)))
+    api = WalkScoreAPI(api_key = 'KEY', http_client = http_client)
+
+    started = time.monotonic()
+    with pytest.raises(errors.WalkScoreError):
+        api.get_score(47.6, -122.3, max_retries = 5, deadline = 0.3)
+
+    assert time.monotonic() - started < 0.3
+    assert http_client.calls == 1
+
+
+def test_get_score_timeout():
+    api = WalkScoreAPI(api_key = 'KEY', http_client = StubHTTPClient(delay = 1))
+
+    started = time.monotonic()
+    with pytest.raises(errors.HTTPTimeoutError):
+        api.get_score(47.6, -122.3, max_retries = 0, timeout = (0.1, 0.1))
+
+    assert time.monotonic() - started < 0.5
+
+
+def test_get_score_deadline_clamps_timeout():
+    api = WalkScoreAPI(api_key = 'KEY', http_client = StubHTTPClient(delay = 1))
+
+    started = time.monotonic()
+    with pytest.raises(errors.HTTPTimeoutError):
+        api.get_score(47.6, -122.3, max_retries = 3, deadline = 0.2)
+
+    assert time.monotonic() - started < 0.5
+
+
+def test_rate_limiter_max_wait():
+    rate_limiter = RateLimiter(rate = 1, burst = 1)
+
+    assert rate_limiter.acquire(max_wait = 0) is True
+    assert rate_limiter.acquire(max_wait = 0.1) is False
+    assert rate_limiter.reserve() == pytest.approx(1, abs = 0.1)
+
+
+def test_get_score_rate_limited_past_deadline():
+    rate_limiter = RateLimiter(rate = 1, burst = 1)
+    http_client = StubHTTPClient()
+    api = WalkScoreAPI(api_key = 'KEY', http_client = http_client, rate_limiter = rate_limiter)
+
+    api.get_score(47.6, -122.3, deadline = 0.3)
+    with pytest.raises(errors.HTTPTimeoutError):
+        api.get_score(47.7, -122.3, deadline = 0.3)
+
+    assert http_client.calls == 1
+
+
+def test_quota_ledger_max_wait():
+    ledger = QuotaLedger(daily_quota = 1, on_exhausted = 'wait')
+    ledger.consume('KEY')
+
+    with pytest.raises(errors.QuotaExhaustedError):
+        ledger.consume('KEY', max_wait = 1)
+
+
+def test_get_scores_deadline():
+    api = WalkScoreAPI(api_key = 'KEY', http_client = StubHTTPClient(delay = 0.05))
+    locations = [(47 + x / 10, -122.3) for x in range(4)]
+
+    results = list(api.get_scores(locations, max_workers = 4, deadline = 1))
+    assert [x.walk_score for x in results] == [98] * 4
+
+    results = list(api.get_scores([(48.5, -122.3)],
+                                  deadline = Deadline(0),
+                                  return_exceptions = True))
+    assert isinstance(results[0], errors.HTTPTimeoutError)
+
+    with pytest.raises(ValueError):
+        api.get_scores(locations, timeout = 'not a timeout')
+
+    with pytest.raises(ValueError):
+        api.get_scores(locations, deadline = -1)
+
+
+def test_AsyncWalkScoreAPI_deadline():
+    http_client = StubAsyncHTTPClient(delay = 1)
+
+    async def run():
+        async with AsyncWalkScoreAPI(api_key = 'KEY', http_client = http_client) as api:
+            return await api.get_score(47.6, -122.3, max_retries = 3, deadline = 0.2)
+
+    started = time.monotonic()
+    with pytest.raises(errors.HTTPTimeoutError):
+        asyncio.run(run())
+
+    assert time.monotonic() - started < 0.5
+    assert http_client.in_flight == 0
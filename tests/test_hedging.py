@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_hedging
+******************************************
+
+Tests for the :mod:`walkscore.hedging` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import time
+from concurrent import futures
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.circuitbreaker import CircuitBreaker
+from walkscore.hedging import HedgeExecutor, HedgePolicy, LatencyTracker
+from walkscore.quota import QuotaLedger
+from walkscore.retry import RetryBudget
+
+
+class SlowFirstHTTPClient(StubHTTPClient):
+    """Stub client whose first request for each location is slow."""
+
+    def __init__(self, slow_delay = 0.5, **kwargs):
+        super(SlowFirstHTTPClient, self).__init__(**kwargs)
+        self.slow_delay = slow_delay
+        self.seen = set()
+
+    def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        with self._lock:
+            key = (parameters['lat'], parameters['lon'])
+            is_first = key not in self.seen
+            self.seen.add(key)
+
+        if is_first:
+            time.sleep(self.slow_delay)
+
+        return super(SlowFirstHTTPClient, self)._request(method, url, parameters, headers, request_body, timeout)
+
+
+class SlowFirstAsyncHTTPClient(StubAsyncHTTPClient):
+    """Asynchronous equivalent of :class:`SlowFirstHTTPClient`, which also counts
+    the requests which were cancelled."""
+
+    def __init__(self, slow_delay = 0.5, **kwargs):
+        super(SlowFirstAsyncHTTPClient, self).__init__(**kwargs)
+        self.slow_delay = slow_delay
+        self.seen = set()
+        self.cancelled = 0
+
+    async def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        key = (parameters['lat'], parameters['lon'])
+        is_first = key not in self.seen
+        self.seen.add(key)
+
+        if is_first:
+            try:
+                await asyncio.sleep(self.slow_delay)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+
+        return await super(SlowFirstAsyncHTTPClient, self)._request(method, url, parameters, headers, request_body, timeout)
+
+
+def warm_tracker(latency_tracker, seconds = 0.001, samples = 20):
+    for _ in range(samples):
+        latency_tracker.record(seconds)
+
+    return latency_tracker
+
+
+@pytest.mark.parametrize('latencies, percentile, expected_result', [
+    ([], 95, None),
+    ([0.1], 50, 0.1),
+    ([0.1, 0.2, 0.3, 0.4], 50, 0.2),
+    ([0.1, 0.2, 0.3, 0.4], 100, 0.4),
+    ([0.4, 0.3, 0.2, 0.1], 0, 0.1),
+    (list(range(1, 101)), 95, 95),
+])
+def test_LatencyTracker_percentile(latencies, percentile, expected_result):
+    latency_tracker = LatencyTracker()
+    for latency in latencies:
+        latency_tracker.record(latency)
+
+    assert latency_tracker.percentile(percentile) == expected_result
+
+
+def test_LatencyTracker_window():
+    latency_tracker = LatencyTracker(window_size = 2)
+    for latency in (10, 1, 2):
+        latency_tracker.record(latency)
+
+    assert len(latency_tracker) == 2
+    assert latency_tracker.percentile(100) == 2
+
+
+@pytest.mark.parametrize('kwargs, samples, latency, expected_result', [
+    ({}, 19, 0.5, None),
+    ({}, 20, 0.5, 0.5),
+    ({'min_delay': 1}, 20, 0.5, 1),
+    ({'max_delay': 0.2}, 20, 0.5, 0.2),
+    ({'minimum_samples': 1}, 1, 0.5, 0.5),
+])
+def test_HedgePolicy_get_delay(kwargs, samples, latency, expected_result):
+    policy = HedgePolicy(**kwargs)
+    latency_tracker = warm_tracker(LatencyTracker(), latency, samples)
+
+    assert policy.get_delay(latency_tracker) == expected_result
+    assert policy.get_delay(None) is None
+
+
+def test_HedgePolicy_call():
+    policy = HedgePolicy(budget = RetryBudget(minimum_retries = 5))
+    latency_tracker = warm_tracker(LatencyTracker())
+
+    with futures.ThreadPoolExecutor(max_workers = 4) as executor:
+        assert policy.call(executor, latency_tracker, lambda: 'fast', lambda: 'hedge') == 'fast'
+        assert policy.stats['hedged'] == 0
+
+        started = time.monotonic()
+        result = policy.call(executor,
+                             latency_tracker,
+                             lambda: time.sleep(0.5) or 'slow',
+                             lambda: 'hedge')
+        assert result == 'hedge'
+        assert time.monotonic() - started < 0.4
+        assert policy.stats['hedged'] == 1
+        assert policy.stats['wins'] == 1
+
+
+def test_HedgePolicy_call_hedge_fails():
+    policy = HedgePolicy(budget = RetryBudget(minimum_retries = 5))
+    latency_tracker = warm_tracker(LatencyTracker())
+
+    def fail():
+        raise ValueError('hedge failed')
+
+    with futures.ThreadPoolExecutor(max_workers = 4) as executor:
+        result = policy.call(executor,
+                             latency_tracker,
+                             lambda: time.sleep(0.1) or 'slow',
+                             fail)
+
+    assert result == 'slow'
+    assert policy.stats == {'hedged': 1, 'wins': 0, 'exhausted': 0}
+
+
+def test_HedgePolicy_call_budget_exhausted():
+    policy = HedgePolicy(budget = RetryBudget(ratio = 0, minimum_retries = 0))
+    latency_tracker = warm_tracker(LatencyTracker())
+    hedges = []
+
+    with futures.ThreadPoolExecutor(max_workers = 4) as executor:
+        result = policy.call(executor,
+                             latency_tracker,
+                             lambda: time.sleep(0.1) or 'slow',
+                             lambda: hedges.append(1))
+
+    assert result == 'slow'
+    assert not hedges
+    assert policy.stats == {'hedged': 0, 'wins': 0, 'exhausted': 1}
+
+
+def test_HedgePolicy_stats_threads():
+    policy = HedgePolicy(budget = RetryBudget(minimum_retries = 1000))
+    latency_tracker = warm_tracker(LatencyTracker())
+
+    def call(_):
+        return policy.call(hedge_executor,
+                           latency_tracker,
+                           lambda: time.sleep(0.05) or 'slow',
+                           lambda: 'hedge')
+
+    with HedgeExecutor(max_workers = 64) as hedge_executor:
+        with futures.ThreadPoolExecutor(max_workers = 32) as executor:
+            results = list(executor.map(call, range(200)))
+
+    assert results == ['hedge'] * 200
+    assert policy.stats['hedged'] == 200
+    assert policy.stats['wins'] == 200
+
+
+def test_HedgeExecutor_shutdown_cancels_pending():
+    executor = HedgeExecutor(max_workers = 1)
+    started = futures.Future()
+
+    running = executor.submit(lambda: started.set_result(True) or time.sleep(0.2))
+    queued = [executor.submit(lambda: 'queued') for _ in range(3)]
+    started.result()
+
+    executor.shutdown(wait = True)
+
+    assert running.result() is None
+    assert all(x.cancelled() for x in queued)
+    assert not executor._pending                                                    # pylint: disable=W0212
+
+
+def test_HedgePolicy_call_async_cancels_loser():
+    policy = HedgePolicy(budget = RetryBudget(minimum_retries = 5))
+    latency_tracker = warm_tracker(LatencyTracker())
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(1)
+            raise
+
+    async def hedge():
+        return 'hedge'
+
+    assert asyncio.run(policy.call_async(latency_tracker, slow, hedge)) == 'hedge'
+    assert cancelled == [1]
+    assert policy.stats['wins'] == 1
+
+
+def test_WalkScoreAPI_get_scores_hedged():
+    http_client = SlowFirstHTTPClient()
+    warm_tracker(http_client.latency)
+    ledger = QuotaLedger(daily_quota = 100)
+    policy = HedgePolicy(budget = RetryBudget(minimum_retries = 10))
+    api = WalkScoreAPI(api_key = 'KEY',
+                       http_client = http_client,
+                       quota_ledger = ledger,
+                       hedge_policy = policy)
+    locations = [(47 + x / 10, -122.3) for x in range(3)]
+
+    started = time.monotonic()
+    results = list(api.get_scores(locations, max_workers = 3, max_retries = 0))
+
+    assert time.monotonic() - started < 0.4
+    assert [x.walk_score for x in results] == [98, 98, 98]
+    assert policy.stats['hedged'] == 3
+    assert policy.stats['wins'] == 3
+    assert ledger.used_quota('KEY') == 6
+
+
+def test_WalkScoreAPI_get_score_not_hedged():
+    http_client = SlowFirstHTTPClient(slow_delay = 0.05)
+    warm_tracker(http_client.latency)
+    policy = HedgePolicy()
+    api = WalkScoreAPI(api_key = 'KEY', http_client = http_client, hedge_policy = policy)
+
+    api.get_score(47.6, -122.3, max_retries = 0)
+
+    assert policy.stats['hedged'] == 0
+    assert http_client.calls == 1
+
+
+def test_AsyncWalkScoreAPI_hedged():
+    http_client = SlowFirstAsyncHTTPClient()
+    warm_tracker(http_client.latency)
+    policy = HedgePolicy(budget = RetryBudget(minimum_retries = 10))
+
+    async def run():
+        async with AsyncWalkScoreAPI(api_key = 'KEY',
+                                     http_client = http_client,
+                                     hedge_policy = policy) as api:
+            return await api.get_score(47.6, -122.3, max_retries = 0)
+
+    started = time.monotonic()
+    result = asyncio.run(run())
+
+    assert time.monotonic() - started < 0.4
+    assert result.walk_score == 98
+    assert policy.stats['wins'] == 1
+    assert http_client.cancelled == 1
+    assert http_client.in_flight == 0
+
+
+def test_cancelled_trial_released():
+    breaker = CircuitBreaker(window_size = 1, minimum_requests = 1, reset_timeout = 0)
+    breaker.record_failure()
+    assert breaker.state == 'half-open'
+
+    breaker.before_request()
+    breaker.record_cancelled()
+    breaker.before_request()
+
+
+def test_hedge_policy_validation():
+    with pytest.raises(ValueError):
+        HedgePolicy(budget = 'not a budget')
+
+    with pytest.raises(ValueError):
+        WalkScoreAPI(api_key = 'KEY', hedge_policy = 'not a policy')
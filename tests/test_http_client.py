@@ -0,0 +1,490 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_http_client
+******************************************
+
+Tests for the :mod:`walkscore.http_client` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import socket
+import ssl
+import time
+from concurrent import futures
+
+import pytest
+
+from tests.fixtures import StubHTTPClient, local_api, local_http2_api
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.http_client import PycurlClient, PycurlMultiClient, Urllib2Client, \
+    HttpxClient, AsyncHttpxClient, AiohttpClient, PreparedRequest, default_http_client, \
+    default_async_http_client
+from walkscore.retry import RetryBudget, RetryPolicy
+from walkscore import errors
+
+
+def get_requests(url, count):
+    return [{'method': 'GET',
+             'url': url + '/score',
+             'parameters': {'lat': 47 + x / 10, 'lon': -122.3}}
+            for x in range(count)]
+
+
+class FlakyHTTPClient(StubHTTPClient):
+    """Stub client which fails the first request for each location."""
+
+    def __init__(self, **kwargs):
+        super(FlakyHTTPClient, self).__init__(**kwargs)
+        self.seen = set()
+
+    def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        key = (parameters['lat'], parameters['lon'])
+        if key not in self.seen:
+            self.seen.add(key)
+            self.calls += 1
+            raise errors.HTTPConnectionError('Simulated connection failure.')
+
+        return super(FlakyHTTPClient, self)._request(method, url, parameters, headers, request_body, timeout)
+
+
+def test_PycurlClient_threads(local_api):
+    pytest.importorskip('pycurl')
+    local_api.delay = 0.05
+    http_client = PycurlClient()
+
+    def request(latitude):
+        return http_client.request('GET',
+                                   local_api.url + '/score',
+                                   parameters = {'lat': latitude, 'lon': -122.3})[1]
+
+    # Each batch runs in new threads, as WalkScoreAPI.get_scores() does.
+    for _ in range(5):
+        with futures.ThreadPoolExecutor(max_workers = 4) as executor:
+            assert list(executor.map(request, [47 + x / 10 for x in range(8)])) == [200] * 8
+
+    assert len(http_client._curls) <= 4                                             # pylint: disable=W0212
+    assert len(http_client._idle_curls) == len(http_client._curls)                 # pylint: disable=W0212
+    assert len(local_api.connections) <= 4
+
+    http_client.close()
+    assert not http_client._curls                                                  # pylint: disable=W0212
+    assert not http_client._idle_curls                                             # pylint: disable=W0212
+
+    assert http_client.request('GET', local_api.url + '/score', parameters = {'lat': 47.6, 'lon': -122.3})[1] == 200
+    http_client.close()
+
+
+def test_PycurlClient_idle_handles_are_bounded():
+    pytest.importorskip('pycurl')
+    http_client = PycurlClient(pool_size = 2)
+    curls = [http_client._get_curl() for _ in range(4)]                            # pylint: disable=W0212
+    for curl in curls:
+        http_client._release_curl(curl)                                             # pylint: disable=W0212
+
+    assert len(http_client._curls) == 2                                             # pylint: disable=W0212
+    assert len(http_client._idle_curls) == 2                                        # pylint: disable=W0212
+
+    curl = http_client._get_curl()                                                  # pylint: disable=W0212
+    http_client.close()
+    http_client._release_curl(curl)                                                 # pylint: disable=W0212
+
+    assert not http_client._idle_curls                                             # pylint: disable=W0212
+    http_client.close()
+
+
+def test_RequestsClient_sessions_are_bounded(local_api):
+    pytest.importorskip('requests')
+    local_api.delay = 0.01
+    http_client = default_http_client(backend = 'requests')
+    created = []
+    get_session = http_client._get_session                                          # pylint: disable=W0212
+
+    def counting_get_session():
+        session = get_session()
+        if session not in created:
+            created.append(session)
+        return session
+
+    http_client._get_session = counting_get_session                                 # pylint: disable=W0212
+
+    def request(latitude):
+        return http_client.request('GET',
+                                   local_api.url + '/score',
+                                   parameters = {'lat': latitude, 'lon': -122.3})[1]
+
+    # Each batch runs in new threads, as WalkScoreAPI.get_scores() does.
+    for _ in range(5):
+        with futures.ThreadPoolExecutor(max_workers = 4) as executor:
+            assert list(executor.map(request, [47 + x / 10 for x in range(8)])) == [200] * 8
+
+    assert len(created) <= 4
+    assert len(http_client._idle_sessions) == len(created)                         # pylint: disable=W0212
+    assert len(local_api.connections) <= 4
+
+    http_client.close()
+    assert not http_client._idle_sessions                                          # pylint: disable=W0212
+
+
+@pytest.mark.parametrize('max_retries, expected_calls, expected_errors', [
+    (0, 3, 3),
+    (1, 6, 0),
+])
+def test_request_many(max_retries, expected_calls, expected_errors):
+    http_client = FlakyHTTPClient(retry_policy = RetryPolicy(base_delay = 0,
+                                                             max_delay = 0,
+                                                             budget = RetryBudget(minimum_retries = 10)))
+
+    responses = http_client.request_many(get_requests('http://127.0.0.1', 3),
+                                         max_retries = max_retries)
+
+    assert len(responses) == 3
+    assert http_client.calls == expected_calls
+    assert len([x for x in responses if isinstance(x, Exception)]) == expected_errors
+
+
+def test_request_many_invalid():
+    with pytest.raises(ValueError):
+        StubHTTPClient().request_many([{'method': 'FETCH', 'url': 'http://127.0.0.1'}])
+
+
+def test_PycurlMultiClient_request_many(local_api):
+    pytest.importorskip('pycurl')
+    local_api.delay = 0.2
+    http_client = PycurlMultiClient(pool_size = 10)
+
+    started = time.monotonic()
+    responses = http_client.request_many(get_requests(local_api.url, 10))
+    elapsed = time.monotonic() - started
+
+    http_client.close()
+
+    assert elapsed < 1
+    assert [x[1] for x in responses] == [200] * 10
+    assert len(local_api.requests) == 10
+    assert sorted(float(x[0]['lat']) for x in local_api.requests) == [47 + x / 10 for x in range(10)]
+
+
+def test_PycurlMultiClient_reuses_connections(local_api):
+    pytest.importorskip('pycurl')
+    http_client = PycurlMultiClient(pool_size = 2)
+
+    for _ in range(3):
+        responses = http_client.request_many(get_requests(local_api.url, 2))
+        assert [x[1] for x in responses] == [200, 200]
+
+    content, status_code, _ = http_client.request('GET', local_api.url + '/score', parameters = {'lat': 47.6, 'lon': -122.3})
+    http_client.close()
+
+    assert status_code == 200
+    assert len(local_api.requests) == 7
+    assert len(local_api.connections) == 2
+
+
+def test_PycurlMultiClient_connection_error():
+    pytest.importorskip('pycurl')
+    http_client = PycurlMultiClient()
+
+    responses = http_client.request_many(get_requests('http://localhost:9', 2))
+    http_client.close()
+
+    assert all(isinstance(x, errors.HTTPConnectionError) for x in responses)
+
+
+@pytest.mark.parametrize('deduplicate', [False, True])
+def test_get_scores_multiplexed(local_api, deduplicate):
+    pytest.importorskip('pycurl')
+    local_api.delay = 0.2
+    api = WalkScoreAPI(api_key = 'KEY', http_client = PycurlMultiClient(pool_size = 10))
+    api._BASE_URL = local_api.url                                            # pylint: disable=W0212
+    locations = [(47 + x / 10, -122.3) for x in range(10)]
+    if deduplicate:
+        locations += [(47.0001, -122.3)]
+
+    started = time.monotonic()
+    results = list(api.get_scores(locations,
+                                  max_workers = 10,
+                                  max_retries = 0,
+                                  deduplicate = deduplicate))
+    elapsed = time.monotonic() - started
+
+    api.http_client.close()
+
+    assert elapsed < 1
+    assert [x.walk_score for x in results] == [98] * len(locations)
+    assert [x.original_latitude for x in results] == [x[0] for x in locations]
+    assert len(local_api.requests) == 10
+
+
+@pytest.mark.parametrize('keep_alive, expected_connections', [
+    (True, 1),
+    (False, 5),
+])
+def test_Urllib2Client_connection_reuse(local_api, keep_alive, expected_connections):
+    api = WalkScoreAPI(api_key = 'KEY', http_client = Urllib2Client(keep_alive = keep_alive))
+    api._BASE_URL = local_api.url                                            # pylint: disable=W0212
+
+    for x in range(5):
+        result = api.get_score(47 + x / 10, -122.3, max_retries = 0)
+        assert result.walk_score == 98
+
+    api.http_client.close()
+
+    assert len(local_api.requests) == 5
+    assert len(local_api.connections) == expected_connections
+
+
+def test_Urllib2Client_stale_connection(local_api):
+    http_client = Urllib2Client()
+    url = local_api.url + '/score'
+
+    assert http_client.request('GET', url, parameters = {'lat': 47.6, 'lon': -122.3})[1] == 200
+
+    for idle in http_client._connections.values():                                # pylint: disable=W0212
+        for connection in idle:
+            connection.sock.shutdown(socket.SHUT_RDWR)
+
+    assert http_client.request('GET', url, parameters = {'lat': 47.7, 'lon': -122.3})[1] == 200
+    http_client.close()
+
+    assert len(local_api.requests) == 2
+
+
+def test_Urllib2Client_threads(local_api):
+    local_api.delay = 0.02
+    http_client = Urllib2Client(pool_size = 4)
+
+    def request(latitude):
+        return http_client.request('GET',
+                                   local_api.url + '/score',
+                                   parameters = {'lat': latitude, 'lon': -122.3})[1]
+
+    with futures.ThreadPoolExecutor(max_workers = 4) as executor:
+        results = list(executor.map(request, [47 + x / 10 for x in range(20)]))
+
+    http_client.close()
+
+    assert results == [200] * 20
+    assert len(local_api.connections) <= 4
+
+
+def test_Urllib2Client_connection_error():
+    http_client = Urllib2Client()
+
+    with pytest.raises(errors.HTTPConnectionError):
+        http_client.request('GET', 'http://localhost:9/score')
+
+
+@pytest.mark.parametrize('error, expected_result', [
+    (socket.timeout('timed out'), errors.HTTPTimeoutError),
+    (ConnectionRefusedError('refused'), errors.HTTPConnectionError),
+    (TypeError('bug'), errors.BindingError),
+    (errors.QuotaError('quota'), errors.QuotaError),
+])
+def test_WalkScoreError_from_exception(error, expected_result):
+    assert isinstance(errors.WalkScoreError.from_exception(error), expected_result)
+
+
+def test_HttpxClient_http2(local_http2_api):
+    pytest.importorskip('httpx')
+    local_http2_api.delay = 0.5
+    http_client = HttpxClient(http1 = False)
+    observed = []
+
+    def request(latitude):
+        return http_client.request('GET',
+                                   local_http2_api.url + '/score',
+                                   parameters = {'lat': latitude, 'lon': -122.3})[1]
+
+    with futures.ThreadPoolExecutor(max_workers = 10) as executor:
+        results = executor.map(request, [47 + x / 10 for x in range(10)])
+        while local_http2_api.open_streams < 10:
+            time.sleep(0.01)
+        observed = http_client.connection_stats
+        results = list(results)
+
+    completed = http_client.connection_stats
+    for latitude in (47.1, 47.2):
+        request(latitude)
+    sequential = http_client.connection_stats
+
+    http_client.close()
+
+    assert results == [200] * 10
+    assert len(local_http2_api.connections) == 1
+    assert local_http2_api.max_open_streams == 10
+    assert len(observed) == 1
+    assert observed[0]['http_version'] == 'HTTP/2'
+    assert observed[0]['open_streams'] == 10
+    assert completed[0]['open_streams'] == 0
+    assert sequential == completed
+
+
+def test_HttpxClient_http1(local_api):
+    pytest.importorskip('httpx')
+    api = WalkScoreAPI(api_key = 'KEY', http_client = default_http_client(backend = 'httpx'))
+    api._BASE_URL = local_api.url                                            # pylint: disable=W0212
+
+    for x in range(3):
+        assert api.get_score(47 + x / 10, -122.3, max_retries = 0).walk_score == 98
+
+    stats = api.http_client.connection_stats
+    api.http_client.close()
+
+    assert stats == [{'origin': local_api.url, 'http_version': 'HTTP/1.1', 'open_streams': 0}]
+    assert len(local_api.connections) == 1
+    assert 'address' not in local_api.requests[0][0]
+
+
+def test_AsyncHttpxClient_http2(local_http2_api):
+    pytest.importorskip('httpx')
+    local_http2_api.delay = 0.2
+    http_client = default_async_http_client(backend = 'httpx', http1 = False)
+    assert isinstance(http_client, AsyncHttpxClient)
+
+    async def run():
+        async with AsyncWalkScoreAPI(api_key = 'KEY', http_client = http_client) as api:
+            api._BASE_URL = local_http2_api.url                              # pylint: disable=W0212
+            results = await asyncio.gather(*[api.get_score(47 + x / 10, -122.3, max_retries = 0)
+                                             for x in range(10)])
+
+        await http_client.close()
+        return results
+
+    started = time.monotonic()
+    results = asyncio.run(run())
+
+    assert time.monotonic() - started < 1
+    assert [x.walk_score for x in results] == [98] * 10
+    assert len(local_http2_api.connections) == 1
+    assert local_http2_api.max_open_streams == 10
+
+
+def test_HttpxClient_connection_error():
+    pytest.importorskip('httpx')
+    http_client = HttpxClient()
+
+    with pytest.raises(errors.HTTPConnectionError):
+        http_client.request('GET', 'http://localhost:9/score')
+
+
+@pytest.mark.parametrize('kwargs, expected_limit, expected_verify_mode', [
+    ({}, 10, ssl.CERT_REQUIRED),
+    ({'pool_size': 4}, 4, ssl.CERT_REQUIRED),
+    ({'limit': 0, 'verify_ssl_certs': False}, 0, ssl.CERT_NONE),
+])
+def test_AiohttpClient_connector(kwargs, expected_limit, expected_verify_mode):
+    pytest.importorskip('aiohttp')
+    http_client = AiohttpClient(**kwargs)
+
+    async def get_connector():
+        session = http_client._get_session()                                   # pylint: disable=W0212
+        connector = session.connector
+        await session.close()
+        return connector
+
+    connector = asyncio.run(get_connector())
+
+    assert connector.limit == expected_limit
+    assert isinstance(connector._ssl, ssl.SSLContext) is True                   # pylint: disable=W0212
+    assert connector._ssl.verify_mode == expected_verify_mode                   # pylint: disable=W0212
+
+
+@pytest.mark.parametrize('backend, asynchronous, expected_result', [
+    ('requests', False, 'requests'),
+    ('pycurl', False, 'pycurl'),
+    ('pycurl-multi', False, 'pycurl-multi'),
+    ('urllib', False, 'urllib.request'),
+    ('httpx', False, 'httpx'),
+    ('httpx', True, 'httpx-async'),
+    ('aiohttp', True, 'aiohttp'),
+    ('aiohttp', False, ValueError),
+    ('not a backend', True, ValueError),
+])
+def test_default_http_client_backend(backend, asynchronous, expected_result):
+    factory = default_async_http_client if asynchronous else default_http_client
+    if not isinstance(expected_result, str):
+        with pytest.raises(expected_result):
+            factory(backend = backend)
+    else:
+        try:
+            http_client = factory(backend = backend)
+        except ImportError:
+            pytest.skip('%s is not installed' % backend)
+
+        assert http_client.name == expected_result
+
+
+@pytest.mark.parametrize('constant, variable, expected_result', [
+    ({'format': 'json', 'bike': None}, None, 'format=json'),
+    ({'format': 'json'}, {'lat': '47.6', 'address': None}, 'format=json&lat=47.6'),
+    ({}, {'address': '1 Main St'}, 'address=1+Main+St'),
+    ({}, None, ''),
+])
+def test_PreparedRequest_bind(constant, variable, expected_result):
+    prepared = PreparedRequest('get', 'https://api.walkscore.com/score', parameters = constant)
+    parameters = prepared.bind(variable)
+
+    assert prepared.method == 'GET'
+    assert parameters.query_string == expected_result
+    assert parameters == dict(prepared.parameters, **(variable or {}))
+    assert 'bike' not in prepared.parameters
+
+
+@pytest.mark.parametrize('method, url, parameters', [
+    ('NOT A METHOD', 'https://api.walkscore.com/score', None),
+    ('GET', 'not a url', None),
+    ('GET', 'https://api.walkscore.com/score', 'not a dict'),
+])
+def test_PreparedRequest_invalid(method, url, parameters):
+    with pytest.raises((ValueError, TypeError)):
+        PreparedRequest(method, url, parameters = parameters)
+
+
+@pytest.mark.parametrize('backend', ['requests', 'pycurl', 'pycurl-multi', 'urllib', 'httpx'])
+def test_send(local_api, backend):
+    try:
+        http_client = default_http_client(backend = backend)
+    except ImportError:
+        pytest.skip('%s is not installed' % backend)
+
+    prepared = PreparedRequest('GET', local_api.url + '/score', parameters = {'format': 'json', 'bike': None})
+    for latitude in ('47.6', '47.7'):
+        content, status_code, _ = http_client.send(prepared, {'lat': latitude, 'address': None})
+        assert status_code == 200
+        assert content
+
+    responses = http_client.request_many([{'prepared': prepared, 'parameters': {'lat': '47.8'}}])
+    http_client.close()
+
+    assert responses[0][1] == 200
+    assert [x[0] for x in local_api.requests] == [{'format': 'json', 'lat': '47.6'},
+                                                  {'format': 'json', 'lat': '47.7'},
+                                                  {'format': 'json', 'lat': '47.8'}]
+
+
+def test_send_with_retries():
+    http_client = FlakyHTTPClient(retry_policy = RetryPolicy(base_delay = 0, budget = RetryBudget(minimum_retries = 10)))
+    prepared = PreparedRequest('GET', 'https://api.walkscore.com/score', parameters = {'format': 'json'})
+
+    _, status_code, _ = http_client.send_with_retries(prepared, {'lat': 47.6, 'lon': -122.3}, max_retries = 1)
+
+    assert status_code == 200
+    assert http_client.calls == 2
+
+    with pytest.raises(errors.HTTPConnectionError):
+        http_client.send_with_retries(prepared, {'lat': 47.7, 'lon': -122.3}, max_retries = 0)
+
+
+def test_get_score_prepared():
+    http_client = StubHTTPClient()
+    api = WalkScoreAPI(api_key = 'KEY', http_client = http_client)
+
+    api.get_score(47.6, -122.3, max_retries = 0)
+    api.get_score(47.7, -122.3, max_retries = 0)
+    api.get_score(47.7, -122.3, return_bike_score = False, max_retries = 0)
+
+    assert len(api._prepared_requests) == 2                                  # pylint: disable=W0212
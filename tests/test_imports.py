@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_imports
+******************************************
+
+Tests that the :mod:`walkscore` package and its HTTP libraries are imported
+lazily.
+
+"""
+# pylint: disable=line-too-long
+
+import subprocess
+import sys
+
+import pytest
+
+import walkscore
+
+
+BACKENDS = ['requests', 'pycurl', 'aiohttp', 'httpx', 'h2']
+
+
+def get_imported(script):
+    """Return the modules of interest which have been imported after executing
+    ``script`` in a fresh interpreter."""
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        '%s\n'
+        'import sys\n'
+        'print(" ".join(x for x in %r if x in sys.modules))' % (
+            script, ['walkscore.api', 'walkscore.locationscore'] + BACKENDS
+        )
+    ])
+
+    return output.decode('utf-8').split()
+
+
+@pytest.mark.parametrize('script, expected_result', [
+    ('import walkscore', []),
+    ('from walkscore import LocationScore', ['walkscore.locationscore']),
+    ('from walkscore import WalkScoreAPI', ['walkscore.api', 'walkscore.locationscore']),
+    ('from walkscore.http_client import default_http_client; default_http_client(backend = "urllib")', []),
+])
+def test_lazy_imports(script, expected_result):
+    assert get_imported(script) == expected_result
+
+
+@pytest.mark.parametrize('script', [
+    'from walkscore import WalkScoreAPI, AsyncWalkScoreAPI',
+    'from walkscore import SQLiteCache, QuotaLedger, HedgePolicy, RetryPolicy',
+])
+def test_deferred_standard_library_imports(script):
+    output = subprocess.check_output([
+        sys.executable, '-c',
+        '%s\n'
+        'import sys\n'
+        'print(" ".join(x for x in ["asyncio", "sqlite3"] if x in sys.modules))' % script
+    ])
+
+    assert output.decode('utf-8').split() == []
+
+
+def test_eager_imports_without_pep_562():
+    imported = get_imported('import sys\n'
+                            'sys.version_info = (3, 6, 15)\n'
+                            'import walkscore')
+
+    assert imported == ['walkscore.api', 'walkscore.locationscore']
+
+
+@pytest.mark.parametrize('backend, expected_result', [
+    ('requests', ['requests']),
+    ('pycurl', ['pycurl']),
+    ('httpx', ['httpx', 'h2']),
+])
+def test_lazy_backend_imports(backend, expected_result):
+    pytest.importorskip(backend)
+    imported = get_imported('from walkscore.http_client import default_http_client\n'
+                            'default_http_client(backend = %r)' % backend)
+
+    assert [x for x in imported if x in BACKENDS] == expected_result
+
+
+def test_package_attributes():
+    from walkscore.api import WalkScoreAPI
+
+    assert walkscore.WalkScoreAPI is WalkScoreAPI
+    assert set(walkscore.__all__) <= set(dir(walkscore))
+    assert walkscore.__version__
+
+    with pytest.raises(AttributeError):
+        walkscore.NotAnAttribute                                        # pylint: disable=W0104
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_jsoncodec
+******************************************
+
+Tests for the :mod:`walkscore.jsoncodec` module.
+
+"""
+# pylint: disable=line-too-long
+
+import json
+
+import pytest
+
+from tests.fixtures import stub_response
+from walkscore import jsoncodec
+from walkscore.cache import SQLiteCache
+from walkscore.jsoncodec import JSONCodec, get_json_codec, set_json_codec
+from walkscore.locationscore import LocationScore
+
+
+@pytest.fixture
+def codec():
+    """Restore the codec which was in use before the test."""
+    original = get_json_codec()
+    yield
+    set_json_codec(original)
+
+
+def set_library(name):
+    try:
+        return set_json_codec(name)
+    except ImportError:
+        pytest.skip('%s is not installed' % name)
+
+
+LIBRARIES = ['orjson', 'ujson', 'simdjson', 'json']
+
+
+@pytest.mark.parametrize('name', LIBRARIES)
+@pytest.mark.parametrize('value', [
+    stub_response(),
+    stub_response().decode('utf-8'),
+])
+def test_loads(codec, name, value):
+    set_library(name)
+
+    assert jsoncodec.loads(value) == json.loads(value)
+
+
+@pytest.mark.parametrize('name', LIBRARIES)
+def test_dumps(codec, name):
+    set_library(name)
+    value = json.loads(stub_response())
+    result = jsoncodec.dumps(value)
+
+    assert isinstance(result, str)
+    assert json.loads(result) == value
+
+
+@pytest.mark.parametrize('name', LIBRARIES)
+@pytest.mark.parametrize('value', [b'not json', '{"a": ', b'{"a": 1}}'])
+def test_loads_error(codec, name, value):
+    set_library(name)
+
+    with pytest.raises(ValueError):
+        jsoncodec.loads(value)
+
+
+def test_detection(codec):
+    installed = []
+    for name in jsoncodec.JSON_LIBRARIES:
+        try:
+            __import__(name)
+        except ImportError:
+            continue
+        installed.append(name)
+
+    assert set_json_codec().name == installed[0]
+    assert get_json_codec().name == installed[0]
+
+
+@pytest.mark.parametrize('value, expected_result', [
+    ('stdlib', 'json'),
+    ('JSON', 'json'),
+    (JSONCodec('custom', json.loads, json.dumps), 'custom'),
+    ('not-a-library', ValueError),
+    (123, ValueError),
+])
+def test_set_json_codec(codec, value, expected_result):
+    if isinstance(expected_result, str):
+        assert set_json_codec(value).name == expected_result
+        assert get_json_codec().name == expected_result
+    else:
+        with pytest.raises(expected_result):
+            set_json_codec(value)
+
+
+def test_custom_codec_is_used(codec):
+    calls = []
+
+    def loads(value):
+        calls.append('loads')
+        return json.loads(value)
+
+    def dumps(value):
+        calls.append('dumps')
+        return json.dumps(value)
+
+    set_json_codec(JSONCodec('custom', loads, dumps))
+
+    score = LocationScore.from_json(stub_response(), api_compatible = True)
+    assert calls == ['loads']
+
+    payload = SQLiteCache._serialize(score)                                    # pylint: disable=W0212
+    assert calls == ['loads', 'dumps']
+
+    assert SQLiteCache._deserialize(payload).to_dict() == score.to_dict()      # pylint: disable=W0212
+    assert calls == ['loads', 'dumps', 'loads']
+
+
+@pytest.mark.parametrize('name', LIBRARIES)
+@pytest.mark.parametrize('api_compatible', [True, False])
+def test_to_json_does_not_depend_on_codec(codec, name, api_compatible):
+    score = LocationScore.from_json(stub_response(), api_compatible = True)
+    set_json_codec('json')
+    expected_result = score.to_json(api_compatible = api_compatible)
+
+    set_library(name)
+
+    assert score.to_json(api_compatible = api_compatible) == expected_result
+    assert ', ' in expected_result
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_keypool
+******************************************
+
+Tests for the :mod:`walkscore.keypool` module.
+
+"""
+# pylint: disable=line-too-long
+
+import time
+
+import pytest
+
+from tests.fixtures import StubHTTPClient, stub_response
+from walkscore.api import WalkScoreAPI
+from walkscore.keypool import APIKeyPool
+from walkscore.quota import QuotaLedger
+from walkscore import errors
+
+
+class RejectingHTTPClient(StubHTTPClient):
+    """Stub client which rejects requests sent with some API keys."""
+
+    def __init__(self, rejected, **kwargs):
+        super(RejectingHTTPClient, self).__init__(**kwargs)
+        self.rejected = rejected
+        self.api_keys = []
+
+    def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        self.api_keys.append(parameters['wsapikey'])
+        status = self.rejected.get(parameters['wsapikey'], 1)
+
+        return stub_response(parameters, status), 200, {}
+
+
+@pytest.mark.parametrize('api_keys, daily_quota, expected_keys, error', [
+    (['first', 'second'], None, ['first', 'second'], None),
+    (('first', 'second', 'first'), 100, ['first', 'second'], None),
+    ([], None, None, ValueError),
+    ('first', None, None, TypeError),
+    (['first', ''], None, None, ValueError),
+])
+def test__init__(api_keys, daily_quota, expected_keys, error):
+    if not error:
+        result = APIKeyPool(api_keys, daily_quota = daily_quota)
+        assert result.api_keys == expected_keys
+        assert result.available_keys == expected_keys
+        assert len(result) == len(expected_keys)
+    else:
+        with pytest.raises(error):
+            APIKeyPool(api_keys, daily_quota = daily_quota)
+
+
+def test_select():
+    pool = APIKeyPool(['first', 'second', 'third'])
+
+    assert [pool.select() for _ in range(6)] == ['first', 'second', 'third'] * 2
+    assert pool.stats['first'] == {'requests': 2, 'rejections': 0, 'available': True}
+
+
+def test_select_most_remaining():
+    ledger = QuotaLedger(10)
+    for _ in range(5):
+        ledger.consume('first')
+    ledger.consume('second')
+
+    pool = APIKeyPool(['first', 'second', 'third'])
+
+    assert pool.select(ledger) == 'third'
+    ledger.exhaust('third')
+    assert pool.select(ledger) == 'second'
+
+
+def test_cool_off():
+    pool = APIKeyPool(['first', 'second'], cooloff = 0.05)
+    pool.cool_off('first')
+
+    assert pool.available_keys == ['second']
+    assert pool.select() == 'second'
+    assert pool.stats['first']['rejections'] == 1
+
+    pool.cool_off('second')
+    with pytest.raises(errors.QuotaExhaustedError):
+        pool.select()
+
+    time.sleep(0.06)
+
+    assert pool.available_keys == ['first', 'second']
+
+
+@pytest.mark.parametrize('status, expected_error', [
+    (40, errors.AuthenticationError),
+    (41, errors.QuotaError),
+])
+def test_WalkScoreAPI_key_pool(monkeypatch, status, expected_error):
+    monkeypatch.delenv('WALKSCORE_API_KEY', raising = False)
+    http_client = RejectingHTTPClient({'first': status})
+    pool = APIKeyPool(['first', 'second'])
+    api = WalkScoreAPI(http_client = http_client, key_pool = pool)
+
+    with pytest.raises(expected_error):
+        api.get_score(47.6085, -122.3295, max_retries = 0)
+
+    results = list(api.get_scores([(47.6085 + (x / 100), -122.3295) for x in range(4)],
+                                  max_retries = 0))
+
+    assert len(results) == 4
+    assert http_client.api_keys == ['first'] + ['second'] * 4
+    assert pool.stats['first']['available'] is False
+    assert pool.stats['second']['requests'] == 4
+
+
+def test_WalkScoreAPI_key_pool_remaining_quota():
+    api = WalkScoreAPI(http_client = StubHTTPClient(),
+                       key_pool = APIKeyPool(['first', 'second']),
+                       quota_ledger = QuotaLedger(10))
+
+    api.get_score(47.6085, -122.3295, max_retries = 0)
+
+    assert api.remaining_quota() == 19
+
+    with pytest.raises(ValueError):
+        api.key_pool = ['first', 'second']
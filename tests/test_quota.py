@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_quota
+******************************************
+
+Tests for the :mod:`walkscore.quota` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import multiprocessing
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.quota import QuotaLedger, MemoryQuotaBackend, SQLiteQuotaBackend
+from walkscore import errors
+
+
+def consume_in_process(path, count):
+    ledger = QuotaLedger(1000, backend = SQLiteQuotaBackend(path))
+    for _ in range(count):
+        ledger.consume('custom-api-key')
+
+
+@pytest.mark.parametrize('daily_quota, backend, on_exhausted, error', [
+    (10, None, 'raise', None),
+    (10, MemoryQuotaBackend(), 'wait', None),
+    (-1, None, 'raise', ValueError),
+    (10, 'not a backend', 'raise', ValueError),
+    (10, None, 'ignore', ValueError),
+])
+def test__init__(daily_quota, backend, on_exhausted, error):
+    if not error:
+        result = QuotaLedger(daily_quota, backend = backend, on_exhausted = on_exhausted)
+        assert result.daily_quota == daily_quota
+        assert result.remaining_quota() == daily_quota
+    else:
+        with pytest.raises(error):
+            QuotaLedger(daily_quota, backend = backend, on_exhausted = on_exhausted)
+
+
+@pytest.mark.parametrize('use_sqlite', [False, True])
+def test_consume(tmp_path, use_sqlite):
+    backend = SQLiteQuotaBackend(str(tmp_path / 'quota.db')) if use_sqlite else None
+    ledger = QuotaLedger(3, backend = backend)
+
+    ledger.consume('first-key')
+    ledger.consume('first-key')
+
+    assert ledger.used_quota('first-key') == 2
+    assert ledger.remaining_quota('first-key') == 1
+    assert ledger.remaining_quota('second-key') == 3
+
+    ledger.exhaust('first-key')
+
+    assert ledger.remaining_quota('first-key') == 0
+    with pytest.raises(errors.QuotaExhaustedError):
+        ledger.consume('first-key')
+
+    ledger.close()
+
+
+def test_SQLiteQuotaBackend_shared(tmp_path):
+    path = str(tmp_path / 'quota.db')
+    processes = [multiprocessing.Process(target = consume_in_process, args = (path, 25))
+                 for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert QuotaLedger(1000, backend = SQLiteQuotaBackend(path)).used_quota('custom-api-key') == 100
+
+
+def test_seconds_until_reset():
+    assert 0 < QuotaLedger.seconds_until_reset() <= 24 * 60 * 60
+
+
+def test_WalkScoreAPI_quota_ledger():
+    http_client = StubHTTPClient()
+    api = WalkScoreAPI(api_key = 'custom-api-key',
+                       http_client = http_client,
+                       quota_ledger = QuotaLedger(2))
+
+    assert api.remaining_quota() == 2
+    api.get_score(47.6085, -122.3295, max_retries = 0)
+    api.get_score(47.6185, -122.3295, max_retries = 0)
+
+    assert api.remaining_quota() == 0
+    with pytest.raises(errors.QuotaExhaustedError):
+        api.get_score(47.6285, -122.3295, max_retries = 0)
+
+    assert http_client.calls == 2
+    assert WalkScoreAPI(api_key = 'custom-api-key').remaining_quota() is None
+
+
+def test_WalkScoreAPI_quota_error():
+    api = WalkScoreAPI(api_key = 'custom-api-key',
+                       http_client = StubHTTPClient(status = 41),
+                       quota_ledger = QuotaLedger(100))
+
+    with pytest.raises(errors.QuotaError):
+        api.get_score(47.6085, -122.3295, max_retries = 0)
+
+    assert api.remaining_quota() == 0
+
+
+def test_AsyncWalkScoreAPI_quota_ledger():
+    http_client = StubAsyncHTTPClient()
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key',
+                            http_client = http_client,
+                            quota_ledger = QuotaLedger(3))
+    locations = [(47.6085 + (x / 100), -122.3295) for x in range(5)]
+
+    async def get_scores():
+        return [x async for x in api.get_scores(locations,
+                                                max_retries = 0,
+                                                return_exceptions = True)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(get_scores())
+    finally:
+        loop.close()
+
+    assert http_client.calls == 3
+    assert sum(isinstance(x, errors.QuotaExhaustedError) for x in results) == 2
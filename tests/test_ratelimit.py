@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_ratelimit
+******************************************
+
+Tests for the :mod:`walkscore.ratelimit` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import time
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.ratelimit import RateLimiter
+from walkscore import errors
+
+
+@pytest.mark.parametrize('rate, burst, expected_burst, error', [
+    (10, None, 10, None),
+    (2.5, None, 3, None),
+    (10, 1, 1, None),
+    (0, None, None, ValueError),
+    (10, 0, None, ValueError),
+])
+def test__init__(rate, burst, expected_burst, error):
+    if not error:
+        result = RateLimiter(rate, burst = burst)
+        assert result.rate == rate
+        assert result.burst == expected_burst
+        assert result.cooling_off is False
+    else:
+        with pytest.raises(error):
+            RateLimiter(rate, burst = burst)
+
+
+def test_reserve():
+    limiter = RateLimiter(10, burst = 2)
+
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.1, abs = 0.01)
+    assert limiter.reserve() == pytest.approx(0.2, abs = 0.01)
+
+
+def test_cool_off():
+    limiter = RateLimiter(10, burst = 5, cooloff = 0.05, cooloff_factor = 0.5)
+    limiter.cool_off()
+
+    assert limiter.cooling_off is True
+    assert limiter.cooloffs == 1
+    assert limiter.reserve() == pytest.approx(0.2, abs = 0.01)
+
+    time.sleep(0.06)
+
+    assert limiter.cooling_off is False
+
+
+def test_WalkScoreAPI_rate_limiter():
+    http_client = StubHTTPClient()
+    limiter = RateLimiter(50, burst = 1)
+    api = WalkScoreAPI(api_key = 'custom-api-key',
+                       http_client = http_client,
+                       rate_limiter = limiter)
+    locations = [(47.6085 + (x / 100), -122.3295) for x in range(6)]
+
+    start = time.monotonic()
+    results = list(api.get_scores(locations, max_workers = 6, max_retries = 0))
+    elapsed = time.monotonic() - start
+
+    assert len(results) == 6
+    assert elapsed >= 0.09
+
+
+def test_WalkScoreAPI_rate_limiter_cool_off():
+    limiter = RateLimiter(50, cooloff = 60)
+    api = WalkScoreAPI(api_key = 'custom-api-key',
+                       http_client = StubHTTPClient(status = 41),
+                       rate_limiter = limiter)
+
+    with pytest.raises(errors.QuotaError):
+        api.get_score(47.6085, -122.3295, max_retries = 0)
+
+    assert limiter.cooling_off is True
+
+    with pytest.raises(ValueError):
+        api.rate_limiter = 'not a rate limiter'
+
+
+def test_AsyncWalkScoreAPI_rate_limiter():
+    limiter = RateLimiter(50, burst = 1)
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key',
+                            http_client = StubAsyncHTTPClient(),
+                            rate_limiter = limiter)
+    locations = [(47.6085 + (x / 100), -122.3295) for x in range(6)]
+
+    async def get_scores():
+        return [x async for x in api.get_scores(locations, max_retries = 0)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.monotonic()
+        results = loop.run_until_complete(get_scores())
+        elapsed = time.monotonic() - start
+    finally:
+        loop.close()
+
+    assert len(results) == 6
+    assert elapsed >= 0.09
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_repoll
+******************************************
+
+Tests for the :mod:`walkscore.repoll` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient, stub_response
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.locationscore import LocationScore
+from walkscore.repoll import RepollQueue
+from walkscore import errors
+
+
+class InProgressHTTPClient(StubHTTPClient):
+    """Stub client which reports scores for some latitudes as in progress for
+    their first ``polls`` requests."""
+
+    def __init__(self, in_progress, **kwargs):
+        super(InProgressHTTPClient, self).__init__(**kwargs)
+        self.in_progress = dict(in_progress)
+        self.latitudes = []
+        self._polls_lock = threading.Lock()
+
+    def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        latitude = float(parameters['lat'])
+        with self._polls_lock:
+            self.latitudes.append(latitude)
+            polls = self.in_progress.get(latitude, 0)
+            self.in_progress[latitude] = polls - 1
+
+        return stub_response(parameters, 2 if polls > 0 else 1), 200, {}
+
+
+class InProgressAsyncHTTPClient(StubAsyncHTTPClient):
+
+    def __init__(self, in_progress, **kwargs):
+        super(InProgressAsyncHTTPClient, self).__init__(**kwargs)
+        self.in_progress = dict(in_progress)
+
+    async def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        self.calls += 1
+        latitude = float(parameters['lat'])
+        polls = self.in_progress.get(latitude, 0)
+        self.in_progress[latitude] = polls - 1
+
+        return stub_response(parameters, 2 if polls > 0 else 1), 200, {}
+
+
+def test_RepollQueue():
+    queue = RepollQueue(initial_delay = 0.02, backoff = 2, max_delay = 0.05, max_attempts = 3)
+
+    assert [queue.get_delay(x) for x in (1, 2, 3)] == [0.02, 0.04, 0.05]
+    assert queue.next_delay() is None
+    assert queue.push('first') is True
+    assert queue.push('second', attempt = 3) is True
+    assert queue.push('third', attempt = 4) is False
+    assert len(queue) == 2
+    assert queue.deferred == 2
+    assert queue.pop_due() is None
+    assert 0 < queue.next_delay() <= 0.02
+
+    time.sleep(0.03)
+
+    assert queue.pop_due() == ('first', 1)
+    assert queue.pop_due() is None
+
+    time.sleep(0.03)
+
+    assert queue.pop_due() == ('second', 3)
+    assert len(queue) == 0
+
+
+@pytest.mark.parametrize('ordered, deduplicate', [
+    (True, False),
+    (False, False),
+    (True, True),
+])
+def test_get_scores_repoll(ordered, deduplicate):
+    locations = [(47.6, -122.3), (47.7, -122.3), (47.8, -122.3), (47.9, -122.3)]
+    http_client = InProgressHTTPClient({47.7: 2})
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+    queue = RepollQueue(initial_delay = 0.01, backoff = 2)
+
+    results = list(api.get_scores(locations,
+                                  max_workers = 2,
+                                  ordered = ordered,
+                                  max_retries = 0,
+                                  deduplicate = deduplicate,
+                                  repoll = queue))
+
+    assert all(isinstance(x, LocationScore) for x in results) is True
+    assert sorted(x.original_latitude for x in results) == [47.6, 47.7, 47.8, 47.9]
+    if ordered and deduplicate:
+        assert [x.original_latitude for x in results] == [47.6, 47.7, 47.8, 47.9]
+    else:
+        assert results[-1].original_latitude == 47.7
+    assert http_client.latitudes.count(47.7) == 3
+    assert queue.deferred == 2
+    assert len(queue) == 0
+
+
+@pytest.mark.parametrize('return_exceptions', [True, False])
+def test_get_scores_repoll_exhausted(return_exceptions):
+    http_client = InProgressHTTPClient({47.7: 10})
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+    queue = RepollQueue(initial_delay = 0.001, max_attempts = 2)
+
+    results = api.get_scores([(47.7, -122.3)],
+                             max_retries = 0,
+                             return_exceptions = return_exceptions,
+                             repoll = queue)
+    if return_exceptions:
+        assert isinstance(list(results)[0], errors.ScoreInProgressError) is True
+    else:
+        with pytest.raises(errors.ScoreInProgressError):
+            list(results)
+
+    assert http_client.latitudes == [47.7] * 3
+
+
+def test_get_scores_repoll_invalid():
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = StubHTTPClient())
+
+    with pytest.raises(ValueError):
+        api.get_scores([(47.7, -122.3)], repoll = 'not a queue')
+
+
+def test_AsyncWalkScoreAPI_get_scores_repoll():
+    locations = [(47.6, -122.3), (47.7, -122.3), (47.8, -122.3)]
+    http_client = InProgressAsyncHTTPClient({47.6: 1})
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+    queue = RepollQueue(initial_delay = 0.01)
+
+    async def get_scores():
+        return [x async for x in api.get_scores(locations, max_retries = 0, repoll = queue)]
+
+    loop = asyncio.new_event_loop()
+    try:
+        results = loop.run_until_complete(get_scores())
+    finally:
+        loop.close()
+
+    assert [x.original_latitude for x in results] == [47.7, 47.8, 47.6]
+    assert http_client.calls == 4
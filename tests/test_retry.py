@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_retry
+******************************************
+
+Tests for the :mod:`walkscore.retry` module.
+
+"""
+# pylint: disable=line-too-long
+
+import asyncio
+import time
+from email.utils import formatdate
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient, stub_response
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.http_client import _get_retry_after
+from walkscore.deadline import Deadline
+from walkscore.retry import RetryBudget, RetryPolicy
+from walkscore import errors
+
+
+class ScriptedHTTPClient(StubHTTPClient):
+    """Stub client which returns the status code and headers in ``responses`` in
+    turn, then succeeds."""
+
+    def __init__(self, responses, **kwargs):
+        super(ScriptedHTTPClient, self).__init__(**kwargs)
+        self.responses = list(responses)
+
+    def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        self.calls += 1
+        if self.responses:
+            status_code, response_headers = self.responses.pop(0)
+        else:
+            status_code, response_headers = 200, {}
+
+        return stub_response(parameters), status_code, response_headers
+
+
+class ScriptedAsyncHTTPClient(StubAsyncHTTPClient):
+    """Asynchronous equivalent of :class:`ScriptedHTTPClient`."""
+
+    def __init__(self, responses, **kwargs):
+        super(ScriptedAsyncHTTPClient, self).__init__(**kwargs)
+        self.responses = list(responses)
+
+    async def _request(self, method, url, parameters = None, headers = None, request_body = None, timeout = None):
+        self.calls += 1
+        if self.responses:
+            status_code, response_headers = self.responses.pop(0)
+        else:
+            status_code, response_headers = 200, {}
+
+        return stub_response(parameters), status_code, response_headers
+
+
+def immediate_policy(**kwargs):
+    """Return a policy which retries without waiting, using its own budget."""
+    kwargs.setdefault('budget', RetryBudget())
+    return RetryPolicy(base_delay = 0, max_delay = 0, **kwargs)
+
+
+@pytest.mark.parametrize('error, status_code, expected_result', [
+    (errors.HTTPConnectionError('failed'), None, True),
+    (errors.HTTPTimeoutError('failed'), None, True),
+    (errors.InternalAPIError('failed'), None, True),
+    (errors.TooManyRequestsError('failed'), None, True),
+    (errors.WalkScoreError('failed'), 503, True),
+    (errors.WalkScoreError('failed'), None, False),
+    (errors.InvalidCoordinatesError('failed'), 404, False),
+    (errors.AuthenticationError('failed'), 401, False),
+    (errors.SSLError('failed'), None, False),
+    (errors.BindingError('failed'), None, False),
+    (errors.CircuitOpenError('failed'), None, False),
+    (ValueError('failed'), None, False),
+])
+def test_is_retryable(error, status_code, expected_result):
+    if status_code is not None:
+        error.status_code = status_code
+
+    assert RetryPolicy.is_retryable(error) is expected_result
+
+
+def test_get_delay():
+    policy = RetryPolicy(base_delay = 0.5, max_delay = 4, budget = RetryBudget())
+
+    delay = None
+    for _ in range(20):
+        delay = policy.get_delay(delay)
+        assert 0.5 <= delay <= 4
+
+    error = errors.TooManyRequestsError('failed')
+    error.retry_after = 3
+    assert policy.get_delay(error = error) >= 3
+
+    error.retry_after = 60
+    assert policy.get_delay(error = error) == 60
+
+    ignoring = RetryPolicy(base_delay = 0.5,
+                           max_delay = 4,
+                           budget = RetryBudget(),
+                           respect_retry_after = False)
+    assert ignoring.get_delay(error = error) <= 1.5
+
+
+def test_budget():
+    budget = RetryBudget(ratio = 0.5, minimum_retries = 1, window = 60)
+
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+    for _ in range(4):
+        budget.record_request()
+
+    assert budget.try_spend() is True
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+    assert budget.stats == {'requests': 4, 'retries': 3, 'exhausted': 2}
+
+
+def test_budget_window():
+    budget = RetryBudget(ratio = 0, minimum_retries = 1, window = 0.05)
+
+    assert budget.try_spend() is True
+    assert budget.try_spend() is False
+
+    time.sleep(0.06)
+
+    assert budget.try_spend() is True
+
+
+@pytest.mark.parametrize('failures, max_retries, expected_calls, succeeds', [
+    (0, 3, 1, True),
+    (2, 3, 3, True),
+    (3, 3, 4, True),
+    (4, 3, 4, False),
+    (1, 0, 1, False),
+])
+def test_execute(failures, max_retries, expected_calls, succeeds):
+    policy = immediate_policy(max_retries = 3)
+    calls = []
+
+    def function(value):
+        calls.append(value)
+        if len(calls) <= failures:
+            raise errors.HTTPTimeoutError('timed out')
+
+        return value
+
+    if succeeds:
+        assert policy.execute(function, 'ok', max_retries = max_retries) == 'ok'
+    else:
+        with pytest.raises(errors.HTTPTimeoutError):
+            policy.execute(function, 'ok', max_retries = max_retries)
+
+    assert len(calls) == expected_calls
+
+
+def test_execute_not_retryable():
+    policy = immediate_policy()
+    calls = []
+
+    def function():
+        calls.append(1)
+        raise errors.AuthenticationError('invalid key')
+
+    with pytest.raises(errors.AuthenticationError):
+        policy.execute(function)
+
+    assert len(calls) == 1
+
+
+def test_execute_budget_exhausted():
+    budget = RetryBudget(ratio = 0, minimum_retries = 1)
+    policy = immediate_policy(max_retries = 5, budget = budget)
+    calls = []
+
+    def function():
+        calls.append(1)
+        raise errors.HTTPConnectionError('refused')
+
+    with pytest.raises(errors.HTTPConnectionError):
+        policy.execute(function)
+
+    assert len(calls) == 2
+    assert budget.stats['exhausted'] == 1
+
+
+@pytest.mark.parametrize('kwargs, deadline', [
+    ({'max_total_delay': 30}, None),
+    ({}, 30),
+])
+def test_execute_retry_after_exceeds_max_delay(kwargs, deadline):
+    budget = RetryBudget()
+    policy = RetryPolicy(base_delay = 0, max_delay = 1, budget = budget, **kwargs)
+    calls = []
+
+    def function(deadline = None):
+        calls.append(1)
+        error = errors.TooManyRequestsError('slow down')
+        error.retry_after = 60
+        raise error
+
+    started = time.monotonic()
+    with pytest.raises(errors.TooManyRequestsError):
+        policy.execute(function, deadline = Deadline(deadline) if deadline else None)
+
+    assert time.monotonic() - started < 1
+    assert len(calls) == 1
+    assert budget.stats['retries'] == 0
+
+
+def test_execute_async():
+    policy = immediate_policy(max_retries = 2)
+    calls = []
+
+    async def function():
+        calls.append(1)
+        if len(calls) < 3:
+            raise errors.InternalAPIError('failed')
+
+        return 'ok'
+
+    assert asyncio.run(policy.execute_async(function)) == 'ok'
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize('headers, expected_result', [
+    (None, None),
+    ({}, None),
+    ({'Retry-After': '5'}, 5),
+    ({'retry-after': '2.5'}, 2.5),
+    ({'Retry-After': 'soon'}, None),
+    ({'Retry-After': formatdate(0, usegmt = True)}, 0),
+])
+def test_get_retry_after(headers, expected_result):
+    assert _get_retry_after(headers) == expected_result
+
+
+def test_get_retry_after_date():
+    headers = {'Retry-After': formatdate(time.time() + 30, usegmt = True)}
+
+    assert 25 <= _get_retry_after(headers) <= 30
+
+
+def test_request_with_retries():
+    client = ScriptedHTTPClient([(503, {}), (429, {'Retry-After': '0'})],
+                                retry_policy = immediate_policy())
+
+    content, status_code, _ = client.request_with_retries('GET', 'https://api.walkscore.com/score')
+
+    assert status_code == 200
+    assert client.calls == 3
+
+
+def test_request_with_retries_annotates_error():
+    client = ScriptedHTTPClient([(429, {'Retry-After': '7'})],
+                                retry_policy = immediate_policy())
+
+    with pytest.raises(errors.TooManyRequestsError) as error:
+        client.request_with_retries('GET', 'https://api.walkscore.com/score', max_retries = 0)
+
+    assert error.value.status_code == 429
+    assert error.value.retry_after == 7
+    assert client.calls == 1
+
+
+@pytest.mark.parametrize('max_retries, expected_calls, succeeds', [
+    (None, 3, True),
+    (1, 2, False),
+    (0, 1, False),
+])
+def test_get_score_max_retries(max_retries, expected_calls, succeeds):
+    client = ScriptedHTTPClient([(503, {}), (503, {})],
+                                retry_policy = immediate_policy())
+    api = WalkScoreAPI(api_key = 'KEY', http_client = client, max_retries = 3)
+
+    if succeeds:
+        result = api.get_score(latitude = 47.6, longitude = -122.3, max_retries = max_retries)
+        assert result.walk_score == 98
+    else:
+        with pytest.raises(errors.InternalAPIError):
+            api.get_score(latitude = 47.6, longitude = -122.3, max_retries = max_retries)
+
+    assert client.calls == expected_calls
+
+
+def test_async_get_score_max_retries():
+    client = ScriptedAsyncHTTPClient([(429, {}), (504, {})],
+                                     retry_policy = immediate_policy())
+
+    async def run():
+        async with AsyncWalkScoreAPI(api_key = 'KEY', http_client = client) as api:
+            return await api.get_score(latitude = 47.6, longitude = -122.3)
+
+    result = asyncio.run(run())
+
+    assert result.walk_score == 98
+    assert client.calls == 3
+
+
+def test_retry_policy_validation():
+    with pytest.raises(ValueError):
+        RetryPolicy(budget = 'not a budget')
+
+    with pytest.raises(ValueError):
+        StubHTTPClient(retry_policy = 'not a policy')
+
+    with pytest.raises(ValueError):
+        WalkScoreAPI(api_key = 'KEY', retry_policy = 'not a policy')
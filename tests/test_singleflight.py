@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_singleflight
+******************************************
+
+Tests for the :mod:`walkscore.singleflight` module.
+
+"""
+# pylint: disable=line-too-long
+
+import time
+import asyncio
+import threading
+
+import pytest
+
+from tests.fixtures import StubAsyncHTTPClient, StubHTTPClient
+from walkscore.api import AsyncWalkScoreAPI, WalkScoreAPI
+from walkscore.locationscore import LocationScore
+from walkscore import errors
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def get_concurrently(api, locations, **kwargs):
+    results = [None] * len(locations)
+    barrier = threading.Barrier(len(locations))
+
+    def get_score(index, location):
+        barrier.wait()
+        try:
+            results[index] = api.get_score(*location, max_retries = 0, **kwargs)
+        except Exception as error:
+            results[index] = error
+
+    threads = [threading.Thread(target = get_score, args = (index, location))
+               for index, location in enumerate(locations)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return results
+
+
+@pytest.mark.parametrize('coalesce_requests, expected_calls', [
+    (True, 1),
+    (False, 8),
+])
+def test_WalkScoreAPI_coalescing(coalesce_requests, expected_calls):
+    http_client = StubHTTPClient(delay = 0.1)
+    api = WalkScoreAPI(api_key = 'custom-api-key',
+                       http_client = http_client,
+                       coalesce_requests = coalesce_requests)
+    locations = [(47.6085, -122.3295, '%s Main St' % x) for x in range(8)]
+
+    results = get_concurrently(api, locations)
+
+    assert http_client.calls == expected_calls
+    assert api.coalesce_requests is coalesce_requests
+    assert api.coalesced_calls == 8 - expected_calls
+    assert all(isinstance(x, LocationScore) for x in results) is True
+    assert [x.address for x in results] == [x[2] for x in locations]
+    assert len(set(id(x) for x in results)) == len(results)
+
+
+def test_WalkScoreAPI_coalescing_keys():
+    http_client = StubHTTPClient(delay = 0.1)
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    get_concurrently(api, [(47.6085, -122.3295), (47.6086, -122.3295)])
+    get_concurrently(api, [(47.6085, -122.3295)] * 2, return_bike_score = False)
+
+    assert http_client.calls == 3
+    assert api.coalesced_calls == 1
+
+
+def test_WalkScoreAPI_coalescing_errors():
+    http_client = StubHTTPClient(delay = 0.1, status = 41)
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    results = get_concurrently(api, [(47.6085, -122.3295)] * 4)
+
+    assert http_client.calls == 1
+    assert all(isinstance(x, errors.QuotaError) for x in results) is True
+
+    http_client.status = 1
+    assert api.get_score(47.6085, -122.3295, max_retries = 0).walk_score == 98
+
+
+def test_AsyncWalkScoreAPI_coalescing():
+    http_client = StubAsyncHTTPClient(delay = 0.01)
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    async def get_scores():
+        return await asyncio.gather(*[api.get_score(47.6085, -122.3295, address = str(x), max_retries = 0)
+                                      for x in range(8)])
+
+    results = run(get_scores())
+
+    assert http_client.calls == 1
+    assert api.coalesced_calls == 7
+    assert [x.address for x in results] == [str(x) for x in range(8)]
+
+
+def test_AsyncWalkScoreAPI_coalescing_errors():
+    http_client = StubAsyncHTTPClient(delay = 0.01, status = 41)
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    async def get_scores():
+        return await asyncio.gather(*[api.get_score(47.6085, -122.3295, max_retries = 0)
+                                      for x in range(4)],
+                                    return_exceptions = True)
+
+    results = run(get_scores())
+
+    assert http_client.calls == 1
+    assert all(isinstance(x, errors.QuotaError) for x in results) is True
+
+
+def get_staggered(api, first_kwargs, second_kwargs):
+    """Request the same location twice, starting the second request once the
+    first is in flight."""
+    results = {}
+
+    def get_score(name, kwargs):
+        started = time.monotonic()
+        try:
+            results[name] = api.get_score(47.6085, -122.3295, max_retries = 0, **kwargs)
+        except Exception as error:
+            results[name] = error
+        results[name + '_elapsed'] = time.monotonic() - started
+
+    leader = threading.Thread(target = get_score, args = ('leader', first_kwargs))
+    leader.start()
+    time.sleep(0.05)
+    get_score('follower', second_kwargs)
+    leader.join()
+
+    return results
+
+
+def test_WalkScoreAPI_coalescing_follower_deadline():
+    http_client = StubHTTPClient(delay = 0.5)
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    results = get_staggered(api, {'timeout': 30}, {'timeout': 30, 'deadline': 0.1})
+
+    assert isinstance(results['leader'], LocationScore)
+    assert isinstance(results['follower'], errors.HTTPTimeoutError)
+    assert results['follower_elapsed'] < 0.3
+    assert http_client.calls == 1
+    assert api.coalesced_calls == 1
+
+
+def test_WalkScoreAPI_coalescing_leader_deadline():
+    http_client = StubHTTPClient(delay = 0.3)
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    results = get_staggered(api, {'deadline': 0.1}, {})
+
+    assert isinstance(results['leader'], errors.HTTPTimeoutError)
+    assert isinstance(results['follower'], LocationScore)
+    assert http_client.calls == 2
+
+
+def test_WalkScoreAPI_coalescing_timeouts():
+    http_client = StubHTTPClient(delay = 0.1)
+    api = WalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    results = get_staggered(api, {'timeout': 30}, {'timeout': 0.05})
+
+    assert isinstance(results['leader'], LocationScore)
+    assert isinstance(results['follower'], errors.HTTPTimeoutError)
+    assert http_client.calls == 2
+    assert api.coalesced_calls == 0
+
+
+def test_AsyncWalkScoreAPI_coalescing_follower_deadline():
+    http_client = StubAsyncHTTPClient(delay = 0.5)
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    async def get_score(delay, **kwargs):
+        await asyncio.sleep(delay)
+        started = time.monotonic()
+        try:
+            result = await api.get_score(47.6085, -122.3295, max_retries = 0, **kwargs)
+        except errors.HTTPTimeoutError as error:
+            result = error
+
+        return result, time.monotonic() - started
+
+    async def get_scores():
+        return await asyncio.gather(get_score(0),
+                                    get_score(0.05, deadline = 0.1))
+
+    leader, follower = run(get_scores())
+
+    assert isinstance(leader[0], LocationScore)
+    assert isinstance(follower[0], errors.HTTPTimeoutError)
+    assert follower[1] < 0.3
+    assert http_client.calls == 1
+    assert api.coalesced_calls == 1
+
+
+def test_AsyncWalkScoreAPI_coalescing_leader_cancelled():
+    http_client = StubAsyncHTTPClient(delay = 0.1)
+    api = AsyncWalkScoreAPI(api_key = 'custom-api-key', http_client = http_client)
+
+    async def get_scores():
+        leader = asyncio.ensure_future(api.get_score(47.6085, -122.3295, max_retries = 0))
+        await asyncio.sleep(0.02)
+        waiters = [asyncio.ensure_future(api.get_score(47.6085, -122.3295, max_retries = 0))
+                   for x in range(3)]
+        await asyncio.sleep(0.02)
+        leader.cancel()
+
+        results = await asyncio.gather(*waiters, return_exceptions = True)
+
+        return leader, waiters, results
+
+    leader, waiters, results = run(get_scores())
+
+    assert leader.cancelled() is True
+    assert any(x.cancelled() for x in waiters) is False
+    assert all(isinstance(x, LocationScore) for x in results) is True
+    assert http_client.calls == 2
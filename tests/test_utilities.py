@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+
+"""
+******************************************
+tests.test_utilities
+******************************************
+
+Tests for the :mod:`walkscore.utilities` module.
+
+"""
+# pylint: disable=line-too-long
+
+import json
+
+import pytest
+
+from tests.fixtures import stub_response
+from walkscore import errors
+from walkscore.jsoncodec import JSONCodec, get_json_codec, set_json_codec
+from walkscore.utilities import parse_response, check_for_errors
+
+
+@pytest.mark.parametrize('content, status_code, expected_result', [
+    (stub_response({'lat': 47.6}), 200, None),
+    (stub_response({'lat': 47.6}).decode('utf-8'), 200, None),
+    (stub_response({'lat': 47.6}), '200', None),
+    (json.dumps({'status': 40, 'message': 'Invalid key'}).encode('utf-8'), 200, errors.AuthenticationError),
+    (json.dumps({'status': 41}).encode('utf-8'), 200, errors.QuotaError),
+    (json.dumps({'status': 2}).encode('utf-8'), 200, errors.ScoreInProgressError),
+    (b'Forbidden', 403, errors.BlockedIPError),
+    (b'', 500, errors.WalkScoreError),
+    (b'', 503, errors.InternalAPIError),
+    (b'not json', 200, errors.InternalAPIError),
+    (b'[1, 2]', 200, errors.InternalAPIError),
+    (b'', 200, errors.InternalAPIError),
+])
+def test_parse_response(content, status_code, expected_result):
+    if not expected_result:
+        result = parse_response(content, status_code, {})
+        assert result == json.loads(content)
+    else:
+        with pytest.raises(expected_result):
+            parse_response(content, status_code, {})
+
+
+@pytest.mark.parametrize('content, expected_result', [
+    (json.dumps({'status': 40, 'message': 'Invalid key'}).encode('utf-8'), 'Invalid key'),
+    (json.dumps({'status': 40}).encode('utf-8'), '{"status": 40}'),
+])
+def test_parse_response_message(content, expected_result):
+    with pytest.raises(errors.AuthenticationError) as error:
+        parse_response(content, 200)
+
+    assert str(error.value) == expected_result
+
+
+def test_parse_response_parses_once():
+    calls = []
+    original = get_json_codec()
+
+    def loads(value):
+        calls.append(value)
+        return original.loads(value)
+
+    set_json_codec(JSONCodec('counting', loads, original.dumps))
+    try:
+        parse_response(stub_response(), 200)
+    finally:
+        set_json_codec(original)
+
+    assert len(calls) == 1
+
+
+def test_check_for_errors():
+    content = stub_response()
+
+    assert check_for_errors(content, 200, {}) == (content, 200, {})
+
+
+@pytest.mark.parametrize('status_code, expected_result', [
+    (200, None),
+    (404, errors.InvalidCoordinatesError),
+    (429, errors.TooManyRequestsError),
+])
+def test_errors_check_for_errors(capsys, status_code, expected_result):
+    if not expected_result:
+        assert errors.check_for_errors(status_code, b'') is None
+    else:
+        with pytest.raises(expected_result):
+            errors.check_for_errors(status_code, b'Error')
+
+    assert capsys.readouterr().out == ''
@@ -5,21 +5,87 @@ While this entry point to the library exposes all classes and functions for
 convenience, those items themselves are actually implemented and documented in
 child modules.
 
-"""
+The child modules are only imported when one of their items is first accessed,
+so that importing the library itself is fast. Likewise, :mod:`asyncio` and
+:mod:`sqlite3` are only imported by the coroutines and SQLite-backed classes
+which use them.
+
+.. note::
 
-import os
+  Importing items on first access relies on :pep:`562`, which requires Python
+  3.7. On Python 3.6, the child modules are imported when the library is.
+
+"""
 
-# Get the version number from the _version.py file
-version_dict = {}
-with open(os.path.join(os.path.dirname(__file__), '__version__.py')) as version_file:
-    exec(version_file.read(), version_dict)                                     # pylint: disable=W0122
+import sys
+import importlib
 
-__version__ = version_dict.get('__version__')
+from walkscore.__version__ import __version__
 
-from walkscore.api import WalkScoreAPI
-from walkscore.locationscore import LocationScore
+# The module in which each of the items exposed by the library is implemented.
+_EXPORTS = {
+    'WalkScoreAPI': 'walkscore.api',
+    'AsyncWalkScoreAPI': 'walkscore.api',
+    'LocationScore': 'walkscore.locationscore',
+    'ScoreCache': 'walkscore.cache',
+    'MemoryCache': 'walkscore.cache',
+    'SQLiteCache': 'walkscore.cache',
+    'RateLimiter': 'walkscore.ratelimit',
+    'QuotaLedger': 'walkscore.quota',
+    'QuotaBackend': 'walkscore.quota',
+    'MemoryQuotaBackend': 'walkscore.quota',
+    'SQLiteQuotaBackend': 'walkscore.quota',
+    'APIKeyPool': 'walkscore.keypool',
+    'RepollQueue': 'walkscore.repoll',
+    'CircuitBreaker': 'walkscore.circuitbreaker',
+    'RetryPolicy': 'walkscore.retry',
+    'RetryBudget': 'walkscore.retry',
+    'HedgePolicy': 'walkscore.hedging',
+    'LatencyTracker': 'walkscore.hedging',
+    'Deadline': 'walkscore.deadline',
+}
 
 __all__ = [
     'WalkScoreAPI',
+    'AsyncWalkScoreAPI',
     'LocationScore',
+    'ScoreCache',
+    'MemoryCache',
+    'SQLiteCache',
+    'RateLimiter',
+    'QuotaLedger',
+    'QuotaBackend',
+    'MemoryQuotaBackend',
+    'SQLiteQuotaBackend',
+    'APIKeyPool',
+    'RepollQueue',
+    'CircuitBreaker',
+    'RetryPolicy',
+    'RetryBudget',
+    'HedgePolicy',
+    'LatencyTracker',
+    'Deadline',
 ]
+
+
+def __getattr__(name):
+    """Import the item ``name`` from the child module which implements it, the
+    first time it is accessed (see :pep:`562`)."""
+    if name not in _EXPORTS:
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    for _name in __all__:
+        __getattr__(_name)
+
+    del _name
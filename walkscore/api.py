@@ -6,13 +6,26 @@
 # there as needed.
 
 import os
+import copy
+import functools
+import itertools
+import threading
 
-from validator_collection import validators
+from validator_collection import validators, checkers
 
-from walkscore.http_client import default_http_client
+from walkscore.batch import BatchPlan, run_batch, run_async_batch, parse_location, \
+    default_max_workers
+from walkscore.cache import DEFAULT_GRID_SIZE
+from walkscore.deadline import Deadline, normalize_timeout
+from walkscore.hedging import HedgeExecutor
+from walkscore.http_client import default_http_client, default_async_http_client, \
+    PreparedRequest
 from walkscore.locationscore import LocationScore
-from walkscore.utilities import check_for_errors
-from walkscore.errors import AuthenticationError, InvalidCoordinatesError
+from walkscore.singleflight import SingleFlight, AsyncSingleFlight
+from walkscore.utilities import parse_response
+from walkscore.errors import AuthenticationError, InvalidCoordinatesError, \
+    QuotaError, BlockedIPError, ScoreInProgressError, InternalAPIError, \
+    TooManyRequestsError, HTTPTimeoutError
 
 
 class WalkScoreAPI(object):
@@ -25,7 +38,17 @@ class WalkScoreAPI(object):
                  api_key = None,
                  http_client = None,
                  proxy = None,
-                 max_retries = None):
+                 max_retries = None,
+                 pool_size = 10,
+                 keep_alive = True,
+                 cache = None,
+                 coalesce_requests = True,
+                 rate_limiter = None,
+                 quota_ledger = None,
+                 key_pool = None,
+                 circuit_breaker = None,
+                 retry_policy = None,
+                 hedge_policy = None):
         """
 
         :param api_key: The API key provided by WalkScore used to authenticate
@@ -53,16 +76,125 @@ class WalkScoreAPI(object):
           :obj:`None <python:None>`.
         :type proxy: :class:`str <python:str>` / :obj:`None <python:None>`
 
-        :param max_retries: Determines the maximum number of HTTP request attempts to
-          make on network failure before giving up. If not specified, defaults to
-          environment variable ``BACKOFF_DEFAULT_TRIES`` or ``3`` if not available.
+        :param max_retries: Determines the maximum number of times to retry a
+          request which fails with a retryable error (see
+          :class:`RetryPolicy <walkscore.retry.RetryPolicy>`) before giving up. If not
+          specified, defaults to environment variable ``BACKOFF_DEFAULT_TRIES`` or ``3``
+          if not available.
         :type max_retries: :class:`int <python:int>`
 
+        :param pool_size: The maximum number of connections to the WalkScore API
+          which the default HTTP client keeps open for re-use. Ignored if
+          ``http_client`` is supplied. Defaults to ``10``.
+        :type pool_size: :class:`int <python:int>`
+
+        :param keep_alive: If ``True``, the default HTTP client keeps connections to
+          the WalkScore API open for re-use across requests. Ignored if
+          ``http_client`` is supplied. Defaults to ``True``.
+        :type keep_alive: :class:`bool <python:bool>`
+
+        :param cache: The cache in which to store scores retrieved from the
+          WalkScore API, so that subsequent requests for locations in the same
+          ~500 ft. grid cell are served without calling the API. If
+          :obj:`None <python:None>`, scores are not cached. Defaults to
+          :obj:`None <python:None>`.
+        :type cache: :class:`ScoreCache <walkscore.cache.ScoreCache>` /
+          :obj:`None <python:None>`
+
+        :param coalesce_requests: If ``True``, concurrent requests for the same
+          location (and scores) share a single request to the WalkScore API.
+          Defaults to ``True``.
+        :type coalesce_requests: :class:`bool <python:bool>`
+
+        :param rate_limiter: The rate limiter which paces the requests sent to the
+          WalkScore API. It slows down automatically for a cool-off period after the
+          WalkScore API reports a :class:`QuotaError <walkscore.errors.QuotaError>`
+          or :class:`BlockedIPError <walkscore.errors.BlockedIPError>`. If
+          :obj:`None <python:None>`, requests are not rate limited. Defaults to
+          :obj:`None <python:None>`.
+        :type rate_limiter: :class:`RateLimiter <walkscore.ratelimit.RateLimiter>` /
+          :obj:`None <python:None>`
+
+        :param quota_ledger: The ledger in which to record every request sent to
+          the WalkScore API, so that requests are refused (or deferred) once the
+          daily quota has been used up. If :obj:`None <python:None>`, requests are
+          not recorded. Defaults to :obj:`None <python:None>`.
+        :type quota_ledger: :class:`QuotaLedger <walkscore.quota.QuotaLedger>` /
+          :obj:`None <python:None>`
+
+        :param key_pool: A pool of API keys across which to distribute requests.
+          If supplied, each request is sent using the key in the pool with the most
+          remaining budget, rather than ``api_key``. Defaults to
+          :obj:`None <python:None>`.
+        :type key_pool: :class:`APIKeyPool <walkscore.keypool.APIKeyPool>` /
+          :obj:`None <python:None>`
+
+        :param circuit_breaker: The circuit breaker which the default HTTP client
+          uses to stop sending requests while the WalkScore API is failing. Ignored
+          if ``http_client`` is supplied (configure the client's own
+          :attr:`circuit_breaker <walkscore.http_client.HTTPClient.circuit_breaker>`
+          instead). Defaults to :obj:`None <python:None>`.
+        :type circuit_breaker: :class:`CircuitBreaker <walkscore.circuitbreaker.CircuitBreaker>` /
+          :obj:`None <python:None>`
+
+        :param retry_policy: The policy which the default HTTP client uses to
+          decide whether, and when, to retry failed requests. If
+          :obj:`None <python:None>`, uses a default
+          :class:`RetryPolicy <walkscore.retry.RetryPolicy>`. Ignored if
+          ``http_client`` is supplied (configure the client's own
+          :attr:`retry_policy <walkscore.http_client.HTTPClient.retry_policy>`
+          instead). Defaults to :obj:`None <python:None>`.
+        :type retry_policy: :class:`RetryPolicy <walkscore.retry.RetryPolicy>` /
+          :obj:`None <python:None>`
+
+        :param hedge_policy: The policy which determines when a slow request sent
+          by :meth:`get_scores` is hedged with a duplicate request. If
+          :obj:`None <python:None>`, requests are not hedged. Defaults to
+          :obj:`None <python:None>`.
+        :type hedge_policy: :class:`HedgePolicy <walkscore.hedging.HedgePolicy>` /
+          :obj:`None <python:None>`
+
+        .. tip::
+
+          The default HTTP client is created the first time it is needed and
+          re-used (along with its open connections) until :meth:`close` is called.
+          Use the API object as a context manager to close it automatically:
+
+          .. code-block:: python
+
+            with WalkScoreAPI(api_key = 'MY API KEY') as api:
+                result = api.get_score(latitude = 123.45, longitude = 54.321)
+
         """
         self._api_key = None
         self._http_client = None
+        self._default_http_client = None
+        self._retired_http_clients = []
+        self._http_client_lock = threading.Lock()
         self._proxy = None
         self._max_retries = None
+        self._cache = None
+        self._single_flight = None
+        self._deduplicated_calls = 0
+        self._rate_limiter = None
+        self._quota_ledger = None
+        self._key_pool = None
+        self._hedge_policy = None
+        self._prepared_requests = {}
+        self._pool_size = validators.integer(pool_size, minimum = 1)
+        self._keep_alive = bool(keep_alive)
+
+        if circuit_breaker is not None and \
+           not checkers.is_type(circuit_breaker, 'CircuitBreaker'):
+            raise ValueError('circuit_breaker must be of type "CircuitBreaker", '
+                             'was "%s"' % str(type(circuit_breaker)))
+        self._circuit_breaker = circuit_breaker
+
+        if retry_policy is not None and \
+           not checkers.is_type(retry_policy, 'RetryPolicy'):
+            raise ValueError('retry_policy must be of type "RetryPolicy", '
+                             'was "%s"' % str(type(retry_policy)))
+        self._retry_policy = retry_policy
 
         if not api_key:
             api_key = os.getenv('WALKSCORE_API_KEY', None)
@@ -71,6 +203,18 @@ class WalkScoreAPI(object):
         self.http_client = http_client
         self.proxy = proxy
         self.max_retries = max_retries
+        self.cache = cache
+        self.coalesce_requests = coalesce_requests
+        self.rate_limiter = rate_limiter
+        self.quota_ledger = quota_ledger
+        self.key_pool = key_pool
+        self.hedge_policy = hedge_policy
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     @property
     def api_key(self):
@@ -89,12 +233,20 @@ class WalkScoreAPI(object):
         """The object instance to use as the HTTP client to make HTTP requests against
         the WalkScore API.
 
+        If no HTTP client was supplied, a default client is created the first time
+        it is needed and re-used thereafter.
+
         :rtype: :class:`HTTPClient <walkscore.http_client.HTTPClient>`
         """
-        if not self._http_client:
-            return default_http_client(proxy = self.proxy)
+        if self._http_client:
+            return self._http_client
+
+        if self._default_http_client is None:
+            with self._http_client_lock:
+                if self._default_http_client is None:
+                    self._default_http_client = self._new_http_client()
 
-        return self._http_client
+        return self._default_http_client
 
     @http_client.setter
     def http_client(self, value):
@@ -115,7 +267,58 @@ class WalkScoreAPI(object):
     @proxy.setter
     def proxy(self, value):
         self._proxy = validators.url(value, allow_empty = True)
-        self.http_client.proxy = self._proxy
+        if self._http_client:
+            self._http_client.proxy = self._proxy
+
+        # The default client was configured with the previous proxy, so replace it
+        # the next time it is needed and close it when the API object is closed.
+        with self._http_client_lock:
+            if self._default_http_client is not None:
+                self._retired_http_clients.append(self._default_http_client)
+                self._default_http_client = None
+
+    def _new_http_client(self):
+        """Create the default HTTP client used when none has been supplied.
+
+        :rtype: :class:`HTTPClient <walkscore.http_client.HTTPClient>`
+        """
+        return default_http_client(proxy = self.proxy,
+                                   pool_size = self._pool_size,
+                                   keep_alive = self._keep_alive,
+                                   circuit_breaker = self._circuit_breaker,
+                                   retry_policy = self._retry_policy)
+
+    def _release_http_clients(self):
+        """Detach and return the HTTP client(s) created by the API object, so that
+        they can be closed.
+
+        :rtype: :class:`list <python:list>` of
+          :class:`HTTPClient <walkscore.http_client.HTTPClient>`
+        """
+        with self._http_client_lock:
+            http_clients = self._retired_http_clients
+            if self._default_http_client is not None:
+                http_clients.append(self._default_http_client)
+
+            self._retired_http_clients = []
+            self._default_http_client = None
+
+        return http_clients
+
+    def close(self):
+        """Close the HTTP client(s) created by the API object, releasing their open
+        connections.
+
+        .. note::
+
+          An :class:`HTTPClient <walkscore.http_client.HTTPClient>` supplied to the
+          API object is left open. The :attr:`cache` is flushed, but also left open.
+        """
+        for http_client in self._release_http_clients():
+            http_client.close()
+
+        if self.cache is not None:
+            self.cache.flush()
 
     @property
     def max_retries(self):
@@ -123,7 +326,7 @@ class WalkScoreAPI(object):
 
         :rtype: :class:`int <python:int>`
         """
-        if not self._max_retries:
+        if self._max_retries is None:
             return validators.integer(os.getenv('BACKOFF_DEFAULT_TRIES', '3'))
 
         return self._max_retries
@@ -132,6 +335,154 @@ class WalkScoreAPI(object):
     def max_retries(self, value):
         self._max_retries = validators.integer(value, allow_empty = True)
 
+    @property
+    def cache(self):
+        """The cache in which scores retrieved from the WalkScore API are stored.
+
+        :rtype: :class:`ScoreCache <walkscore.cache.ScoreCache>` /
+          :obj:`None <python:None>`
+        """
+        return self._cache
+
+    @cache.setter
+    def cache(self, value):
+        if value is not None and not checkers.is_type(value, 'ScoreCache'):
+            raise ValueError('cache must be of type "ScoreCache", was "%s"' %
+                             str(type(value)))
+
+        self._cache = value
+
+    @property
+    def rate_limiter(self):
+        """The rate limiter which paces the requests sent to the WalkScore API.
+
+        :rtype: :class:`RateLimiter <walkscore.ratelimit.RateLimiter>` /
+          :obj:`None <python:None>`
+        """
+        return self._rate_limiter
+
+    @rate_limiter.setter
+    def rate_limiter(self, value):
+        if value is not None and not checkers.is_type(value, 'RateLimiter'):
+            raise ValueError('rate_limiter must be of type "RateLimiter", was "%s"' %
+                             str(type(value)))
+
+        self._rate_limiter = value
+
+    @property
+    def quota_ledger(self):
+        """The ledger in which requests sent to the WalkScore API are recorded.
+
+        :rtype: :class:`QuotaLedger <walkscore.quota.QuotaLedger>` /
+          :obj:`None <python:None>`
+        """
+        return self._quota_ledger
+
+    @quota_ledger.setter
+    def quota_ledger(self, value):
+        if value is not None and not checkers.is_type(value, 'QuotaLedger'):
+            raise ValueError('quota_ledger must be of type "QuotaLedger", was "%s"' %
+                             str(type(value)))
+
+        self._quota_ledger = value
+
+    @property
+    def key_pool(self):
+        """The pool of API keys across which requests are distributed.
+
+        :rtype: :class:`APIKeyPool <walkscore.keypool.APIKeyPool>` /
+          :obj:`None <python:None>`
+        """
+        return self._key_pool
+
+    @key_pool.setter
+    def key_pool(self, value):
+        if value is not None and not checkers.is_type(value, 'APIKeyPool'):
+            raise ValueError('key_pool must be of type "APIKeyPool", was "%s"' %
+                             str(type(value)))
+
+        self._key_pool = value
+
+    @property
+    def hedge_policy(self):
+        """The policy which determines when a slow request is hedged with a
+        duplicate request.
+
+        :rtype: :class:`HedgePolicy <walkscore.hedging.HedgePolicy>` /
+          :obj:`None <python:None>`
+        """
+        return self._hedge_policy
+
+    @hedge_policy.setter
+    def hedge_policy(self, value):
+        if value is not None and not checkers.is_type(value, 'HedgePolicy'):
+            raise ValueError('hedge_policy must be of type "HedgePolicy", was "%s"' %
+                             str(type(value)))
+
+        self._hedge_policy = value
+
+    def remaining_quota(self):
+        """Return the number of requests which may still be sent to the WalkScore
+        API today, according to the :attr:`quota_ledger`.
+
+        :returns: The remaining quota (summed across the keys in the
+          :attr:`key_pool`, if any), or :obj:`None <python:None>` if no
+          :attr:`quota_ledger` has been configured.
+        :rtype: :class:`int <python:int>` / :obj:`None <python:None>`
+        """
+        if self.quota_ledger is None:
+            return None
+
+        if self.key_pool is not None:
+            return sum(self.quota_ledger.remaining_quota(x)
+                       for x in self.key_pool.api_keys)
+
+        return self.quota_ledger.remaining_quota(self.api_key)
+
+    @property
+    def coalesce_requests(self):
+        """If ``True``, concurrent requests for the same location (and scores) share
+        a single request to the WalkScore API.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        return self._single_flight is not None
+
+    @coalesce_requests.setter
+    def coalesce_requests(self, value):
+        if value and self._single_flight is None:
+            self._single_flight = self._new_single_flight()
+        elif not value:
+            self._single_flight = None
+
+    @property
+    def coalesced_calls(self):
+        """The number of requests which were served by sharing another concurrent
+        request to the WalkScore API.
+
+        :rtype: :class:`int <python:int>`
+        """
+        if self._single_flight is None:
+            return 0
+
+        return self._single_flight.coalesced
+
+    @property
+    def deduplicated_calls(self):
+        """The number of requests saved by collapsing locations which fall in the
+        same grid cell when retrieving scores with ``deduplicate = True``.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self._deduplicated_calls
+
+    def _new_single_flight(self):
+        """Create the object used to coalesce concurrent requests.
+
+        :rtype: :class:`SingleFlight <walkscore.singleflight.SingleFlight>`
+        """
+        return SingleFlight()
+
     @property
     def _API_URL(self):
         """The full URL to use when requesting scores from the WalkScore API.
@@ -146,7 +497,9 @@ class WalkScoreAPI(object):
                   address = None,
                   return_transit_score = True,
                   return_bike_score = True,
-                  max_retries = None):
+                  max_retries = None,
+                  timeout = None,
+                  deadline = None):
               """Retrieve the :term:`WalkScore`, :term:`TransitScore`, and/or
               :term:`BikeScore` for a given location from the WalkScore API.
 
@@ -179,6 +532,25 @@ class WalkScoreAPI(object):
                 set to 0. Defaults to :obj:`None <python:None>`.
               :type max_retries: :obj:`None <python:None>` / :class:`int <python:int>`
 
+              :param timeout: The number of seconds to wait for each HTTP request
+                to the WalkScore API, as either a single number or a
+                ``(connect, read)`` :class:`tuple <python:tuple>`. If
+                :obj:`None <python:None>`, will apply the HTTP client's
+                :attr:`connect_timeout <walkscore.http_client.HTTPClient.connect_timeout>`
+                and :attr:`read_timeout <walkscore.http_client.HTTPClient.read_timeout>`.
+                Defaults to :obj:`None <python:None>`.
+              :type timeout: numeric / :class:`tuple <python:tuple>` /
+                :obj:`None <python:None>`
+
+              :param deadline: The time budget for the whole call, including any
+                time spent waiting on the rate limiter or quota, retries, and
+                backoff, as either a number of seconds or a
+                :class:`Deadline <walkscore.deadline.Deadline>`. If
+                :obj:`None <python:None>`, the call has no deadline. Defaults to
+                :obj:`None <python:None>`.
+              :type deadline: numeric / :class:`Deadline <walkscore.deadline.Deadline>` /
+                :obj:`None <python:None>`
+
               :returns: The location's :term:`WalkScore`, :term:`TransitScore`,
                 and :term:`BikeScore` with meta-data.
               :rtype: :class:`LocationScore <walkscore.locationscore.LocationScore>`
@@ -191,59 +563,1411 @@ class WalkScoreAPI(object):
               :raises BlockedIPError: if your IP address has been blocked
               :raises InvalidCoordinatesError: if your latitude/longitude coordinates
                 are not valid
+              :raises HTTPTimeoutError: if the ``deadline`` passes or a request
+                times out
 
               """
-              if not self.api_key:
-                  raise AuthenticationError('No API key supplied.')
-
-              if not (latitude and longitude):
-                  raise InvalidCoordinatesError('No coordinates supplied.')
-
-              if latitude:
-                  latitude = validators.numeric(latitude, allow_empty = False)
-                  latitude = str(latitude)
-              if longitude:
-                  longitude = validators.numeric(longitude, allow_empty = False)
-                  longitude = str(longitude)
-
-              if max_retries is None:
-                  max_retries = self.max_retries
-
-              method = 'GET'
-              parameters = {
-                  'address': address,
-                  'lat': latitude,
-                  'lon': longitude,
-                  'format': 'json',
-                  'transit': 1,
-                  'bike': 1,
-                  'wsapikey': self.api_key
-              }
-
-              if not return_bike_score:
-                  parameters['bike'] = None
-
-              if not return_transit_score:
-                  parameters['transit'] = None
-
-              if max_retries:
-                  response = self.http_client.request_with_retries(method,
-                                                                   self._API_URL,
-                                                                   parameters = parameters,
-                                                                   request_body = None)
-              else:
-                  response = self.http_client.request(method,
-                                                      self._API_URL,
-                                                      parameters = parameters,
-                                                      request_body = None)
-
-              result_set = check_for_errors(*response)
-
-              result = LocationScore.from_json(result_set[0],
-                                               api_compatible = True)
-
-              result.address = address
-              result.original_latitude = latitude
-              result.original_longitude = longitude
-
-              return result
+              return self._get_score(latitude,
+                                     longitude,
+                                     address = address,
+                                     return_transit_score = return_transit_score,
+                                     return_bike_score = return_bike_score,
+                                     max_retries = max_retries,
+                                     timeout = timeout,
+                                     deadline = deadline)
+
+    def _get_score(self,
+                   latitude,
+                   longitude,
+                   address = None,
+                   return_transit_score = True,
+                   return_bike_score = True,
+                   max_retries = None,
+                   timeout = None,
+                   deadline = None,
+                   http_client = None,
+                   hedge_executor = None):
+        """Retrieve the score(s) for a given location, using ``http_client`` to
+        execute the request.
+
+        Accepts the same parameters as :meth:`get_score`, plus:
+
+        :param http_client: The HTTP client to use when executing the request.
+          If :obj:`None <python:None>`, defaults to :attr:`http_client`.
+        :type http_client: :class:`HTTPClient <walkscore.http_client.HTTPClient>`
+          / :obj:`None <python:None>`
+
+        :param hedge_executor: The executor in which to run hedged requests. If
+          :obj:`None <python:None>`, the request is not hedged.
+        :type hedge_executor: :class:`Executor <python:concurrent.futures.Executor>`
+          / :obj:`None <python:None>`
+
+        :rtype: :class:`LocationScore <walkscore.locationscore.LocationScore>`
+        """
+        deadline = Deadline.coerce(deadline)
+
+        latitude, longitude, parameters = self._prepare_parameters(
+            latitude,
+            longitude,
+            address = address,
+            return_transit_score = return_transit_score,
+            return_bike_score = return_bike_score
+        )
+
+        cache_key, result = self._get_cached(latitude,
+                                             longitude,
+                                             address = address,
+                                             return_transit_score = return_transit_score,
+                                             return_bike_score = return_bike_score)
+        if result is not None:
+            return result
+
+        if self._single_flight is None:
+            return self._fetch_score(parameters,
+                                     cache_key = cache_key,
+                                     max_retries = max_retries,
+                                     timeout = timeout,
+                                     deadline = deadline,
+                                     http_client = http_client,
+                                     hedge_executor = hedge_executor)
+
+        result, is_shared = self._single_flight.do(
+            self._coalescing_key(parameters, timeout = timeout),
+            self._fetch_score,
+            parameters,
+            cache_key = cache_key,
+            max_retries = max_retries,
+            timeout = timeout,
+            deadline = deadline,
+            http_client = http_client,
+            hedge_executor = hedge_executor,
+            **self._get_coalescing_limits(deadline)
+        )
+        if is_shared:
+            result = self._localize(copy.copy(result), latitude, longitude, address)
+
+        return result
+
+    def _fetch_score(self,
+                     parameters,
+                     cache_key = None,
+                     max_retries = None,
+                     timeout = None,
+                     deadline = None,
+                     http_client = None,
+                     hedge_executor = None):
+        """Request a score from the WalkScore API, and store it in the
+        :attr:`cache`.
+
+        :param parameters: The URL parameters assembled by
+          :meth:`_prepare_parameters`.
+        :type parameters: :class:`dict <python:dict>`
+
+        :param cache_key: The key under which to cache the score. If
+          :obj:`None <python:None>`, the score is not cached.
+        :type cache_key: :class:`tuple <python:tuple>` / :obj:`None <python:None>`
+
+        :param hedge_executor: The executor in which to run hedged requests. If
+          :obj:`None <python:None>` (or there is no :attr:`hedge_policy`), the
+          request is not hedged.
+        :type hedge_executor: :class:`Executor <python:concurrent.futures.Executor>`
+          / :obj:`None <python:None>`
+
+        :rtype: :class:`LocationScore <walkscore.locationscore.LocationScore>`
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        if http_client is None:
+            http_client = self.http_client
+
+        if self.key_pool is not None:
+            parameters = dict(parameters,
+                              wsapikey = self.key_pool.select(self.quota_ledger))
+
+        self._admit(parameters['wsapikey'], deadline)
+
+        try:
+            if hedge_executor is not None and self.hedge_policy is not None:
+                response = self.hedge_policy.call(
+                    hedge_executor,
+                    getattr(http_client, 'latency', None),
+                    functools.partial(self._send,
+                                      http_client,
+                                      parameters,
+                                      max_retries,
+                                      timeout = timeout,
+                                      deadline = deadline),
+                    functools.partial(self._send_hedge,
+                                      http_client,
+                                      parameters,
+                                      timeout = timeout,
+                                      deadline = deadline)
+                )
+            else:
+                response = self._send(http_client,
+                                      parameters,
+                                      max_retries,
+                                      timeout = timeout,
+                                      deadline = deadline)
+
+            result = self._parse_response(response,
+                                          parameters['lat'],
+                                          parameters['lon'],
+                                          parameters['address'])
+        except Exception as error:
+            self._handle_error(error, http_client, parameters['wsapikey'])
+            raise
+
+        self._set_cached(cache_key, result)
+
+        return result
+
+    @staticmethod
+    def _get_max_wait(deadline):
+        """Return the number of seconds which may be spent waiting on the
+        :attr:`quota_ledger` or :attr:`rate_limiter` before ``deadline``.
+
+        :raises HTTPTimeoutError: if ``deadline`` has passed
+        """
+        if deadline is None:
+            return None
+
+        deadline.check()
+
+        return deadline.remaining()
+
+    def _admit(self, api_key, deadline = None):
+        """Count a request against the :attr:`quota_ledger` and wait for the
+        :attr:`rate_limiter`, giving up if either would wait beyond ``deadline``.
+
+        :raises QuotaExhaustedError: if the quota would not be available before
+          ``deadline``
+        :raises HTTPTimeoutError: if the rate limiter would not admit the request
+          before ``deadline``
+        """
+        if self.quota_ledger is not None:
+            self.quota_ledger.consume(api_key, max_wait = self._get_max_wait(deadline))
+
+        if self.rate_limiter is not None:
+            if not self.rate_limiter.acquire(max_wait = self._get_max_wait(deadline)):
+                raise HTTPTimeoutError('The rate limiter would not admit the request '
+                                       'before its deadline.')
+
+    def _send(self, http_client, parameters, max_retries, timeout = None, deadline = None):
+        """Send a request for a score to the WalkScore API.
+
+        :returns: The content, status code, and headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        prepared = self._get_prepared_request(parameters)
+        if max_retries:
+            return http_client.send_with_retries(prepared,
+                                                 self._get_location_parameters(parameters),
+                                                 max_retries = max_retries,
+                                                 timeout = timeout,
+                                                 deadline = deadline)
+
+        return http_client.send(prepared,
+                                self._get_location_parameters(parameters),
+                                timeout = timeout,
+                                deadline = deadline)
+
+    def _send_hedge(self, http_client, parameters, timeout = None, deadline = None):
+        """Send a duplicate of a slow request for a score, counting it against the
+        :attr:`quota_ledger` and :attr:`rate_limiter`.
+
+        :returns: The content, status code, and headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        self._admit(parameters['wsapikey'], deadline)
+
+        return http_client.send(self._get_prepared_request(parameters),
+                                self._get_location_parameters(parameters),
+                                timeout = timeout,
+                                deadline = deadline)
+
+    def _get_prepared_request(self, parameters):
+        """Return the prepared request which carries the parameters which are
+        constant across requests (the API key, format, and flags), preparing it
+        the first time it is needed.
+
+        :param parameters: The URL parameters assembled by
+          :meth:`_prepare_parameters`.
+        :type parameters: :class:`dict <python:dict>`
+
+        :rtype: :class:`PreparedRequest <walkscore.http_client.PreparedRequest>`
+        """
+        key = (self._BASE_URL,
+               parameters['wsapikey'],
+               parameters['transit'],
+               parameters['bike'])
+        prepared = self._prepared_requests.get(key, None)
+        if prepared is None:
+            prepared = PreparedRequest('GET',
+                                       self._API_URL,
+                                       parameters = {
+                                           'format': parameters['format'],
+                                           'transit': parameters['transit'],
+                                           'bike': parameters['bike'],
+                                           'wsapikey': parameters['wsapikey']
+                                       })
+            self._prepared_requests[key] = prepared
+
+        return prepared
+
+    @staticmethod
+    def _get_location_parameters(parameters):
+        """Return the URL parameters which identify the location requested, and
+        so vary between requests.
+
+        :rtype: :class:`dict <python:dict>`
+        """
+        return {
+            'lat': parameters['lat'],
+            'lon': parameters['lon'],
+            'address': parameters['address']
+        }
+
+    def _prepare_parameters(self,
+                            latitude,
+                            longitude,
+                            address = None,
+                            return_transit_score = True,
+                            return_bike_score = True):
+        """Validate the location supplied and assemble the URL parameters to submit
+        to the WalkScore API.
+
+        :returns: The validated latitude, the validated longitude, and the
+          URL parameters for the request.
+        :rtype: :class:`tuple <python:tuple>`
+
+        :raises AuthenticationError: if no API key has been supplied
+        :raises InvalidCoordinatesError: if ``latitude`` or ``longitude`` are empty
+        """
+        if not self.api_key and self.key_pool is None:
+            raise AuthenticationError('No API key supplied.')
+
+        if not (latitude and longitude):
+            raise InvalidCoordinatesError('No coordinates supplied.')
+
+        # Numbers are returned unchanged by the validator, so only validate
+        # anything else.
+        if latitude.__class__ not in (int, float):
+            latitude = validators.numeric(latitude, allow_empty = False)
+        latitude = str(latitude)
+        if longitude.__class__ not in (int, float):
+            longitude = validators.numeric(longitude, allow_empty = False)
+        longitude = str(longitude)
+
+        parameters = {
+            'address': address,
+            'lat': latitude,
+            'lon': longitude,
+            'format': 'json',
+            'transit': 1,
+            'bike': 1,
+            'wsapikey': self.api_key
+        }
+
+        if not return_bike_score:
+            parameters['bike'] = None
+
+        if not return_transit_score:
+            parameters['transit'] = None
+
+        return latitude, longitude, parameters
+
+    def _get_cached(self,
+                    latitude,
+                    longitude,
+                    address = None,
+                    return_transit_score = True,
+                    return_bike_score = True):
+        """Look up the score for a location in the :attr:`cache`.
+
+        :returns: The key under which the location's score is cached (or
+          :obj:`None <python:None>` if there is no cache), and the cached score (or
+          :obj:`None <python:None>` if it has not been cached).
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        if self.cache is None:
+            return None, None
+
+        cache_key = self.cache.make_key(latitude,
+                                        longitude,
+                                        return_transit_score = return_transit_score,
+                                        return_bike_score = return_bike_score)
+        result = self.cache.get(cache_key)
+        if result is not None:
+            self._localize(result, latitude, longitude, address)
+
+        return cache_key, result
+
+    def _set_cached(self, cache_key, result):
+        """Store ``result`` in the :attr:`cache` under ``cache_key``, provided that
+        it is a valid score."""
+        if cache_key is not None and result:
+            self.cache.set(cache_key, result)
+
+    def _handle_error(self, error, http_client, api_key):
+        """Update the state of the API object after a request for a score made
+        with ``http_client`` and ``api_key`` raised ``error``."""
+        if isinstance(error, (AuthenticationError,
+                              QuotaError,
+                              BlockedIPError,
+                              TooManyRequestsError)):
+            self._handle_rejection(error, api_key)
+        elif isinstance(error, InternalAPIError):
+            self._handle_internal_error(http_client)
+
+    @staticmethod
+    def _handle_internal_error(http_client):
+        """Record a failure in the circuit breaker of ``http_client`` after the
+        WalkScore API reports an
+        :class:`InternalAPIError <walkscore.errors.InternalAPIError>` in the body of
+        an otherwise successful response.
+        """
+        breaker = getattr(http_client, 'circuit_breaker', None)
+        if breaker is not None:
+            breaker.record_failure(replaces_success = True)
+
+    def _handle_rejection(self, error, api_key):
+        """Slow down the :attr:`rate_limiter`, update the :attr:`quota_ledger`, and
+        take ``api_key`` out of the :attr:`key_pool` as appropriate after the
+        WalkScore API rejects a request.
+
+        :param error: The error raised for the request.
+        :type error: :class:`AuthenticationError <walkscore.errors.AuthenticationError>` /
+          :class:`QuotaError <walkscore.errors.QuotaError>` /
+          :class:`BlockedIPError <walkscore.errors.BlockedIPError>` /
+          :class:`TooManyRequestsError <walkscore.errors.TooManyRequestsError>`
+
+        :param api_key: The API key used for the request.
+        :type api_key: :class:`str <python:str>`
+        """
+        if self.rate_limiter is not None and \
+           isinstance(error, (QuotaError, BlockedIPError, TooManyRequestsError)):
+            self.rate_limiter.cool_off()
+
+        if self.quota_ledger is not None and isinstance(error, QuotaError):
+            self.quota_ledger.exhaust(api_key)
+
+        if self.key_pool is not None and \
+           isinstance(error, (AuthenticationError, QuotaError)):
+            self.key_pool.cool_off(api_key)
+
+    @staticmethod
+    def _coalescing_key(parameters, timeout = None):
+        """Return the key used to coalesce concurrent requests for the same
+        location.
+
+        Requests are only coalesced if they apply the same timeouts, so that each
+        caller is held to its own.
+
+        :param parameters: The URL parameters assembled by
+          :meth:`_prepare_parameters`.
+        :type parameters: :class:`dict <python:dict>`
+
+        :param timeout: The timeout supplied for the request.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        return (float(parameters['lat']),
+                float(parameters['lon']),
+                bool(parameters['transit']),
+                bool(parameters['bike']),
+                normalize_timeout(timeout))
+
+    @staticmethod
+    def _get_coalescing_limits(deadline):
+        """Return the limits which apply to a request while it waits for the same
+        request made by another caller: it waits no later than ``deadline``, and
+        if that request times out (e.g. against its own, earlier, deadline) it is
+        made again while ``deadline`` has not passed.
+
+        :param deadline: The deadline for the request.
+        :type deadline: :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
+        :returns: The ``max_wait`` and ``retry_on`` arguments for
+          :meth:`SingleFlight.do() <walkscore.singleflight.SingleFlight.do>`.
+        :rtype: :class:`dict <python:dict>`
+        """
+        def retry_on(error):
+            return isinstance(error, HTTPTimeoutError) and \
+                (deadline is None or not deadline.expired)
+
+        return {
+            'max_wait': deadline.remaining() if deadline is not None else None,
+            'retry_on': retry_on
+        }
+
+    @staticmethod
+    def _localize(result, latitude, longitude, address = None):
+        """Record the location originally requested on ``result``.
+
+        :rtype: :class:`LocationScore <walkscore.locationscore.LocationScore>`
+        """
+        result.address = address
+        result.original_latitude = latitude
+        result.original_longitude = longitude
+
+        return result
+
+    @staticmethod
+    def _parse_response(response, latitude, longitude, address = None):
+        """Convert the response returned by the WalkScore API into a
+        :class:`LocationScore <walkscore.locationscore.LocationScore>`.
+
+        :param response: The content, status code, and headers of the HTTP response.
+        :type response: :class:`tuple <python:tuple>`
+
+        :rtype: :class:`LocationScore <walkscore.locationscore.LocationScore>`
+
+        :raises WalkScoreError: *or sub-classes* for errors returned by the API
+        """
+        # The values parsed from the response already have the expected types,
+        # so they are not validated again.
+        return LocationScore._from_trusted(parse_response(*response),           # pylint: disable=W0212
+                                           latitude = latitude,
+                                           longitude = longitude,
+                                           address = address)
+
+    def get_scores(self,
+                   locations,
+                   max_workers = None,
+                   ordered = True,
+                   return_transit_score = True,
+                   return_bike_score = True,
+                   max_retries = None,
+                   timeout = None,
+                   deadline = None,
+                   return_exceptions = False,
+                   deduplicate = False,
+                   repoll = None):
+        """Retrieve the :term:`WalkScore`, :term:`TransitScore`, and/or
+        :term:`BikeScore` for a batch of locations, executing the requests
+        concurrently on a bounded pool of worker threads.
+
+        :param locations: The locations whose scores should be retrieved. Each
+          location may be either a :class:`dict <python:dict>` with ``latitude``,
+          ``longitude``, and (optionally) ``address`` keys, or a
+          :class:`tuple <python:tuple>` of ``(latitude, longitude)`` or
+          ``(latitude, longitude, address)``.
+        :type locations: iterable
+
+        :param max_workers: The maximum number of requests to execute concurrently.
+          If :obj:`None <python:None>`, defaults to the number of CPUs plus four
+          (capped at ``32``). Defaults to :obj:`None <python:None>`.
+        :type max_workers: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :param ordered: If ``True``, yields results in the same order as
+          ``locations``. If ``False``, yields results as soon as they are
+          retrieved. Defaults to ``True``.
+        :type ordered: :class:`bool <python:bool>`
+
+        :param return_transit_score: If ``True``, will
+          return each location's :term:`TransitScore`. Defaults to
+          ``True``.
+        :type return_transit_score: :class:`bool <python:bool>`
+
+        :param return_bike_score: If ``True``, will
+          return each location's :term:`BikeScore`. Defaults to
+          ``True``.
+        :type return_bike_score: :class:`bool <python:bool>`
+
+        :param max_retries: The maximum number of retries to attempt for each
+          location. If :obj:`None <python:None>`, will apply the default configured
+          when initializing the WalkScore API object. Defaults to
+          :obj:`None <python:None>`.
+        :type max_retries: :obj:`None <python:None>` / :class:`int <python:int>`
+
+        :param timeout: The number of seconds to wait for each HTTP request, as
+          either a single number or a ``(connect, read)``
+          :class:`tuple <python:tuple>`. If :obj:`None <python:None>`, will apply
+          the HTTP client's defaults. Defaults to :obj:`None <python:None>`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param deadline: The time budget for retrieving the score of each location.
+          A number of seconds applies to each location separately, starting when
+          its request is made, while a
+          :class:`Deadline <walkscore.deadline.Deadline>` is shared by the whole
+          batch. If :obj:`None <python:None>`, there is no deadline. Defaults to
+          :obj:`None <python:None>`.
+        :type deadline: numeric / :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
+        :param return_exceptions: If ``True``, an error raised when retrieving
+          the score for a location is yielded in place of its result. If ``False``,
+          the error is raised when its result is reached. Defaults to ``False``.
+        :type return_exceptions: :class:`bool <python:bool>`
+
+        :param deduplicate: If ``True``, locations which fall in the same
+          ~500 ft. grid cell (to which the WalkScore API snaps locations) are
+          collapsed so that only one request is made per cell, and its result is
+          returned for every location in the cell. The number of requests saved
+          is added to :attr:`deduplicated_calls`. Defaults to ``False``.
+        :type deduplicate: :class:`bool <python:bool>`
+
+        :param repoll: The queue in which to defer locations whose scores are still
+          being calculated by the WalkScore API (which raise a
+          :class:`ScoreInProgressError <walkscore.errors.ScoreInProgressError>`).
+          Deferred locations are requested again with increasing delays while the
+          rest of the batch continues, and their scores are yielded once they are
+          available. Unless both ``ordered`` and ``deduplicate`` are ``True``, this
+          means after the scores of the locations which follow them. If
+          :obj:`None <python:None>`, the error is returned (or raised) immediately.
+          Defaults to :obj:`None <python:None>`.
+        :type repoll: :class:`RepollQueue <walkscore.repoll.RepollQueue>` /
+          :obj:`None <python:None>`
+
+        :returns: Iterator over the locations' scores, as
+          :class:`LocationScore <walkscore.locationscore.LocationScore>` instances.
+        :rtype: iterator
+
+        .. note::
+
+          When ``deduplicate`` is ``True``, ``locations`` is consumed in full
+          before the first request is made.
+
+        .. note::
+
+          All worker threads share the API object's
+          :attr:`http_client <WalkScoreAPI.http_client>`, so connections opened
+          during one batch are re-used by subsequent requests.
+
+        .. note::
+
+          If the API object has a :attr:`hedge_policy`, slow requests are hedged
+          with a duplicate request, and whichever answers first is used.
+
+        .. note::
+
+          If the :attr:`http_client <WalkScoreAPI.http_client>` is
+          :attr:`multiplexed <walkscore.http_client.HTTPClient.multiplexed>` (e.g. a
+          :class:`PycurlMultiClient <walkscore.http_client.PycurlMultiClient>`), and
+          neither ``repoll`` nor a :attr:`hedge_policy` is supplied, the requests
+          are executed by the HTTP client from the calling thread, ``max_workers``
+          at a time, and results are yielded in the same order as ``locations``. A
+          numeric ``deadline`` then applies to each group of ``max_workers``
+          locations.
+
+        :raises AuthenticationError: if the API key is invalid
+        :raises ValueError: if ``max_workers`` is not a positive integer, if
+          ``timeout`` or ``deadline`` are not valid, or if ``repoll`` is not a
+          :class:`RepollQueue <walkscore.repoll.RepollQueue>`
+
+        """
+        if not self.api_key and self.key_pool is None:
+            raise AuthenticationError('No API key supplied.')
+
+        max_workers = validators.integer(max_workers,
+                                         allow_empty = True,
+                                         minimum = 1)
+
+        normalize_timeout(timeout)
+        if deadline is not None and not checkers.is_type(deadline, 'Deadline'):
+            deadline = validators.numeric(deadline, minimum = 0)
+
+        if repoll is not None and not checkers.is_type(repoll, 'RepollQueue'):
+            raise ValueError('repoll must be of type "RepollQueue", was "%s"' %
+                             str(type(repoll)))
+
+        return self._iter_scores(locations,
+                                 max_workers = max_workers,
+                                 ordered = ordered,
+                                 return_transit_score = return_transit_score,
+                                 return_bike_score = return_bike_score,
+                                 max_retries = max_retries,
+                                 timeout = timeout,
+                                 deadline = deadline,
+                                 return_exceptions = return_exceptions,
+                                 deduplicate = deduplicate,
+                                 repoll = repoll)
+
+    def _plan_batch(self, locations):
+        """Create the :class:`BatchPlan <walkscore.batch.BatchPlan>` used to
+        de-duplicate a batch, and count the requests it saves.
+
+        :rtype: :class:`BatchPlan <walkscore.batch.BatchPlan>`
+        """
+        grid_size = DEFAULT_GRID_SIZE
+        if self.cache is not None:
+            grid_size = self.cache.grid_size
+
+        plan = BatchPlan(locations, grid_size = grid_size)
+        with self._http_client_lock:
+            self._deduplicated_calls += plan.saved_calls
+
+        return plan
+
+    @staticmethod
+    def _is_in_progress(result, error):
+        """Return ``True`` if a location's score is still being calculated by the
+        WalkScore API.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        return isinstance(error, ScoreInProgressError)
+
+    @staticmethod
+    def _is_planned_in_progress(result, error):
+        """Return ``True`` if the score requested for a cell of a
+        :class:`BatchPlan <walkscore.batch.BatchPlan>` is still being calculated by
+        the WalkScore API.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        return result is not None and isinstance(result[1], ScoreInProgressError)
+
+    @staticmethod
+    def _resolve_planned(plan, request_index, result, ordered, return_exceptions):
+        """Return the results of a batch plan which are ready to be yielded,
+        raising the first error among them unless ``return_exceptions`` is ``True``.
+
+        :rtype: :class:`list <python:list>`
+        """
+        ready = plan.resolve(request_index, result, ordered = ordered)
+        if not return_exceptions:
+            for value in ready:
+                if isinstance(value, Exception):
+                    raise value
+
+        return ready
+
+    def _iter_scores(self,
+                     locations,
+                     max_workers = None,
+                     ordered = True,
+                     return_transit_score = True,
+                     return_bike_score = True,
+                     max_retries = None,
+                     timeout = None,
+                     deadline = None,
+                     return_exceptions = False,
+                     deduplicate = False,
+                     repoll = None):
+        """Generator which executes a batch of score requests on behalf of
+        :meth:`get_scores`.
+        """
+        http_client = self.http_client
+
+        if getattr(http_client, 'multiplexed', False) and \
+           repoll is None and self.hedge_policy is None:
+            for result in self._iter_multiplexed_scores(
+                    http_client,
+                    locations,
+                    max_workers = max_workers,
+                    return_transit_score = return_transit_score,
+                    return_bike_score = return_bike_score,
+                    max_retries = max_retries,
+                    timeout = timeout,
+                    deadline = deadline,
+                    return_exceptions = return_exceptions,
+                    deduplicate = deduplicate
+            ):
+                yield result
+
+            return
+
+        hedge_executor = None
+        if self.hedge_policy is not None:
+            hedge_executor = HedgeExecutor(
+                max_workers = 2 * (max_workers or default_max_workers())
+            )
+
+        def get_location_score(location):
+            latitude, longitude, address = parse_location(location)
+            return self._get_score(latitude,
+                                   longitude,
+                                   address = address,
+                                   return_transit_score = return_transit_score,
+                                   return_bike_score = return_bike_score,
+                                   max_retries = max_retries,
+                                   timeout = timeout,
+                                   deadline = deadline,
+                                   http_client = http_client,
+                                   hedge_executor = hedge_executor)
+
+        try:
+            if not deduplicate:
+                for result in run_batch(get_location_score,
+                                        locations,
+                                        max_workers = max_workers,
+                                        ordered = ordered,
+                                        return_exceptions = return_exceptions,
+                                        repoll_queue = repoll,
+                                        repoll_on = self._is_in_progress):
+                    yield result
+
+                return
+
+            plan = self._plan_batch(locations)
+
+            def get_planned_score(request_index):
+                try:
+                    return request_index, get_location_score(plan.requests[request_index])
+                except Exception as error:                                      # pylint: disable=W0703
+                    return request_index, error
+
+            for request_index, result in run_batch(get_planned_score,
+                                                   range(len(plan.requests)),
+                                                   max_workers = max_workers,
+                                                   ordered = ordered,
+                                                   repoll_queue = repoll,
+                                                   repoll_on = self._is_planned_in_progress):
+                for value in self._resolve_planned(plan,
+                                                   request_index,
+                                                   result,
+                                                   ordered,
+                                                   return_exceptions):
+                    yield value
+        finally:
+            # Hedged requests which lost the race are abandoned rather than awaited.
+            if hedge_executor is not None:
+                hedge_executor.shutdown(wait = False)
+
+    def _iter_multiplexed_scores(self,
+                                 http_client,
+                                 locations,
+                                 max_workers = None,
+                                 return_transit_score = True,
+                                 return_bike_score = True,
+                                 max_retries = None,
+                                 timeout = None,
+                                 deadline = None,
+                                 return_exceptions = False,
+                                 deduplicate = False):
+        """Generator which executes a batch of score requests on behalf of
+        :meth:`get_scores` over a
+        :attr:`multiplexed <walkscore.http_client.HTTPClient.multiplexed>` HTTP
+        client, ``max_workers`` requests at a time.
+
+        Results are always yielded in the same order as ``locations``.
+        """
+        plan = None
+        if deduplicate:
+            plan = self._plan_batch(locations)
+            locations = plan.requests
+
+        chunk_size = max_workers or default_max_workers()
+        locations = iter(locations)
+        request_index = 0
+        while True:
+            chunk = list(itertools.islice(locations, chunk_size))
+            if not chunk:
+                break
+
+            for result in self._get_multiplexed_scores(
+                    http_client,
+                    chunk,
+                    return_transit_score = return_transit_score,
+                    return_bike_score = return_bike_score,
+                    max_retries = max_retries,
+                    timeout = timeout,
+                    deadline = deadline
+            ):
+                if plan is not None:
+                    for value in self._resolve_planned(plan,
+                                                       request_index,
+                                                       result,
+                                                       True,
+                                                       return_exceptions):
+                        yield value
+                elif isinstance(result, Exception) and not return_exceptions:
+                    raise result
+                else:
+                    yield result
+
+                request_index += 1
+
+    def _get_multiplexed_scores(self,
+                                http_client,
+                                locations,
+                                return_transit_score = True,
+                                return_bike_score = True,
+                                max_retries = None,
+                                timeout = None,
+                                deadline = None):
+        """Retrieve the scores for ``locations``, executing the requests for those
+        which are not cached in a single call to ``http_client``\'s
+        :meth:`request_many() <walkscore.http_client.HTTPClient.request_many>`.
+
+        :returns: The score retrieved for each location, or the error raised when
+          retrieving it.
+        :rtype: :class:`list <python:list>`
+        """
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        deadline = Deadline.coerce(deadline)
+
+        results = [None] * len(locations)
+        pending = []
+        for position, location in enumerate(locations):
+            try:
+                latitude, longitude, address = parse_location(location)
+                latitude, longitude, parameters = self._prepare_parameters(
+                    latitude,
+                    longitude,
+                    address = address,
+                    return_transit_score = return_transit_score,
+                    return_bike_score = return_bike_score
+                )
+                cache_key, results[position] = self._get_cached(
+                    latitude,
+                    longitude,
+                    address = address,
+                    return_transit_score = return_transit_score,
+                    return_bike_score = return_bike_score
+                )
+                if results[position] is not None:
+                    continue
+
+                if self.key_pool is not None:
+                    parameters = dict(parameters,
+                                      wsapikey = self.key_pool.select(self.quota_ledger))
+
+                self._admit(parameters['wsapikey'], deadline)
+            except Exception as error:                                          # pylint: disable=W0703
+                results[position] = error
+                continue
+
+            pending.append((position, parameters, cache_key))
+
+        responses = http_client.request_many([{
+            'prepared': self._get_prepared_request(parameters),
+            'parameters': self._get_location_parameters(parameters)
+        } for _, parameters, _ in pending],
+                                             timeout = timeout,
+                                             deadline = deadline,
+                                             max_retries = max_retries)
+
+        for (position, parameters, cache_key), response in zip(pending, responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+
+                result = self._parse_response(response,
+                                              parameters['lat'],
+                                              parameters['lon'],
+                                              parameters['address'])
+            except Exception as error:                                          # pylint: disable=W0703
+                self._handle_error(error, http_client, parameters['wsapikey'])
+                results[position] = error
+                continue
+
+            self._set_cached(cache_key, result)
+            results[position] = result
+
+        return results
+
+
+class AsyncWalkScoreAPI(WalkScoreAPI):
+    """The Python object which exposes the WalkScore API's functionality to
+    :mod:`asyncio <python:asyncio>` applications.
+
+    Exposes the same interface as :class:`WalkScoreAPI`, except that
+    :meth:`get_score` is a coroutine which must be awaited and :meth:`get_scores`
+    returns an asynchronous iterator.
+    """
+
+    def __init__(self,
+                 api_key = None,
+                 http_client = None,
+                 proxy = None,
+                 max_retries = None,
+                 pool_size = 10,
+                 keep_alive = True,
+                 cache = None,
+                 coalesce_requests = True,
+                 rate_limiter = None,
+                 quota_ledger = None,
+                 key_pool = None,
+                 circuit_breaker = None,
+                 retry_policy = None,
+                 hedge_policy = None,
+                 max_concurrency = 100):
+        """
+
+        :param api_key: The API key provided by WalkScore used to authenticate
+          your application. If :obj:`None <python:None>` or not specified will
+          default to the ``WALKSCORE_API_KEY`` environment variable if present,
+          and :obj:`None <python:None>` if not.
+        :type api_key: :class:`str <python:str>` / :obj:`None <python:None>`
+
+        :param http_client: The asynchronous HTTP client instance to use for the
+          execution of requests. If not overridden, will default to
+          `aiohttp <https://docs.aiohttp.org/en/stable/>`_.
+        :type http_client: :class:`AsyncHTTPClient <walkscore.http_client.AsyncHTTPClient>`
+
+        :param proxy: The URL to use as an HTTP proxy. Defaults to
+          :obj:`None <python:None>`.
+        :type proxy: :class:`str <python:str>` / :obj:`None <python:None>`
+
+        :param max_retries: Determines the maximum number of times to retry a
+          request which fails with a retryable error (see
+          :class:`RetryPolicy <walkscore.retry.RetryPolicy>`) before giving up. If not
+          specified, defaults to environment variable ``BACKOFF_DEFAULT_TRIES`` or ``3``
+          if not available.
+        :type max_retries: :class:`int <python:int>`
+
+        :param pool_size: The maximum number of connections to the WalkScore API
+          which the default HTTP client keeps open for re-use. Ignored if
+          ``http_client`` is supplied. Defaults to ``10``.
+        :type pool_size: :class:`int <python:int>`
+
+        :param keep_alive: If ``True``, the default HTTP client keeps connections to
+          the WalkScore API open for re-use across requests. Ignored if
+          ``http_client`` is supplied. Defaults to ``True``.
+        :type keep_alive: :class:`bool <python:bool>`
+
+        :param cache: The cache in which to store scores retrieved from the
+          WalkScore API. If :obj:`None <python:None>`, scores are not cached.
+          Defaults to :obj:`None <python:None>`.
+        :type cache: :class:`ScoreCache <walkscore.cache.ScoreCache>` /
+          :obj:`None <python:None>`
+
+        :param coalesce_requests: If ``True``, concurrent requests for the same
+          location (and scores) share a single request to the WalkScore API.
+          Defaults to ``True``.
+        :type coalesce_requests: :class:`bool <python:bool>`
+
+        :param rate_limiter: The rate limiter which paces the requests sent to the
+          WalkScore API. It slows down automatically for a cool-off period after the
+          WalkScore API reports a :class:`QuotaError <walkscore.errors.QuotaError>`
+          or :class:`BlockedIPError <walkscore.errors.BlockedIPError>`. If
+          :obj:`None <python:None>`, requests are not rate limited. Defaults to
+          :obj:`None <python:None>`.
+        :type rate_limiter: :class:`RateLimiter <walkscore.ratelimit.RateLimiter>` /
+          :obj:`None <python:None>`
+
+        :param quota_ledger: The ledger in which to record every request sent to
+          the WalkScore API, so that requests are refused (or deferred) once the
+          daily quota has been used up. If :obj:`None <python:None>`, requests are
+          not recorded. Defaults to :obj:`None <python:None>`.
+        :type quota_ledger: :class:`QuotaLedger <walkscore.quota.QuotaLedger>` /
+          :obj:`None <python:None>`
+
+        :param key_pool: A pool of API keys across which to distribute requests.
+          If supplied, each request is sent using the key in the pool with the most
+          remaining budget, rather than ``api_key``. Defaults to
+          :obj:`None <python:None>`.
+        :type key_pool: :class:`APIKeyPool <walkscore.keypool.APIKeyPool>` /
+          :obj:`None <python:None>`
+
+        :param circuit_breaker: The circuit breaker which the default HTTP client
+          uses to stop sending requests while the WalkScore API is failing. Ignored
+          if ``http_client`` is supplied (configure the client's own
+          :attr:`circuit_breaker <walkscore.http_client.HTTPClient.circuit_breaker>`
+          instead). Defaults to :obj:`None <python:None>`.
+        :type circuit_breaker: :class:`CircuitBreaker <walkscore.circuitbreaker.CircuitBreaker>` /
+          :obj:`None <python:None>`
+
+        :param retry_policy: The policy which the default HTTP client uses to
+          decide whether, and when, to retry failed requests. If
+          :obj:`None <python:None>`, uses a default
+          :class:`RetryPolicy <walkscore.retry.RetryPolicy>`. Ignored if
+          ``http_client`` is supplied (configure the client's own
+          :attr:`retry_policy <walkscore.http_client.HTTPClient.retry_policy>`
+          instead). Defaults to :obj:`None <python:None>`.
+        :type retry_policy: :class:`RetryPolicy <walkscore.retry.RetryPolicy>` /
+          :obj:`None <python:None>`
+
+        :param hedge_policy: The policy which determines when a slow request is
+          hedged with a duplicate request (and the slower of the two cancelled). If
+          :obj:`None <python:None>`, requests are not hedged. Defaults to
+          :obj:`None <python:None>`.
+        :type hedge_policy: :class:`HedgePolicy <walkscore.hedging.HedgePolicy>` /
+          :obj:`None <python:None>`
+
+        :param max_concurrency: The maximum number of requests to have in flight
+          against the WalkScore API at any one time. Defaults to ``100``.
+        :type max_concurrency: :class:`int <python:int>`
+
+        """
+        self._max_concurrency = None
+        self._semaphore = None
+
+        super(AsyncWalkScoreAPI, self).__init__(api_key = api_key,
+                                                http_client = http_client,
+                                                proxy = proxy,
+                                                max_retries = max_retries,
+                                                pool_size = pool_size,
+                                                keep_alive = keep_alive,
+                                                cache = cache,
+                                                coalesce_requests = coalesce_requests,
+                                                rate_limiter = rate_limiter,
+                                                quota_ledger = quota_ledger,
+                                                key_pool = key_pool,
+                                                circuit_breaker = circuit_breaker,
+                                                retry_policy = retry_policy,
+                                                hedge_policy = hedge_policy)
+
+        self.max_concurrency = max_concurrency
+
+    def __enter__(self):
+        raise TypeError('AsyncWalkScoreAPI must be used with "async with"')
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    @property
+    def http_client(self):
+        """The object instance to use as the asynchronous HTTP client to make HTTP
+        requests against the WalkScore API.
+
+        :rtype: :class:`AsyncHTTPClient <walkscore.http_client.AsyncHTTPClient>`
+        """
+        return super(AsyncWalkScoreAPI, self).http_client
+
+    @http_client.setter
+    def http_client(self, value):
+        if value and not checkers.is_type(value, 'AsyncHTTPClient'):
+            raise ValueError('http_client must be of type "AsyncHTTPClient", was "%s"' %
+                             str(type(value)))
+
+        self._http_client = value
+
+    def _new_single_flight(self):
+        return AsyncSingleFlight()
+
+    def _new_http_client(self):
+        return default_async_http_client(proxy = self.proxy,
+                                         pool_size = self._pool_size,
+                                         keep_alive = self._keep_alive,
+                                         circuit_breaker = self._circuit_breaker,
+                                         retry_policy = self._retry_policy)
+
+    @property
+    def max_concurrency(self):
+        """The maximum number of requests to have in flight against the WalkScore
+        API at any one time.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self._max_concurrency
+
+    @max_concurrency.setter
+    def max_concurrency(self, value):
+        self._max_concurrency = validators.integer(value,
+                                                   allow_empty = False,
+                                                   minimum = 1)
+        self._semaphore = None
+
+    def _get_semaphore(self):
+        """Return the :class:`asyncio.Semaphore <python:asyncio.Semaphore>` which
+        bounds the number of requests in flight, creating it if necessary.
+        """
+        import asyncio
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        return self._semaphore
+
+    async def close(self):
+        """Close the HTTP client(s) created by the API object.
+
+        .. note::
+
+          An :class:`AsyncHTTPClient <walkscore.http_client.AsyncHTTPClient>`
+          supplied to the API object is left open. The :attr:`cache` is flushed,
+          but also left open.
+        """
+        for http_client in self._release_http_clients():
+            await http_client.close()
+
+        if self.cache is not None:
+            self.cache.flush()
+
+    async def get_score(self,
+                        latitude,
+                        longitude,
+                        address = None,
+                        return_transit_score = True,
+                        return_bike_score = True,
+                        max_retries = None,
+                        timeout = None,
+                        deadline = None):
+        """Retrieve the :term:`WalkScore`, :term:`TransitScore`, and/or
+        :term:`BikeScore` for a given location from the WalkScore API.
+
+        Accepts the same parameters, and raises the same errors, as
+        :meth:`WalkScoreAPI.get_score`.
+
+        :returns: The location's :term:`WalkScore`, :term:`TransitScore`,
+          and :term:`BikeScore` with meta-data.
+        :rtype: :class:`LocationScore <walkscore.locationscore.LocationScore>`
+        """
+        return await self._get_score(latitude,
+                                     longitude,
+                                     address = address,
+                                     return_transit_score = return_transit_score,
+                                     return_bike_score = return_bike_score,
+                                     max_retries = max_retries,
+                                     timeout = timeout,
+                                     deadline = deadline)
+
+    async def _get_score(self,
+                         latitude,
+                         longitude,
+                         address = None,
+                         return_transit_score = True,
+                         return_bike_score = True,
+                         max_retries = None,
+                         timeout = None,
+                         deadline = None,
+                         http_client = None):
+        deadline = Deadline.coerce(deadline)
+
+        latitude, longitude, parameters = self._prepare_parameters(
+            latitude,
+            longitude,
+            address = address,
+            return_transit_score = return_transit_score,
+            return_bike_score = return_bike_score
+        )
+
+        cache_key, result = self._get_cached(latitude,
+                                             longitude,
+                                             address = address,
+                                             return_transit_score = return_transit_score,
+                                             return_bike_score = return_bike_score)
+        if result is not None:
+            return result
+
+        if self._single_flight is None:
+            return await self._fetch_score(parameters,
+                                           cache_key = cache_key,
+                                           max_retries = max_retries,
+                                           timeout = timeout,
+                                           deadline = deadline,
+                                           http_client = http_client)
+
+        result, is_shared = await self._single_flight.do(
+            self._coalescing_key(parameters, timeout = timeout),
+            self._fetch_score,
+            parameters,
+            cache_key = cache_key,
+            max_retries = max_retries,
+            timeout = timeout,
+            deadline = deadline,
+            http_client = http_client,
+            **self._get_coalescing_limits(deadline)
+        )
+        if is_shared:
+            result = self._localize(copy.copy(result), latitude, longitude, address)
+
+        return result
+
+    async def _fetch_score(self,
+                           parameters,
+                           cache_key = None,
+                           max_retries = None,
+                           timeout = None,
+                           deadline = None,
+                           http_client = None):
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        if http_client is None:
+            http_client = self.http_client
+
+        if self.key_pool is not None:
+            parameters = dict(parameters,
+                              wsapikey = self.key_pool.select(self.quota_ledger))
+
+        await self._admit(parameters['wsapikey'], deadline)
+
+        try:
+            if self.hedge_policy is not None:
+                response = await self.hedge_policy.call_async(
+                    getattr(http_client, 'latency', None),
+                    functools.partial(self._send,
+                                      http_client,
+                                      parameters,
+                                      max_retries,
+                                      timeout = timeout,
+                                      deadline = deadline),
+                    functools.partial(self._send_hedge,
+                                      http_client,
+                                      parameters,
+                                      timeout = timeout,
+                                      deadline = deadline)
+                )
+            else:
+                response = await self._send(http_client,
+                                            parameters,
+                                            max_retries,
+                                            timeout = timeout,
+                                            deadline = deadline)
+
+            result = self._parse_response(response,
+                                          parameters['lat'],
+                                          parameters['lon'],
+                                          parameters['address'])
+        except Exception as error:
+            self._handle_error(error, http_client, parameters['wsapikey'])
+            raise
+
+        self._set_cached(cache_key, result)
+
+        return result
+
+    async def _admit(self, api_key, deadline = None):
+        if self.quota_ledger is not None:
+            await self.quota_ledger.consume_async(
+                api_key,
+                max_wait = self._get_max_wait(deadline)
+            )
+
+        if self.rate_limiter is not None:
+            if not await self.rate_limiter.acquire_async(
+                    max_wait = self._get_max_wait(deadline)
+            ):
+                raise HTTPTimeoutError('The rate limiter would not admit the request '
+                                       'before its deadline.')
+
+    async def _send(self, http_client, parameters, max_retries, timeout = None, deadline = None):
+        prepared = self._get_prepared_request(parameters)
+        async with self._get_semaphore():
+            if max_retries:
+                return await http_client.send_with_retries(
+                    prepared,
+                    self._get_location_parameters(parameters),
+                    max_retries = max_retries,
+                    timeout = timeout,
+                    deadline = deadline
+                )
+
+            return await http_client.send(prepared,
+                                          self._get_location_parameters(parameters),
+                                          timeout = timeout,
+                                          deadline = deadline)
+
+    async def _send_hedge(self, http_client, parameters, timeout = None, deadline = None):
+        await self._admit(parameters['wsapikey'], deadline)
+
+        async with self._get_semaphore():
+            return await http_client.send(self._get_prepared_request(parameters),
+                                          self._get_location_parameters(parameters),
+                                          timeout = timeout,
+                                          deadline = deadline)
+
+    def get_scores(self,
+                   locations,
+                   max_workers = None,
+                   ordered = True,
+                   return_transit_score = True,
+                   return_bike_score = True,
+                   max_retries = None,
+                   timeout = None,
+                   deadline = None,
+                   return_exceptions = False,
+                   deduplicate = False,
+                   repoll = None):
+        """Retrieve the :term:`WalkScore`, :term:`TransitScore`, and/or
+        :term:`BikeScore` for a batch of locations, executing the requests
+        concurrently.
+
+        Accepts the same parameters as :meth:`WalkScoreAPI.get_scores`, except that
+        ``max_workers`` limits the number of locations being processed at once
+        (defaulting to :attr:`max_concurrency`).
+
+        .. code-block:: python
+
+          async with AsyncWalkScoreAPI(api_key = 'MY API KEY') as api:
+              async for result in api.get_scores(locations):
+                  print(result.walk_score)
+
+        :returns: Asynchronous iterator over the locations' scores, as
+          :class:`LocationScore <walkscore.locationscore.LocationScore>` instances.
+        :rtype: asynchronous iterator
+
+        :raises AuthenticationError: if the API key is invalid
+        :raises ValueError: if ``max_workers`` is not a positive integer, if
+          ``timeout`` or ``deadline`` are not valid, or if ``repoll`` is not a
+          :class:`RepollQueue <walkscore.repoll.RepollQueue>`
+        """
+        return super(AsyncWalkScoreAPI, self).get_scores(
+            locations,
+            max_workers = max_workers,
+            ordered = ordered,
+            return_transit_score = return_transit_score,
+            return_bike_score = return_bike_score,
+            max_retries = max_retries,
+            timeout = timeout,
+            deadline = deadline,
+            return_exceptions = return_exceptions,
+            deduplicate = deduplicate,
+            repoll = repoll
+        )
+
+    async def _iter_scores(self,
+                           locations,
+                           max_workers = None,
+                           ordered = True,
+                           return_transit_score = True,
+                           return_bike_score = True,
+                           max_retries = None,
+                           timeout = None,
+                           deadline = None,
+                           return_exceptions = False,
+                           deduplicate = False,
+                           repoll = None):
+        """Asynchronous generator which executes a batch of score requests on
+        behalf of :meth:`get_scores`.
+        """
+        max_concurrency = max_workers or self.max_concurrency
+
+        async def get_location_score(location):
+            latitude, longitude, address = parse_location(location)
+            return await self._get_score(latitude,
+                                         longitude,
+                                         address = address,
+                                         return_transit_score = return_transit_score,
+                                         return_bike_score = return_bike_score,
+                                         max_retries = max_retries,
+                                         timeout = timeout,
+                                         deadline = deadline)
+
+        if not deduplicate:
+            async for result in run_async_batch(get_location_score,
+                                                locations,
+                                                max_concurrency,
+                                                ordered = ordered,
+                                                return_exceptions = return_exceptions,
+                                                repoll_queue = repoll,
+                                                repoll_on = self._is_in_progress):
+                yield result
+
+            return
+
+        plan = self._plan_batch(locations)
+
+        async def get_planned_score(request_index):
+            try:
+                return request_index, await get_location_score(plan.requests[request_index])
+            except Exception as error:                                          # pylint: disable=W0703
+                return request_index, error
+
+        async for request_index, result in run_async_batch(get_planned_score,
+                                                           range(len(plan.requests)),
+                                                           max_concurrency,
+                                                           ordered = ordered,
+                                                           repoll_queue = repoll,
+                                                           repoll_on = self._is_planned_in_progress):
+            for value in self._resolve_planned(plan,
+                                               request_index,
+                                               result,
+                                               ordered,
+                                               return_exceptions):
+                yield value
@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.batch
+#########################################
+
+Implements the machinery used to execute batches of score requests concurrently.
+
+"""
+import os
+import copy
+import time
+from collections import deque
+from concurrent import futures
+
+from validator_collection import validators
+
+from walkscore.cache import DEFAULT_GRID_SIZE, grid_cell
+
+
+def default_max_workers():
+    """Return the default number of worker threads to use for a batch.
+
+    Score requests are I/O-bound, so this mirrors the default applied by
+    :class:`ThreadPoolExecutor <python:concurrent.futures.ThreadPoolExecutor>`
+    (the number of CPUs plus four, capped at ``32``).
+
+    :rtype: :class:`int <python:int>`
+    """
+    return min(32, (os.cpu_count() or 1) + 4)
+
+
+def parse_location(location):
+    """Normalize a location supplied to a batch into its constituent parts.
+
+    :param location: The location to normalize. Accepts either a
+      :class:`dict <python:dict>` with ``latitude``, ``longitude``, and (optionally)
+      ``address`` keys, or an iterable of ``(latitude, longitude)`` or
+      ``(latitude, longitude, address)``.
+    :type location: :class:`dict <python:dict>` / :class:`tuple <python:tuple>`
+
+    :returns: The location's latitude, longitude, and address.
+    :rtype: :class:`tuple <python:tuple>`
+
+    :raises ValueError: if ``location`` cannot be interpreted as a location
+    """
+    if isinstance(location, dict):
+        return (location.get('latitude', None),
+                location.get('longitude', None),
+                location.get('address', None))
+
+    location = validators.iterable(location,
+                                   allow_empty = False,
+                                   minimum_length = 2,
+                                   maximum_length = 3)
+    location = tuple(location)
+    if len(location) == 2:
+        return location[0], location[1], None
+
+    return location
+
+
+class BatchPlan(object):
+    """Collapses the locations in a batch which fall in the same grid cell, so
+    that only one request is made per cell.
+
+    The WalkScore API snaps every location to a grid of approximately 500 ft. by
+    500 ft., so locations which fall in the same cell receive identical scores.
+    The plan exposes one :attr:`requests` entry per cell, and :meth:`resolve`
+    fans the result of each request back out to every location in its cell.
+
+    .. note::
+
+      Building a plan consumes ``locations`` in full.
+    """
+
+    def __init__(self, locations, grid_size = DEFAULT_GRID_SIZE):
+        """
+        :param locations: The locations in the batch, in any form accepted by
+          :func:`parse_location`.
+        :type locations: iterable
+
+        :param grid_size: The size (in decimal degrees) of the grid cells used to
+          collapse locations. Defaults to
+          :data:`DEFAULT_GRID_SIZE <walkscore.cache.DEFAULT_GRID_SIZE>`.
+        :type grid_size: numeric
+        """
+        self.locations = []
+        self.requests = []
+        self._members = []
+        self._results = {}
+        self._next_index = 0
+
+        cells = {}
+        for index, location in enumerate(locations):
+            self.locations.append(location)
+            try:
+                latitude, longitude, _ = parse_location(location)
+                cell = grid_cell(latitude, longitude, grid_size)
+            except (TypeError, ValueError):
+                cell = None
+
+            if cell is not None and cell in cells:
+                self._members[cells[cell]].append(index)
+                continue
+
+            if cell is not None:
+                cells[cell] = len(self.requests)
+
+            self.requests.append(location)
+            self._members.append([index])
+
+    def __len__(self):
+        return len(self.locations)
+
+    @property
+    def saved_calls(self):
+        """The number of requests saved by collapsing locations.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return len(self.locations) - len(self.requests)
+
+    def resolve(self, request_index, result, ordered = True):
+        """Fan the result of a request out to every location in its cell.
+
+        :param request_index: The index (within :attr:`requests`) of the request
+          which produced ``result``.
+        :type request_index: :class:`int <python:int>`
+
+        :param result: The score retrieved for the request, or the exception raised
+          when retrieving it.
+        :type result: :class:`LocationScore <walkscore.locationscore.LocationScore>` /
+          :class:`Exception <python:Exception>`
+
+        :param ordered: If ``True``, returns only the results which are next in the
+          order of :attr:`locations`, holding back the rest until the results
+          which precede them are resolved. Defaults to ``True``.
+        :type ordered: :class:`bool <python:bool>`
+
+        :returns: The results which are ready, each a copy of ``result`` carrying
+          its own location's coordinates and address.
+        :rtype: :class:`list <python:list>`
+        """
+        resolved = []
+        for position, index in enumerate(self._members[request_index]):
+            value = result
+            if position > 0 and not isinstance(result, Exception):
+                latitude, longitude, address = parse_location(self.locations[index])
+                value = copy.copy(result)
+                value.address = address
+                value.original_latitude = latitude
+                value.original_longitude = longitude
+
+            resolved.append((index, value))
+
+        if not ordered:
+            return [value for _, value in resolved]
+
+        self._results.update(resolved)
+        ready = []
+        while self._next_index in self._results:
+            ready.append(self._results.pop(self._next_index))
+            self._next_index += 1
+
+        return ready
+
+
+def _unwrap(future, return_exceptions):
+    """Return the result of ``future`` (or :class:`asyncio.Task <python:asyncio.Task>`),
+    or its exception if ``return_exceptions`` is ``True``.
+    """
+    error = future.exception()
+    if error is None:
+        return future.result()
+
+    if return_exceptions:
+        return error
+
+    raise error
+
+
+def _outcome(future):
+    """Return the result of ``future`` and the exception it raised (either of
+    which may be :obj:`None <python:None>`).
+
+    :rtype: :class:`tuple <python:tuple>`
+    """
+    error = future.exception()
+    if error is not None:
+        return None, error
+
+    return future.result(), None
+
+
+def run_batch(function,
+              items,
+              max_workers = None,
+              ordered = True,
+              return_exceptions = False,
+              repoll_queue = None,
+              repoll_on = None):
+    """Apply ``function`` to each of ``items`` on a bounded thread pool, yielding
+    the results.
+
+    At most ``max_workers * 2`` items are submitted to the pool at any one time,
+    so that very large (or lazily-generated) batches are consumed incrementally
+    rather than materialized all at once.
+
+    :param function: The callable to apply to each item. Receives the item as
+      its only argument.
+    :type function: callable
+
+    :param items: The items to process.
+    :type items: iterable
+
+    :param max_workers: The maximum number of worker threads to use. If
+      :obj:`None <python:None>`, defaults to :func:`default_max_workers`.
+    :type max_workers: :class:`int <python:int>` / :obj:`None <python:None>`
+
+    :param ordered: If ``True``, yields results in the order of ``items``. If
+      ``False``, yields results as they complete. Defaults to ``True``.
+    :type ordered: :class:`bool <python:bool>`
+
+    :param return_exceptions: If ``True``, yields the exception raised by an item
+      in place of its result. If ``False``, the exception is re-raised when the
+      item's result is reached. Defaults to ``False``.
+    :type return_exceptions: :class:`bool <python:bool>`
+
+    :param repoll_queue: The queue in which to defer items whose outcome satisfies
+      ``repoll_on``. Deferred items are submitted again once they are due
+      (interleaved with the remaining ``items``), and their results are yielded
+      once they are no longer deferred. Defaults to :obj:`None <python:None>`.
+    :type repoll_queue: :class:`RepollQueue <walkscore.repoll.RepollQueue>` /
+      :obj:`None <python:None>`
+
+    :param repoll_on: A callable which receives the result of an item and the
+      exception it raised (either of which may be :obj:`None <python:None>`), and
+      returns ``True`` if the item should be deferred. Required if
+      ``repoll_queue`` is supplied.
+    :type repoll_on: callable / :obj:`None <python:None>`
+
+    :returns: Iterator over the results of ``function``.
+    :rtype: iterator
+    """
+    max_workers = validators.integer(max_workers,
+                                     allow_empty = True,
+                                     minimum = 1) or default_max_workers()
+    window = max_workers * 2
+    items = iter(items)
+
+    executor = futures.ThreadPoolExecutor(max_workers = max_workers)
+    pending = deque() if ordered else set()
+    attempts = {}
+
+    def submit(item, attempt):
+        future = executor.submit(function, item)
+        if ordered:
+            pending.append(future)
+        else:
+            pending.add(future)
+
+        if repoll_queue is not None:
+            attempts[future] = (item, attempt)
+
+    def submit_next():
+        if repoll_queue is not None:
+            entry = repoll_queue.pop_due()
+            if entry is not None:
+                submit(*entry)
+                return True
+
+        try:
+            item = next(items)
+        except StopIteration:
+            return False
+
+        submit(item, 0)
+
+        return True
+
+    def fill_window():
+        while len(pending) < window and submit_next():
+            pass
+
+    def defer(future):
+        if repoll_queue is None:
+            return False
+
+        item, attempt = attempts.pop(future)
+        if not repoll_on(*_outcome(future)):
+            return False
+
+        return repoll_queue.push(item, attempt + 1)
+
+    try:
+        fill_window()
+
+        while pending or (repoll_queue is not None and len(repoll_queue)):
+            timeout = repoll_queue.next_delay() if repoll_queue is not None else None
+            if not pending:
+                time.sleep(timeout)
+                fill_window()
+                continue
+
+            if ordered:
+                done, _ = futures.wait([pending[0]], timeout = timeout)
+                if done:
+                    pending.popleft()
+            else:
+                done, _ = futures.wait(pending,
+                                       timeout = timeout,
+                                       return_when = futures.FIRST_COMPLETED)
+                pending.difference_update(done)
+
+            fill_window()
+            for future in done:
+                if defer(future):
+                    continue
+
+                fill_window()
+                yield _unwrap(future, return_exceptions)
+    finally:
+        for future in pending:
+            future.cancel()
+
+        executor.shutdown(wait = True)
+
+
+async def run_async_batch(function,
+                          items,
+                          max_concurrency,
+                          ordered = True,
+                          return_exceptions = False,
+                          repoll_queue = None,
+                          repoll_on = None):
+    """Await ``function`` for each of ``items`` concurrently, yielding the results.
+
+    At most ``max_concurrency * 2`` items are scheduled at any one time, so that
+    very large (or lazily-generated) batches are consumed incrementally rather
+    than materialized all at once.
+
+    :param function: The coroutine function to await for each item. Receives the
+      item as its only argument.
+    :type function: callable
+
+    :param items: The items to process.
+    :type items: iterable
+
+    :param max_concurrency: The maximum number of items to process concurrently.
+    :type max_concurrency: :class:`int <python:int>`
+
+    :param ordered: If ``True``, yields results in the order of ``items``. If
+      ``False``, yields results as they complete. Defaults to ``True``.
+    :type ordered: :class:`bool <python:bool>`
+
+    :param return_exceptions: If ``True``, yields the exception raised by an item
+      in place of its result. If ``False``, the exception is re-raised when the
+      item's result is reached. Defaults to ``False``.
+    :type return_exceptions: :class:`bool <python:bool>`
+
+    :param repoll_queue: The queue in which to defer items whose outcome satisfies
+      ``repoll_on``, as for :func:`run_batch`. Defaults to
+      :obj:`None <python:None>`.
+    :type repoll_queue: :class:`RepollQueue <walkscore.repoll.RepollQueue>` /
+      :obj:`None <python:None>`
+
+    :param repoll_on: A callable which receives the result of an item and the
+      exception it raised, and returns ``True`` if the item should be deferred.
+      Required if ``repoll_queue`` is supplied.
+    :type repoll_on: callable / :obj:`None <python:None>`
+
+    :returns: Asynchronous iterator over the results of ``function``.
+    :rtype: asynchronous iterator
+    """
+    import asyncio
+
+    window = max_concurrency * 2
+    items = iter(items)
+    pending = []
+    attempts = {}
+
+    def submit(item, attempt):
+        task = asyncio.ensure_future(function(item))
+        pending.append(task)
+        if repoll_queue is not None:
+            attempts[task] = (item, attempt)
+
+    def submit_next():
+        if repoll_queue is not None:
+            entry = repoll_queue.pop_due()
+            if entry is not None:
+                submit(*entry)
+                return True
+
+        try:
+            item = next(items)
+        except StopIteration:
+            return False
+
+        submit(item, 0)
+
+        return True
+
+    def fill_window():
+        while len(pending) < window and submit_next():
+            pass
+
+    def defer(task):
+        if repoll_queue is None:
+            return False
+
+        item, attempt = attempts.pop(task)
+        if not repoll_on(*_outcome(task)):
+            return False
+
+        return repoll_queue.push(item, attempt + 1)
+
+    try:
+        fill_window()
+
+        while pending or (repoll_queue is not None and len(repoll_queue)):
+            timeout = repoll_queue.next_delay() if repoll_queue is not None else None
+            if not pending:
+                await asyncio.sleep(timeout)
+                fill_window()
+                continue
+
+            if ordered:
+                done, _ = await asyncio.wait([pending[0]], timeout = timeout)
+                if done:
+                    pending.pop(0)
+            else:
+                done, _ = await asyncio.wait(pending,
+                                             timeout = timeout,
+                                             return_when = asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+
+            fill_window()
+            for task in done:
+                if defer(task):
+                    continue
+
+                fill_window()
+                yield _unwrap(task, return_exceptions)
+    finally:
+        for task in pending:
+            task.cancel()
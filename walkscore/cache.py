@@ -0,0 +1,572 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.cache
+#########################################
+
+Implements caches which store :class:`LocationScore` results so that repeated
+requests for the same location do not need to be sent to the WalkScore API.
+
+The WalkScore API snaps every location to a grid of approximately 500 ft. by
+500 ft. (see :attr:`LocationScore.snapped_latitude` and
+:attr:`LocationScore.snapped_longitude`), so nearby locations receive identical
+scores. The caches key their entries on the grid cell in which a location falls.
+
+"""
+import os
+import copy
+import time
+import atexit
+import weakref
+import warnings
+import threading
+from collections import OrderedDict
+
+from validator_collection import validators
+
+from walkscore import jsoncodec
+from walkscore.locationscore import LocationScore
+
+#: The size (in decimal degrees) of the grid cells used to key cached scores. This
+#: approximates the ~500 ft. grid to which the WalkScore API snaps locations.
+DEFAULT_GRID_SIZE = 0.0015
+
+# The SQLite caches which may hold buffered scores, committed when the
+# interpreter exits.
+_open_sqlite_caches = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_sqlite_caches():
+    """Commit the scores buffered by any :class:`SQLiteCache` which has not been
+    closed."""
+    for cache in list(_open_sqlite_caches):
+        try:
+            cache.close()
+        except Exception as error:                                              # pylint: disable=W0703
+            warnings.warn('Could not commit the scores buffered for %s: %s' %
+                          (cache.path, error))
+
+
+def grid_cell(latitude, longitude, grid_size = DEFAULT_GRID_SIZE):
+    """Return the grid cell in which a location falls.
+
+    :param latitude: The latitude of the location.
+    :type latitude: numeric
+
+    :param longitude: The longitude of the location.
+    :type longitude: numeric
+
+    :param grid_size: The size (in decimal degrees) of the grid cells. Defaults to
+      :data:`DEFAULT_GRID_SIZE`.
+    :type grid_size: numeric
+
+    :returns: The row and column of the grid cell.
+    :rtype: :class:`tuple <python:tuple>` of :class:`int <python:int>`
+
+    :raises TypeError: if ``latitude`` or ``longitude`` is :obj:`None <python:None>`
+    :raises ValueError: if ``latitude`` or ``longitude`` is not numeric
+    """
+    return (int(round(float(latitude) / grid_size)),
+            int(round(float(longitude) / grid_size)))
+
+
+class ScoreCache(object):
+    """Base class for caches of :class:`LocationScore` results."""
+
+    def __init__(self,
+                 ttl = None,
+                 grid_size = DEFAULT_GRID_SIZE):
+        """
+        :param ttl: The number of seconds for which a cached score remains valid.
+          If :obj:`None <python:None>`, cached scores do not expire. Defaults to
+          :obj:`None <python:None>`.
+        :type ttl: numeric / :obj:`None <python:None>`
+
+        :param grid_size: The size (in decimal degrees) of the grid cells used to
+          key cached scores. Defaults to ``0.0015``, approximately 500 ft.
+        :type grid_size: numeric
+        """
+        self._ttl = validators.numeric(ttl, allow_empty = True, minimum = 0)
+        self._grid_size = validators.numeric(grid_size, minimum = 0.000001)
+
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def ttl(self):
+        """The number of seconds for which a cached score remains valid.
+
+        :rtype: numeric / :obj:`None <python:None>`
+        """
+        return self._ttl
+
+    @property
+    def grid_size(self):
+        """The size (in decimal degrees) of the grid cells used to key cached
+        scores.
+
+        :rtype: numeric
+        """
+        return self._grid_size
+
+    @property
+    def stats(self):
+        """Counters describing the cache's effectiveness.
+
+        :rtype: :class:`dict <python:dict>` with ``hits``, ``misses``,
+          ``evictions``, and ``size`` keys
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self)
+            }
+
+    def make_key(self,
+                 latitude,
+                 longitude,
+                 return_transit_score = True,
+                 return_bike_score = True):
+        """Return the key under which the score for a location is cached.
+
+        :param latitude: The latitude of the location.
+        :type latitude: numeric
+
+        :param longitude: The longitude of the location.
+        :type longitude: numeric
+
+        :param return_transit_score: Whether the :term:`TransitScore` was requested.
+        :type return_transit_score: :class:`bool <python:bool>`
+
+        :param return_bike_score: Whether the :term:`BikeScore` was requested.
+        :type return_bike_score: :class:`bool <python:bool>`
+
+        :returns: The grid cell in which the location falls, and the flags.
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        return grid_cell(latitude, longitude, self.grid_size) + \
+            (bool(return_transit_score), bool(return_bike_score))
+
+    def get(self, key):
+        """Return the score cached under ``key``.
+
+        :param key: The key returned by :meth:`make_key`.
+        :type key: :class:`tuple <python:tuple>`
+
+        :returns: The cached score, or :obj:`None <python:None>` if there is no
+          (unexpired) score cached under ``key``.
+        :rtype: :class:`LocationScore` / :obj:`None <python:None>`
+        """
+        raise NotImplementedError('ScoreCache subclasses must implement `get`')
+
+    def set(self, key, value):
+        """Cache ``value`` under ``key``.
+
+        :param key: The key returned by :meth:`make_key`.
+        :type key: :class:`tuple <python:tuple>`
+
+        :param value: The score to cache.
+        :type value: :class:`LocationScore`
+        """
+        raise NotImplementedError('ScoreCache subclasses must implement `set`')
+
+    def delete(self, key):
+        """Remove the score cached under ``key``, if any.
+
+        :param key: The key returned by :meth:`make_key`.
+        :type key: :class:`tuple <python:tuple>`
+        """
+        raise NotImplementedError('ScoreCache subclasses must implement `delete`')
+
+    def clear(self):
+        """Remove all cached scores."""
+        raise NotImplementedError('ScoreCache subclasses must implement `clear`')
+
+    def flush(self):
+        """Persist any scores which the cache has buffered."""
+        pass
+
+    def close(self):
+        """Release any resources held by the cache."""
+        pass
+
+    def __len__(self):
+        raise NotImplementedError('ScoreCache subclasses must implement `__len__`')
+
+
+class MemoryCache(ScoreCache):
+    """Thread-safe, in-process :class:`ScoreCache` which evicts the least-recently
+    used score once it holds ``max_entries`` scores."""
+
+    def __init__(self,
+                 max_entries = 10000,
+                 ttl = None,
+                 grid_size = DEFAULT_GRID_SIZE):
+        """
+        :param max_entries: The maximum number of scores to hold. Defaults to
+          ``10000``.
+        :type max_entries: :class:`int <python:int>`
+
+        :param ttl: The number of seconds for which a cached score remains valid.
+          If :obj:`None <python:None>`, cached scores do not expire. Defaults to
+          :obj:`None <python:None>`.
+        :type ttl: numeric / :obj:`None <python:None>`
+
+        :param grid_size: The size (in decimal degrees) of the grid cells used to
+          key cached scores. Defaults to ``0.0015``, approximately 500 ft.
+        :type grid_size: numeric
+        """
+        super(MemoryCache, self).__init__(ttl = ttl, grid_size = grid_size)
+
+        self._max_entries = validators.integer(max_entries, minimum = 1)
+        self._entries = OrderedDict()
+
+    @property
+    def max_entries(self):
+        """The maximum number of scores to hold.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self._max_entries
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy.copy(entry[1])
+
+    def set(self, key, value):
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.monotonic() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (expires_at, copy.copy(value))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last = False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCache(ScoreCache):
+    """:class:`ScoreCache` which persists scores to a
+    `SQLite <https://www.sqlite.org/>`_ database on disk.
+
+    Because the database is opened in
+    `write-ahead logging <https://www.sqlite.org/wal.html>`_ mode, multiple
+    processes on the same host can share the same cache file (and so each other's
+    cached scores), and the cache survives restarts.
+
+    Scores are stored as the JSON-serialized output of
+    :meth:`LocationScore.to_dict() <walkscore.locationscore.LocationScore.to_dict>`.
+    Writes are buffered in memory and committed in batches, either once
+    ``batch_size`` scores are waiting or once ``flush_interval`` seconds have
+    elapsed since the last commit. Call :meth:`flush` (or :meth:`close`) to commit
+    them immediately. Scores still buffered when the cache is garbage collected or
+    the interpreter exits are committed then.
+
+    Expired scores are deleted from the database as they are found, and all
+    expired scores are deleted at most once every ``purge_interval`` seconds when
+    buffered scores are committed, so the database does not grow without limit.
+    Call :meth:`vacuum` to also compact the database file.
+
+    .. caution::
+
+      All processes sharing a cache file must use the same ``grid_size``.
+    """
+
+    def __init__(self,
+                 path,
+                 ttl = None,
+                 grid_size = DEFAULT_GRID_SIZE,
+                 batch_size = 100,
+                 flush_interval = 1.0,
+                 timeout = 30,
+                 purge_interval = 300):
+        """
+        :param path: The path to the SQLite database file. It is created if it does
+          not already exist.
+        :type path: :class:`str <python:str>`
+
+        :param ttl: The number of seconds for which a cached score remains valid.
+          If :obj:`None <python:None>`, cached scores do not expire. Defaults to
+          :obj:`None <python:None>`.
+        :type ttl: numeric / :obj:`None <python:None>`
+
+        :param grid_size: The size (in decimal degrees) of the grid cells used to
+          key cached scores. Defaults to ``0.0015``, approximately 500 ft.
+        :type grid_size: numeric
+
+        :param batch_size: The number of scores to buffer before committing them to
+          the database. Defaults to ``100``.
+        :type batch_size: :class:`int <python:int>`
+
+        :param flush_interval: The maximum number of seconds to buffer scores before
+          committing them to the database. Defaults to ``1.0``.
+        :type flush_interval: numeric
+
+        :param timeout: The number of seconds to wait for another process to release
+          its lock on the database. Defaults to ``30``.
+        :type timeout: numeric
+
+        :param purge_interval: The minimum number of seconds between deletions of
+          all expired scores from the database. Defaults to ``300``.
+        :type purge_interval: numeric
+        """
+        super(SQLiteCache, self).__init__(ttl = ttl, grid_size = grid_size)
+
+        self._path = validators.string(path, allow_empty = False)
+        self._batch_size = validators.integer(batch_size, minimum = 1)
+        self._flush_interval = validators.numeric(flush_interval, minimum = 0)
+        self._timeout = validators.numeric(timeout, minimum = 0)
+        self._purge_interval = validators.numeric(purge_interval, minimum = 0)
+
+        self._connection = None
+        self._pid = None
+        self._pending = OrderedDict()
+        self._last_flush = time.monotonic()
+        self._last_purge = time.monotonic()
+
+        self._connect()
+        _open_sqlite_caches.add(self)
+
+    @property
+    def path(self):
+        """The path to the SQLite database file.
+
+        :rtype: :class:`str <python:str>`
+        """
+        return self._path
+
+    def _connect(self):
+        """Return the connection to the database, opening it (and creating the
+        schema) if necessary.
+
+        A new connection is opened if the process has forked since the connection
+        was opened, as SQLite connections cannot be shared across processes.
+
+        :rtype: :class:`sqlite3.Connection <python:sqlite3.Connection>`
+        """
+        import sqlite3
+
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        connection = sqlite3.connect(self.path,
+                                     timeout = self._timeout,
+                                     isolation_level = None,
+                                     check_same_thread = False)
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute('PRAGMA synchronous = NORMAL')
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS location_scores (
+                latitude_cell INTEGER NOT NULL,
+                longitude_cell INTEGER NOT NULL,
+                transit INTEGER NOT NULL,
+                bike INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                expires_at REAL,
+                PRIMARY KEY (latitude_cell, longitude_cell, transit, bike)
+            ) WITHOUT ROWID""")
+        connection.execute("""
+            CREATE INDEX IF NOT EXISTS ix_location_scores_expires_at
+            ON location_scores (expires_at)""")
+
+        self._connection = connection
+        self._pid = os.getpid()
+
+        return connection
+
+    @staticmethod
+    def _serialize(value):
+        """Serialize ``value`` to the JSON payload stored in the database.
+
+        :rtype: :class:`str <python:str>`
+        """
+        result = value.to_dict(api_compatible = True)
+        if result['updated'] is not None:
+            result['updated'] = result['updated'].isoformat()
+
+        return jsoncodec.dumps(result)
+
+    @staticmethod
+    def _deserialize(payload):
+        """Deserialize a JSON payload stored in the database.
+
+        :rtype: :class:`LocationScore <walkscore.locationscore.LocationScore>`
+        """
+        return LocationScore.from_dict(jsoncodec.loads(payload), api_compatible = True)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._pending.get(key, None)
+            if entry is None:
+                entry = self._connect().execute(
+                    """SELECT payload, expires_at FROM location_scores
+                       WHERE latitude_cell = ? AND longitude_cell = ?
+                       AND transit = ? AND bike = ?""",
+                    key
+                ).fetchone()
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if entry[1] is not None and entry[1] <= now:
+                self.misses += 1
+                self._delete_expired(key, now)
+                return None
+
+            self.hits += 1
+
+        return self._deserialize(entry[0])
+
+    def set(self, key, value):
+        expires_at = None
+        if self.ttl is not None:
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._pending[key] = (self._serialize(value), expires_at)
+            if len(self._pending) >= self._batch_size or \
+               time.monotonic() - self._last_flush >= self._flush_interval:
+                self.flush()
+
+    def _delete_expired(self, key, now):
+        """Delete the score stored under ``key`` if it expired by ``now``."""
+        self._pending.pop(key, None)
+        self._connect().execute(
+            """DELETE FROM location_scores
+               WHERE latitude_cell = ? AND longitude_cell = ?
+               AND transit = ? AND bike = ? AND expires_at <= ?""",
+            key + (now,)
+        )
+        self.evictions += 1
+
+    def _purge(self, connection):
+        """Delete all expired scores from the database.
+
+        :returns: The number of expired scores deleted.
+        :rtype: :class:`int <python:int>`
+        """
+        cursor = connection.execute(
+            'DELETE FROM location_scores WHERE expires_at <= ?',
+            (time.time(),)
+        )
+        removed = max(cursor.rowcount, 0)
+        self.evictions += removed
+        self._last_purge = time.monotonic()
+
+        return removed
+
+    def flush(self):
+        """Commit any buffered scores to the database (deleting all expired scores
+        too, if ``purge_interval`` seconds have elapsed since they were last
+        deleted)."""
+        with self._lock:
+            if self._pending:
+                connection = self._connect()
+                connection.execute('BEGIN IMMEDIATE')
+                try:
+                    connection.executemany(
+                        """INSERT OR REPLACE INTO location_scores
+                           (latitude_cell, longitude_cell, transit, bike,
+                            payload, expires_at)
+                           VALUES (?, ?, ?, ?, ?, ?)""",
+                        [key + entry for key, entry in self._pending.items()]
+                    )
+                    if time.monotonic() - self._last_purge >= self._purge_interval:
+                        self._purge(connection)
+                except Exception:
+                    connection.execute('ROLLBACK')
+                    raise
+
+                connection.execute('COMMIT')
+                self._pending.clear()
+
+            self._last_flush = time.monotonic()
+
+    def delete(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+            self._connect().execute(
+                """DELETE FROM location_scores
+                   WHERE latitude_cell = ? AND longitude_cell = ?
+                   AND transit = ? AND bike = ?""",
+                key
+            )
+
+    def clear(self):
+        with self._lock:
+            self._pending.clear()
+            self._connect().execute('DELETE FROM location_scores')
+
+    def vacuum(self):
+        """Remove expired scores from the database and compact the database file.
+
+        :returns: The number of expired scores removed.
+        :rtype: :class:`int <python:int>`
+        """
+        with self._lock:
+            self.flush()
+            connection = self._connect()
+            removed = self._purge(connection)
+
+            connection.execute('VACUUM')
+
+        return removed
+
+    def close(self):
+        """Commit any buffered scores and close the connection to the database."""
+        with self._lock:
+            _open_sqlite_caches.discard(self)
+            if self._pending:
+                self.flush()
+
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+
+            self._connection = None
+
+    def __del__(self):
+        if getattr(self, '_pending', None):
+            try:
+                self.close()
+            except Exception:                                                   # pylint: disable=W0703
+                pass
+
+    def __len__(self):
+        with self._lock:
+            self.flush()
+            return self._connect().execute(
+                'SELECT COUNT(*) FROM location_scores'
+            ).fetchone()[0]
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.circuitbreaker
+#########################################
+
+Implements a circuit breaker which stops requests from being sent to the
+WalkScore API while it is failing, so that callers fail fast rather than waiting
+for each request to time out.
+
+"""
+import time
+import threading
+from collections import deque
+
+from validator_collection import validators
+
+from walkscore.errors import CircuitOpenError, HTTPConnectionError, InternalAPIError
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+
+class CircuitBreaker(object):
+    """Tracks the outcome of recent requests and stops further requests once too
+    many of them have failed.
+
+    The breaker starts **closed**, letting every request through. Once at least
+    ``minimum_requests`` of the last ``window_size`` requests have been recorded and
+    the share of them which failed reaches ``failure_threshold``, the breaker
+    **opens**: requests fail immediately with a
+    :class:`CircuitOpenError <walkscore.errors.CircuitOpenError>`.
+
+    After ``reset_timeout`` seconds, the breaker becomes **half-open** and lets up
+    to ``half_open_requests`` trial requests through. If a trial succeeds, the
+    breaker closes again; if it fails, the breaker re-opens for another
+    ``reset_timeout`` seconds.
+
+    Failures are :class:`HTTPConnectionError <walkscore.errors.HTTPConnectionError>`
+    (including :class:`HTTPTimeoutError <walkscore.errors.HTTPTimeoutError>`),
+    :class:`InternalAPIError <walkscore.errors.InternalAPIError>`, and responses
+    with a ``5xx`` status code.
+    """
+
+    def __init__(self,
+                 failure_threshold = 0.5,
+                 window_size = 20,
+                 minimum_requests = 10,
+                 reset_timeout = 30,
+                 half_open_requests = 1):
+        """
+        :param failure_threshold: The share (between ``0`` and ``1``) of recent
+          requests which must fail for the breaker to open. Defaults to ``0.5``.
+        :type failure_threshold: numeric
+
+        :param window_size: The number of recent requests whose outcome is tracked.
+          Defaults to ``20``.
+        :type window_size: :class:`int <python:int>`
+
+        :param minimum_requests: The number of requests which must be tracked before
+          the breaker may open. Defaults to ``10``.
+        :type minimum_requests: :class:`int <python:int>`
+
+        :param reset_timeout: The number of seconds for which the breaker stays open
+          before letting trial requests through. Defaults to ``30``.
+        :type reset_timeout: numeric
+
+        :param half_open_requests: The number of trial requests to let through at
+          once while half-open. Defaults to ``1``.
+        :type half_open_requests: :class:`int <python:int>`
+        """
+        self._failure_threshold = validators.numeric(failure_threshold,
+                                                     minimum = 0.000001,
+                                                     maximum = 1)
+        self._window_size = validators.integer(window_size, minimum = 1)
+        self._minimum_requests = min(self._window_size,
+                                     validators.integer(minimum_requests,
+                                                        minimum = 1))
+        self._reset_timeout = validators.numeric(reset_timeout, minimum = 0)
+        self._half_open_requests = validators.integer(half_open_requests,
+                                                      minimum = 1)
+
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen = self._window_size)
+        self._state = CLOSED
+        self._opened_at = None
+        self._trials = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self):
+        """The state of the breaker: ``'closed'``, ``'open'``, or ``'half-open'``.
+
+        :rtype: :class:`str <python:str>`
+        """
+        with self._lock:
+            return self._get_state(time.monotonic())
+
+    @property
+    def failure_rate(self):
+        """The share of the tracked requests which failed.
+
+        :rtype: :class:`float <python:float>`
+        """
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+
+            return self._outcomes.count(False) / float(len(self._outcomes))
+
+    @property
+    def stats(self):
+        """Counters describing the breaker, for monitoring.
+
+        :rtype: :class:`dict <python:dict>` with ``state``, ``failure_rate``,
+          ``opened`` (the number of times the breaker has opened), and ``rejected``
+          (the number of requests refused while open) keys
+        """
+        return {
+            'state': self.state,
+            'failure_rate': self.failure_rate,
+            'opened': self.opened,
+            'rejected': self.rejected
+        }
+
+    def _get_state(self, now):
+        if self._state == OPEN and now - self._opened_at >= self._reset_timeout:
+            self._state = HALF_OPEN
+            self._trials = 0
+
+        return self._state
+
+    def _open(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self.opened += 1
+
+    @staticmethod
+    def is_failure(error = None, status_code = None):
+        """Return ``True`` if a request which raised ``error`` (or returned
+        ``status_code``) counts as a failure.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        if isinstance(error, (HTTPConnectionError, InternalAPIError)):
+            return True
+
+        return status_code is not None and status_code >= 500
+
+    def before_request(self):
+        """Check whether a request may be sent.
+
+        :raises CircuitOpenError: if the breaker is open, or is half-open and
+          already has ``half_open_requests`` trial requests in flight
+        """
+        with self._lock:
+            state = self._get_state(time.monotonic())
+            if state == CLOSED:
+                return
+
+            if state == HALF_OPEN and self._trials < self._half_open_requests:
+                self._trials += 1
+                return
+
+            self.rejected += 1
+
+        raise CircuitOpenError('The circuit breaker is %s; the WalkScore API is '
+                               'failing.' % state)
+
+    def record_success(self):
+        """Record that a request succeeded."""
+        with self._lock:
+            if self._get_state(time.monotonic()) == HALF_OPEN:
+                self._state = CLOSED
+                self._outcomes.clear()
+
+            self._outcomes.append(True)
+
+    def record_cancelled(self):
+        """Record that a request was cancelled before its outcome was known, so
+        that it no longer counts as a trial request while half-open."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_failure(self, replaces_success = False):
+        """Record that a request failed.
+
+        :param replaces_success: If ``True``, the request has already been recorded
+          as a success (e.g. because the failure was only detected once its
+          response was parsed), and that record is replaced. Defaults to ``False``.
+        :type replaces_success: :class:`bool <python:bool>`
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._get_state(now)
+            if state == OPEN:
+                return
+
+            if state == HALF_OPEN:
+                self._open(now)
+                return
+
+            if replaces_success and True in self._outcomes:
+                index = len(self._outcomes) - 1 - list(reversed(self._outcomes)).index(True)
+                self._outcomes[index] = False
+            else:
+                self._outcomes.append(False)
+
+            failures = self._outcomes.count(False)
+            if len(self._outcomes) >= self._minimum_requests and \
+               failures >= self._failure_threshold * len(self._outcomes):
+                self._open(now)
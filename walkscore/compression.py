@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.compression
+#########################################
+
+Implements the negotiation of compressed responses from the WalkScore API, and
+their decompression as they are received.
+
+"""
+import importlib
+import threading
+import zlib
+
+from walkscore.errors import HTTPConnectionError
+
+
+#: The number of bytes read from a response at a time.
+CHUNK_SIZE = 16 * 1024
+
+_brotli = []
+
+
+def _get_brotli():
+    """Return the brotli library (importing it the first time it is needed), or
+    :obj:`None <python:None>` if it is not installed."""
+    if not _brotli:
+        module = None
+        for name in ('brotli', 'brotlicffi'):
+            try:
+                module = importlib.import_module(name)
+            except ImportError:
+                continue
+            break
+
+        _brotli.append(module)
+
+    return _brotli[0]
+
+
+def get_accept_encoding():
+    """Return the value of the ``Accept-Encoding`` header to send with requests,
+    listing the content codings which can be decompressed.
+
+    :rtype: :class:`str <python:str>`
+    """
+    if _get_brotli() is not None:
+        return 'gzip, deflate, br'
+
+    return 'gzip, deflate'
+
+
+class _DeflateDecompressor(object):
+    """Decompresses ``deflate`` content, which servers send either wrapped in a
+    zlib header (as the specification requires) or as a raw deflate stream."""
+
+    def __init__(self):
+        self._decompressor = zlib.decompressobj()
+        self._is_first = True
+
+    def decompress(self, data):
+        if not self._is_first:
+            return self._decompressor.decompress(data)
+
+        self._is_first = False
+        try:
+            return self._decompressor.decompress(data)
+        except zlib.error:
+            self._decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decompressor.decompress(data)
+
+    def flush(self):
+        return self._decompressor.flush()
+
+    @property
+    def eof(self):
+        return self._decompressor.eof
+
+
+class _BrotliDecompressor(object):
+    """Decompresses ``br`` content."""
+
+    def __init__(self):
+        self._decompressor = _get_brotli().Decompressor()
+
+    def decompress(self, data):
+        if hasattr(self._decompressor, 'process'):
+            return self._decompressor.process(data)
+
+        return self._decompressor.decompress(data)
+
+    def flush(self):
+        return b''
+
+
+def _get_decompressor(content_coding):
+    """Return a decompressor for ``content_coding``, or :obj:`None <python:None>`
+    if it cannot be decompressed."""
+    if content_coding in ('gzip', 'x-gzip'):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if content_coding == 'deflate':
+        return _DeflateDecompressor()
+    if content_coding == 'br' and _get_brotli() is not None:
+        return _BrotliDecompressor()
+
+    return None
+
+
+class ResponseDecoder(object):
+    """Decompresses the body of a response as it is received, counting the bytes
+    received and the bytes which they decompress to.
+
+    Content codings which cannot be decompressed (including ``identity``) are
+    passed through unchanged.
+    """
+
+    def __init__(self, content_encoding = None):
+        """
+        :param content_encoding: The value of the response's ``Content-Encoding``
+          header. Defaults to :obj:`None <python:None>`.
+        :type content_encoding: :class:`str <python:str>` / :obj:`None <python:None>`
+        """
+        self._chunks = []
+        self._decompressors = None
+        self._error = None
+
+        #: The number of bytes received, before decompression.
+        self.compressed_bytes = 0
+
+        #: The number of bytes of content, after decompression.
+        self.decompressed_bytes = 0
+
+        self.content_encoding = content_encoding
+
+    @property
+    def content_encoding(self):
+        """The value of the response's ``Content-Encoding`` header.
+
+        May be set until the first chunk of the body has been written.
+
+        :rtype: :class:`str <python:str>` / :obj:`None <python:None>`
+        """
+        return self._content_encoding
+
+    @content_encoding.setter
+    def content_encoding(self, value):
+        self._content_encoding = value
+        self._decompressors = None
+
+    def _get_decompressors(self):
+        if self._decompressors is None:
+            # Codings are listed in the order they were applied, so are undone
+            # in reverse.
+            codings = [x.strip().lower()
+                       for x in (self._content_encoding or '').split(',')]
+            self._decompressors = [_get_decompressor(x) for x in reversed(codings)
+                                   if x and x != 'identity']
+            if None in self._decompressors:
+                self._decompressors = []
+
+        return self._decompressors
+
+    def write(self, data):
+        """Decompress ``data``, a chunk of the response body.
+
+        :param data: The chunk, as received.
+        :type data: :class:`bytes <python:bytes>`
+
+        .. note::
+
+          So that it may be called back by HTTP libraries, this method does not
+          raise an error if ``data`` cannot be decompressed: the error is raised
+          by :meth:`getvalue` instead.
+        """
+        if not data:
+            return
+
+        self.compressed_bytes += len(data)
+        if self._error is not None:
+            return
+
+        try:
+            for decompressor in self._get_decompressors():
+                data = decompressor.decompress(data)
+        except Exception as error:                                              # pylint: disable=W0703
+            self._error = self._get_error(error)
+            return
+
+        self._append(data)
+
+    @staticmethod
+    def _get_error(error):
+        result = HTTPConnectionError('The response from the WalkScore API could '
+                                     'not be decompressed: %s' % error)
+        result.__cause__ = error
+
+        return result
+
+    def _append(self, data):
+        if data:
+            self.decompressed_bytes += len(data)
+            self._chunks.append(data)
+
+    def getvalue(self):
+        """Return the decompressed response body.
+
+        :rtype: :class:`bytes <python:bytes>`
+
+        :raises HTTPConnectionError: if the body cannot be decompressed
+        """
+        if self._error is not None:
+            raise self._error
+
+        decompressors = self._get_decompressors()
+        try:
+            for index, decompressor in enumerate(decompressors):
+                data = decompressor.flush()
+                if not getattr(decompressor, 'eof', True):
+                    raise ValueError('the compressed content is incomplete')
+
+                for remaining in decompressors[index + 1:]:
+                    data = remaining.decompress(data)
+
+                self._append(data)
+        except Exception as error:
+            self._error = self._get_error(error)
+            raise self._error
+
+        self._decompressors = []
+        content = b''.join(self._chunks)
+        self._chunks = [content]
+
+        return content
+
+
+class TransferCounter(object):
+    """Counts the bytes received by an HTTP client, before and after
+    decompression."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+        #: The number of response bytes received, before decompression.
+        self.compressed_bytes = 0
+
+        #: The number of response bytes, after decompression.
+        self.decompressed_bytes = 0
+
+    def record(self, decoder):
+        """Add the bytes counted by ``decoder``.
+
+        :param decoder: The decoder of a response.
+        :type decoder: :class:`ResponseDecoder`
+        """
+        with self._lock:
+            self.compressed_bytes += decoder.compressed_bytes
+            self.decompressed_bytes += decoder.decompressed_bytes
+
+    @property
+    def stats(self):
+        """Counters describing the bytes received, for monitoring.
+
+        :rtype: :class:`dict <python:dict>` with ``compressed_bytes`` and
+          ``decompressed_bytes`` keys
+        """
+        with self._lock:
+            return {
+                'compressed_bytes': self.compressed_bytes,
+                'decompressed_bytes': self.decompressed_bytes
+            }
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.deadline
+#########################################
+
+Implements the deadline by which a request to the WalkScore API (including any
+retries) must complete, and the normalization of connect / read timeouts.
+
+"""
+import time
+from collections import namedtuple
+
+from validator_collection import validators, checkers
+
+from walkscore.errors import HTTPTimeoutError
+
+
+#: The timeouts applied to a single HTTP request: ``connect`` and ``read`` are the
+#: number of seconds to wait for a connection and for the response respectively,
+#: and ``total`` (if not :obj:`None <python:None>`) is the number of seconds in
+#: which the whole request must complete.
+Timeout = namedtuple('Timeout', ['connect', 'read', 'total'])
+
+
+def normalize_timeout(timeout):
+    """Normalize ``timeout`` into separate connect and read timeouts.
+
+    :param timeout: The timeout to normalize. Accepts a number of seconds (applied
+      to both connecting and reading), a ``(connect, read)``
+      :class:`tuple <python:tuple>` (either of which may be
+      :obj:`None <python:None>`), or :obj:`None <python:None>`.
+    :type timeout: numeric / :class:`tuple <python:tuple>` / :obj:`None <python:None>`
+
+    :returns: The connect and read timeouts, in seconds.
+    :rtype: :class:`tuple <python:tuple>` of numeric / :obj:`None <python:None>`
+
+    :raises ValueError: if ``timeout`` is not a valid timeout
+    """
+    if timeout is None:
+        return None, None
+
+    if isinstance(timeout, Timeout):
+        return timeout.connect, timeout.read
+
+    if checkers.is_numeric(timeout):
+        timeout = validators.numeric(timeout, minimum = 0)
+        return timeout, timeout
+
+    if not isinstance(timeout, (tuple, list)) or len(timeout) != 2:
+        raise ValueError('timeout must be a number or a (connect, read) tuple, '
+                         'was "%s"' % str(timeout))
+
+    return (validators.numeric(timeout[0], allow_empty = True, minimum = 0),
+            validators.numeric(timeout[1], allow_empty = True, minimum = 0))
+
+
+class Deadline(object):
+    """The point in time by which a request (including any retries, backoff, and
+    hedges) must complete.
+
+    A deadline may be shared by several requests, e.g. to hold all of the score
+    lookups made while handling one web request to a single time budget.
+    """
+
+    def __init__(self, seconds):
+        """
+        :param seconds: The number of seconds from now until the deadline.
+        :type seconds: numeric
+        """
+        seconds = validators.numeric(seconds, allow_empty = False, minimum = 0)
+        self._expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def coerce(cls, value):
+        """Return ``value`` as a :class:`Deadline`.
+
+        :param value: A :class:`Deadline`, a number of seconds from now, or
+          :obj:`None <python:None>`.
+        :type value: :class:`Deadline` / numeric / :obj:`None <python:None>`
+
+        :rtype: :class:`Deadline` / :obj:`None <python:None>`
+        """
+        if value is None or checkers.is_type(value, 'Deadline'):
+            return value
+
+        return cls(value)
+
+    def remaining(self):
+        """Return the number of seconds until the deadline.
+
+        :rtype: :class:`float <python:float>`
+        """
+        return max(0.0, self._expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        """``True`` if the deadline has passed.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        return time.monotonic() >= self._expires_at
+
+    def check(self):
+        """Raise an error if the deadline has passed.
+
+        :raises HTTPTimeoutError: if the deadline has passed
+        """
+        if self.expired:
+            raise HTTPTimeoutError('The deadline for the request to the WalkScore '
+                                   'API has passed.')
+
+    def clamp(self, timeout):
+        """Return ``timeout`` shortened so that the request cannot extend beyond
+        the deadline.
+
+        :param timeout: The timeouts to apply to the request.
+        :type timeout: :class:`Timeout`
+
+        :rtype: :class:`Timeout`
+        """
+        remaining = self.remaining()
+        total = remaining if timeout.total is None else min(timeout.total, remaining)
+
+        return Timeout(min(timeout.connect, remaining),
+                       min(timeout.read, remaining),
+                       total)
@@ -11,7 +11,40 @@ class WalkScoreError(ValueError):
     """Base error raised by **WalkScore**. Inherits from
     :class:`ValueError <python:ValueError>`.
     """
-    pass
+
+    @classmethod
+    def from_exception(cls, error):
+        """Return the error to raise when an HTTP library raises ``error``.
+
+        :param error: The error raised by the HTTP library.
+        :type error: :class:`Exception <python:Exception>`
+
+        :returns: An :class:`HTTPTimeoutError`, :class:`SSLError`, or
+          :class:`HTTPConnectionError` for network errors, a :class:`BindingError`
+          for any other error, or ``error`` itself if it is already a
+          :class:`WalkScoreError`.
+        :rtype: :class:`WalkScoreError`
+        """
+        if isinstance(error, WalkScoreError):
+            return error
+
+        # urllib wraps the underlying error in a URLError
+        reason = getattr(error, 'reason', None)
+        if isinstance(reason, Exception):
+            error = reason
+
+        # Match on the names of the error's classes, so that the errors of HTTP
+        # libraries which are not installed need not be imported.
+        names = [x.__name__ for x in type(error).__mro__]
+        message = '%s: %s' % (type(error).__name__, error)
+        if 'SSLError' in names or 'SSLCertVerificationError' in names:
+            return SSLError(message)
+        if set(names) & set(['Timeout', 'TimeoutError', 'timeout']):
+            return HTTPTimeoutError(message)
+        if isinstance(error, OSError) or set(names) & set(['HTTPException', 'HTTPError']):
+            return HTTPConnectionError(message)
+
+        return BindingError(message)
 
 class InternalAPIError(WalkScoreError):
     """Internal error within the WalkScore API itself. Inherits from
@@ -31,6 +64,18 @@ class QuotaError(WalkScoreError):
     """Error raised when you have exceeded your daily quota."""
     pass
 
+class TooManyRequestsError(WalkScoreError):
+    """Error raised when the WalkScore API asks for requests to be slowed down,
+    returning a ``Status Code: 429``.
+    """
+    status_code = 429
+
+class QuotaExhaustedError(QuotaError):
+    """Error raised when a request is refused (without calling the WalkScore API)
+    because the daily quota recorded in a
+    :class:`QuotaLedger <walkscore.quota.QuotaLedger>` has been used up."""
+    pass
+
 class ScoreInProgressError(WalkScoreError):
     """Error raised when a score for the location supplied is being calculated
     and is not yet available."""
@@ -60,6 +105,13 @@ class HTTPTimeoutError(HTTPConnectionError):
     """
     status_code = 504
 
+class CircuitOpenError(WalkScoreError):
+    """Error raised (without calling the WalkScore API) when a request is refused
+    because the :class:`CircuitBreaker <walkscore.circuitbreaker.CircuitBreaker>`
+    of the HTTP client is open.
+    """
+    pass
+
 class SSLError(WalkScoreError):
     """Error produced when an SSL certificate cannot be verified, returns a
     ``Status Code: 495``.
@@ -67,6 +119,27 @@ class SSLError(WalkScoreError):
     status_code = 495
 
 
+def get_error_type(status_code):
+    """Return the error which corresponds to ``status_code``.
+
+    :param status_code: The HTTP Status Code received, or the ``status`` reported
+      by the WalkScore API in the body of its response.
+    :type status_code: :class:`int <python:int>`
+
+    :returns: The error, or :obj:`None <python:None>` if ``status_code`` does not
+      indicate an error.
+    :rtype: :class:`type <python:type>` / :obj:`None <python:None>`
+    """
+    error_type = DEFAULT_ERROR_CODES.get(status_code, None)
+    if isinstance(error_type, str):
+        error_type = ERROR_TYPES.get(error_type, None)
+
+    if not error_type and isinstance(status_code, int) and status_code >= 500:
+        error_type = InternalAPIError
+
+    return error_type
+
+
 def parse_http_error(status_code, http_response):
     """Return the error based on the ``http_response`` received.
 
@@ -86,7 +159,7 @@ def parse_http_error(status_code, http_response):
     except AttributeError:
         pass
 
-    error_type = DEFAULT_ERROR_CODES.get(status_code, None)
+    error_type = get_error_type(status_code)
     message = None
 
     try:
@@ -100,12 +173,6 @@ def parse_http_error(status_code, http_response):
         except AttributeError:
             message = http_response
 
-    if isinstance(error_type, str):
-        error_type = ERROR_TYPES.get(error_type, None)
-
-    if not error_type and status_code >= 500:
-        error_type = InternalAPIError
-
     return status_code, error_type, message
 
 # pylint: disable=R1711
@@ -122,9 +189,11 @@ def check_for_errors(status_code, http_response = None):
     :raises WalkScoreError: or a sub-type thereof based on ``status_code``
 
     """
-    status_code, error_type, message = parse_http_error(status_code, http_response)
-    if error_type:
-        print(error_type)
+    status_code = getattr(http_response, 'status_code', status_code)
+
+    # The message is only extracted from the response if there is an error.
+    if get_error_type(status_code):
+        _, error_type, message = parse_http_error(status_code, http_response)
         raise error_type(message)
 
     return None
@@ -136,6 +205,7 @@ DEFAULT_ERROR_CODES = {
     403: 'AuthorizationError',
     404: 'ResourceNotFoundError',
     409: 'WalkScoreError',
+    429: 'TooManyRequestsError',
     504: 'HTTPTimeoutError',
     495: 'SSLError',
     2: 'ScoreInProgressError',
@@ -157,10 +227,13 @@ ERROR_TYPES = {
     'DownloadError': WalkScoreError,
     'ResponseTooLargeError': InternalAPIError,
     'HTTPConnectionError': HTTPConnectionError,
+    'CircuitOpenError': CircuitOpenError,
     'URLError': BindingError,
     'ValueError': WalkScoreError,
     'InternalAPIError': InternalAPIError,
     'QuotaError': QuotaError,
+    'QuotaExhaustedError': QuotaExhaustedError,
+    'TooManyRequestsError': TooManyRequestsError,
     'InvalidCoordinatesError': InvalidCoordinatesError,
     'ScoreInProgressError': ScoreInProgressError
 }
@@ -0,0 +1,332 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.hedging
+#########################################
+
+Implements hedged requests: if a request has not completed within the latency
+typical of recent requests, a duplicate is sent and whichever answers first is
+used.
+
+"""
+import math
+import threading
+from collections import deque
+from concurrent import futures
+
+from validator_collection import validators, checkers
+
+from walkscore.retry import RetryBudget
+
+
+class LatencyTracker(object):
+    """Records the latency of recent requests, so that percentiles of it can be
+    calculated."""
+
+    def __init__(self, window_size = 1000):
+        """
+        :param window_size: The number of recent requests whose latency is tracked.
+          Defaults to ``1000``.
+        :type window_size: :class:`int <python:int>`
+        """
+        self._window_size = validators.integer(window_size, minimum = 1)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen = self._window_size)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._latencies)
+
+    def record(self, seconds):
+        """Record the latency of a request.
+
+        :param seconds: The number of seconds the request took.
+        :type seconds: numeric
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percentile):
+        """Return the ``percentile`` latency of the tracked requests.
+
+        :param percentile: The percentile to return, between ``0`` and ``100``.
+        :type percentile: numeric
+
+        :returns: The latency in seconds, or :obj:`None <python:None>` if no
+          requests have been tracked.
+        :rtype: numeric / :obj:`None <python:None>`
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+
+        if not latencies:
+            return None
+
+        index = int(math.ceil(percentile / 100.0 * len(latencies))) - 1
+
+        return latencies[min(len(latencies) - 1, max(0, index))]
+
+
+class HedgeExecutor(futures.ThreadPoolExecutor):
+    """:class:`ThreadPoolExecutor <python:concurrent.futures.ThreadPoolExecutor>`
+    in which to run hedged requests, which keeps track of the requests it has not
+    finished so that they can be cancelled when it is shut down (without relying
+    on ``cancel_futures``, which requires Python 3.9)."""
+
+    def __init__(self, *args, **kwargs):
+        super(HedgeExecutor, self).__init__(*args, **kwargs)
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+
+    def submit(self, *args, **kwargs):                                       # pylint: disable=W0221
+        future = super(HedgeExecutor, self).submit(*args, **kwargs)
+        with self._pending_lock:
+            self._pending.add(future)
+
+        future.add_done_callback(self._discard)
+
+        return future
+
+    def _discard(self, future):
+        with self._pending_lock:
+            self._pending.discard(future)
+
+    def cancel_pending(self):
+        """Cancel the requests which have not started yet.
+
+        :returns: The number of requests cancelled.
+        :rtype: :class:`int <python:int>`
+        """
+        with self._pending_lock:
+            pending = list(self._pending)
+
+        return len([x for x in pending if x.cancel()])
+
+    def shutdown(self, wait = True):                                          # pylint: disable=W0221
+        """Cancel the requests which have not started yet, and shut down the
+        executor.
+
+        :param wait: If ``True``, waits for the requests which are running to
+          finish. Defaults to ``True``.
+        :type wait: :class:`bool <python:bool>`
+        """
+        self.cancel_pending()
+        super(HedgeExecutor, self).shutdown(wait = wait)
+
+
+class HedgePolicy(object):
+    """Determines when to send a duplicate (hedge) of a slow request.
+
+    Once at least ``minimum_samples`` requests have been tracked by the HTTP
+    client's :class:`LatencyTracker`, a request which has not completed within the
+    ``percentile`` latency of recent requests is hedged: a duplicate is sent, and
+    whichever answers first (successfully) is used. The other request is cancelled
+    if it has not yet been sent, and its answer is discarded otherwise.
+
+    Hedges are withdrawn from a :class:`RetryBudget <walkscore.retry.RetryBudget>`,
+    so that they cannot add more than a share of the requests made.
+
+    .. note::
+
+      Each hedge is a request to the WalkScore API, and so counts against the
+      :class:`QuotaLedger <walkscore.quota.QuotaLedger>` and waits for the
+      :class:`RateLimiter <walkscore.ratelimit.RateLimiter>` (if any).
+    """
+
+    def __init__(self,
+                 percentile = 95,
+                 min_delay = 0.01,
+                 max_delay = None,
+                 minimum_samples = 20,
+                 budget = None):
+        """
+        :param percentile: The percentile of recent latencies after which a request
+          is hedged. Defaults to ``95``.
+        :type percentile: numeric
+
+        :param min_delay: The minimum number of seconds to wait before hedging a
+          request. Defaults to ``0.01``.
+        :type min_delay: numeric
+
+        :param max_delay: The maximum number of seconds to wait before hedging a
+          request. If :obj:`None <python:None>`, there is no maximum. Defaults to
+          :obj:`None <python:None>`.
+        :type max_delay: numeric / :obj:`None <python:None>`
+
+        :param minimum_samples: The number of requests which must be tracked before
+          any request is hedged. Defaults to ``20``.
+        :type minimum_samples: :class:`int <python:int>`
+
+        :param budget: The budget from which hedges are withdrawn. If
+          :obj:`None <python:None>`, hedges may add at most 10% to the requests
+          made. Defaults to :obj:`None <python:None>`.
+        :type budget: :class:`RetryBudget <walkscore.retry.RetryBudget>` /
+          :obj:`None <python:None>`
+        """
+        self._percentile = validators.numeric(percentile, minimum = 0, maximum = 100)
+        self._min_delay = validators.numeric(min_delay, minimum = 0)
+        self._max_delay = validators.numeric(max_delay,
+                                             allow_empty = True,
+                                             minimum = self._min_delay)
+        self._minimum_samples = validators.integer(minimum_samples, minimum = 1)
+
+        if budget is None:
+            budget = RetryBudget(ratio = 0.1, minimum_retries = 0)
+        elif not checkers.is_type(budget, 'RetryBudget'):
+            raise ValueError('budget must be of type "RetryBudget", was "%s"' %
+                             str(type(budget)))
+        self._budget = budget
+
+        self.hedged = 0
+        self.wins = 0
+        self._lock = threading.Lock()
+
+    @property
+    def budget(self):
+        """The budget from which hedges are withdrawn.
+
+        :rtype: :class:`RetryBudget <walkscore.retry.RetryBudget>`
+        """
+        return self._budget
+
+    @property
+    def stats(self):
+        """Counters describing the policy, for monitoring.
+
+        :rtype: :class:`dict <python:dict>` with ``hedged`` (the number of hedges
+          sent), ``wins`` (the number of hedges which answered first), and
+          ``exhausted`` (the number of hedges refused by the budget) keys
+        """
+        with self._lock:
+            result = {
+                'hedged': self.hedged,
+                'wins': self.wins
+            }
+
+        result['exhausted'] = self.budget.exhausted
+
+        return result
+
+    def get_delay(self, latency_tracker):
+        """Return the number of seconds to wait before hedging a request.
+
+        :param latency_tracker: The tracker of recent request latencies.
+        :type latency_tracker: :class:`LatencyTracker` / :obj:`None <python:None>`
+
+        :returns: The number of seconds, or :obj:`None <python:None>` if too few
+          requests have been tracked to hedge.
+        :rtype: numeric / :obj:`None <python:None>`
+        """
+        if latency_tracker is None or len(latency_tracker) < self._minimum_samples:
+            return None
+
+        delay = max(self._min_delay, latency_tracker.percentile(self._percentile))
+        if self._max_delay is not None:
+            delay = min(self._max_delay, delay)
+
+        return delay
+
+    def _get_winner(self, tasks, done):
+        """Return the first of ``tasks`` which is in ``done`` and succeeded, or
+        :obj:`None <python:None>`."""
+        for task in tasks:
+            if task in done and not task.cancelled() and task.exception() is None:
+                if task is not tasks[0]:
+                    with self._lock:
+                        self.wins += 1
+
+                return task
+
+        return None
+
+    def call(self, executor, latency_tracker, request, hedge):
+        """Execute ``request``, hedging it with ``hedge`` if it is slow.
+
+        :param executor: The executor in which to run ``request`` and ``hedge``.
+        :type executor: :class:`Executor <python:concurrent.futures.Executor>`
+
+        :param latency_tracker: The tracker of recent request latencies.
+        :type latency_tracker: :class:`LatencyTracker` / :obj:`None <python:None>`
+
+        :param request: Callable which sends the request.
+        :type request: callable
+
+        :param hedge: Callable which sends the duplicate request.
+        :type hedge: callable
+
+        :returns: The result of whichever of ``request`` and ``hedge`` succeeded
+          first.
+
+        :raises Exception: the error raised by ``request``, if neither succeeded
+        """
+        self.budget.record_request()
+        delay = self.get_delay(latency_tracker)
+        if delay is None:
+            return request()
+
+        tasks = [executor.submit(request)]
+        try:
+            return tasks[0].result(timeout = delay)
+        except futures.TimeoutError:
+            pass
+
+        if not self.budget.try_spend():
+            return tasks[0].result()
+
+        tasks.append(executor.submit(hedge))
+        with self._lock:
+            self.hedged += 1
+
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = futures.wait(pending,
+                                             return_when = futures.FIRST_COMPLETED)
+                winner = self._get_winner(tasks, done)
+                if winner is not None:
+                    return winner.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return tasks[0].result()
+
+    async def call_async(self, latency_tracker, request, hedge):
+        """Await ``request``, hedging it with ``hedge`` if it is slow.
+
+        Accepts the same parameters as :meth:`call` (without ``executor``), except
+        that ``request`` and ``hedge`` must be coroutine functions. Whichever does
+        not answer first is cancelled.
+        """
+        import asyncio
+
+        self.budget.record_request()
+        delay = self.get_delay(latency_tracker)
+        if delay is None:
+            return await request()
+
+        tasks = [asyncio.ensure_future(request())]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout = delay)
+            if done or not self.budget.try_spend():
+                return await tasks[0]
+
+            tasks.append(asyncio.ensure_future(hedge()))
+            with self._lock:
+                self.hedged += 1
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending,
+                                                   return_when = asyncio.FIRST_COMPLETED)
+                winner = self._get_winner(tasks, done)
+                if winner is not None:
+                    return winner.result()
+
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions = True)
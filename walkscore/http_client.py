@@ -10,70 +10,138 @@ returning the response.
 
 """
 import sys
+import os
 import warnings
 import email
+import email.utils
 import time
 import threading
-import json
 import io
+from collections import deque
 
 # - Requests is the preferred HTTP library
 # - Google App Engine has urlfetch
 # - Use Pycurl if it's there (at least it verifies SSL certs)
-# - Fall back to urllib2 with a warning if needed
-try:
-    import urllib2 as urllib
-except ImportError:
-    # Try to load in urllib2, but don't sweat it if it's not available.
-    pass
-
-try:
-    import pycurl
-except ImportError:
-    pycurl = None
-
-try:
-    import requests
-except ImportError:
-    requests = None
-else:
+# - The standard library's http.client provides the final fallback
+# - aiohttp provides the asynchronous transport
+# - httpx provides HTTP/2 transports (if h2 is installed), both sync and async
+#
+# Importing the HTTP libraries is slow, so each is only imported (by
+# _import_backend()) when a client which uses it is first created.
+import ssl
+import importlib
+from six.moves import http_client
+
+# proxy support for the pycurl client
+import six
+from six.moves.urllib.parse import urlparse, urlencode
+
+from validator_collection import validators, checkers
+
+from walkscore import jsoncodec
+from walkscore.utilities import CA_BUNDLE_PATH, to_utf8
+from walkscore.errors import check_for_errors, HTTPTimeoutError, SSLError, \
+    WalkScoreError, BindingError, HTTPConnectionError, InternalAPIError
+from walkscore.retry import RetryPolicy
+from walkscore.hedging import LatencyTracker
+from walkscore.deadline import Timeout, normalize_timeout
+from walkscore.compression import CHUNK_SIZE, ResponseDecoder, TransferCounter, \
+    get_accept_encoding
+
+
+pycurl = None
+requests = None
+urlfetch = None
+aiohttp = None
+httpx = None
+h2 = None
+
+_BACKEND_MODULES = {
+    'pycurl': 'pycurl',
+    'requests': 'requests',
+    'urlfetch': 'google.appengine.api.urlfetch',
+    'aiohttp': 'aiohttp',
+    'httpx': 'httpx',
+    'h2': 'h2',
+}
+
+_imported_backends = set()
+_import_lock = threading.RLock()
+
+
+def _check_requests_version(module):
+    """Return ``module`` (the requests library), or :obj:`None <python:None>` if it
+    is too old to be used."""
     try:
         # Require version 0.8.8, but don't want to depend on distutils
-        version = requests.__version__
+        version = module.__version__
         major, minor, patch = [int(i) for i in version.split(".")]
     except Exception:                                                                     # pylint: disable=W0703
         # Probably some new-fangled version, so it should support verify
-        pass
-    else:
-        if (major, minor, patch) < (0, 8, 8):
-            sys.stderr.write(
-                "Warning: the WalkScore library requires that your Python "
-                '"requests" library be newer than version 0.8.8, but your '
-                '"requests" library is version %s. WalkScore will fall back to '
-                "an alternate HTTP library so everything should work. We "
-                'recommend upgrading your "requests" library. If you have any '
-                "questions, please contact software@insightindustry.com. (HINT: running "
-                '"pip install -U requests" should upgrade your requests '
-                "library to the latest version.)" % (version,)
-            )
-            requests = None
+        return module
+
+    if (major, minor, patch) < (0, 8, 8):
+        sys.stderr.write(
+            "Warning: the WalkScore library requires that your Python "
+            '"requests" library be newer than version 0.8.8, but your '
+            '"requests" library is version %s. WalkScore will fall back to '
+            "an alternate HTTP library so everything should work. We "
+            'recommend upgrading your "requests" library. If you have any '
+            "questions, please contact software@insightindustry.com. (HINT: running "
+            '"pip install -U requests" should upgrade your requests '
+            "library to the latest version.)" % (version,)
+        )
+        return None
 
-try:
-    from google.appengine.api import urlfetch
-except ImportError:
-    urlfetch = None
+    return module
 
-# proxy support for the pycurl client
-import six
-from six.moves.urllib.parse import urlparse
 
-from backoff_utils import backoff
-from backoff_utils import strategies as backoff_strategies
-from validator_collection import validators
+def _import_backend(name):
+    """Import the optional HTTP library ``name`` the first time it is needed, and
+    bind it to the module-level name of the same name.
 
-from walkscore.utilities import CA_BUNDLE_PATH, to_utf8
-from walkscore.errors import check_for_errors, HTTPTimeoutError, SSLError, \
-    WalkScoreError, BindingError, HTTPConnectionError
+    :param name: The name of the library: ``'pycurl'``, ``'requests'``,
+      ``'urlfetch'``, ``'aiohttp'``, ``'httpx'``, or ``'h2'``.
+    :type name: :class:`str <python:str>`
+
+    :returns: The library, or :obj:`None <python:None>` if it is not installed.
+    :rtype: module / :obj:`None <python:None>`
+    """
+    if name in _imported_backends:
+        return globals()[name]
+
+    with _import_lock:
+        if name not in _imported_backends:
+            try:
+                module = importlib.import_module(_BACKEND_MODULES[name])
+            except ImportError:
+                module = None
+
+            if module is not None and name == 'requests':
+                module = _check_requests_version(module)
+
+            globals()[name] = module
+            _imported_backends.add(name)
+
+    return globals()[name]
+
+
+def _require_backend(name, backend = None):
+    """Import the optional HTTP library ``name``, raising an error if it is not
+    installed.
+
+    :raises ImportError: if the library is not installed
+    """
+    module = _import_backend(name)
+    if module is None:
+        backend = backend or name
+        raise ImportError(
+            "The WalkScore library's \"%s\" backend requires a library which is "
+            "not installed. (HINT: running \"pip install %s\" should install "
+            "it.)" % (backend, backend.split('-')[0])
+        )
+
+    return module
 
 
 HTTP_METHODS = ['GET',
@@ -85,6 +153,119 @@ HTTP_METHODS = ['GET',
                 'DELETE']
 
 
+def _new_ssl_context(verify_ssl_certs):
+    """Return an :class:`ssl.SSLContext <python:ssl.SSLContext>` which verifies
+    certificates against the bundled CA certificates (falling back to the
+    system's, if the bundle is missing), or which does not verify them.
+
+    :param verify_ssl_certs: If ``True``, verifies certificates.
+    :type verify_ssl_certs: :class:`bool <python:bool>`
+
+    :rtype: :class:`ssl.SSLContext <python:ssl.SSLContext>`
+    """
+    if verify_ssl_certs:
+        cafile = CA_BUNDLE_PATH if os.path.exists(CA_BUNDLE_PATH) else None
+        return ssl.create_default_context(cafile = cafile)
+
+    return ssl._create_unverified_context()                                    # pylint: disable=W0212
+
+
+def _get_query_string(parameters):
+    """Return ``parameters`` URL-encoded, omitting any whose value is
+    :obj:`None <python:None>`.
+
+    :param parameters: The URL parameters to encode.
+    :type parameters: :class:`dict <python:dict>` /
+      :class:`PreparedParameters` / :obj:`None <python:None>`
+
+    :returns: The query string, or :obj:`None <python:None>` if there are no
+      parameters to encode.
+    :rtype: :class:`str <python:str>` / :obj:`None <python:None>`
+    """
+    if not parameters:
+        return None
+
+    if isinstance(parameters, PreparedParameters):
+        return parameters.query_string
+
+    return urlencode([(key, value) for key, value in six.iteritems(parameters)
+                      if value is not None]) or None
+
+
+class PreparedParameters(dict):
+    """The URL parameters of a :class:`PreparedRequest`, which carry their
+    URL-encoded form so that the constant parameters are not re-encoded for every
+    request."""
+
+    def __init__(self, constant, constant_query, variable = None):
+        super(PreparedParameters, self).__init__(constant)
+
+        self.query_string = constant_query
+        if variable:
+            self.update(variable)
+            variable_query = _get_query_string(variable)
+            if variable_query:
+                self.query_string = '&'.join(x for x in (constant_query, variable_query) if x)
+
+
+class PreparedRequest(object):
+    """A request whose constant parts - its method, URL, headers, and the URL
+    parameters which do not change between requests - are validated and
+    URL-encoded once, so that it can be sent repeatedly (with
+    :meth:`HTTPClient.send`) supplying only the parameters which vary.
+    """
+
+    def __init__(self,
+                 method,
+                 url,
+                 parameters = None,
+                 headers = None):
+        """
+        :param method: The HTTP method to use for the request. Accepts `GET`, `HEAD`,
+          `POST`, `PATCH`, `PUT`, or `DELETE`.
+        :type method: :class:`str <python:str>`
+
+        :param url: The URL to execute the request against.
+        :type url: :class:`str <python:str>`
+
+        :param parameters: The URL parameters to submit with every request.
+          Parameters whose value is :obj:`None <python:None>` are omitted. Defaults
+          to :obj:`None <python:None>`.
+        :type parameters: :class:`dict <python:dict>` / :obj:`None <python:None>`
+
+        :param headers: HTTP headers to submit with every request. Defaults to
+          :obj:`None <python:None>`.
+        :type headers: :class:`dict <python:dict>` / :obj:`None <python:None>`
+
+        :raises ValueError: if ``method``, ``url``, ``parameters``, or ``headers``
+          are not valid
+        """
+        self.method, self.url, parameters, self.headers = HTTPClient._validate_request(     # pylint: disable=W0212
+            method,
+            url,
+            parameters,
+            headers
+        )
+
+        self.parameters = dict((key, value) for key, value
+                               in six.iteritems(parameters or {})
+                               if value is not None)
+        self._query_string = _get_query_string(self.parameters) or ''
+
+    def bind(self, parameters = None):
+        """Return the URL parameters for one request, combining the constant
+        parameters with ``parameters``.
+
+        :param parameters: The parameters which vary between requests. They are
+          not validated. Parameters whose value is :obj:`None <python:None>` are
+          omitted from the query string. Defaults to :obj:`None <python:None>`.
+        :type parameters: :class:`dict <python:dict>` / :obj:`None <python:None>`
+
+        :rtype: :class:`PreparedParameters`
+        """
+        return PreparedParameters(self.parameters, self._query_string, parameters)
+
+
 def _now_ms():
     """Returns the current time expressed in milliseconds.
 
@@ -93,40 +274,255 @@ def _now_ms():
     return int(round(time.time() * 1000))
 
 
-def default_http_client(*args, **kwargs):
+def _get_retry_after(headers):
+    """Return the number of seconds to wait indicated by the ``Retry-After``
+    header in ``headers``.
+
+    :param headers: The headers of an HTTP response.
+
+    :returns: The number of seconds, or :obj:`None <python:None>` if the header is
+      missing or cannot be parsed.
+    :rtype: numeric / :obj:`None <python:None>`
+    """
+    if not headers:
+        return None
+
+    value = None
+    for key in headers.keys():
+        if key.lower() == 'retry-after':
+            value = headers[key]
+            break
+
+    if not value:
+        return None
+
+    try:
+        return max(0, float(value))
+    except (TypeError, ValueError):
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0, retry_at.timestamp() - time.time())
+
+
+def _get_total_timeout(timeout):
+    """Return the number of seconds in which a request with ``timeout`` must
+    complete, for transports which apply a single timeout to the whole request.
+
+    :param timeout: The timeouts to apply to the request.
+    :type timeout: :class:`Timeout <walkscore.deadline.Timeout>`
+
+    :rtype: numeric
+    """
+    if timeout.total is not None:
+        return timeout.total
+
+    return timeout.connect + timeout.read
+
+
+def _apply_timeout(kwargs, timeout):
+    """Set the ``connect_timeout`` and ``read_timeout`` in ``kwargs`` from the
+    ``timeout`` accepted by some :class:`HTTPClient` sub-classes.
+
+    :param kwargs: The keyword arguments to update.
+    :type kwargs: :class:`dict <python:dict>`
+
+    :param timeout: A number of seconds, a ``(connect, read)``
+      :class:`tuple <python:tuple>`, or :obj:`None <python:None>`.
+    """
+    connect_timeout, read_timeout = normalize_timeout(timeout)
+    if connect_timeout is not None:
+        kwargs['connect_timeout'] = connect_timeout
+    if read_timeout is not None:
+        kwargs['read_timeout'] = read_timeout
+
+
+def _get_backend(backend, asynchronous = False):
+    """Return the :class:`HTTPClient` sub-class which implements ``backend``.
+
+    :param backend: The name of the HTTP library to use.
+    :type backend: :class:`str <python:str>`
+
+    :param asynchronous: If ``True``, returns an :class:`AsyncHTTPClient`
+      sub-class. Defaults to ``False``.
+    :type asynchronous: :class:`bool <python:bool>`
+
+    :rtype: :class:`type <python:type>`
+
+    :raises ValueError: if ``backend`` is not recognized
+    :raises ImportError: if the library which implements ``backend`` is not
+      installed
+    """
+    if asynchronous:
+        backends = {
+            'aiohttp': (AiohttpClient, 'aiohttp'),
+            'httpx': (AsyncHttpxClient, 'httpx'),
+        }
+    else:
+        backends = {
+            'urlfetch': (UrlFetchClient, 'urlfetch'),
+            'requests': (RequestsClient, 'requests'),
+            'pycurl': (PycurlClient, 'pycurl'),
+            'pycurl-multi': (PycurlMultiClient, 'pycurl'),
+            'urllib': (Urllib2Client, None),
+            'httpx': (HttpxClient, 'httpx'),
+        }
+
+    if backend not in backends:
+        raise ValueError('backend must be one of %s, was "%s"' %
+                         (', '.join(sorted(backends)), backend))
+
+    impl, library = backends[backend]
+    if library:
+        _require_backend(library, backend)
+
+    return impl
+
+
+def default_http_client(*args, backend = None, **kwargs):
     """Return a default HTTP Client.
 
+    :param backend: The name of the HTTP library to use: ``'requests'``,
+      ``'pycurl'``, ``'pycurl-multi'``, ``'httpx'``, ``'urlfetch'``, or
+      ``'urllib'``. If :obj:`None <python:None>`, uses the first of urlfetch,
+      requests, pycurl, and urllib which is available. Defaults to
+      :obj:`None <python:None>`.
+    :type backend: :class:`str <python:str>` / :obj:`None <python:None>`
+
     :rtype: :class:`HTTPClient`
+
+    :raises ValueError: if ``backend`` is not recognized
+    :raises ImportError: if the library which implements ``backend`` is not
+      installed
     """
-    if urlfetch:
+    if backend is not None:
+        impl = _get_backend(backend)
+    elif _import_backend('urlfetch'):
         impl = UrlFetchClient
-    elif requests:
+    elif _import_backend('requests'):
         impl = RequestsClient
-    elif pycurl:
+    elif _import_backend('pycurl'):
         impl = PycurlClient
     else:
         impl = Urllib2Client
         warnings.warn(
-            "Warning: the WalkScore library is falling back to urllib2/urllib "
-            "because neither requests nor pycurl are installed. "
-            "urllib2's SSL implementation doesn't verify server "
-            "certificates. For improved security, we suggest installing "
+            "Warning: the WalkScore library is falling back to the Python "
+            "standard library because neither requests nor pycurl are "
+            "installed. For improved performance, we suggest installing "
             "requests."
         )
 
     return impl(*args, **kwargs)
 
 
+def default_async_http_client(*args, backend = None, **kwargs):
+    """Return a default asynchronous HTTP Client.
+
+    :param backend: The name of the HTTP library to use: ``'aiohttp'`` or
+      ``'httpx'``. If :obj:`None <python:None>`, uses the first of aiohttp and
+      httpx which is available. Defaults to :obj:`None <python:None>`.
+    :type backend: :class:`str <python:str>` / :obj:`None <python:None>`
+
+    :rtype: :class:`AsyncHTTPClient`
+
+    :raises ValueError: if ``backend`` is not recognized
+    :raises ImportError: if no asynchronous HTTP library is installed
+    """
+    if backend is not None:
+        impl = _get_backend(backend, asynchronous = True)
+    elif _import_backend('aiohttp'):
+        impl = AiohttpClient
+    elif _import_backend('httpx'):
+        impl = AsyncHttpxClient
+    else:
+        raise ImportError(
+            "The WalkScore library's asynchronous client requires the aiohttp "
+            "or httpx library. (HINT: running \"pip install aiohttp\" should "
+            "install it.)"
+        )
+
+    return impl(*args, **kwargs)
+
+
 class HTTPClient(object):                                                                 # pylint: disable=R0205
     """Base class that provides HTTP connectivity."""
 
-    MAX_DELAY = 2
-    INITIAL_DELAY = 0.5
+    #: If ``True``, :meth:`request_many` executes its requests concurrently, and
+    #: is used by :meth:`WalkScoreAPI.get_scores() <walkscore.api.WalkScoreAPI.get_scores>`
+    #: in place of a pool of worker threads.
+    multiplexed = False
 
     def __init__(self,
                  verify_ssl_certs = True,
-                 proxy = None):
+                 proxy = None,
+                 pool_size = 10,
+                 keep_alive = True,
+                 circuit_breaker = None,
+                 retry_policy = None,
+                 connect_timeout = 30,
+                 read_timeout = 80,
+                 compression = True):
+        """
+        :param verify_ssl_certs: If ``True``, verifies the SSL certificate presented
+          by the server. Defaults to ``True``.
+        :type verify_ssl_certs: :class:`bool <python:bool>`
+
+        :param proxy: The proxy to route requests through, expressed either as a URL
+          or as a :class:`dict <python:dict>` with URLs under the ``http`` and/or
+          ``https`` keys. Defaults to :obj:`None <python:None>`.
+        :type proxy: :class:`str <python:str>` / :class:`dict <python:dict>` /
+          :obj:`None <python:None>`
+
+        :param pool_size: The maximum number of connections to keep open for re-use
+          (by transports which pool connections). Defaults to ``10``.
+        :type pool_size: :class:`int <python:int>`
+
+        :param keep_alive: If ``True``, connections are kept open for re-use once a
+          request has completed. Defaults to ``True``.
+        :type keep_alive: :class:`bool <python:bool>`
+
+        :param circuit_breaker: The circuit breaker which stops requests from being
+          sent while the WalkScore API is failing. If :obj:`None <python:None>`,
+          every request is sent. Defaults to :obj:`None <python:None>`.
+        :type circuit_breaker: :class:`CircuitBreaker <walkscore.circuitbreaker.CircuitBreaker>` /
+          :obj:`None <python:None>`
+
+        :param retry_policy: The policy which determines whether, and when, failed
+          requests are retried by :meth:`request_with_retries`. If
+          :obj:`None <python:None>`, uses a default
+          :class:`RetryPolicy <walkscore.retry.RetryPolicy>`. Defaults to
+          :obj:`None <python:None>`.
+        :type retry_policy: :class:`RetryPolicy <walkscore.retry.RetryPolicy>` /
+          :obj:`None <python:None>`
+
+        :param connect_timeout: The number of seconds to wait for a connection to
+          the WalkScore API to be established, unless overridden for a request.
+          Defaults to ``30``.
+        :type connect_timeout: numeric
+
+        :param read_timeout: The number of seconds to wait for the WalkScore API to
+          respond once connected, unless overridden for a request. Defaults to
+          ``80``.
+        :type read_timeout: numeric
+
+        :param compression: If ``True``, asks the server to compress its responses
+          (with ``gzip``, ``deflate``, or - if
+          `brotli <https://github.com/google/brotli>`_ is installed - ``br``), and
+          decompresses them as they are received. Defaults to ``True``.
+        :type compression: :class:`bool <python:bool>`
+        """
         self._verify_ssl_certs = verify_ssl_certs
+        self._compression = bool(compression)
+        self._connect_timeout = validators.numeric(connect_timeout, minimum = 0)
+        self._read_timeout = validators.numeric(read_timeout, minimum = 0)
+        self.circuit_breaker = circuit_breaker
+        self.retry_policy = retry_policy
+        self._pool_size = validators.integer(pool_size, minimum = 1)
+        self._keep_alive = bool(keep_alive)
 
         if proxy:
             if isinstance(proxy, str):
@@ -153,12 +549,162 @@ class HTTPClient(object):
 
         self._thread_local = threading.local()
 
+        #: The latency of recent successful requests, used to decide when to hedge
+        #: a request (see :class:`HedgePolicy <walkscore.hedging.HedgePolicy>`).
+        self.latency = LatencyTracker()
+
+        #: The number of response bytes received, before and after decompression.
+        self.transfer = TransferCounter()
+
+    @property
+    def circuit_breaker(self):
+        """The circuit breaker which stops requests from being sent while the
+        WalkScore API is failing.
+
+        :rtype: :class:`CircuitBreaker <walkscore.circuitbreaker.CircuitBreaker>` /
+          :obj:`None <python:None>`
+        """
+        return self._circuit_breaker
+
+    @circuit_breaker.setter
+    def circuit_breaker(self, value):
+        if value is not None and not checkers.is_type(value, 'CircuitBreaker'):
+            raise ValueError('circuit_breaker must be of type "CircuitBreaker", '
+                             'was "%s"' % str(type(value)))
+
+        self._circuit_breaker = value
+
+    @property
+    def retry_policy(self):
+        """The policy which determines whether, and when, failed requests are
+        retried by :meth:`request_with_retries`.
+
+        :rtype: :class:`RetryPolicy <walkscore.retry.RetryPolicy>`
+        """
+        return self._retry_policy
+
+    @retry_policy.setter
+    def retry_policy(self, value):
+        if value is None:
+            value = RetryPolicy()
+        elif not checkers.is_type(value, 'RetryPolicy'):
+            raise ValueError('retry_policy must be of type "RetryPolicy", '
+                             'was "%s"' % str(type(value)))
+
+        self._retry_policy = value
+
+    @property
+    def connect_timeout(self):
+        """The default number of seconds to wait for a connection to be established.
+
+        :rtype: numeric
+        """
+        return self._connect_timeout
+
+    @property
+    def read_timeout(self):
+        """The default number of seconds to wait for a response once connected.
+
+        :rtype: numeric
+        """
+        return self._read_timeout
+
+    @property
+    def compression(self):
+        """If ``True``, the client asks the server to compress its responses.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        return self._compression
+
+    def _get_headers(self, headers = None):
+        """Return ``headers`` with the ``Accept-Encoding`` header added, unless it
+        has been supplied.
+
+        :rtype: :class:`dict <python:dict>`
+        """
+        headers = dict(headers or {})
+        if not any(x.lower() == 'accept-encoding' for x in headers):
+            if self._compression:
+                headers['Accept-Encoding'] = get_accept_encoding()
+            else:
+                headers['Accept-Encoding'] = 'identity'
+
+        return headers
+
+    def _get_content(self, decoder):
+        """Return the content decompressed by ``decoder``, and record the bytes it
+        counted in :attr:`transfer`.
+
+        :param decoder: The decoder of a response.
+        :type decoder: :class:`ResponseDecoder <walkscore.compression.ResponseDecoder>`
+
+        :rtype: :class:`bytes <python:bytes>`
+        """
+        content = decoder.getvalue()
+        self.transfer.record(decoder)
+
+        return content
+
+    def _get_timeout(self, timeout = None, deadline = None):
+        """Return the connect and read timeouts to apply to a request.
+
+        :param timeout: The timeout(s) requested for the request. Missing values
+          are taken from :attr:`connect_timeout` and :attr:`read_timeout`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param deadline: The deadline by which the request must complete.
+        :type deadline: :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
+        :rtype: :class:`Timeout <walkscore.deadline.Timeout>`
+        """
+        connect_timeout, read_timeout = normalize_timeout(timeout)
+        if connect_timeout is None:
+            connect_timeout = self.connect_timeout
+        if read_timeout is None:
+            read_timeout = self.read_timeout
+
+        timeout = Timeout(connect_timeout, read_timeout, None)
+        if deadline is not None:
+            timeout = deadline.clamp(timeout)
+
+        return timeout
+
+    def _record_outcome(self, error = None, status_code = None):
+        """Record the outcome of a request in the :attr:`circuit_breaker`."""
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return
+
+        if breaker.is_failure(error, status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+    @staticmethod
+    def _annotate_error(error, status_code, headers):
+        """Attach the ``status_code`` and the ``Retry-After`` delay of the response
+        which caused ``error`` to it, for use by the :attr:`retry_policy`."""
+        if status_code is None:
+            return
+
+        try:
+            error.status_code = status_code
+            error.retry_after = _get_retry_after(headers)
+        except AttributeError:
+            pass
+
     def request_with_retries(self,
                              method,
                              url,
                              parameters = None,
                              headers = None,
-                             request_body = None):
+                             request_body = None,
+                             max_retries = None,
+                             timeout = None,
+                             deadline = None):
         """Execute a standard HTTP request with automatic retries on failure.
 
         :param method: The HTTP method to use for the request. Accepts `GET`, `HEAD`,
@@ -181,18 +727,38 @@ class HTTPClient(object):
         :type request_body: :obj:`None <python:None>` / :class:`dict <python:dict>` /
           :class:`str <python:str>` / :class:`bytes <python:bytes>`
 
+        :param max_retries: The maximum number of times to retry the request. If
+          :obj:`None <python:None>`, uses the
+          :attr:`RetryPolicy.max_retries <walkscore.retry.RetryPolicy.max_retries>`
+          of the :attr:`retry_policy`. Defaults to :obj:`None <python:None>`.
+        :type max_retries: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :param timeout: The timeout(s) to apply to each attempt, as a number of
+          seconds or a ``(connect, read)`` :class:`tuple <python:tuple>`. Missing
+          values default to :attr:`connect_timeout` and :attr:`read_timeout`.
+          Defaults to :obj:`None <python:None>`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param deadline: The deadline by which the request, including all retries
+          and the delays between them, must complete. No retry is attempted which
+          could not complete before it. Defaults to :obj:`None <python:None>`.
+        :type deadline: :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
         .. note::
 
-          This method will apply an
-          `exponential backoff strategy <https://en.wikipedia.org/wiki/Exponential_backoff>`_
-          to retry the API request if it times out. By default:
+          Requests which time out, fail to connect, or receive a ``429`` or ``5xx``
+          response are retried according to the :attr:`retry_policy`. By default:
 
           * requests that can be retried will be retried up to ``3`` times, but this can
             be overridden by setting a ``BACKOFF_DEFAULT_TRIES`` environment variable with
-            the maximum number of attempts to make
+            the maximum number of retries to make
           * there is no maximum delay to wait before final failure, but this can be
             overridden by setting a ``BACKOFF_DEFAULT_DELAY`` environment variable with
             the maximum number of seconds to wait (across all attempts) before failing.
+          * retries across the process may not exceed a share of the requests made
+            (see :class:`RetryBudget <walkscore.retry.RetryBudget>`).
 
         :raises ValueError: if ``method`` is not either ``GET``, ``HEAD``, ``POST``,
           ``PATCH``, ``PUT`` or ``DELETE``
@@ -202,19 +768,23 @@ class HTTPClient(object):
         :raises WalkScoreError: *or sub-classes* for other errors returned by the API
 
         """
-        response = backoff(self.request,
-                           args = [method, url, parameters, headers, request_body],
-                           catch_exceptions = [type(HTTPTimeoutError)],
-                           strategy = backoff_strategies.Exponential)
-
-        return response
+        return self.retry_policy.execute(self.request,
+                                         method,
+                                         url,
+                                         parameters = parameters,
+                                         headers = headers,
+                                         request_body = request_body,
+                                         timeout = timeout,
+                                         deadline = deadline,
+                                         max_retries = max_retries)
 
     def _request(self,
                  method,
                  url,
                  parameters = None,
                  headers = None,
-                 request_body = None):
+                 request_body = None,
+                 timeout = None):
         """Execute a standard HTTP request.
 
         :param method: The HTTP method to use for the request. Accepts `GET`, `HEAD`,
@@ -237,6 +807,11 @@ class HTTPClient(object):
         :type request_body: :obj:`None <python:None>` / :class:`dict <python:dict>` /
           :class:`str <python:str>` / :class:`bytes <python:bytes>`
 
+        :param timeout: The timeouts to apply. If :obj:`None <python:None>`,
+          defaults to :attr:`connect_timeout` and :attr:`read_timeout`.
+        :type timeout: :class:`Timeout <walkscore.deadline.Timeout>` /
+          :obj:`None <python:None>`
+
         :returns: The content of the HTTP response, the status code of the HTTP response,
           and the headers of the HTTP response.
         :rtype: :class:`tuple <python:tuple>` of :class:`bytes <python:bytes>`,
@@ -260,7 +835,9 @@ class HTTPClient(object):
                 url,
                 parameters = None,
                 headers = None,
-                request_body = None):
+                request_body = None,
+                timeout = None,
+                deadline = None):
         """Execute a standard HTTP request.
 
         :param method: The HTTP method to use for the request. Accepts `GET`, `HEAD`,
@@ -283,6 +860,19 @@ class HTTPClient(object):
         :type request_body: :obj:`None <python:None>` / :class:`dict <python:dict>` /
           :class:`str <python:str>` / :class:`bytes <python:bytes>`
 
+        :param timeout: The timeout(s) to apply, as a number of seconds or a
+          ``(connect, read)`` :class:`tuple <python:tuple>`. Missing values default
+          to :attr:`connect_timeout` and :attr:`read_timeout`. Defaults to
+          :obj:`None <python:None>`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param deadline: The deadline by which the request must complete. The
+          timeouts are shortened so as not to extend beyond it. Defaults to
+          :obj:`None <python:None>`.
+        :type deadline: :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
         :returns: The content of the HTTP response, the status code of the HTTP response,
           and the headers of the HTTP response.
         :rtype: :class:`tuple <python:tuple>` of :class:`bytes <python:bytes>`,
@@ -294,37 +884,540 @@ class HTTPClient(object):
         :raises ValueError: if ``headers`` is not empty and is not a
           :class:`dict <python:dict>`
 
-        :raises HTTPTimeoutError: if the request times out
+        :raises HTTPTimeoutError: if the request times out, or ``deadline`` has
+          passed
+        :raises SSLError: if the request fails SSL certificate verification
+        :raises CircuitOpenError: if the :attr:`circuit_breaker` is open
+        :raises WalkScoreError: *or sub-classes* for other errors returned by the API
+
+        """
+        method, url, parameters, headers = self._validate_request(method,
+                                                                  url,
+                                                                  parameters,
+                                                                  headers)
+
+        return self._execute(method,
+                             url,
+                             parameters,
+                             headers,
+                             request_body,
+                             timeout = timeout,
+                             deadline = deadline)
+
+    def send(self,
+             prepared,
+             parameters = None,
+             timeout = None,
+             deadline = None):
+        """Execute a prepared request.
+
+        Unlike :meth:`request`, the method, URL, and headers of the request are not
+        validated again, and only ``parameters`` are URL-encoded.
+
+        :param prepared: The request to execute.
+        :type prepared: :class:`PreparedRequest`
+
+        :param parameters: The URL parameters which vary between requests, which
+          are added to those of ``prepared``. Defaults to
+          :obj:`None <python:None>`.
+        :type parameters: :class:`dict <python:dict>` / :obj:`None <python:None>`
+
+        :param timeout: The timeout(s) to apply, as for :meth:`request`. Defaults to
+          :obj:`None <python:None>`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param deadline: The deadline by which the request must complete. Defaults
+          to :obj:`None <python:None>`.
+        :type deadline: :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
+        :returns: The content of the HTTP response, the status code of the HTTP response,
+          and the headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>` of :class:`bytes <python:bytes>`,
+          :class:`int <python:int>`, and :class:`dict <python:dict>`
+
+        :raises HTTPTimeoutError: if the request times out, or ``deadline`` has
+          passed
         :raises SSLError: if the request fails SSL certificate verification
+        :raises CircuitOpenError: if the :attr:`circuit_breaker` is open
         :raises WalkScoreError: *or sub-classes* for other errors returned by the API
+        """
+        return self._execute(prepared.method,
+                             prepared.url,
+                             prepared.bind(parameters),
+                             prepared.headers,
+                             None,
+                             timeout = timeout,
+                             deadline = deadline)
+
+    def send_with_retries(self,
+                          prepared,
+                          parameters = None,
+                          max_retries = None,
+                          timeout = None,
+                          deadline = None):
+        """Execute a prepared request with automatic retries on failure.
+
+        Accepts the same parameters as :meth:`send`, plus ``max_retries`` (as for
+        :meth:`request_with_retries`).
+
+        :returns: The content of the HTTP response, the status code of the HTTP response,
+          and the headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>` of :class:`bytes <python:bytes>`,
+          :class:`int <python:int>`, and :class:`dict <python:dict>`
+        """
+        return self.retry_policy.execute(self.send,
+                                         prepared,
+                                         parameters = parameters,
+                                         timeout = timeout,
+                                         deadline = deadline,
+                                         max_retries = max_retries)
+
+    def _execute(self,
+                 method,
+                 url,
+                 parameters,
+                 headers,
+                 request_body,
+                 timeout = None,
+                 deadline = None):
+        """Execute a request whose arguments have already been validated.
+
+        :returns: The content, status code, and headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        if deadline is not None:
+            deadline.check()
+
+        timeout = self._get_timeout(timeout, deadline)
+
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request()
+
+        started = time.monotonic()
+        try:
+            response = self._request(method,
+                                     url,
+                                     parameters,
+                                     headers,
+                                     request_body,
+                                     timeout = timeout)
+        except Exception as error:
+            response = error
+
+        return self._complete_request(response, started)
+
+    def _complete_request(self, response, started):
+        """Check the ``response`` to a request for errors, and record its outcome
+        in the :attr:`circuit_breaker` and :attr:`latency` tracker.
+
+        :param response: The content, status code, and headers of the HTTP response,
+          or the error raised when executing the request.
+        :type response: :class:`tuple <python:tuple>` /
+          :class:`Exception <python:Exception>`
+
+        :param started: The :func:`monotonic <python:time.monotonic>` time at which
+          the request was sent.
+        :type started: :class:`float <python:float>`
+
+        :returns: The content, status code, and headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>`
+
+        :raises WalkScoreError: *or sub-classes* if the request failed
+        """
+        status_code = None
+        response_headers = None
+        try:
+            if isinstance(response, Exception):
+                raise response
+
+            content, status_code, response_headers = response
+            check_for_errors(status_code, content)
+        except Exception as error:
+            self._record_outcome(error, status_code)
+            self._annotate_error(error, status_code, response_headers)
+            raise
+
+        self.latency.record(time.monotonic() - started)
+        self._record_outcome(status_code = status_code)
+
+        return content, status_code, response_headers
+
+    def request_many(self,
+                     requests,
+                     timeout = None,
+                     deadline = None,
+                     max_retries = 0):
+        """Execute several standard HTTP requests.
+
+        Sub-classes which are :attr:`multiplexed` execute the requests concurrently;
+        otherwise, they are executed one after another.
+
+        :param requests: The requests to execute, each a :class:`dict <python:dict>`
+          with ``method`` and ``url`` keys, and optionally ``parameters``,
+          ``headers``, and ``request_body`` keys (which accept the same values as
+          the parameters of :meth:`request`). Alternatively, a request may have a
+          ``prepared`` key holding a :class:`PreparedRequest` and, optionally, the
+          ``parameters`` to add to it (as for :meth:`send`).
+        :type requests: iterable of :class:`dict <python:dict>`
+
+        :param timeout: The timeout(s) to apply to each request, as a number of
+          seconds or a ``(connect, read)`` :class:`tuple <python:tuple>`. Defaults to
+          :obj:`None <python:None>`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param deadline: The deadline by which all of the requests, including any
+          retries, must complete. Defaults to :obj:`None <python:None>`.
+        :type deadline: :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
+        :param max_retries: The maximum number of times to retry each request which
+          fails, according to the :attr:`retry_policy`. Failed requests are retried
+          together once the longest of their delays has passed. If
+          :obj:`None <python:None>`, uses the
+          :attr:`RetryPolicy.max_retries <walkscore.retry.RetryPolicy.max_retries>`
+          of the :attr:`retry_policy`. Defaults to ``0``.
+        :type max_retries: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :returns: The outcome of each request, in the same order as ``requests``:
+          either a :class:`tuple <python:tuple>` of the content, status code, and
+          headers of the HTTP response, or the error raised by the request.
+        :rtype: :class:`list <python:list>`
+
+        :raises ValueError: if any of ``requests`` is not valid
+        """
+        requests = [self._validate_many_request(request) for request in requests]
+
+        if max_retries is None:
+            max_retries = self.retry_policy.max_retries
+
+        responses = [None] * len(requests)
+        retries = [(0, 0, None)] * len(requests)
+        pending = list(range(len(requests)))
+        for _ in pending:
+            self.retry_policy.budget.record_request()
+
+        while pending:
+            self._send_many(requests, pending, responses, timeout, deadline)
+
+            retrying = []
+            longest_delay = 0
+            for index in pending:
+                if not isinstance(responses[index], Exception):
+                    continue
+
+                attempt, waited, delay = retries[index]
+                delay = self.retry_policy._get_next_delay(attempt,                       # pylint: disable=W0212
+                                                          max_retries,
+                                                          waited,
+                                                          delay,
+                                                          responses[index],
+                                                          deadline = deadline)
+                if delay is None:
+                    continue
+
+                retries[index] = (attempt + 1, waited + delay, delay)
+                longest_delay = max(longest_delay, delay)
+                retrying.append(index)
+
+            if retrying:
+                time.sleep(longest_delay)
+
+            pending = retrying
+
+        return responses
+
+    def _send_many(self, requests, indices, responses, timeout = None, deadline = None):
+        """Execute the ``requests`` at ``indices``, storing the outcome of each in
+        ``responses``."""
+        sending = []
+        for index in indices:
+            try:
+                if deadline is not None:
+                    deadline.check()
+                if self.circuit_breaker is not None:
+                    self.circuit_breaker.before_request()
+            except Exception as error:                                          # pylint: disable=W0703
+                responses[index] = error
+                continue
+
+            sending.append(index)
+
+        if not sending:
+            return
+
+        started = time.monotonic()
+        outcomes = self._request_many([requests[index] for index in sending],
+                                      timeout = self._get_timeout(timeout, deadline))
+        for index, response in zip(sending, outcomes):
+            try:
+                responses[index] = self._complete_request(response, started)
+            except Exception as error:                                          # pylint: disable=W0703
+                responses[index] = error
+
+    def _request_many(self, requests, timeout = None):
+        """Execute several standard HTTP requests, which have already been
+        validated.
+
+        The default implementation executes the requests one after another. Sub-classes
+        which can execute requests concurrently should override it, and set
+        :attr:`multiplexed` to ``True``.
+
+        :param requests: The requests to execute, each a
+          :class:`tuple <python:tuple>` of the ``method``, ``url``, ``parameters``,
+          ``headers``, and ``request_body`` to supply to :meth:`_request`.
+        :type requests: :class:`list <python:list>` of :class:`tuple <python:tuple>`
+
+        :param timeout: The timeouts to apply to each request.
+        :type timeout: :class:`Timeout <walkscore.deadline.Timeout>` /
+          :obj:`None <python:None>`
+
+        :returns: The outcome of each request: either a
+          :class:`tuple <python:tuple>` of the content, status code, and headers of
+          the HTTP response, or the error raised by the request.
+        :rtype: :class:`list <python:list>`
+        """
+        responses = []
+        for request in requests:
+            try:
+                responses.append(self._request(*request, timeout = timeout))
+            except Exception as error:                                          # pylint: disable=W0703
+                responses.append(error)
+
+        return responses
+
+    def _validate_many_request(self, request):
+        """Validate one of the requests supplied to :meth:`request_many`.
 
+        :returns: The ``method``, ``url``, ``parameters``, ``headers``, and
+          ``request_body`` to supply to :meth:`_request`.
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        prepared = request.get('prepared', None)
+        if prepared is not None:
+            return (prepared.method,
+                    prepared.url,
+                    prepared.bind(request.get('parameters', None)),
+                    prepared.headers,
+                    None)
+
+        return self._validate_request(request.get('method'),
+                                      request.get('url'),
+                                      request.get('parameters', None),
+                                      request.get('headers', None)) + \
+            (request.get('request_body', None),)
+
+    @staticmethod
+    def _validate_request(method, url, parameters = None, headers = None):
+        """Validate the arguments supplied to :meth:`request`.
+
+        :returns: The validated ``method``, ``url``, ``parameters``, and ``headers``.
+        :rtype: :class:`tuple <python:tuple>`
+
+        :raises ValueError: if ``method`` is not either ``GET``, ``HEAD``, ``POST``,
+          ``PATCH``, ``PUT`` or ``DELETE``
+        :raises ValueError: if ``url`` is not a valid URL
+        :raises ValueError: if ``headers`` is not empty and is not a
+          :class:`dict <python:dict>`
         """
         method = validators.string(method, allow_empty = False)
         method = method.upper()
         if method not in HTTP_METHODS:
             raise ValueError('method (%s) not a recognized HTTP method' % method)
 
-        url = validators.url(url, allow_empty = False)
+        url = validators.url(url, allow_empty = False, allow_special_ips = True)
 
         parameters = validators.dict(parameters, allow_empty = True)
         headers = validators.dict(headers, allow_empty = True)
 
+        return method, url, parameters, headers
 
-        content, status_code, headers = self._request(method,
-                                                      url,
-                                                      parameters,
-                                                      headers,
-                                                      request_body)
+    def close(self):
+        """Closes an existing HTTP connection/session."""
 
-        check_for_errors(status_code, content)
+        raise NotImplementedError(
+            "HTTPClient subclasses must implement `close`"
+        )
 
-        return content, status_code, headers
 
-    def close(self):
+class AsyncHTTPClient(HTTPClient):
+    """Base class that provides asynchronous HTTP connectivity.
+
+    Exposes the same interface as :class:`HTTPClient`, except that
+    :meth:`request`, :meth:`request_with_retries`, and :meth:`close` are
+    coroutines which must be awaited.
+    """
+
+    async def request_with_retries(self,
+                                   method,
+                                   url,
+                                   parameters = None,
+                                   headers = None,
+                                   request_body = None,
+                                   max_retries = None,
+                                   timeout = None,
+                                   deadline = None):
+        """Execute a standard HTTP request with automatic retries on failure.
+
+        Accepts the same parameters as :meth:`HTTPClient.request_with_retries`, and
+        waits between attempts without blocking the event loop.
+
+        :returns: The content of the HTTP response, the status code of the HTTP response,
+          and the headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>` of :class:`bytes <python:bytes>`,
+          :class:`int <python:int>`, and :class:`dict <python:dict>`
+
+        :raises HTTPTimeoutError: if the request times out after repeated attempts
+        :raises SSLError: if the request fails SSL certificate verification
+        :raises WalkScoreError: *or sub-classes* for other errors returned by the API
+        """
+        return await self.retry_policy.execute_async(self.request,
+                                                     method,
+                                                     url,
+                                                     parameters = parameters,
+                                                     headers = headers,
+                                                     request_body = request_body,
+                                                     timeout = timeout,
+                                                     deadline = deadline,
+                                                     max_retries = max_retries)
+
+    async def _request(self,
+                       method,
+                       url,
+                       parameters = None,
+                       headers = None,
+                       request_body = None,
+                       timeout = None):
+        """Execute a standard HTTP request.
+
+        Accepts the same parameters and returns the same value as
+        :meth:`HTTPClient._request`.
+        """
+        raise NotImplementedError(
+            "AsyncHTTPClient subclasses must implement `_request`"
+        )
+
+    async def request(self,
+                      method,
+                      url,
+                      parameters = None,
+                      headers = None,
+                      request_body = None,
+                      timeout = None,
+                      deadline = None):
+        """Execute a standard HTTP request.
+
+        Accepts the same parameters and returns the same value as
+        :meth:`HTTPClient.request`.
+        """
+        method, url, parameters, headers = self._validate_request(method,
+                                                                  url,
+                                                                  parameters,
+                                                                  headers)
+
+        return await self._execute(method,
+                                   url,
+                                   parameters,
+                                   headers,
+                                   request_body,
+                                   timeout = timeout,
+                                   deadline = deadline)
+
+    async def send(self,
+                   prepared,
+                   parameters = None,
+                   timeout = None,
+                   deadline = None):
+        """Execute a prepared request.
+
+        Accepts the same parameters and returns the same value as
+        :meth:`HTTPClient.send`.
+        """
+        return await self._execute(prepared.method,
+                                   prepared.url,
+                                   prepared.bind(parameters),
+                                   prepared.headers,
+                                   None,
+                                   timeout = timeout,
+                                   deadline = deadline)
+
+    async def send_with_retries(self,
+                                prepared,
+                                parameters = None,
+                                max_retries = None,
+                                timeout = None,
+                                deadline = None):
+        """Execute a prepared request with automatic retries on failure.
+
+        Accepts the same parameters and returns the same value as
+        :meth:`HTTPClient.send_with_retries`, and waits between attempts without
+        blocking the event loop.
+        """
+        return await self.retry_policy.execute_async(self.send,
+                                                     prepared,
+                                                     parameters = parameters,
+                                                     timeout = timeout,
+                                                     deadline = deadline,
+                                                     max_retries = max_retries)
+
+    async def _execute(self,
+                       method,
+                       url,
+                       parameters,
+                       headers,
+                       request_body,
+                       timeout = None,
+                       deadline = None):
+        """Execute a request whose arguments have already been validated.
+
+        :returns: The content, status code, and headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        import asyncio
+
+        if deadline is not None:
+            deadline.check()
+
+        timeout = self._get_timeout(timeout, deadline)
+
+        if self.circuit_breaker is not None:
+            self.circuit_breaker.before_request()
+
+        status_code = None
+        response_headers = None
+        started = time.monotonic()
+        try:
+            content, status_code, response_headers = await self._request(
+                method,
+                url,
+                parameters,
+                headers,
+                request_body,
+                timeout = timeout
+            )
+
+            check_for_errors(status_code, content)
+        except asyncio.CancelledError:
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record_cancelled()
+            raise
+        except Exception as error:
+            self._record_outcome(error, status_code)
+            self._annotate_error(error, status_code, response_headers)
+            raise
+
+        self.latency.record(time.monotonic() - started)
+        self._record_outcome(status_code = status_code)
+
+        return content, status_code, response_headers
+
+    async def close(self):
         """Closes an existing HTTP connection/session."""
 
         raise NotImplementedError(
-            "HTTPClient subclasses must implement `close`"
+            "AsyncHTTPClient subclasses must implement `close`"
         )
 
 
@@ -334,20 +1427,82 @@ class RequestsClient(HTTPClient):
     name = "requests"
 
     def __init__(self,
-                 timeout = 80,
+                 timeout = None,
                  session = None,
                  **kwargs):
+        """
+        :param timeout: The default timeout(s) to apply to requests, as a number of
+          seconds or a ``(connect, read)`` :class:`tuple <python:tuple>`. Overrides
+          ``connect_timeout`` and ``read_timeout`` if supplied. Defaults to
+          :obj:`None <python:None>`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param session: An existing :class:`requests.Session` to use. If
+          :obj:`None <python:None>`, sessions are created as they are needed, and
+          at most ``pool_size`` idle sessions are kept for re-use. Defaults to
+          :obj:`None <python:None>`.
+        """
+        _apply_timeout(kwargs, timeout)
+        _require_backend('requests')
         super(RequestsClient, self).__init__(**kwargs)
 
         self._session = session
-        self._timeout = timeout
+
+        # A session is checked out for each request and returned afterwards, so
+        # that no more sessions are kept than are used at once. They all share a
+        # single adapter (and so a single thread-safe connection pool) so that
+        # connections are re-used across threads.
+        self._adapter = requests.adapters.HTTPAdapter(pool_connections = self._pool_size,
+                                                      pool_maxsize = self._pool_size)
+        self._idle_sessions = []
+        self._sessions_lock = threading.Lock()
+
+    def _get_session(self):
+        """Check out an idle :class:`requests.Session`, creating one if there is
+        none. It is returned with :meth:`_release_session`.
+
+        :rtype: :class:`requests.Session`
+        """
+        if self._session is not None:
+            return self._session
+
+        with self._sessions_lock:
+            if self._idle_sessions:
+                return self._idle_sessions.pop()
+
+        session = requests.Session()
+        session.mount('http://', self._adapter)
+        session.mount('https://', self._adapter)
+        if not self._keep_alive:
+            session.headers['Connection'] = 'close'
+
+        return session
+
+    def _release_session(self, session):
+        """Return a session checked out with :meth:`_get_session`, discarding it
+        if ``pool_size`` idle sessions are already kept.
+
+        The connections belong to the shared adapter, so discarding a session
+        does not close them.
+
+        :param session: The session to return.
+        :type session: :class:`requests.Session`
+        """
+        if session is self._session:
+            return
+
+        with self._sessions_lock:
+            if len(self._idle_sessions) < self._pool_size:
+                self._idle_sessions.append(session)
 
     def _request(self,
                  method,
                  url,
                  parameters = None,
                  headers = None,
-                 request_body = None):
+                 request_body = None,
+                 timeout = None):
         """Execute a standard HTTP request.
 
         :param method: The HTTP method to use for the request. Accepts `GET`, `HEAD`,
@@ -370,6 +1525,11 @@ class RequestsClient(HTTPClient):
         :type request_body: :obj:`None <python:None>` / :class:`dict <python:dict>` /
           :class:`str <python:str>` / :class:`bytes <python:bytes>`
 
+        :param timeout: The timeouts to apply. If :obj:`None <python:None>`,
+          defaults to :attr:`connect_timeout` and :attr:`read_timeout`.
+        :type timeout: :class:`Timeout <walkscore.deadline.Timeout>` /
+          :obj:`None <python:None>`
+
         :returns: The content of the HTTP response, the status code of the HTTP response,
           and the headers of the HTTP response.
         :rtype: :class:`tuple <python:tuple>` of :class:`bytes <python:bytes>`,
@@ -392,18 +1552,18 @@ class RequestsClient(HTTPClient):
         if self._proxy:
             kwargs["proxies"] = self._proxy
 
-        if getattr(self._thread_local, "session", None) is None:
-            self._thread_local.session = self._session or requests.Session()
+        session = self._get_session()
 
         try:
             try:
-                result = self._thread_local.session.request(method,
-                                                            url,
-                                                            params = parameters,
-                                                            headers = headers,
-                                                            data = request_body,
-                                                            timeout = self._timeout,
-                                                            **kwargs)
+                result = session.request(method,
+                                         url,
+                                         params = _get_query_string(parameters),
+                                         headers = self._get_headers(headers),
+                                         data = request_body,
+                                         timeout = (timeout.connect, timeout.read),
+                                         stream = True,
+                                         **kwargs)
             except TypeError as error:
                 raise TypeError(
                     "Warning: It looks like your installed version of the "
@@ -414,23 +1574,38 @@ class RequestsClient(HTTPClient):
                     "underlying error was: %s" % (error,)
                 )
 
-            # This causes the content to actually be read, which could cause
-            # e.g. a socket timeout. TODO: The other fetch methods probably
-            # are susceptible to the same and should be updated.
-            content = result.content
+            # Read the raw (still compressed) body, so that it is decompressed
+            # as it arrives and its size on the wire can be counted. Reading
+            # could cause e.g. a socket timeout.
+            decoder = ResponseDecoder(result.headers.get('content-encoding', None))
+            try:
+                for chunk in result.raw.stream(CHUNK_SIZE, decode_content = False):
+                    decoder.write(chunk)
+            finally:
+                result.close()
+
+            content = self._get_content(decoder)
             status_code = result.status_code
         except Exception as error:                                                        # pylint: disable=W0703
             # Would catch just requests.exceptions.RequestException, but can
             # also raise ValueError, RuntimeError, etc.
-            WalkScoreError.from_exception(error)
+            raise WalkScoreError.from_exception(error) from error
+        finally:
+            self._release_session(session)
 
         return content, status_code, result.headers
 
     def close(self):
-        """Closes an existing HTTP connection/session."""
+        """Closes the HTTP sessions created by the client, and their connection pool."""
 
-        if getattr(self._thread_local, "session", None) is not None:
-            self._thread_local.session.close()
+        with self._sessions_lock:
+            sessions = self._idle_sessions
+            self._idle_sessions = []
+
+        for session in sessions:
+            session.close()
+
+        self._adapter.close()
 
 
 class UrlFetchClient(HTTPClient):
@@ -441,9 +1616,12 @@ class UrlFetchClient(HTTPClient):
     def __init__(self,
                  verify_ssl_certs = True,
                  proxy = None,
-                 deadline = 55):
+                 deadline = 55,
+                 **kwargs):
+        _require_backend('urlfetch')
         super(UrlFetchClient, self).__init__(verify_ssl_certs = verify_ssl_certs,
-                                             proxy = proxy)
+                                             proxy = proxy,
+                                             **kwargs)
 
         # no proxy support in urlfetch. for a patch, see:
         # https://code.google.com/p/googleappengine/issues/detail?id=544
@@ -460,23 +1638,36 @@ class UrlFetchClient(HTTPClient):
         # to 55 seconds to allow for a slow WalkScore API
         self._deadline = deadline
 
+    def _get_deadline(self, timeout = None):
+        """Return the urlfetch deadline for a request with ``timeout``.
+
+        urlfetch applies a single deadline to the whole request, so the connect and
+        read timeouts are combined (and capped at the client's ``deadline``).
+
+        :rtype: numeric
+        """
+        timeout = timeout or self._get_timeout()
+
+        return min(self._deadline, _get_total_timeout(timeout))
+
     def _request(self,
                  method,
                  url,
                  parameters = None,
                  headers = None,
-                 request_body = None):
+                 request_body = None,
+                 timeout = None):
         try:
             result = urlfetch.request(
                 url = url,
                 method = method,
-                params = parameters,
-                headers = headers,
+                params = _get_query_string(parameters),
+                headers = self._get_headers(headers),
                 # Google App Engine doesn't let us specify our own cert bundle.
                 # However, that's ok because the CA bundle they use recognizes
                 # api.stripe.com.
                 validate_certificate = self._verify_ssl_certs,
-                deadline = self._deadline,
+                deadline = self._get_deadline(timeout),
                 data = request_body,
             )
         except urlfetch.Error as error:
@@ -502,7 +1693,11 @@ class UrlFetchClient(HTTPClient):
 
             raise InternalAPIError(message)
 
-        return result.content, result.status_code, result.headers
+        # urlfetch does not stream, so the body is decompressed once received.
+        decoder = ResponseDecoder(result.headers.get('content-encoding', None))
+        decoder.write(result.content)
+
+        return self._get_content(decoder), result.status_code, result.headers
 
     def close(self):
         pass
@@ -511,18 +1706,35 @@ class UrlFetchClient(HTTPClient):
 class PycurlClient(HTTPClient):
     """class:`HTTPClient` for the `pycurl <http://pycurl.io/docs/latest/index.html>`_
     library.
+
+    A ``Curl`` handle cannot be used by more than one thread at a time, so a
+    handle is checked out for each request and returned afterwards, and at most
+    ``pool_size`` idle handles are kept. The handles are linked through a
+    ``CurlShare`` handle, so that they share their DNS cache, open connections,
+    and TLS sessions, and one client can be shared by many threads.
     """
 
     name = "pycurl"
 
     def __init__(self,
                  verify_ssl_certs = True,
-                 proxy = None):
+                 proxy = None,
+                 **kwargs):
+        _require_backend('pycurl')
         super(PycurlClient, self).__init__(verify_ssl_certs = verify_ssl_certs,
-                                           proxy = proxy)
+                                           proxy = proxy,
+                                           **kwargs)
 
-        # Initialize this within the object so that we can reuse connections.
-        self._curl = pycurl.Curl()
+        # pycurl serializes access to the shared data between threads itself.
+        self._share = pycurl.CurlShare()
+        self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+        self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+        if hasattr(pycurl, 'LOCK_DATA_CONNECT'):
+            self._share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+
+        self._curls = []
+        self._idle_curls = []
+        self._curls_lock = threading.Lock()
 
         # need to urlparse the proxy, since PyCurl
         # consumes the proxy url in small pieces
@@ -547,109 +1759,219 @@ class PycurlClient(HTTPClient):
 
         return dict((k.lower(), v) for k, v in six.iteritems(dict(headers)))
 
+    def _new_curl(self):
+        """Create a ``Curl`` handle linked to the client's ``CurlShare`` handle.
+
+        :rtype: :class:`pycurl.Curl`
+        """
+        curl = pycurl.Curl()
+        curl.setopt(pycurl.SHARE, self._share)
+
+        with self._curls_lock:
+            self._curls.append(curl)
+
+        return curl
+
+    def _get_curl(self):
+        """Check out an idle ``Curl`` handle, creating one if there is none. It is
+        returned with :meth:`_release_curl`.
+
+        :rtype: :class:`pycurl.Curl`
+        """
+        with self._curls_lock:
+            if self._idle_curls:
+                return self._idle_curls.pop()
+
+        return self._new_curl()
+
+    def _release_curl(self, curl):
+        """Return a ``Curl`` handle checked out with :meth:`_get_curl`, closing it
+        if ``pool_size`` idle handles are already kept (or if the client has
+        been closed since it was checked out).
+
+        :param curl: The handle to return.
+        :type curl: :class:`pycurl.Curl`
+        """
+        with self._curls_lock:
+            is_open = any(x is curl for x in self._curls)
+            if is_open and len(self._idle_curls) < self._pool_size:
+                self._idle_curls.append(curl)
+                return
+
+            if is_open:
+                self._curls.remove(curl)
+
+        curl.close()
+
     def _request(self,
                  method,
                  url,
                  parameters = None,
                  headers = None,
-                 request_body = None):
+                 request_body = None,
+                 timeout = None):
+        # Pycurl's design is a little weird: although we set per-request
+        # options on this object, it's also capable of maintaining established
+        # connections. _prepare_curl() calls reset() between uses to make sure
+        # it's in a pristine state, but notably reset() doesn't reset
+        # connections, so we still get to take advantage of those by virtue of
+        # re-using the same object.
+        curl = self._get_curl()
+        try:
+            buffers = self._prepare_curl(curl,
+                                         method,
+                                         url,
+                                         parameters = parameters,
+                                         headers = headers,
+                                         request_body = request_body,
+                                         timeout = timeout)
+
+            try:
+                curl.perform()
+            except pycurl.error as error:
+                self._handle_request_error(error)
+
+            return self._read_response(curl, *buffers)
+        finally:
+            self._release_curl(curl)
+
+    def _prepare_curl(self,
+                      curl,
+                      method,
+                      url,
+                      parameters = None,
+                      headers = None,
+                      request_body = None,
+                      timeout = None):
+        """Reset ``curl`` and set its options to execute a request.
+
+        Accepts the same parameters as :meth:`_request`, plus:
+
+        :param curl: The handle to prepare.
+        :type curl: :class:`pycurl.Curl`
+
+        :returns: The decoder into which the body of the response is written, and
+          the buffer into which its headers are written.
+        :rtype: :class:`tuple <python:tuple>` of
+          :class:`ResponseDecoder <walkscore.compression.ResponseDecoder>` and
+          :class:`BytesIO <python:io.BytesIO>`
+        """
         if isinstance(request_body, dict):
-            request_body = json.dumps(request_body)
+            request_body = jsoncodec.dumps(request_body)
 
-        b = io.BytesIO()
+        b = ResponseDecoder()
         rheaders = io.BytesIO()
 
-        # Pycurl's design is a little weird: although we set per-request
-        # options on this object, it's also capable of maintaining established
-        # connections. Here we call reset() between uses to make sure it's in a
-        # pristine state, but notably reset() doesn't reset connections, so we
-        # still get to take advantage of those by virtue of re-using the same
-        # object.
-        self._curl.reset()
+        def write_header(line):
+            rheaders.write(line)
+            # Each response (e.g. following a redirect) starts with its status
+            # line, and the body is only written after the last one's headers.
+            name, _, value = line.decode('iso-8859-1').partition(':')
+            if line.startswith(b'HTTP/'):
+                b.content_encoding = None
+            elif name.strip().lower() == 'content-encoding':
+                b.content_encoding = value.strip()
+
+        curl.reset()
 
         proxy = self._get_proxy(url)
         if proxy:
             if proxy.hostname:
-                self._curl.setopt(pycurl.PROXY, proxy.hostname)
+                curl.setopt(pycurl.PROXY, proxy.hostname)
             if proxy.port:
-                self._curl.setopt(pycurl.PROXYPORT, proxy.port)
+                curl.setopt(pycurl.PROXYPORT, proxy.port)
             if proxy.username or proxy.password:
-                self._curl.setopt(
+                curl.setopt(
                     pycurl.PROXYUSERPWD,
                     "%s:%s" % (proxy.username, proxy.password),
                 )
 
         if method == "GET":
-            self._curl.setopt(pycurl.HTTPGET, 1)
+            curl.setopt(pycurl.HTTPGET, 1)
         elif method == 'HEAD':
-            self._curl.setopt(pycurl.NOBODY, 1)
+            curl.setopt(pycurl.NOBODY, 1)
         elif method == "POST":
-            self._curl.setopt(pycurl.POST, 1)
-            self._curl.setopt(pycurl.POSTFIELDS, request_body)
+            curl.setopt(pycurl.POST, 1)
+            curl.setopt(pycurl.POSTFIELDS, request_body)
         elif method == 'PUT':
-            self._curl.setopt(pycurl.CUSTOMREQUEST, 'PUT')
-            self._curl.setopt(pycurl.POSTFIELDS, request_body)
+            curl.setopt(pycurl.CUSTOMREQUEST, 'PUT')
+            curl.setopt(pycurl.POSTFIELDS, request_body)
         elif method == 'PATCH':
-            self._curl.setopt(pycurl.CUSTOMREQUEST, 'PATCH')
-            self._curl.setopt(pycurl.POSTFIELDS, request_body)
+            curl.setopt(pycurl.CUSTOMREQUEST, 'PATCH')
+            curl.setopt(pycurl.POSTFIELDS, request_body)
         else:
-            self._curl.setopt(pycurl.CUSTOMREQUEST, method.upper())
+            curl.setopt(pycurl.CUSTOMREQUEST, method.upper())
 
         # pycurl doesn't like unicode URLs
-        if parameters:
-            parameter_string = base_urllib.urlencode(parameters)
-
+        parameter_string = _get_query_string(parameters)
+        if parameter_string:
             url += '?' + parameter_string
 
         url = to_utf8(url)
-        self._curl.setopt(pycurl.URL, url)
-
-        self._curl.setopt(pycurl.WRITEFUNCTION, b.write)
-        self._curl.setopt(pycurl.HEADERFUNCTION, rheaders.write)
-        self._curl.setopt(pycurl.NOSIGNAL, 1)
-        self._curl.setopt(pycurl.CONNECTTIMEOUT, 30)
-        self._curl.setopt(pycurl.TIMEOUT, 80)
-
-        if headers:
-            self._curl.setopt(
-                pycurl.HTTPHEADER,
-                ["%s: %s" % (k, v) for k, v in six.iteritems(dict(headers))],
-            )
+        curl.setopt(pycurl.URL, url)
+
+        # The Accept-Encoding header is sent rather than setting ACCEPT_ENCODING,
+        # which would have libcurl decompress the body (and hide its size).
+        curl.setopt(pycurl.WRITEFUNCTION, b.write)
+        curl.setopt(pycurl.HEADERFUNCTION, write_header)
+        curl.setopt(pycurl.NOSIGNAL, 1)
+        if not self._keep_alive:
+            curl.setopt(pycurl.FORBID_REUSE, 1)
+        # pycurl's TIMEOUT covers the whole transfer, including connecting
+        timeout = timeout or self._get_timeout()
+        curl.setopt(pycurl.CONNECTTIMEOUT_MS, int(timeout.connect * 1000))
+        curl.setopt(pycurl.TIMEOUT_MS, int(_get_total_timeout(timeout) * 1000))
+
+        curl.setopt(
+            pycurl.HTTPHEADER,
+            ["%s: %s" % (k, v) for k, v in six.iteritems(self._get_headers(headers))],
+        )
 
         if self._verify_ssl_certs:
-            self._curl.setopt(pycurl.CAINFO, CA_BUNDLE_PATH)
+            curl.setopt(pycurl.CAINFO, CA_BUNDLE_PATH)
         else:
-            self._curl.setopt(pycurl.SSL_VERIFYHOST, False)
+            curl.setopt(pycurl.SSL_VERIFYHOST, False)
 
-        try:
-            self._curl.perform()
-        except pycurl.error as error:
-            self._handle_request_error(error)
+        return b, rheaders
+
+    def _read_response(self, curl, b, rheaders):
+        """Return the response to the request executed by ``curl``.
 
-        rbody = b.getvalue().decode("utf-8")
-        rcode = self._curl.getinfo(pycurl.RESPONSE_CODE)
+        :returns: The content of the HTTP response, the status code of the HTTP response,
+          and the headers of the HTTP response.
+        :rtype: :class:`tuple <python:tuple>` of :class:`str <python:str>`,
+          :class:`int <python:int>`, and :class:`dict <python:dict>`
+        """
+        rbody = self._get_content(b).decode("utf-8")
+        rcode = curl.getinfo(pycurl.RESPONSE_CODE)
         headers = self.parse_headers(rheaders.getvalue().decode("utf-8"))
 
         return rbody, rcode, headers
 
     @classmethod
     def _handle_request_error(cls, error):
+        raise cls._get_request_error(error)
+
+    @classmethod
+    def _get_request_error(cls, error):
+        """Return the :class:`WalkScoreError <walkscore.errors.WalkScoreError>` which
+        corresponds to the :class:`pycurl.error` ``error``."""
         if error.args[0] == pycurl.E_OPERATION_TIMEOUTED:
-            raise HTTPTimeoutError('Could not connect to the WalkScore API. '
-                                   'Please check your internet connection and try again. ')
-        elif error.args[0] == [pycurl.E_COULDNT_CONNECT,
+            return HTTPTimeoutError('Could not connect to the WalkScore API. '
+                                    'Please check your internet connection and try again. ')
+        elif error.args[0] in [pycurl.E_COULDNT_CONNECT,
                                pycurl.E_COULDNT_RESOLVE_HOST]:
-            raise HTTPConnectionError("Could not connect to WalkScore.  Please check "
-                                      "your internet connection and try again.")
+            return HTTPConnectionError("Could not connect to WalkScore.  Please check "
+                                       "your internet connection and try again.")
         elif error.args[0] in [pycurl.E_SSL_CACERT,
                                pycurl.E_SSL_PEER_CERTIFICATE]:
-            raise SSLError("Could not verify WalkScore's SSL certificate.  Please make "
-                           "sure that your network is not intercepting certificates.")
-        else:
-            raise HTTPConnectionError(
-                "Unexpected error communicating with the WalkScore API. If this "
-                "problem persists, let us know at software@insightindustry.com."
-            )
+            return SSLError("Could not verify WalkScore's SSL certificate.  Please make "
+                            "sure that your network is not intercepting certificates.")
+
+        return HTTPConnectionError(
+            "Unexpected error communicating with the WalkScore API. If this "
+            "problem persists, let us know at software@insightindustry.com."
+        )
 
     def _get_proxy(self, url):
         if self._proxy:
@@ -667,70 +1989,748 @@ class PycurlClient(HTTPClient):
         return None
 
     def close(self):
-        pass
+        """Closes the ``Curl`` handles created by the client, dropping the
+        connections they hold open."""
+        with self._curls_lock:
+            curls = self._curls
+            self._curls = []
+            self._idle_curls = []
+
+        for curl in curls:
+            curl.close()
+
+
+class PycurlMultiClient(PycurlClient):
+    """class:`HTTPClient` which drives many transfers at once over a
+    `pycurl <http://pycurl.io/docs/latest/index.html>`_ ``CurlMulti`` handle,
+    from a single thread.
+
+    Up to ``pool_size`` transfers are in flight at once. As with
+    :class:`PycurlClient`, open connections, DNS lookups, and TLS sessions are
+    shared between transfers through a ``CurlShare`` handle.
+
+    .. note::
+
+      The ``CurlMulti`` handle may only be driven by one thread at a time, so
+      concurrent calls to :meth:`request <HTTPClient.request>` or
+      :meth:`request_many <HTTPClient.request_many>` from several threads are
+      executed one after another. To execute many requests at once, pass them to
+      :meth:`request_many <HTTPClient.request_many>` in a single call (as
+      :meth:`WalkScoreAPI.get_scores() <walkscore.api.WalkScoreAPI.get_scores>`
+      does).
+    """
+
+    name = "pycurl-multi"
+    multiplexed = True
+
+    def __init__(self,
+                 verify_ssl_certs = True,
+                 proxy = None,
+                 **kwargs):
+        super(PycurlMultiClient, self).__init__(verify_ssl_certs = verify_ssl_certs,
+                                                proxy = proxy,
+                                                **kwargs)
+
+        self._lock = threading.Lock()
+
+        self._multi = pycurl.CurlMulti()
+        self._multi.setopt(pycurl.M_MAXCONNECTS, self._pool_size)
+
+        self._handles = []
+
+    def _get_handle(self):
+        """Return an idle ``Curl`` handle, creating it if necessary.
+
+        :rtype: :class:`pycurl.Curl`
+        """
+        if self._handles:
+            return self._handles.pop()
+
+        return self._new_curl()
+
+    def _request(self,
+                 method,
+                 url,
+                 parameters = None,
+                 headers = None,
+                 request_body = None,
+                 timeout = None):
+        response = self._request_many([(method, url, parameters, headers, request_body)],
+                                      timeout = timeout)[0]
+        if isinstance(response, Exception):
+            raise response
+
+        return response
+
+    def _request_many(self, requests, timeout = None):
+        with self._lock:
+            responses = [None] * len(requests)
+            queued = deque(enumerate(requests))
+            transfers = {}
+            try:
+                while queued or transfers:
+                    while queued and len(transfers) < self._pool_size:
+                        index, request = queued.popleft()
+                        curl = self._get_handle()
+                        try:
+                            buffers = self._prepare_curl(curl, *request, timeout = timeout)
+                        except Exception as error:                              # pylint: disable=W0703
+                            responses[index] = error
+                            self._handles.append(curl)
+                            continue
+
+                        self._multi.add_handle(curl)
+                        transfers[curl] = (index, buffers)
+
+                    self._perform()
+                    for curl, response in self._read_completed(transfers):
+                        index, _ = transfers.pop(curl)
+                        responses[index] = response
+                        self._multi.remove_handle(curl)
+                        self._handles.append(curl)
+
+                    if transfers:
+                        self._multi.select(1.0)
+            finally:
+                for curl in transfers:
+                    self._multi.remove_handle(curl)
+                    self._handles.append(curl)
+
+        return responses
+
+    def _perform(self):
+        """Let the ``CurlMulti`` handle make progress on its transfers."""
+        while True:
+            status, _ = self._multi.perform()
+            if status != pycurl.E_CALL_MULTI_PERFORM:
+                break
+
+    def _read_completed(self, transfers):
+        """Return the transfers which have completed, with their responses.
+
+        :param transfers: The transfers in flight, mapping each ``Curl`` handle to
+          the index of its request and its response buffers.
+        :type transfers: :class:`dict <python:dict>`
+
+        :returns: The handle of each completed transfer, and either its response or
+          the error which it raised.
+        :rtype: :class:`list <python:list>` of :class:`tuple <python:tuple>`
+        """
+        completed = []
+        while True:
+            queued, succeeded, failed = self._multi.info_read()
+            for curl in succeeded:
+                try:
+                    response = self._read_response(curl, *transfers[curl][1])
+                except WalkScoreError as error:
+                    response = error
+
+                completed.append((curl, response))
+
+            for curl, errno, message in failed:
+                completed.append((curl, self._get_request_error(pycurl.error(errno,
+                                                                             message))))
+
+            if not queued:
+                break
+
+        return completed
+
+    def close(self):
+        """Closes the ``Curl`` handles created by the client, dropping the
+        connections they hold open."""
+        with self._lock:
+            self._handles = []
+            self._multi.close()
+
+        super(PycurlMultiClient, self).close()
 
 
 class Urllib2Client(HTTPClient):
-    """class:`HTTPClient` for the :doc:`urllib2` package.
+    """class:`HTTPClient` for the Python standard library, used when no other HTTP
+    library is installed.
+
+    Rather than opening a new connection for every request (as
+    :func:`urlopen() <python:urllib.request.urlopen>` does), the client keeps up
+    to ``pool_size`` idle :class:`HTTPConnection <python:http.client.HTTPConnection>`
+    / :class:`HTTPSConnection <python:http.client.HTTPSConnection>` objects per
+    host open for re-use. A connection is only ever used by one thread at a time,
+    and a request sent over a re-used connection which the server has since closed
+    is re-sent over a new connection.
     """
 
     name = "urllib.request"
 
     def __init__(self,
                  verify_ssl_certs = True,
-                 proxy = None):
+                 proxy = None,
+                 **kwargs):
         super(Urllib2Client, self).__init__(verify_ssl_certs = verify_ssl_certs,
-                                            proxy = proxy)
+                                            proxy = proxy,
+                                            **kwargs)
 
-        # prepare and cache proxy tied opener here
-        self._opener = None
         if self._proxy:
-            proxy = urllib.request.ProxyHandler(self._proxy)
-            self._opener = urllib.request.build_opener(proxy)
+            for scheme in self._proxy:
+                self._proxy[scheme] = urlparse(self._proxy[scheme])
+
+        self._ssl_context = _new_ssl_context(self._verify_ssl_certs)
+
+        self._connections = {}
+        self._connections_lock = threading.Lock()
+
+    def _get_connection(self, scheme, host, port, timeout):
+        """Return an idle connection to ``host``, or a new one if there is none.
+
+        :returns: The connection, and ``True`` if it has been used before.
+        :rtype: :class:`tuple <python:tuple>`
+        """
+        key = (scheme, host, port)
+        with self._connections_lock:
+            idle = self._connections.get(key, None)
+            if idle:
+                connection = idle.pop()
+                connection.timeout = timeout.connect
+                return connection, True
+
+        proxy = self._proxy.get(scheme, None) if self._proxy else None
+        if proxy:
+            connect_host, connect_port = proxy.hostname, proxy.port
+        else:
+            connect_host, connect_port = host, port
+
+        if scheme == 'https':
+            connection = http_client.HTTPSConnection(connect_host,
+                                                     connect_port,
+                                                     timeout = timeout.connect,
+                                                     context = self._ssl_context)
+        else:
+            connection = http_client.HTTPConnection(connect_host,
+                                                    connect_port,
+                                                    timeout = timeout.connect)
+
+        if proxy and scheme == 'https':
+            connection.set_tunnel(host, port)
+
+        return connection, False
+
+    def _release_connection(self, scheme, host, port, connection):
+        """Return ``connection`` to the pool of idle connections, or close it if the
+        pool for its host is full."""
+        key = (scheme, host, port)
+        with self._connections_lock:
+            idle = self._connections.setdefault(key, [])
+            if len(idle) < self._pool_size:
+                idle.append(connection)
+                return
+
+        connection.close()
+
+    @staticmethod
+    def _send(connection, method, path, request_body, headers, timeout):
+        """Send a request over ``connection`` and read its response.
+
+        :returns: The response, and the decoder into which its body was read.
+        :rtype: :class:`tuple <python:tuple>` of
+          :class:`HTTPResponse <python:http.client.HTTPResponse>` and
+          :class:`ResponseDecoder <walkscore.compression.ResponseDecoder>`
+        """
+        if connection.sock is None:
+            connection.connect()
+        connection.sock.settimeout(timeout.read)
+
+        connection.request(method, path, body = request_body, headers = headers)
+        response = connection.getresponse()
+
+        decoder = ResponseDecoder(response.getheader('content-encoding', None))
+        while True:
+            chunk = response.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            decoder.write(chunk)
+
+        return response, decoder
 
     def _request(self,
                  method,
                  url,
                  parameters = None,
                  headers = None,
-                 request_body = None):
+                 request_body = None,
+                 timeout = None):
         request_body = to_utf8(request_body)
 
-        if parameters:
-            parameter_string = base_urllib.urlencode(parameters)
+        parameter_string = _get_query_string(parameters)
+        if parameter_string:
             url += '?' + parameter_string
 
-        request = urllib.request.Request(url, request_body, headers)
+        parsed_url = urlparse(url)
+        scheme = parsed_url.scheme
+        host = parsed_url.hostname
+        port = parsed_url.port or (443 if scheme == 'https' else 80)
+        if self._proxy and scheme == 'http' and scheme in self._proxy:
+            path = url
+        else:
+            path = parsed_url.path or '/'
+            if parsed_url.query:
+                path += '?' + parsed_url.query
+
+        headers = self._get_headers(headers)
+        if not self._keep_alive:
+            headers['Connection'] = 'close'
+
+        timeout = timeout or self._get_timeout()
+        while True:
+            connection, is_reused = self._get_connection(scheme, host, port, timeout)
+            try:
+                response, decoder = self._send(connection,
+                                               method,
+                                               path,
+                                               request_body,
+                                               headers,
+                                               timeout)
+            except (http_client.RemoteDisconnected,
+                    ConnectionResetError,
+                    BrokenPipeError) as error:
+                connection.close()
+                # The server closed the idle connection, so try again over a new one.
+                if is_reused:
+                    continue
+
+                raise WalkScoreError.from_exception(error) from error
+            except (http_client.HTTPException, OSError, ValueError) as error:
+                connection.close()
+                raise WalkScoreError.from_exception(error) from error
+
+            break
+
+        if response.will_close or not self._keep_alive:
+            connection.close()
+        else:
+            self._release_connection(scheme, host, port, connection)
+
+        response_headers = dict((k.lower(), v) for k, v in response.getheaders())
+
+        return self._get_content(decoder), response.status, response_headers
+
+    def close(self):
+        """Closes the idle connections held open by the client."""
+        with self._connections_lock:
+            connections = self._connections
+            self._connections = {}
+
+        for idle in connections.values():
+            for connection in idle:
+                connection.close()
+
+
+class AiohttpClient(AsyncHTTPClient):
+    """:class:`AsyncHTTPClient` for the
+    `aiohttp <https://docs.aiohttp.org/en/stable/>`_ library.
+    """
+
+    name = "aiohttp"
 
-        if method not in ("GET", "POST"):
-            request.get_method = method
+    def __init__(self,
+                 timeout = None,
+                 session = None,
+                 limit = None,
+                 **kwargs):
+        """
+        :param timeout: The default timeout(s) to apply to requests, as a number of
+          seconds or a ``(connect, read)`` :class:`tuple <python:tuple>`. Overrides
+          ``connect_timeout`` and ``read_timeout`` if supplied. Defaults to
+          :obj:`None <python:None>`.
+        :type timeout: numeric / :class:`tuple <python:tuple>` /
+          :obj:`None <python:None>`
+
+        :param session: An existing :class:`aiohttp.ClientSession` to use. If
+          :obj:`None <python:None>`, a session is created when the first request
+          is made. Defaults to :obj:`None <python:None>`.
+
+        :param limit: The maximum number of simultaneous connections to open. If
+          ``0``, the number of connections is unbounded. If
+          :obj:`None <python:None>`, defaults to ``pool_size``. Defaults to
+          :obj:`None <python:None>`.
+        :type limit: :class:`int <python:int>` / :obj:`None <python:None>`
+        """
+        _apply_timeout(kwargs, timeout)
+        _require_backend('aiohttp')
+        super(AiohttpClient, self).__init__(**kwargs)
+
+        self._session = session
+        self._owns_session = session is None
+        self._limit = validators.integer(limit,
+                                         allow_empty = True,
+                                         coerce_value = True,
+                                         minimum = 0)
+        if self._limit is None:
+            self._limit = self._pool_size
+
+    def _get_session(self):
+        """Return the :class:`aiohttp.ClientSession` used to execute requests,
+        creating it if necessary.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit = self._limit,
+                                             force_close = not self._keep_alive,
+                                             ssl = _new_ssl_context(self._verify_ssl_certs))
+            self._session = aiohttp.ClientSession(connector = connector,
+                                                  auto_decompress = False)
+            self._owns_session = True
+
+        return self._session
+
+    def _get_proxy(self, url):
+        if self._proxy:
+            scheme = url.split(":")[0]
+            return self._proxy.get(scheme, None)
+
+        return None
 
+    async def _request(self,
+                       method,
+                       url,
+                       parameters = None,
+                       headers = None,
+                       request_body = None,
+                       timeout = None):
+        import asyncio
+
+        if isinstance(request_body, dict):
+            request_body = jsoncodec.dumps(request_body)
+
+        # aiohttp rejects parameters whose value is None, where the other
+        # transports silently drop them
+        parameters = _get_query_string(parameters)
+
+        timeout = timeout or self._get_timeout()
+        client_timeout = aiohttp.ClientTimeout(total = _get_total_timeout(timeout),
+                                               sock_connect = timeout.connect,
+                                               sock_read = timeout.read)
+
+        session = self._get_session()
         try:
-            # use the custom proxy tied opener, if any.
-            # otherwise, fall to the default urllib opener.
-            if self._opener:
-                response = self._opener.open(request)
-            else:
-                response = urllib.request.urlopen(request)
-
-            rbody = response.read()
-            rcode = response.code
-            response_headers = dict(response.info())
-            if hasattr(response, 'close'):
-                response.close()
-        except urllib.error.HTTPError as error:
-            rcode = error.code
-            rbody = error.read()
-            response_headers = dict(error.info())
-            if hasattr(error, 'close'):
-                error.close()
-        except (urllib.error.URLError, ValueError) as error:
-            WalkScoreError.from_exception(error)
-
-        response_headers = dict((k.lower(), v) for k, v
-                                in six.iteritems(dict(response_headers)))
-
-        return rbody, rcode, response_headers
+            async with session.request(method,
+                                       url,
+                                       params = parameters,
+                                       headers = self._get_headers(headers),
+                                       data = request_body,
+                                       proxy = self._get_proxy(url),
+                                       timeout = client_timeout) as result:
+                status_code = result.status
+                response_headers = dict((k.lower(), v) for k, v
+                                        in six.iteritems(dict(result.headers)))
+
+                # A session supplied by the caller may already decompress the body.
+                if getattr(session, 'auto_decompress', True):
+                    decoder = ResponseDecoder()
+                else:
+                    decoder = ResponseDecoder(response_headers.get('content-encoding', None))
+
+                async for chunk in result.content.iter_chunked(CHUNK_SIZE):
+                    decoder.write(chunk)
+
+            content = self._get_content(decoder)
+        except asyncio.TimeoutError:
+            raise HTTPTimeoutError('Could not connect to the WalkScore API. '
+                                   'Please check your internet connection and try again. ')
+        except aiohttp.ClientSSLError:
+            raise SSLError("Could not verify WalkScore's SSL certificate.  Please make "
+                           "sure that your network is not intercepting certificates.")
+        except aiohttp.ClientError:
+            raise HTTPConnectionError("Could not connect to WalkScore.  Please check "
+                                      "your internet connection and try again.")
+
+        return content, status_code, response_headers
+
+    async def close(self):
+        """Closes an existing HTTP connection/session."""
+
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+
+
+class HttpxClient(HTTPClient):
+    """:class:`HTTPClient` for the `httpx <https://www.python-httpx.org/>`_ library.
+
+    If the `h2 <https://python-hyper.org/projects/h2/>`_ library is installed,
+    requests to servers which support HTTP/2 are multiplexed as concurrent streams
+    over a single connection, rather than each occupying a connection of its own.
+    One client may be shared by many threads.
+    """
+
+    name = "httpx"
+
+    def __init__(self,
+                 http2 = None,
+                 http1 = True,
+                 **kwargs):
+        """
+        :param http2: If ``True``, negotiates HTTP/2 with servers which support it
+          (over HTTPS). If :obj:`None <python:None>`, negotiates HTTP/2 if the
+          ``h2`` library is installed. Defaults to :obj:`None <python:None>`.
+        :type http2: :class:`bool <python:bool>` / :obj:`None <python:None>`
+
+        :param http1: If ``False``, speaks only HTTP/2, including to servers over
+          plain HTTP (which must then support HTTP/2 "with prior knowledge").
+          Defaults to ``True``.
+        :type http1: :class:`bool <python:bool>`
+
+        :raises ImportError: if ``http2`` is ``True`` and the ``h2`` library is
+          not installed
+        """
+        _require_backend('httpx')
+        super(HttpxClient, self).__init__(**kwargs)
+
+        if http2 is None:
+            http2 = _import_backend('h2') is not None
+        elif http2 and _import_backend('h2') is None:
+            raise ImportError(
+                "HTTP/2 support in the WalkScore library's httpx client requires "
+                "the h2 library. (HINT: running \"pip install httpx[http2]\" "
+                "should install it.)"
+            )
+        self._http2 = bool(http2)
+        self._http1 = bool(http1) or not self._http2
+
+        self._client = None
+        self._client_lock = threading.Lock()
+
+        # The HTTP version negotiated with, and the number of requests in flight
+        # to, each origin.
+        self._streams = {}
+        self._streams_lock = threading.Lock()
+
+    def _new_client(self, **kwargs):
+        """Create the :class:`httpx.Client` used to execute requests."""
+        return httpx.Client(**kwargs)
+
+    def _new_transport(self, **kwargs):
+        """Create a transport, which holds a pool of connections."""
+        return httpx.HTTPTransport(**kwargs)
+
+    def _get_client(self):
+        """Return the client used to execute requests, creating it if necessary.
+
+        :rtype: :class:`httpx.Client` / :class:`httpx.AsyncClient`
+        """
+        if self._client is not None:
+            return self._client
+
+        with self._client_lock:
+            if self._client is None:
+                limits = httpx.Limits(
+                    max_connections = self._pool_size,
+                    max_keepalive_connections = self._pool_size if self._keep_alive else 0
+                )
+
+                def new_transport(proxy = None):
+                    return self._new_transport(http1 = self._http1,
+                                               http2 = self._http2,
+                                               limits = limits,
+                                               verify = bool(self._verify_ssl_certs),
+                                               proxy = proxy)
+
+                if self._proxy:
+                    mounts = dict(('%s://' % scheme, new_transport(proxy = url))
+                                  for scheme, url in six.iteritems(self._proxy))
+                    self._client = self._new_client(transport = new_transport(),
+                                                    mounts = mounts)
+                else:
+                    self._client = self._new_client(transport = new_transport())
+
+        return self._client
+
+    @property
+    def connection_stats(self):
+        """The origins the client has sent requests to, for monitoring.
+
+        :rtype: :class:`list <python:list>` of :class:`dict <python:dict>` with
+          ``origin``, ``http_version`` (:obj:`None <python:None>` until a response
+          is received), and ``open_streams`` (the number of requests in flight to
+          the origin) keys
+        """
+        with self._streams_lock:
+            return [{'origin': origin,
+                     'http_version': http_version,
+                     'open_streams': open_streams}
+                    for origin, (http_version, open_streams) in self._streams.items()]
+
+    def _open_stream(self, url):
+        """Record a request to ``url`` as in flight.
+
+        :returns: The origin of ``url``.
+        :rtype: :class:`str <python:str>`
+        """
+        parsed_url = urlparse(url)
+        origin = '%s://%s' % (parsed_url.scheme, parsed_url.netloc)
+        with self._streams_lock:
+            http_version, open_streams = self._streams.get(origin, (None, 0))
+            if http_version is None and not self._http1:
+                http_version = 'HTTP/2'
+            elif http_version is None and not self._http2:
+                http_version = 'HTTP/1.1'
+            self._streams[origin] = [http_version, open_streams + 1]
+
+        return origin
+
+    def _close_stream(self, origin, result = None):
+        """Record a request to ``origin`` as complete, along with the HTTP version
+        of its :class:`httpx.Response` ``result`` (if one was received)."""
+        with self._streams_lock:
+            stream = self._streams.get(origin, None)
+            if stream is None:
+                return
+
+            if result is not None:
+                stream[0] = result.http_version
+            stream[1] = max(stream[1] - 1, 0)
+
+    def _get_request_kwargs(self, parameters, request_body, timeout):
+        """Return the keyword arguments to supply to the client's
+        ``build_request()`` method."""
+        if isinstance(request_body, dict):
+            request_body = jsoncodec.dumps(request_body)
+
+        # httpx sends parameters whose value is None as empty strings, where the
+        # other transports silently drop them
+        parameters = _get_query_string(parameters)
+
+        timeout = timeout or self._get_timeout()
+
+        return {
+            'params': parameters,
+            'content': request_body,
+            'timeout': httpx.Timeout(connect = timeout.connect,
+                                     read = timeout.read,
+                                     write = timeout.read,
+                                     pool = timeout.connect)
+        }
+
+    def _get_response(self, result, decoder):
+        """Return the content, status code, and headers of the
+        :class:`httpx.Response` ``result``, whose raw body has been read into
+        ``decoder``."""
+        response_headers = dict((k.lower(), v) for k, v in result.headers.items())
+
+        return self._get_content(decoder), result.status_code, response_headers
+
+    @staticmethod
+    def _get_request_error(error):
+        """Return the :class:`WalkScoreError <walkscore.errors.WalkScoreError>`
+        which corresponds to the :class:`httpx.HTTPError` ``error``."""
+        if isinstance(error, httpx.TimeoutException):
+            return HTTPTimeoutError('Could not connect to the WalkScore API. '
+                                    'Please check your internet connection and try again. ')
+
+        if isinstance(error, httpx.TransportError):
+            # httpx wraps the error raised by the ssl module
+            cause = error.__context__
+            while cause is not None:
+                if isinstance(cause, ssl.SSLError):
+                    return SSLError("Could not verify WalkScore's SSL certificate.  "
+                                    "Please make sure that your network is not "
+                                    "intercepting certificates.")
+                cause = cause.__context__
+
+            return HTTPConnectionError("Could not connect to WalkScore.  Please check "
+                                       "your internet connection and try again.")
+
+        return WalkScoreError.from_exception(error)
+
+    def _request(self,
+                 method,
+                 url,
+                 parameters = None,
+                 headers = None,
+                 request_body = None,
+                 timeout = None):
+        client = self._get_client()
+        request = client.build_request(
+            method,
+            url,
+            headers = self._get_headers(headers),
+            **self._get_request_kwargs(parameters, request_body, timeout)
+        )
+        origin = self._open_stream(url)
+        result = None
+        try:
+            result = client.send(request, stream = True)
+            try:
+                decoder = ResponseDecoder(result.headers.get('content-encoding', None))
+                for chunk in result.iter_raw(CHUNK_SIZE):
+                    decoder.write(chunk)
+            finally:
+                result.close()
+        except httpx.HTTPError as error:
+            raise self._get_request_error(error) from error
+        finally:
+            self._close_stream(origin, result)
+
+        return self._get_response(result, decoder)
 
     def close(self):
-        pass
+        """Closes the client, and the connections it holds open."""
+        with self._client_lock:
+            client = self._client
+            self._client = None
+
+        if client is not None:
+            client.close()
+
+
+class AsyncHttpxClient(AsyncHTTPClient, HttpxClient):
+    """:class:`AsyncHTTPClient` for the `httpx <https://www.python-httpx.org/>`_
+    library.
+
+    Accepts the same parameters as :class:`HttpxClient`, and likewise multiplexes
+    concurrent requests over HTTP/2 connections where possible.
+    """
+
+    name = "httpx-async"
+
+    def _new_client(self, **kwargs):
+        return httpx.AsyncClient(**kwargs)
+
+    def _new_transport(self, **kwargs):
+        return httpx.AsyncHTTPTransport(**kwargs)
+
+    async def _request(self,
+                       method,
+                       url,
+                       parameters = None,
+                       headers = None,
+                       request_body = None,
+                       timeout = None):
+        client = self._get_client()
+        request = client.build_request(
+            method,
+            url,
+            headers = self._get_headers(headers),
+            **self._get_request_kwargs(parameters, request_body, timeout)
+        )
+        origin = self._open_stream(url)
+        result = None
+        try:
+            result = await client.send(request, stream = True)
+            try:
+                decoder = ResponseDecoder(result.headers.get('content-encoding', None))
+                async for chunk in result.aiter_raw(CHUNK_SIZE):
+                    decoder.write(chunk)
+            finally:
+                await result.aclose()
+        except httpx.HTTPError as error:
+            raise self._get_request_error(error) from error
+        finally:
+            self._close_stream(origin, result)
+
+        return self._get_response(result, decoder)
+
+    async def close(self):
+        """Closes the client, and the connections it holds open."""
+        with self._client_lock:
+            client = self._client
+            self._client = None
+
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.jsoncodec
+#########################################
+
+Implements the (pluggable) codec used to serialize and deserialize :term:`JSON`,
+which uses the fastest JSON library installed (`orjson`_, `ujson`_ or
+`simdjson`_), falling back to the Python standard library.
+
+.. _orjson: https://github.com/ijl/orjson
+.. _ujson: https://github.com/ultrajson/ultrajson
+.. _simdjson: https://github.com/TkTech/pysimdjson
+
+"""
+import importlib
+import json
+import threading
+
+
+#: The JSON libraries supported, in order of preference.
+JSON_LIBRARIES = ('orjson', 'ujson', 'simdjson', 'json')
+
+_codec = []
+_codec_lock = threading.Lock()
+
+
+class JSONCodec(object):
+    """Serializes and deserializes :term:`JSON`, using the functions supplied.
+
+    :param name: The name of the codec.
+    :type name: :class:`str <python:str>`
+
+    :param loads: The function which deserializes a JSON
+      :class:`str <python:str>` or :class:`bytes <python:bytes>` value,
+      raising a :class:`ValueError <python:ValueError>` if it is not valid JSON.
+    :type loads: callable
+
+    :param dumps: The function which serializes an object to a JSON
+      :class:`str <python:str>` (or :class:`bytes <python:bytes>`, which is
+      decoded as UTF-8).
+    :type dumps: callable
+    """
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self._loads = loads
+        self._dumps = dumps
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, self.name)
+
+    def loads(self, value):
+        """Deserialize ``value``.
+
+        :param value: The JSON to deserialize.
+        :type value: :class:`str <python:str>` / :class:`bytes <python:bytes>`
+
+        :raises ValueError: if ``value`` is not valid JSON
+        """
+        return self._loads(value)
+
+    def dumps(self, value):
+        """Serialize ``value``.
+
+        :rtype: :class:`str <python:str>`
+        """
+        result = self._dumps(value)
+        if result.__class__ is bytes:
+            result = result.decode('utf-8')
+
+        return result
+
+
+def _get_library_codec(name):
+    """Return the :class:`JSONCodec` which uses the library ``name``.
+
+    :raises ImportError: if the library is not installed
+    """
+    if name in ('json', 'stdlib'):
+        return JSONCodec('json', json.loads, json.dumps)
+
+    if name not in JSON_LIBRARIES:
+        raise ValueError('%s is not a supported JSON library, expected one of %s' %
+                         (name, ', '.join(JSON_LIBRARIES)))
+
+    module = importlib.import_module(name)
+    if name == 'simdjson':
+        # pysimdjson only accelerates deserialization.
+        return JSONCodec(name, module.loads, json.dumps)
+
+    return JSONCodec(name, module.loads, module.dumps)
+
+
+def _detect_codec():
+    """Return the :class:`JSONCodec` using the first of :data:`JSON_LIBRARIES`
+    which is installed."""
+    for name in JSON_LIBRARIES:
+        try:
+            return _get_library_codec(name)
+        except ImportError:
+            continue
+
+    return _get_library_codec('json')
+
+
+def get_json_codec():
+    """Return the codec used to serialize and deserialize JSON (detecting the
+    fastest JSON library installed the first time it is called).
+
+    :rtype: :class:`JSONCodec`
+    """
+    if not _codec:
+        with _codec_lock:
+            if not _codec:
+                _codec.append(_detect_codec())
+
+    return _codec[0]
+
+
+def set_json_codec(codec = None):
+    """Set the codec used to serialize and deserialize JSON.
+
+    :param codec: The name of the JSON library to use (one of
+      :data:`JSON_LIBRARIES`), a :class:`JSONCodec`, or
+      :obj:`None <python:None>` to use the fastest JSON library installed.
+      Defaults to :obj:`None <python:None>`.
+    :type codec: :class:`str <python:str>` / :class:`JSONCodec` /
+      :obj:`None <python:None>`
+
+    :returns: The codec now in use.
+    :rtype: :class:`JSONCodec`
+
+    :raises ImportError: if the JSON library named is not installed
+    :raises ValueError: if ``codec`` is not a supported JSON library
+    """
+    if codec is None:
+        codec = _detect_codec()
+    elif isinstance(codec, str):
+        codec = _get_library_codec(codec.lower())
+    elif not isinstance(codec, JSONCodec):
+        raise ValueError('codec expects a JSONCodec, a str, or None. Received: %s' %
+                         codec.__class__.__name__)
+
+    with _codec_lock:
+        del _codec[:]
+        _codec.append(codec)
+
+    return codec
+
+
+def loads(value):
+    """Deserialize ``value`` using the codec returned by :func:`get_json_codec`.
+
+    :raises ValueError: if ``value`` is not valid JSON
+    """
+    return get_json_codec().loads(value)
+
+
+def dumps(value):
+    """Serialize ``value`` using the codec returned by :func:`get_json_codec`.
+
+    :rtype: :class:`str <python:str>`
+    """
+    return get_json_codec().dumps(value)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.keypool
+#########################################
+
+Implements a pool of WalkScore API keys, across which requests are distributed.
+
+"""
+import time
+import threading
+
+from validator_collection import validators
+
+from walkscore.errors import QuotaExhaustedError
+
+
+class APIKeyPool(object):
+    """A pool of WalkScore API keys.
+
+    Each request is sent using the available key with the most remaining budget. A
+    key which is rejected by the WalkScore API (with an
+    :class:`AuthenticationError <walkscore.errors.AuthenticationError>` or a
+    :class:`QuotaError <walkscore.errors.QuotaError>`) is taken out of rotation
+    for ``cooloff`` seconds.
+
+    A key's remaining budget is taken from the
+    :class:`QuotaLedger <walkscore.quota.QuotaLedger>` of the
+    :class:`WalkScoreAPI <walkscore.api.WalkScoreAPI>` using the pool if it has
+    one. Otherwise, it is ``daily_quota`` less the number of requests the pool has
+    sent using the key (or, if ``daily_quota`` is :obj:`None <python:None>`, the
+    least-used key is chosen).
+    """
+
+    def __init__(self,
+                 api_keys,
+                 daily_quota = None,
+                 cooloff = 300):
+        """
+        :param api_keys: The WalkScore API keys to use.
+        :type api_keys: iterable of :class:`str <python:str>`
+
+        :param daily_quota: The number of requests permitted per key per day. If
+          :obj:`None <python:None>`, keys are used evenly. Defaults to
+          :obj:`None <python:None>`.
+        :type daily_quota: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :param cooloff: The number of seconds for which to take a key out of
+          rotation after it has been rejected. Defaults to ``300``.
+        :type cooloff: numeric
+
+        :raises TypeError: if ``api_keys`` is not an iterable of keys
+        :raises ValueError: if ``api_keys`` is empty or contains an empty key
+        """
+        api_keys = validators.iterable(api_keys,
+                                       allow_empty = False,
+                                       forbid_literals = (str, bytes, dict))
+        self._api_keys = []
+        for api_key in api_keys:
+            api_key = validators.string(api_key, allow_empty = False)
+            if api_key not in self._api_keys:
+                self._api_keys.append(api_key)
+
+        self._daily_quota = validators.integer(daily_quota,
+                                               allow_empty = True,
+                                               minimum = 0)
+        self._cooloff = validators.numeric(cooloff, minimum = 0)
+
+        self._lock = threading.Lock()
+        self._requests = dict((api_key, 0) for api_key in self._api_keys)
+        self._rejections = dict((api_key, 0) for api_key in self._api_keys)
+        self._available_at = dict((api_key, 0) for api_key in self._api_keys)
+
+    def __len__(self):
+        return len(self._api_keys)
+
+    @property
+    def api_keys(self):
+        """The WalkScore API keys in the pool.
+
+        :rtype: :class:`list <python:list>` of :class:`str <python:str>`
+        """
+        return list(self._api_keys)
+
+    @property
+    def daily_quota(self):
+        """The number of requests permitted per key per day.
+
+        :rtype: :class:`int <python:int>` / :obj:`None <python:None>`
+        """
+        return self._daily_quota
+
+    @property
+    def available_keys(self):
+        """The keys which are currently in rotation.
+
+        :rtype: :class:`list <python:list>` of :class:`str <python:str>`
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [x for x in self._api_keys if self._available_at[x] <= now]
+
+    @property
+    def stats(self):
+        """Usage counters for each key in the pool.
+
+        :returns: A :class:`dict <python:dict>` keyed on API key, each value a
+          :class:`dict <python:dict>` with ``requests`` (the number of requests
+          sent using the key), ``rejections`` (the number of times the key was
+          rejected), and ``available`` (whether the key is in rotation) keys.
+        :rtype: :class:`dict <python:dict>`
+        """
+        now = time.monotonic()
+        with self._lock:
+            return dict((x, {
+                'requests': self._requests[x],
+                'rejections': self._rejections[x],
+                'available': self._available_at[x] <= now
+            }) for x in self._api_keys)
+
+    def _get_budget(self, api_key, quota_ledger):
+        """Return the remaining budget of ``api_key``.
+
+        :rtype: numeric
+        """
+        if quota_ledger is not None:
+            return quota_ledger.remaining_quota(api_key)
+
+        if self.daily_quota is not None:
+            return self.daily_quota - self._requests[api_key]
+
+        return -self._requests[api_key]
+
+    def select(self, quota_ledger = None):
+        """Select the key with which to send a request, and count the request
+        against it.
+
+        :param quota_ledger: The ledger from which to read each key's remaining
+          budget. Defaults to :obj:`None <python:None>`.
+        :type quota_ledger: :class:`QuotaLedger <walkscore.quota.QuotaLedger>` /
+          :obj:`None <python:None>`
+
+        :returns: The available key with the most remaining budget.
+        :rtype: :class:`str <python:str>`
+
+        :raises QuotaExhaustedError: if no key is available
+        """
+        now = time.monotonic()
+        with self._lock:
+            candidates = [x for x in self._api_keys if self._available_at[x] <= now]
+            if not candidates:
+                raise QuotaExhaustedError('No API key in the pool is available.')
+
+            api_key = max(candidates,
+                          key = lambda x: self._get_budget(x, quota_ledger))
+            self._requests[api_key] += 1
+
+        return api_key
+
+    def cool_off(self, api_key):
+        """Take ``api_key`` out of rotation for ``cooloff`` seconds.
+
+        :param api_key: The key which was rejected by the WalkScore API.
+        :type api_key: :class:`str <python:str>`
+        """
+        with self._lock:
+            if api_key not in self._available_at:
+                return
+
+            self._available_at[api_key] = time.monotonic() + self._cooloff
+            self._rejections[api_key] += 1
@@ -5,13 +5,66 @@
 # extension, and its member function documentation is automatically incorporated
 # there as needed.
 
+import json
+import datetime
+
 from validator_collection import validators, checkers
 
+from walkscore import jsoncodec
+
+#: The format of the timestamps in the WalkScore API's responses.
+API_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+# datetime.fromisoformat() requires Python 3.7, and before Python 3.11 it only
+# accepts the formats which datetime.isoformat() produces.
+_fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+
+
+def _parse_api_datetime(value):
+    """Parse a timestamp in :data:`API_DATETIME_FORMAT` (or, where
+    :meth:`datetime.fromisoformat() <python:datetime.datetime.fromisoformat>` is
+    available, in a format which it accepts).
+
+    :rtype: :class:`datetime <python:datetime.datetime>`
+
+    :raises ValueError: if ``value`` is in neither format
+    """
+    if _fromisoformat is not None:
+        try:
+            return _fromisoformat(value)
+        except ValueError:
+            pass
+
+    return datetime.datetime.strptime(value, API_DATETIME_FORMAT)
+
 
 class LocationScore(object):
     """Object representation of a location's scoring data returned from the
     WalkScore API."""
 
+    # Instances are held in very large numbers (e.g. in caches and batch
+    # results), so they do not carry a per-instance __dict__.
+    __slots__ = ('_address',
+                 '_status',
+                 '_walk_score',
+                 '_walk_description',
+                 '_walk_updated',
+                 '_transit_score',
+                 '_transit_description',
+                 '_transit_summary',
+                 '_bike_score',
+                 '_bike_description',
+                 '_logo_url',
+                 '_more_info_icon',
+                 '_more_info_link',
+                 '_help_link',
+                 '_original_latitude',
+                 '_original_longitude',
+                 '_snapped_latitude',
+                 '_snapped_longitude',
+                 '_property_page_link')
+
     def __init__(self,
                  address = None,
                  original_latitude = None,
@@ -118,7 +171,6 @@ class LocationScore(object):
         self._walk_score = None
         self._walk_description = None
         self._walk_updated = None
-        self._ws_link = None
 
         self._transit_score = None
         self._transit_description = None
@@ -564,6 +616,7 @@ class LocationScore(object):
         elif not api_compatible:
             interim['walk']['updated'] = interim['walk']['updated'].isoformat()
 
+        # The output does not depend on which JSON libraries are installed.
         result = json.dumps(interim)
 
         return result
@@ -637,6 +690,88 @@ class LocationScore(object):
 
         return result
 
+    @classmethod
+    def _from_trusted(cls, obj, latitude = None, longitude = None, address = None):
+        """Create a :class:`LocationScore` instance from the JSON object returned
+        by the WalkScore API, without validating the values which already have
+        the type expected (as the values parsed from a response do).
+
+        Values of any other type are validated by the corresponding setter, as
+        usual.
+
+        :param obj: The JSON object returned by the WalkScore API.
+        :type obj: :class:`dict <python:dict>`
+
+        :param latitude: The latitude originally supplied to the WalkScore API.
+        :type latitude: numeric / :obj:`None <python:None>`
+
+        :param longitude: The longitude originally supplied to the WalkScore API.
+        :type longitude: numeric / :obj:`None <python:None>`
+
+        :param address: The address originally supplied to the WalkScore API.
+        :type address: :class:`str <python:str>` / :obj:`None <python:None>`
+
+        :rtype: :class:`LocationScore`
+        """
+        result = cls.__new__(cls)
+
+        transit = obj.get('transit', None) or {}
+        bike = obj.get('bike', None) or {}
+
+        for attribute, value in (('status', obj.get('status', None)),
+                                 ('walk_score', obj.get('walkscore', None)),
+                                 ('transit_score', transit.get('score', None)),
+                                 ('bike_score', bike.get('score', None))):
+            if value is None or (value.__class__ is int and 0 <= value <= 100):
+                setattr(result, '_' + attribute, value)
+            else:
+                setattr(result, attribute, value)
+
+        for attribute, value in (('address', address),
+                                 ('walk_description', obj.get('description', None)),
+                                 ('transit_description', transit.get('description', None)),
+                                 ('transit_summary', transit.get('summary', None)),
+                                 ('bike_description', bike.get('description', None)),
+                                 ('logo_url', obj.get('logo_url', None)),
+                                 ('more_info_icon', obj.get('more_info_icon', None)),
+                                 ('more_info_link', obj.get('more_info_link', None)),
+                                 ('help_link', obj.get('help_link', None)),
+                                 ('property_page_link', obj.get('ws_link', None))):
+            if not value:
+                setattr(result, '_' + attribute, None)
+            elif value.__class__ is str:
+                setattr(result, '_' + attribute, value)
+            else:
+                setattr(result, attribute, value)
+
+        for attribute, value in (('original_latitude', latitude),
+                                 ('original_longitude', longitude),
+                                 ('snapped_latitude', obj.get('snapped_lat', None)),
+                                 ('snapped_longitude', obj.get('snapped_lon', None))):
+            if value is None or value == '':
+                setattr(result, '_' + attribute, None)
+            elif value.__class__ in (float, int, str):
+                try:
+                    setattr(result, '_' + attribute, float(value))
+                except ValueError:
+                    setattr(result, attribute, value)
+            else:
+                setattr(result, attribute, value)
+
+        # Timestamps in any other format are parsed by the (slower) validator.
+        updated = obj.get('updated', None)
+        if not updated:
+            result._walk_updated = None
+        elif updated.__class__ is str:
+            try:
+                result._walk_updated = _parse_api_datetime(updated)
+            except ValueError:
+                result.walk_updated = updated
+        else:
+            result.walk_updated = updated
+
+        return result
+
     @classmethod
     def from_json(cls, obj, api_compatible = False):
         """Create a :class:`LocationScore` instance from a JSON representation.
@@ -653,7 +788,11 @@ class LocationScore(object):
         :returns: :class:`LocationScore` representation of ``obj``.
         :rtype: :class:`LocationScore`
         """
+        if isinstance(obj, bytes):
+            obj = obj.decode('utf-8')
+
         obj = validators.json(obj,
-                              allow_empty = True)
+                              allow_empty = True,
+                              json_serializer = jsoncodec.get_json_codec())
 
         return cls.from_dict(obj, api_compatible = api_compatible)
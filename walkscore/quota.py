@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.quota
+#########################################
+
+Implements a ledger which accounts for the requests made against the WalkScore
+API's daily quota, so that callers can stop (or wait) before the quota is used up
+rather than receiving a :class:`QuotaError <walkscore.errors.QuotaError>`.
+
+The ledger records its usage in a :class:`QuotaBackend`. Use a
+:class:`SQLiteQuotaBackend` to share a ledger between processes on the same host,
+or implement a :class:`QuotaBackend` over a shared store (e.g. a database or a
+key-value server) to share it between hosts.
+
+"""
+import os
+import time
+import hashlib
+import datetime
+import threading
+
+from validator_collection import validators
+
+from walkscore.errors import QuotaExhaustedError
+
+
+class QuotaBackend(object):
+    """Base class for the stores in which a :class:`QuotaLedger` records usage.
+
+    Usage is recorded as a count of requests per ``name`` (identifying the API key)
+    and ``period`` (identifying the day).
+    """
+
+    def get(self, name, period):
+        """Return the number of requests recorded.
+
+        :param name: The name of the API key.
+        :type name: :class:`str <python:str>`
+
+        :param period: The period (day) for which to return usage.
+        :type period: :class:`str <python:str>`
+
+        :rtype: :class:`int <python:int>`
+        """
+        raise NotImplementedError()
+
+    def increment(self, name, period, limit = None):
+        """Atomically record one request, unless doing so would exceed ``limit``.
+
+        :param name: The name of the API key.
+        :type name: :class:`str <python:str>`
+
+        :param period: The period (day) in which to record the request.
+        :type period: :class:`str <python:str>`
+
+        :param limit: The maximum number of requests permitted in ``period``. If
+          :obj:`None <python:None>`, the request is always recorded.
+        :type limit: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :returns: ``True`` if the request was recorded, ``False`` if it would have
+          exceeded ``limit``.
+        :rtype: :class:`bool <python:bool>`
+        """
+        raise NotImplementedError()
+
+    def mark_used(self, name, period, used):
+        """Record that at least ``used`` requests have been made.
+
+        :param name: The name of the API key.
+        :type name: :class:`str <python:str>`
+
+        :param period: The period (day) in which the requests were made.
+        :type period: :class:`str <python:str>`
+
+        :param used: The minimum number of requests made.
+        :type used: :class:`int <python:int>`
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """Release any resources held by the backend."""
+        pass
+
+
+class MemoryQuotaBackend(QuotaBackend):
+    """:class:`QuotaBackend` which records usage in memory, and is therefore only
+    shared by the threads of a single process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._usage = {}
+
+    def get(self, name, period):
+        with self._lock:
+            return self._usage.get((name, period), 0)
+
+    def increment(self, name, period, limit = None):
+        with self._lock:
+            used = self._usage.get((name, period), 0)
+            if limit is not None and used >= limit:
+                return False
+
+            self._usage[(name, period)] = used + 1
+
+            return True
+
+    def mark_used(self, name, period, used):
+        with self._lock:
+            self._usage[(name, period)] = max(used,
+                                              self._usage.get((name, period), 0))
+
+
+class SQLiteQuotaBackend(QuotaBackend):
+    """:class:`QuotaBackend` which records usage in a
+    `SQLite <https://www.sqlite.org/>`_ database on disk, shared by every process
+    on the same host which opens the same file."""
+
+    def __init__(self, path, timeout = 30):
+        """
+        :param path: The path to the SQLite database file. It is created if it does
+          not already exist.
+        :type path: :class:`str <python:str>`
+
+        :param timeout: The number of seconds to wait for another process to release
+          its lock on the database. Defaults to ``30``.
+        :type timeout: numeric
+        """
+        self._path = validators.string(path, allow_empty = False)
+        self._timeout = validators.numeric(timeout, minimum = 0)
+
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+        self._connect()
+
+    @property
+    def path(self):
+        """The path to the SQLite database file.
+
+        :rtype: :class:`str <python:str>`
+        """
+        return self._path
+
+    def _connect(self):
+        """Return the connection to the database, opening it (and creating the
+        schema) if necessary.
+
+        :rtype: :class:`sqlite3.Connection <python:sqlite3.Connection>`
+        """
+        import sqlite3
+
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        connection = sqlite3.connect(self.path,
+                                     timeout = self._timeout,
+                                     isolation_level = None,
+                                     check_same_thread = False)
+        connection.execute('PRAGMA journal_mode = WAL')
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS quota_usage (
+                name TEXT NOT NULL,
+                period TEXT NOT NULL,
+                used INTEGER NOT NULL,
+                PRIMARY KEY (name, period)
+            ) WITHOUT ROWID""")
+
+        self._connection = connection
+        self._pid = os.getpid()
+
+        return connection
+
+    @staticmethod
+    def _get_used(connection, name, period):
+        row = connection.execute(
+            'SELECT used FROM quota_usage WHERE name = ? AND period = ?',
+            (name, period)
+        ).fetchone()
+
+        return row[0] if row else 0
+
+    def get(self, name, period):
+        with self._lock:
+            return self._get_used(self._connect(), name, period)
+
+    def increment(self, name, period, limit = None):
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                used = self._get_used(connection, name, period)
+                if limit is not None and used >= limit:
+                    connection.execute('ROLLBACK')
+                    return False
+
+                connection.execute(
+                    'INSERT OR REPLACE INTO quota_usage (name, period, used) VALUES (?, ?, ?)',
+                    (name, period, used + 1)
+                )
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+            connection.execute('COMMIT')
+
+            return True
+
+    def mark_used(self, name, period, used):
+        with self._lock:
+            connection = self._connect()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                used = max(used, self._get_used(connection, name, period))
+                connection.execute(
+                    'INSERT OR REPLACE INTO quota_usage (name, period, used) VALUES (?, ?, ?)',
+                    (name, period, used)
+                )
+            except BaseException:
+                connection.execute('ROLLBACK')
+                raise
+
+            connection.execute('COMMIT')
+
+    def close(self):
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+
+            self._connection = None
+
+
+class QuotaLedger(object):
+    """Accounts for the requests made against the WalkScore API's daily quota.
+
+    Every billable request is recorded before it is sent. Once ``daily_quota``
+    requests have been recorded for the current day (in UTC), further requests are
+    either refused with a
+    :class:`QuotaExhaustedError <walkscore.errors.QuotaExhaustedError>` or deferred
+    until the quota resets, depending on ``on_exhausted``.
+
+    .. tip::
+
+      To spread requests evenly over the day rather than spending the quota as
+      quickly as possible, combine the ledger with a
+      :class:`RateLimiter <walkscore.ratelimit.RateLimiter>` whose rate is
+      ``daily_quota / 86400``.
+    """
+
+    def __init__(self,
+                 daily_quota,
+                 backend = None,
+                 on_exhausted = 'raise'):
+        """
+        :param daily_quota: The number of requests permitted per API key per day.
+        :type daily_quota: :class:`int <python:int>`
+
+        :param backend: The store in which to record usage. If
+          :obj:`None <python:None>`, usage is recorded in memory. Defaults to
+          :obj:`None <python:None>`.
+        :type backend: :class:`QuotaBackend` / :obj:`None <python:None>`
+
+        :param on_exhausted: What to do with a request once the quota has been used
+          up: ``'raise'`` to raise a
+          :class:`QuotaExhaustedError <walkscore.errors.QuotaExhaustedError>`, or
+          ``'wait'`` to wait until the quota resets. Defaults to ``'raise'``.
+        :type on_exhausted: :class:`str <python:str>`
+
+        :raises ValueError: if ``on_exhausted`` is not ``'raise'`` or ``'wait'``
+        """
+        self._daily_quota = validators.integer(daily_quota, minimum = 0)
+
+        if backend is None:
+            backend = MemoryQuotaBackend()
+        elif not isinstance(backend, QuotaBackend):
+            raise ValueError('backend must be of type "QuotaBackend", was "%s"' %
+                             str(type(backend)))
+        self._backend = backend
+
+        on_exhausted = validators.string(on_exhausted, allow_empty = False)
+        if on_exhausted not in ('raise', 'wait'):
+            raise ValueError('on_exhausted must be "raise" or "wait", was "%s"' %
+                             on_exhausted)
+        self._on_exhausted = on_exhausted
+
+    @property
+    def daily_quota(self):
+        """The number of requests permitted per API key per day.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self._daily_quota
+
+    @property
+    def backend(self):
+        """The store in which usage is recorded.
+
+        :rtype: :class:`QuotaBackend`
+        """
+        return self._backend
+
+    @staticmethod
+    def _get_name(api_key):
+        """Return the name under which usage for ``api_key`` is recorded.
+
+        API keys are hashed so that they are not written to the backend.
+
+        :rtype: :class:`str <python:str>`
+        """
+        if not api_key:
+            return 'default'
+
+        return hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _get_period():
+        """Return the current period (the current day in UTC).
+
+        :rtype: :class:`str <python:str>`
+        """
+        return datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d')
+
+    @staticmethod
+    def seconds_until_reset():
+        """Return the number of seconds until the quota resets (at midnight UTC).
+
+        :rtype: :class:`float <python:float>`
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days = 1),
+                                             datetime.time(tzinfo = datetime.timezone.utc))
+
+        return (midnight - now).total_seconds()
+
+    def used_quota(self, api_key = None):
+        """Return the number of requests recorded today.
+
+        :param api_key: The API key whose usage to return. Defaults to
+          :obj:`None <python:None>`.
+        :type api_key: :class:`str <python:str>` / :obj:`None <python:None>`
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self.backend.get(self._get_name(api_key), self._get_period())
+
+    def remaining_quota(self, api_key = None):
+        """Return the number of requests which may still be made today.
+
+        :param api_key: The API key whose remaining quota to return. Defaults to
+          :obj:`None <python:None>`.
+        :type api_key: :class:`str <python:str>` / :obj:`None <python:None>`
+
+        :rtype: :class:`int <python:int>`
+        """
+        return max(0, self.daily_quota - self.used_quota(api_key))
+
+    def _try_consume(self, api_key):
+        """Record a request if the quota permits it, returning ``0`` if it was
+        recorded or the number of seconds to wait before trying again.
+
+        :rtype: numeric
+
+        :raises QuotaExhaustedError: if the quota has been used up and
+          ``on_exhausted`` is ``'raise'``
+        """
+        if self.backend.increment(self._get_name(api_key),
+                                  self._get_period(),
+                                  limit = self.daily_quota):
+            return 0
+
+        if self._on_exhausted == 'raise':
+            raise QuotaExhaustedError('The daily quota of %s requests has been used up.' %
+                                      self.daily_quota)
+
+        return self.seconds_until_reset() + 1
+
+    def _check_wait(self, delay, max_wait):
+        """Raise an error if waiting ``delay`` seconds would exceed ``max_wait``.
+
+        :raises QuotaExhaustedError: if ``delay`` exceeds ``max_wait``
+        """
+        if max_wait is not None and delay > max_wait:
+            raise QuotaExhaustedError('The daily quota of %s requests has been used '
+                                      'up, and will not reset within %s seconds.' %
+                                      (self.daily_quota, max_wait))
+
+    def consume(self, api_key = None, max_wait = None):
+        """Record a request, blocking the current thread until the quota resets if
+        it has been used up and ``on_exhausted`` is ``'wait'``.
+
+        :param api_key: The API key used for the request. Defaults to
+          :obj:`None <python:None>`.
+        :type api_key: :class:`str <python:str>` / :obj:`None <python:None>`
+
+        :param max_wait: The maximum number of seconds to wait for the quota to
+          reset. If :obj:`None <python:None>`, waits as long as necessary. Defaults
+          to :obj:`None <python:None>`.
+        :type max_wait: numeric / :obj:`None <python:None>`
+
+        :raises QuotaExhaustedError: if the quota has been used up and
+          ``on_exhausted`` is ``'raise'``, or it will not reset within ``max_wait``
+          seconds
+        """
+        delay = self._try_consume(api_key)
+        while delay:
+            self._check_wait(delay, max_wait)
+            time.sleep(delay)
+            delay = self._try_consume(api_key)
+
+    async def consume_async(self, api_key = None, max_wait = None):
+        """Record a request, waiting (without blocking the event loop) until the
+        quota resets if it has been used up and ``on_exhausted`` is ``'wait'``.
+
+        Accepts the same parameters as :meth:`consume`.
+
+        :raises QuotaExhaustedError: if the quota has been used up and
+          ``on_exhausted`` is ``'raise'``, or it will not reset within ``max_wait``
+          seconds
+        """
+        import asyncio
+
+        delay = self._try_consume(api_key)
+        while delay:
+            self._check_wait(delay, max_wait)
+            await asyncio.sleep(delay)
+            delay = self._try_consume(api_key)
+
+    def exhaust(self, api_key = None):
+        """Record that the quota for today has been used up, e.g. because the
+        WalkScore API has returned a :class:`QuotaError <walkscore.errors.QuotaError>`.
+
+        :param api_key: The API key whose quota has been used up. Defaults to
+          :obj:`None <python:None>`.
+        :type api_key: :class:`str <python:str>` / :obj:`None <python:None>`
+        """
+        self.backend.mark_used(self._get_name(api_key),
+                               self._get_period(),
+                               self.daily_quota)
+
+    def close(self):
+        """Release any resources held by the :attr:`backend`."""
+        self.backend.close()
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.ratelimit
+#########################################
+
+Implements a client-side rate limiter which keeps requests to the WalkScore API
+within the rate permitted for an API key.
+
+"""
+import math
+import time
+import threading
+
+from validator_collection import validators
+
+
+class RateLimiter(object):
+    """Token bucket which limits the rate at which requests are sent to the
+    WalkScore API.
+
+    The bucket holds up to ``burst`` tokens and is refilled at ``rate`` tokens per
+    second. Each request consumes one token, waiting until one is available if the
+    bucket is empty.
+
+    After the WalkScore API reports that the quota has been exceeded (or that the
+    caller's IP address has been blocked), the rate is multiplied by
+    ``cooloff_factor`` for ``cooloff`` seconds.
+
+    A single rate limiter may be shared by any number of threads (and any number
+    of :class:`WalkScoreAPI <walkscore.api.WalkScoreAPI>` instances).
+    """
+
+    def __init__(self,
+                 rate,
+                 burst = None,
+                 cooloff = 60,
+                 cooloff_factor = 0.1):
+        """
+        :param rate: The number of requests permitted per second.
+        :type rate: numeric
+
+        :param burst: The number of requests which may be sent at once when the
+          rate limiter has been idle. If :obj:`None <python:None>`, defaults to
+          ``rate`` (rounded up), permitting one second's worth of requests.
+        :type burst: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :param cooloff: The number of seconds for which to slow down after a
+          :class:`QuotaError <walkscore.errors.QuotaError>`. Defaults to ``60``.
+        :type cooloff: numeric
+
+        :param cooloff_factor: The factor by which to multiply ``rate`` while cooling
+          off. Defaults to ``0.1``.
+        :type cooloff_factor: numeric
+
+        :raises ValueError: if ``rate`` is not a positive number
+        """
+        self._rate = validators.numeric(rate, allow_empty = False, minimum = 0.000001)
+        self._burst = validators.integer(burst,
+                                         allow_empty = True,
+                                         minimum = 1) or int(math.ceil(self._rate))
+        self._cooloff = validators.numeric(cooloff, allow_empty = False, minimum = 0)
+        self._cooloff_factor = validators.numeric(cooloff_factor,
+                                                  allow_empty = False,
+                                                  minimum = 0.000001,
+                                                  maximum = 1)
+
+        self._lock = threading.Lock()
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._cooloff_until = None
+        self.cooloffs = 0
+
+    @property
+    def rate(self):
+        """The number of requests permitted per second, when not cooling off.
+
+        :rtype: numeric
+        """
+        return self._rate
+
+    @property
+    def burst(self):
+        """The number of requests which may be sent at once.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self._burst
+
+    @property
+    def cooling_off(self):
+        """``True`` if the rate limiter has slowed down following a
+        :class:`QuotaError <walkscore.errors.QuotaError>`.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        with self._lock:
+            return self._is_cooling_off(time.monotonic())
+
+    def _is_cooling_off(self, now):
+        return self._cooloff_until is not None and now < self._cooloff_until
+
+    def _current_rate(self, now):
+        if self._is_cooling_off(now):
+            return self._rate * self._cooloff_factor
+
+        return self._rate
+
+    def reserve(self):
+        """Reserve a token, returning the number of seconds to wait before it may
+        be used.
+
+        :rtype: :class:`float <python:float>`
+        """
+        with self._lock:
+            now = time.monotonic()
+            rate = self._current_rate(now)
+            self._tokens = min(float(self._burst),
+                               self._tokens + (now - self._updated) * rate)
+            self._updated = now
+            self._tokens -= 1
+
+            if self._tokens >= 0:
+                return 0.0
+
+            return -self._tokens / rate
+
+    def _reserve(self, max_wait = None):
+        """Reserve a token, unless doing so would mean waiting longer than
+        ``max_wait`` seconds.
+
+        :returns: The number of seconds to wait, or :obj:`None <python:None>` if no
+          token was reserved.
+        :rtype: :class:`float <python:float>` / :obj:`None <python:None>`
+        """
+        delay = self.reserve()
+        if max_wait is not None and delay > max_wait:
+            with self._lock:
+                self._tokens += 1
+
+            return None
+
+        return delay
+
+    def acquire(self, max_wait = None):
+        """Wait (blocking the current thread) until a request may be sent.
+
+        :param max_wait: The maximum number of seconds to wait. If a request may
+          not be sent within it, returns immediately. If
+          :obj:`None <python:None>`, waits as long as necessary. Defaults to
+          :obj:`None <python:None>`.
+        :type max_wait: numeric / :obj:`None <python:None>`
+
+        :returns: ``True`` if a request may be sent, ``False`` if it could not be
+          within ``max_wait`` seconds.
+        :rtype: :class:`bool <python:bool>`
+        """
+        delay = self._reserve(max_wait)
+        if delay is None:
+            return False
+
+        if delay:
+            time.sleep(delay)
+
+        return True
+
+    async def acquire_async(self, max_wait = None):
+        """Wait (without blocking the event loop) until a request may be sent.
+
+        Accepts the same parameters and returns the same value as :meth:`acquire`.
+        """
+        import asyncio
+
+        delay = self._reserve(max_wait)
+        if delay is None:
+            return False
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        return True
+
+    def cool_off(self):
+        """Slow down to ``rate * cooloff_factor`` for the next ``cooloff`` seconds,
+        discarding any tokens in the bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._cooloff_until = now + self._cooloff
+            self._tokens = min(self._tokens, 0.0)
+            self._updated = now
+            self.cooloffs += 1
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.repoll
+#########################################
+
+Implements the queue in which locations whose scores are still being calculated
+by the WalkScore API (see
+:class:`ScoreInProgressError <walkscore.errors.ScoreInProgressError>`) wait to be
+requested again.
+
+"""
+import time
+import heapq
+import itertools
+import threading
+
+from validator_collection import validators
+
+
+class RepollQueue(object):
+    """Time-ordered queue of items waiting to be re-polled, with delays which
+    increase on each attempt.
+
+    The delay before attempt ``n`` is ``initial_delay * backoff ** (n - 1)``,
+    capped at ``max_delay``. Once an item has been re-polled ``max_attempts``
+    times, it is no longer accepted by :meth:`push`.
+
+    .. caution::
+
+      A queue holds the state of a single batch, and must not be shared between
+      batches which are running concurrently.
+    """
+
+    def __init__(self,
+                 initial_delay = 30,
+                 backoff = 2,
+                 max_delay = 600,
+                 max_attempts = 6):
+        """
+        :param initial_delay: The number of seconds to wait before the first
+          re-poll. Defaults to ``30``.
+        :type initial_delay: numeric
+
+        :param backoff: The factor by which the delay increases on each attempt.
+          Defaults to ``2``.
+        :type backoff: numeric
+
+        :param max_delay: The maximum number of seconds to wait between re-polls.
+          Defaults to ``600``.
+        :type max_delay: numeric
+
+        :param max_attempts: The maximum number of times to re-poll an item.
+          Defaults to ``6``.
+        :type max_attempts: :class:`int <python:int>`
+        """
+        self._initial_delay = validators.numeric(initial_delay, minimum = 0)
+        self._backoff = validators.numeric(backoff, minimum = 1)
+        self._max_delay = validators.numeric(max_delay, minimum = 0)
+        self._max_attempts = validators.integer(max_attempts, minimum = 0)
+
+        self._lock = threading.Lock()
+        self._heap = []
+        self._counter = itertools.count()
+        self.deferred = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._heap)
+
+    @property
+    def max_attempts(self):
+        """The maximum number of times to re-poll an item.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self._max_attempts
+
+    def get_delay(self, attempt):
+        """Return the number of seconds to wait before re-poll ``attempt``.
+
+        :param attempt: The number of the attempt, starting at ``1``.
+        :type attempt: :class:`int <python:int>`
+
+        :rtype: numeric
+        """
+        return min(self._max_delay,
+                   self._initial_delay * (self._backoff ** (attempt - 1)))
+
+    def push(self, item, attempt = 1):
+        """Queue ``item`` to be re-polled.
+
+        :param item: The item to re-poll.
+
+        :param attempt: The number of the re-poll attempt, starting at ``1``.
+        :type attempt: :class:`int <python:int>`
+
+        :returns: ``True`` if the item was queued, ``False`` if it has already been
+          re-polled ``max_attempts`` times.
+        :rtype: :class:`bool <python:bool>`
+        """
+        if attempt > self.max_attempts:
+            return False
+
+        due = time.monotonic() + self.get_delay(attempt)
+        with self._lock:
+            heapq.heappush(self._heap, (due, next(self._counter), item, attempt))
+            self.deferred += 1
+
+        return True
+
+    def pop_due(self):
+        """Remove and return the earliest item which is due to be re-polled.
+
+        :returns: The item and the number of its re-poll attempt, or
+          :obj:`None <python:None>` if no item is due.
+        :rtype: :class:`tuple <python:tuple>` / :obj:`None <python:None>`
+        """
+        with self._lock:
+            if not self._heap or self._heap[0][0] > time.monotonic():
+                return None
+
+            _, _, item, attempt = heapq.heappop(self._heap)
+
+        return item, attempt
+
+    def next_delay(self):
+        """Return the number of seconds until the earliest item is due.
+
+        :returns: The number of seconds, or :obj:`None <python:None>` if the queue
+          is empty.
+        :rtype: numeric / :obj:`None <python:None>`
+        """
+        with self._lock:
+            if not self._heap:
+                return None
+
+            return max(0, self._heap[0][0] - time.monotonic())
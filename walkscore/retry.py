@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.retry
+#########################################
+
+Implements the policy which determines whether, and when, a failed request to the
+WalkScore API is retried.
+
+"""
+import os
+import time
+import random
+import threading
+from collections import deque
+
+from validator_collection import validators, checkers
+
+from walkscore.errors import HTTPConnectionError, InternalAPIError, \
+    TooManyRequestsError, BindingError, CircuitOpenError
+
+
+class RetryBudget(object):
+    """Limits retries to a share of the requests made, so that a struggling
+    WalkScore API is not overwhelmed by a storm of retries.
+
+    Over any ``window`` seconds, at most ``ratio`` retries are permitted for each
+    request made, plus ``minimum_retries`` retries regardless of traffic.
+
+    A single budget is shared by every :class:`RetryPolicy` which does not specify
+    its own, and so by every HTTP client in the process.
+    """
+
+    def __init__(self,
+                 ratio = 0.2,
+                 minimum_retries = 10,
+                 window = 10):
+        """
+        :param ratio: The number of retries permitted per request made. Defaults
+          to ``0.2``, i.e. retries may add at most 20% to the traffic sent.
+        :type ratio: numeric
+
+        :param minimum_retries: The number of retries permitted per ``window``
+          regardless of the number of requests made. Defaults to ``10``.
+        :type minimum_retries: :class:`int <python:int>`
+
+        :param window: The number of seconds over which requests and retries are
+          counted. Defaults to ``10``.
+        :type window: numeric
+        """
+        self._ratio = validators.numeric(ratio, minimum = 0)
+        self._minimum_retries = validators.integer(minimum_retries, minimum = 0)
+        self._window = validators.numeric(window, minimum = 0.001)
+
+        self._lock = threading.Lock()
+        self._requests = deque()
+        self._retries = deque()
+        self.exhausted = 0
+
+    def _expire(self, now):
+        cutoff = now - self._window
+        for timestamps in (self._requests, self._retries):
+            while timestamps and timestamps[0] < cutoff:
+                timestamps.popleft()
+
+    @property
+    def stats(self):
+        """Counters describing the budget.
+
+        :rtype: :class:`dict <python:dict>` with ``requests`` and ``retries`` (the
+          numbers made in the current window) and ``exhausted`` (the number of
+          retries refused) keys
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            return {
+                'requests': len(self._requests),
+                'retries': len(self._retries),
+                'exhausted': self.exhausted
+            }
+
+    def record_request(self):
+        """Record that a (first-attempt) request has been made."""
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._requests.append(now)
+
+    def try_spend(self):
+        """Withdraw a retry from the budget.
+
+        :returns: ``True`` if the retry is permitted, ``False`` if the budget has
+          been used up.
+        :rtype: :class:`bool <python:bool>`
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            permitted = self._minimum_retries + self._ratio * len(self._requests)
+            if len(self._retries) >= permitted:
+                self.exhausted += 1
+                return False
+
+            self._retries.append(now)
+
+            return True
+
+
+#: The retry budget shared by every :class:`RetryPolicy` which does not specify its
+#: own.
+DEFAULT_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy(object):
+    """Determines whether, and when, a failed request is retried.
+
+    A request is retried if it raised an
+    :class:`HTTPConnectionError <walkscore.errors.HTTPConnectionError>` (including
+    :class:`HTTPTimeoutError <walkscore.errors.HTTPTimeoutError>`), an
+    :class:`InternalAPIError <walkscore.errors.InternalAPIError>`, a
+    :class:`TooManyRequestsError <walkscore.errors.TooManyRequestsError>`, or any
+    other error for a response with a ``5xx`` status code, as long as the
+    :class:`RetryBudget` permits it.
+
+    Delays between attempts follow an exponential backoff with
+    `decorrelated jitter <https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/>`_,
+    and are extended to honour any ``Retry-After`` header returned by the
+    WalkScore API.
+    """
+
+    def __init__(self,
+                 max_retries = None,
+                 base_delay = 0.5,
+                 max_delay = 20,
+                 max_total_delay = None,
+                 budget = None,
+                 respect_retry_after = True):
+        """
+        :param max_retries: The maximum number of times to retry a request. If
+          :obj:`None <python:None>`, defaults to the ``BACKOFF_DEFAULT_TRIES``
+          environment variable, or ``3`` if it is not set.
+        :type max_retries: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :param base_delay: The minimum number of seconds to wait before a retry.
+          Defaults to ``0.5``.
+        :type base_delay: numeric
+
+        :param max_delay: The maximum number of seconds to wait before a retry.
+          Defaults to ``20``.
+        :type max_delay: numeric
+
+        :param max_total_delay: The maximum number of seconds to wait across all
+          retries of a request. If :obj:`None <python:None>`, defaults to the
+          ``BACKOFF_DEFAULT_DELAY`` environment variable, or no limit if it is not
+          set.
+        :type max_total_delay: numeric / :obj:`None <python:None>`
+
+        :param budget: The budget from which retries are withdrawn. If
+          :obj:`None <python:None>`, uses the process-wide
+          :data:`DEFAULT_RETRY_BUDGET`.
+        :type budget: :class:`RetryBudget` / :obj:`None <python:None>`
+
+        :param respect_retry_after: If ``True``, waits at least as long as the
+          ``Retry-After`` header of a failed response requests (even beyond
+          ``max_delay``), giving up instead if that would exceed
+          ``max_total_delay`` or the request's deadline. Defaults to ``True``.
+        :type respect_retry_after: :class:`bool <python:bool>`
+        """
+        if max_retries is None:
+            max_retries = os.getenv('BACKOFF_DEFAULT_TRIES', 3)
+        if max_total_delay is None:
+            max_total_delay = os.getenv('BACKOFF_DEFAULT_DELAY', None)
+
+        self._max_retries = validators.integer(max_retries, minimum = 0)
+        self._base_delay = validators.numeric(base_delay, minimum = 0)
+        self._max_delay = validators.numeric(max_delay, minimum = self._base_delay)
+        self._max_total_delay = validators.numeric(max_total_delay,
+                                                   allow_empty = True,
+                                                   minimum = 0)
+
+        if budget is not None and not checkers.is_type(budget, 'RetryBudget'):
+            raise ValueError('budget must be of type "RetryBudget", was "%s"' %
+                             str(type(budget)))
+        self._budget = budget or DEFAULT_RETRY_BUDGET
+
+        self._respect_retry_after = bool(respect_retry_after)
+
+    @property
+    def max_retries(self):
+        """The maximum number of times to retry a request.
+
+        :rtype: :class:`int <python:int>`
+        """
+        return self._max_retries
+
+    @property
+    def budget(self):
+        """The budget from which retries are withdrawn.
+
+        :rtype: :class:`RetryBudget`
+        """
+        return self._budget
+
+    @staticmethod
+    def is_retryable(error):
+        """Return ``True`` if a request which raised ``error`` may be retried.
+
+        :rtype: :class:`bool <python:bool>`
+        """
+        if isinstance(error, (BindingError, CircuitOpenError)):
+            return False
+
+        if isinstance(error, (HTTPConnectionError,
+                              InternalAPIError,
+                              TooManyRequestsError)):
+            return True
+
+        status_code = getattr(error, 'status_code', None)
+
+        return isinstance(status_code, int) and status_code >= 500
+
+    def get_delay(self, previous_delay = None, error = None):
+        """Return the number of seconds to wait before the next attempt.
+
+        :param previous_delay: The number of seconds waited before the previous
+          attempt, if any. Defaults to :obj:`None <python:None>`.
+        :type previous_delay: numeric / :obj:`None <python:None>`
+
+        :param error: The error raised by the previous attempt. Defaults to
+          :obj:`None <python:None>`.
+        :type error: :class:`Exception <python:Exception>` / :obj:`None <python:None>`
+
+        :rtype: numeric
+        """
+        upper = max(self._base_delay, (previous_delay or self._base_delay) * 3)
+        delay = min(self._max_delay, random.uniform(self._base_delay, upper))
+
+        retry_after = getattr(error, 'retry_after', None)
+        if self._respect_retry_after and retry_after:
+            delay = max(delay, retry_after)
+
+        return delay
+
+    def _get_next_delay(self,
+                        attempt,
+                        max_retries,
+                        waited,
+                        previous_delay,
+                        error,
+                        deadline = None):
+        """Return the number of seconds to wait before retrying a request which
+        raised ``error``, or :obj:`None <python:None>` if it should not be retried.
+        """
+        if attempt >= max_retries or not self.is_retryable(error):
+            return None
+
+        delay = self.get_delay(previous_delay, error)
+        if self._max_total_delay is not None and \
+           waited + delay > self._max_total_delay:
+            return None
+
+        if deadline is not None and delay >= deadline.remaining():
+            return None
+
+        if not self.budget.try_spend():
+            return None
+
+        return delay
+
+    def execute(self, function, *args, **kwargs):
+        """Call ``function``, retrying it according to the policy.
+
+        :param function: The callable to execute.
+        :type function: callable
+
+        :param max_retries: The maximum number of times to retry ``function``. If
+          :obj:`None <python:None>`, defaults to :attr:`max_retries`. Supplied as a
+          keyword argument, and not passed on to ``function``.
+        :type max_retries: :class:`int <python:int>` / :obj:`None <python:None>`
+
+        :param deadline: The deadline by which ``function`` must succeed. No retry
+          is attempted after a delay which would reach it. Supplied as a keyword
+          argument, and also passed on to ``function``.
+        :type deadline: :class:`Deadline <walkscore.deadline.Deadline>` /
+          :obj:`None <python:None>`
+
+        :returns: The result of ``function``.
+
+        :raises Exception: the error raised by the last attempt, if no attempt
+          succeeded
+        """
+        max_retries = kwargs.pop('max_retries', None)
+        if max_retries is None:
+            max_retries = self.max_retries
+        deadline = kwargs.get('deadline', None)
+
+        self.budget.record_request()
+        attempt = 0
+        waited = 0
+        delay = None
+        while True:
+            try:
+                return function(*args, **kwargs)
+            except Exception as error:
+                delay = self._get_next_delay(attempt,
+                                             max_retries,
+                                             waited,
+                                             delay,
+                                             error,
+                                             deadline = deadline)
+                if delay is None:
+                    raise
+
+            time.sleep(delay)
+            waited += delay
+            attempt += 1
+
+    async def execute_async(self, function, *args, **kwargs):
+        """Await ``function``, retrying it according to the policy without blocking
+        the event loop.
+
+        Accepts the same parameters as :meth:`execute`, except that ``function``
+        must be a coroutine function.
+        """
+        import asyncio
+
+        max_retries = kwargs.pop('max_retries', None)
+        if max_retries is None:
+            max_retries = self.max_retries
+        deadline = kwargs.get('deadline', None)
+
+        self.budget.record_request()
+        attempt = 0
+        waited = 0
+        delay = None
+        while True:
+            try:
+                return await function(*args, **kwargs)
+            except Exception as error:
+                delay = self._get_next_delay(attempt,
+                                             max_retries,
+                                             waited,
+                                             delay,
+                                             error,
+                                             deadline = deadline)
+                if delay is None:
+                    raise
+
+            await asyncio.sleep(delay)
+            waited += delay
+            attempt += 1
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+
+"""
+#########################################
+walkscore.singleflight
+#########################################
+
+Implements request coalescing ("single-flight" execution), in which concurrent
+callers requesting the same thing share the result of a single call rather than
+each making their own.
+
+"""
+import time
+import threading
+from concurrent import futures
+
+from walkscore.errors import HTTPTimeoutError
+
+
+# The result of a call abandoned by its caller (because it was cancelled).
+_ABANDONED = object()
+
+
+def _raise_wait_timeout():
+    raise HTTPTimeoutError('Timed out waiting for a request to the WalkScore API '
+                           'made by another caller.')
+
+
+class SingleFlight(object):
+    """Coalesces concurrent calls made from multiple threads.
+
+    While a call for a given key is in flight, any other thread calling
+    :meth:`do` with the same key waits for that call to complete and receives its
+    result (or its exception) instead of making a call of its own. Each waiting
+    thread may bound how long it waits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.coalesced = 0
+
+    def do(self, key, function, *args, max_wait = None, retry_on = None, **kwargs):
+        """Execute ``function`` unless a call for ``key`` is already in flight, in
+        which case wait for it and return its result.
+
+        :param key: The key identifying the call. Must be hashable.
+
+        :param function: The callable to execute.
+        :type function: callable
+
+        :param max_wait: The maximum number of seconds to wait for a call made by
+          another caller. If :obj:`None <python:None>`, waits until it completes.
+          Defaults to :obj:`None <python:None>`.
+        :type max_wait: numeric / :obj:`None <python:None>`
+
+        :param retry_on: A callable which receives the exception raised by a call
+          made by another caller, and returns ``True`` if this caller should make
+          its own call rather than raise it. If :obj:`None <python:None>`, the
+          exception is always raised. Defaults to :obj:`None <python:None>`.
+        :type retry_on: callable / :obj:`None <python:None>`
+
+        :returns: The result of the call, and whether that result is shared with
+          another caller.
+        :rtype: :class:`tuple <python:tuple>`
+
+        :raises HTTPTimeoutError: if the call made by another caller does not
+          complete within ``max_wait`` seconds
+        :raises Exception: whatever the call raised
+        """
+        expires_at = None if max_wait is None else time.monotonic() + max_wait
+        while True:
+            with self._lock:
+                future = self._calls.get(key, None)
+                is_leader = future is None
+                if is_leader:
+                    future = futures.Future()
+                    self._calls[key] = future
+                else:
+                    self.coalesced += 1
+
+            if is_leader:
+                break
+
+            timeout = None if expires_at is None else max(0, expires_at - time.monotonic())
+            try:
+                return future.result(timeout = timeout), True
+            except futures.TimeoutError:
+                _raise_wait_timeout()
+            except Exception as error:                                           # pylint: disable=W0703
+                if retry_on is None or not retry_on(error):
+                    raise
+
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as error:
+            self._forget(key)
+            future.set_exception(error)
+            raise
+
+        self._forget(key)
+        future.set_result(result)
+
+        return result, False
+
+    def _forget(self, key):
+        with self._lock:
+            self._calls.pop(key, None)
+
+
+class AsyncSingleFlight(object):
+    """Coalesces concurrent calls made from coroutines running on an event loop.
+
+    While a call for a given key is in flight, any other coroutine awaiting
+    :meth:`do` with the same key waits for that call to complete and receives its
+    result (or its exception) instead of making a call of its own. Each waiting
+    coroutine may bound how long it waits.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.coalesced = 0
+
+    async def do(self, key, function, *args, max_wait = None, retry_on = None, **kwargs):
+        """Await ``function`` unless a call for ``key`` is already in flight, in
+        which case wait for it and return its result.
+
+        Accepts the same parameters as :meth:`SingleFlight.do`, except that
+        ``function`` must be a coroutine function.
+
+        :returns: The result of the call, and whether that result is shared with
+          another caller.
+        :rtype: :class:`tuple <python:tuple>`
+
+        :raises HTTPTimeoutError: if the call made by another caller does not
+          complete within ``max_wait`` seconds
+        :raises Exception: whatever the call raised
+        """
+        import asyncio
+
+        expires_at = None if max_wait is None else time.monotonic() + max_wait
+        future = self._calls.get(key, None)
+        while future is not None:
+            self.coalesced += 1
+            timeout = None if expires_at is None else max(0, expires_at - time.monotonic())
+            try:
+                result = await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.TimeoutError:
+                _raise_wait_timeout()
+            except asyncio.CancelledError:
+                # Only this caller's own cancellation propagates: a call
+                # cancelled by anyone else is retried.
+                if not future.cancelled():
+                    raise
+            except Exception as error:                                           # pylint: disable=W0703
+                if retry_on is None or not retry_on(error):
+                    raise
+            else:
+                if result is not _ABANDONED:
+                    return result, True
+
+            future = self._calls.get(key, None)
+
+        future = asyncio.get_event_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await function(*args, **kwargs)
+        except asyncio.CancelledError:
+            # Leave the waiters (if any) to retry, one of them making the call.
+            self._calls.pop(key, None)
+            future.set_result(_ABANDONED)
+            raise
+        except BaseException as error:
+            self._calls.pop(key, None)
+            future.set_exception(error)
+            # Waiters (if any) receive the error themselves, so do not let the
+            # event loop report it as unretrieved.
+            future.exception()
+            raise
+
+        self._calls.pop(key, None)
+        future.set_result(result)
+
+        return result, False
@@ -10,11 +10,10 @@ Implements utility functions used by the library.
 """
 import os
 import sys
-from functools import wraps
-
 from validator_collection import checkers, validators
 
 import walkscore.errors as errors
+from walkscore import jsoncodec
 
 CA_BUNDLE_PATH = os.path.join(
     os.path.dirname(__file__), "data/ca-certificates.crt"
@@ -42,6 +41,59 @@ def to_utf8(value):
     return value
 
 
+def parse_response(response, status_code, headers = None):
+    """Parse the content of a response from the WalkScore API, and raise the error
+    it reports (either in its HTTP Status Code or in the ``status`` of its body),
+    if any.
+
+    The content is parsed exactly once.
+
+    :param response: The content of the response.
+    :type response: :class:`bytes <python:bytes>` / :class:`str <python:str>`
+
+    :param status_code: The HTTP Status Code returned.
+    :type status_code: :class:`int <python:int>`
+
+    :param headers: The HTTP Headers returned. Defaults to
+      :obj:`None <python:None>`.
+    :type headers: :class:`dict <python:dict>` / :obj:`None <python:None>`
+
+    :returns: The JSON object returned by the WalkScore API.
+    :rtype: :class:`dict <python:dict>`
+
+    :raises WalkScoreError: or a sub-type thereof based on ``status_code`` or the
+      ``status`` reported by the WalkScore API
+    :raises InternalAPIError: if the content is not a JSON object
+    """
+    if status_code.__class__ is not int:
+        status_code = validators.integer(status_code, allow_empty = False)
+
+    try:
+        json_response = jsoncodec.loads(response) if response else None
+    except ValueError:
+        json_response = None
+
+    if not isinstance(json_response, dict):
+        json_response = None
+
+    error_type = errors.get_error_type(status_code)
+    if not error_type and json_response is not None:
+        error_type = errors.get_error_type(json_response.get('status', None))
+
+    if error_type:
+        message = json_response.get('message', None) if json_response else None
+        if message is None:
+            message = response.decode('utf-8') if isinstance(response, bytes) else response
+
+        raise error_type(message)
+
+    if json_response is None:
+        raise errors.InternalAPIError('The WalkScore API returned a response which '
+                                      'is not a JSON object.')
+
+    return json_response
+
+
 def check_for_errors(response, status_code, headers):
     """Check the HTTP Status Code and the response for errors and raise an
     appropriate exception. Otherwise return the result as-is.
@@ -60,25 +112,12 @@ def check_for_errors(response, status_code, headers):
     :rtype: :class:`tuple <python:tuple>` of :class:`bytes <python:bytes>`,
       :class:`int <python:int>`, and :class:`dict <python:dict>`
 
-    """
-    status_code = validators.integer(status_code, allow_empty = False)
-    try:
-        json_response = validators.json(response, allow_empty = True)
-    except ValueError:
-        if isinstance(response, bytes):
-            response = response.decode('utf-8')
-            
-        json_response = validators.json(response, allow_empty = True)
-
-    status_code, error_type, message = errors.parse_http_error(status_code,
-                                                               response)
-    if not error_type:
-        ws_status = json_response.get('status', None)
-        error_value = errors.DEFAULT_ERROR_CODES.get(ws_status, None)
-        if error_value:
-            error_type = errors.ERROR_TYPES.get(error_value, None)
+    .. seealso::
 
-    if error_type:
-        raise error_type(message)
+      :func:`parse_response`, which also returns the parsed content (and so
+      avoids parsing it again)
+
+    """
+    parse_response(response, status_code, headers)
 
     return response, status_code, headers